@@ -0,0 +1,325 @@
+"""
+Campaign Simulation Benchmark
+
+SRS Reference: §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/planner_service.md, Pattern A (Trend-Jacked Content)
+
+Generates N synthetic CampaignManifests and drives each one end to end:
+
+    plan_campaign -> validate_task_manifest -> skill execute_skill
+        -> task1.worker.run -> validate_task_result
+
+External calls (platform APIs, LLMs, object storage) are replaced by
+configurable fake latencies. The run reports throughput, p50/p99 latency per
+stage and peak RSS, and can be saved as JSON and compared against an earlier
+run to catch regressions.
+
+Usage:
+    python -m benchmarks.campaign_simulation --campaigns 200 --concurrency 16 \\
+        --latency skill.generate_content=0.05 --output run.json --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.planner.engine import CampaignPlanner
+from src.schemas.agent_task import validate_task_manifest, validate_task_result
+from skills.skill_check_wallet_balance.skill import execute_skill as check_wallet_balance
+from skills.skill_fetch_trends.skill import execute_skill as fetch_trends
+from skills.skill_generate_content.skill import execute_skill as generate_content
+from skills.skill_publish_post.skill import execute_skill as publish_post
+from skills.skill_validate_image.skill import execute_skill as validate_image, set_pipeline
+from skills.skill_validate_image.pipeline import ImageValidationPipeline
+from src.replay.recorder import Recorder
+import task1
+
+PLATFORMS = ["twitter", "instagram", "tiktok", "reddit"]
+REGIONS = ["US", "EU", "ASIA", "GLOBAL"]
+
+SCHEMA_VERSION = 1
+
+
+def generate_manifests(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build `count` synthetic CampaignManifests (specs/planner_service.md §2)."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "campaign_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Synthetic Campaign {i}",
+            "goal": f"Promote collection {i} to {rng.choice(['GenZ', 'Millennials'])}",
+            "budget_limit_usd": round(rng.uniform(100, 5000), 2),
+            "start_date": now,
+            "end_date": now,
+            "target_audience": {
+                "demographics": ["GenZ"],
+                "regions": rng.sample(REGIONS, 2)
+            },
+            "constraints": {
+                "prohibited_keywords": ["fast fashion", "cheap"],
+                "platforms": rng.sample(PLATFORMS, 2)
+            }
+        }
+        for i in range(count)
+    ]
+
+
+class StageTimer:
+    """Thread-safe collector of per-stage durations in seconds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def time(self, stage: str, fn, *args, latency: float = 0.0):
+        start = time.perf_counter()
+        if latency:
+            time.sleep(latency)
+        result = fn(*args)
+        self.record(stage, time.perf_counter() - start)
+        return result
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class CampaignSimulation:
+    """
+    Drives synthetic campaigns through planner, schemas, skills and worker.
+
+    Args:
+        latencies: Fake external latency in seconds per stage name
+            (e.g. {"skill.generate_content": 0.05}).
+        image_url: URL used for validate_image; defaults to a generated local file.
+        recorder: src.replay.recorder.Recorder capturing planner and skill
+            calls (fake latency included) for offline replay.
+    """
+
+    def __init__(self, latencies: Optional[Dict[str, float]] = None, image_url: Optional[str] = None,
+                 recorder: Optional[Recorder] = None):
+        self.latencies = latencies or {}
+        self.recorder = recorder
+        self.timer = StageTimer()
+        self.planner = CampaignPlanner()
+        self.image_url = image_url
+        self._tmpdir: Optional[tempfile.TemporaryDirectory] = None
+
+    def __enter__(self):
+        if self.image_url is None:
+            from PIL import Image
+
+            self._tmpdir = tempfile.TemporaryDirectory()
+            path = os.path.join(self._tmpdir.name, "creative.png")
+            Image.new("RGB", (512, 512), (255, 87, 51)).save(path)
+            self.image_url = f"file://{path}"
+        set_pipeline(ImageValidationPipeline(workers=0))
+        return self
+
+    def __exit__(self, *exc):
+        set_pipeline(None)
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+
+    def _stage(self, stage: str, fn, *args):
+        latency = self.latencies.get(stage, 0.0)
+        if self.recorder is not None and stage.startswith("skill."):
+            fn, latency = self._recorded(stage[len("skill."):], fn, latency), 0.0
+        return self.timer.time(stage, fn, *args, latency=latency)
+
+    def _recorded(self, skill: str, fn, latency: float):
+        def external_call(input_data):
+            if latency:
+                time.sleep(latency)
+            return fn(input_data)
+        return lambda input_data: self.recorder.call(skill, external_call, input_data)
+
+    def _plan(self, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self.recorder is not None:
+            return self.recorder.plan(self.planner, manifest)
+        return self.planner.plan_campaign(manifest)
+
+    def _execute_task(self, task: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+        payload = task["payload"]
+        soul_id = "chimera:agent:bench"
+
+        if task["task_type"] == "analytics_fetch":
+            output = self._stage("skill.fetch_trends", fetch_trends, {
+                "platform": payload["platform"], "region": payload["region"], "limit": 10
+            })
+        elif task["task_type"] == "content_generation":
+            output = self._stage("skill.generate_content", generate_content, {
+                "soul_id": soul_id, "content_type": payload["content_type"],
+                "prompt": payload["prompt"], "context_ids": payload["context_ids"]
+            })
+            self._stage("skill.validate_image", validate_image, {
+                "image_url": self.image_url, "brand_guidelines": {"allowed_colors": ["#FF5733"]}
+            })
+        elif task["task_type"] == "social_publish":
+            self._stage("skill.check_wallet_balance", check_wallet_balance, {"soul_id": soul_id})
+            output = self._stage("skill.publish_post", publish_post, {
+                "platform": payload["platform"], "content": manifest["goal"],
+                "provenance": payload["provenance"]
+            })
+        else:
+            output = {}
+
+        self._stage("worker.run", task1.run, {"id": task["task_id"], "payload": output})
+
+        result = {
+            "task_id": task["task_id"],
+            "worker_soul_id": soul_id,
+            "status": "SUCCESS",
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "confidence": output.get("confidence", 0.9),
+            "output": output
+        }
+        check = self._stage("schema.validate_result", validate_task_result, result)
+        if not check["valid"]:
+            raise ValueError(f"Invalid task result: {check['errors']}")
+        return result
+
+    def run_campaign(self, manifest: Dict[str, Any]) -> int:
+        """Run one campaign end to end. Returns the number of tasks executed."""
+        start = time.perf_counter()
+        tasks = self._stage("planner.plan_campaign", self._plan, manifest)
+        for task in tasks:
+            check = self._stage("schema.validate_manifest", validate_task_manifest, task)
+            if not check["valid"]:
+                raise ValueError(f"Invalid task manifest: {check['errors']}")
+        for task in tasks:
+            self._execute_task(task, manifest)
+        # The worker's telemetry shim keeps every event; drain it so it does
+        # not inflate the peak RSS being measured
+        task1.telemetry.clear()
+        self.timer.record("campaign.total", time.perf_counter() - start)
+        return len(tasks)
+
+    def run(self, manifests: List[Dict[str, Any]], concurrency: int = 1) -> Dict[str, Any]:
+        """Run every manifest and return the benchmark report."""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            task_count = sum(pool.map(self.run_campaign, manifests))
+        elapsed = time.perf_counter() - start
+
+        stages = {}
+        for stage, values in sorted(self.timer.durations.items()):
+            values = sorted(values)
+            stages[stage] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50) * 1000, 4),
+                "p99_ms": round(_percentile(values, 99) * 1000, 4),
+                "max_ms": round(values[-1] * 1000, 4)
+            }
+
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "environment": {"python": platform.python_version(), "machine": platform.machine()},
+            "config": {"campaigns": len(manifests), "concurrency": concurrency, "latencies": self.latencies},
+            "throughput": {
+                "elapsed_s": round(elapsed, 4),
+                "campaigns_per_s": round(len(manifests) / elapsed, 2),
+                "tasks_per_s": round(task_count / elapsed, 2)
+            },
+            "stages": stages,
+            "peak_rss_mb": _peak_rss_mb()
+        }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> List[str]:
+    """
+    List regressions of `current` against `baseline`.
+
+    A regression is tasks_per_s dropping, or a stage's p99 rising, by more
+    than `threshold` (a fraction).
+    """
+    regressions = []
+    base_tps = baseline["throughput"]["tasks_per_s"]
+    cur_tps = current["throughput"]["tasks_per_s"]
+    if base_tps and cur_tps < base_tps * (1 - threshold):
+        regressions.append(f"tasks_per_s {base_tps} -> {cur_tps}")
+
+    for stage, stats in current["stages"].items():
+        base = baseline["stages"].get(stage)
+        if base and base["p99_ms"] and stats["p99_ms"] > base["p99_ms"] * (1 + threshold):
+            regressions.append(f"{stage} p99 {base['p99_ms']}ms -> {stats['p99_ms']}ms")
+    return regressions
+
+
+def _parse_latency(value: str) -> tuple:
+    stage, _, seconds = value.partition("=")
+    if not seconds:
+        raise argparse.ArgumentTypeError("latency must look like stage=seconds")
+    return stage, float(seconds)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=_parse_latency, action="append", default=[],
+                        help="Fake external latency, e.g. skill.publish_post=0.2 (repeatable)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    parser.add_argument("--record", help="Record planner and skill calls here for src.replay.recorder")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    recorder = Recorder(args.record, meta={"source": "campaign_simulation"}) if args.record else None
+    try:
+        with CampaignSimulation(latencies=dict(args.latency), recorder=recorder) as sim:
+            report = sim.run(generate_manifests(args.campaigns, args.seed), concurrency=args.concurrency)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Discovery Query Benchmark
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration, NFR 3.0
+Spec: specs/openclaw_integration.md, §2.2 Discovery Query
+
+Loads N synthetic advertisements into src.openclaw.discovery.DiscoveryIndex
+and reports p50/p99 latency for a mix of §2.2 queries. It also times an
+incremental refresh of 1% of the advertisements.
+
+Usage:
+    python -m benchmarks.discovery_query --ads 1000000 --limit 100
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, Any, List
+
+from src.openclaw.discovery import DiscoveryIndex
+
+SKILLS = [f"skill_{i}" for i in range(200)]
+STATUSES = ["AVAILABLE", "BUSY", "OFFLINE"]
+
+QUERIES = [
+    {"skills": ["skill_3"], "availability": "AVAILABLE"},
+    {"skills": ["skill_0", "skill_7"], "max_price": 40},
+    {"skills": ["skill_12"], "min_reputation": 4.5, "max_price": 60},
+    {"max_price": 5.5},
+    {"min_reputation": 4.99},
+    {"skills": ["skill_1", "skill_2", "skill_3"]},
+    {"availability": "AVAILABLE", "max_price": 30, "min_reputation": 4.0},
+]
+
+
+def _ad(rng: random.Random, i: int) -> Dict[str, Any]:
+    # Skill popularity is skewed: low-numbered skills are far more common
+    skills = {SKILLS[min(int(rng.expovariate(1 / 20)), len(SKILLS) - 1)] for _ in range(rng.randint(1, 5))}
+    return {
+        "soul_id": f"chimera:agent:{i}",
+        "skills": sorted(skills),
+        "availability": {"status": rng.choice(STATUSES)},
+        "pricing": {"base_rate_per_hour": round(rng.uniform(5, 150), 2)},
+        "reputation": {"score": round(rng.uniform(1, 5), 3)}
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ads", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    index = DiscoveryIndex(capacity=args.ads)
+    start = time.perf_counter()
+    index.upsert_batch(_ad(rng, i) for i in range(args.ads))
+    load_s = time.perf_counter() - start
+
+    refresh = [_ad(rng, rng.randrange(args.ads)) for _ in range(max(1, args.ads // 100))]
+    start = time.perf_counter()
+    for ad in refresh:
+        index.upsert(ad)
+    refresh_us = (time.perf_counter() - start) / len(refresh) * 1e6
+
+    results = {}
+    for filters in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            matches = index.query(limit=args.limit, **filters)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[json.dumps(filters)] = {
+            "matches": len(matches),
+            "p50_ms": round(_percentile(timings, 50), 4),
+            "p99_ms": round(_percentile(timings, 99), 4)
+        }
+
+    print(json.dumps({"ads": args.ads, "load_s": round(load_s, 2), "refresh_upsert_us": round(refresh_us, 2),
+                      "queries": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Ledger Throughput Benchmark
+
+SRS Reference: §4.5 Commerce (FR5.2)
+Spec: specs/technical.md, `ledger` table
+
+Measures sustained transactions per second of src/ledger/engine.py for a
+range of group-commit batch sizes against an on-disk WAL database.
+
+Usage:
+    python -m benchmarks.ledger_throughput --transactions 50000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from src.ledger.engine import Ledger
+
+
+def run(transactions: int, batch_size: int, souls: int = 1000) -> Dict[str, Any]:
+    """Submit `transactions` transfers and return throughput figures."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = Ledger(os.path.join(tmp, "ledger.db"), batch_size=batch_size)
+
+        start = time.perf_counter()
+        for i in range(transactions):
+            ledger.submit({
+                "from_soul_id": f"agent-{i % souls}",
+                "to_soul_id": f"agent-{(i * 7 + 1) % souls}",
+                "amount": 1.25,
+                "purpose": "benchmark"
+            })
+        ledger.flush()
+        elapsed = time.perf_counter() - start
+
+        lookups = 100_000
+        lookup_start = time.perf_counter()
+        for i in range(lookups):
+            ledger.get_balance(f"agent-{i % souls}")
+        lookup_elapsed = time.perf_counter() - lookup_start
+
+        ledger.close()
+
+    return {
+        "batch_size": batch_size,
+        "transactions": transactions,
+        "tx_per_second": round(transactions / elapsed),
+        "balance_lookup_us": round(lookup_elapsed / lookups * 1e6, 3)
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 1024])
+    args = parser.parse_args(argv)
+
+    print(f"{'batch':>6} {'tx/s':>10} {'lookup us':>10}")
+    for batch_size in args.batch_sizes:
+        # Unbatched commits are slow; keep that run short
+        count = min(args.transactions, 5_000) if batch_size == 1 else args.transactions
+        result = run(count, batch_size)
+        print(f"{result['batch_size']:>6} {result['tx_per_second']:>10} {result['balance_lookup_us']:>10}")
+
+
+if __name__ == "__main__":
+    main()
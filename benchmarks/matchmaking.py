@@ -0,0 +1,96 @@
+"""
+Matchmaking Benchmark
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration, NFR 3.0
+Spec: specs/openclaw_integration.md, §3.3 Campaign Manifest, §3.10 POST /marketplace/bid
+
+Builds a synthetic market of N campaigns and N agents, solves it with
+src.openclaw.matchmaking.Matchmaker and compares the total score with the
+per-campaign greedy baseline. It then times an incremental re-solve after
+a batch of new bids and reports how many of the bid-on campaigns it had
+to defer to the next full solve.
+
+Usage:
+    python -m benchmarks.matchmaking --campaigns 2000 --agents 2000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, Any, List
+
+from src.openclaw.matchmaking import Matchmaker, greedy_match
+
+SKILLS = [f"skill_{i}" for i in range(12)]
+
+
+def _campaign(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "campaign_id": f"campaign-{i}",
+        "required_skills": rng.sample(SKILLS, rng.randint(1, 3)),
+        "budget_limit_usd": rng.uniform(100, 500),
+        "estimated_hours": rng.uniform(2, 8)
+    }
+
+
+def _ad(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "soul_id": f"chimera:agent:{i}",
+        "skills": rng.sample(SKILLS, rng.randint(2, 8)),
+        "availability": {"status": "AVAILABLE", "capacity_percent": rng.randint(0, 100)},
+        "pricing": {"base_rate_per_hour": rng.uniform(5, 60), "campaign_setup_fee": rng.uniform(0, 50)},
+        "reputation": {"score": rng.uniform(1, 5)}
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--bids", type=int, default=100)
+    parser.add_argument("--min-skill-fit", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    mm = Matchmaker(min_skill_fit=args.min_skill_fit)
+    start = time.perf_counter()
+    mm.add_campaigns(_campaign(rng, i) for i in range(args.campaigns))
+    mm.add_agents(_ad(rng, i) for i in range(args.agents))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = mm.solve()
+    solve_s = time.perf_counter() - start
+    solve_rounds = mm.rounds
+
+    start = time.perf_counter()
+    greedy = greedy_match(mm)
+    greedy_s = time.perf_counter() - start
+    greedy_total = sum(mm.score(c, s) for c, s in greedy.items())
+
+    bids = [{"campaign_id": f"campaign-{rng.randrange(args.campaigns)}",
+             "soul_id": f"chimera:agent:{rng.randrange(args.agents)}",
+             "price_usd": rng.uniform(5, 100)} for _ in range(args.bids)]
+    mm.add_bids(bids)
+    start = time.perf_counter()
+    mm.solve()
+    resolve_s = time.perf_counter() - start
+
+    print(json.dumps({
+        "campaigns": args.campaigns,
+        "agents": args.agents,
+        "build_s": round(build_s, 2),
+        "auction": {"solve_s": round(solve_s, 2), "rounds": solve_rounds, "matched": len(matched),
+                    "total_score": round(sum(m["score"] for m in matched.values()), 3)},
+        "greedy": {"solve_s": round(greedy_s, 2), "matched": len(greedy), "total_score": round(greedy_total, 3)},
+        "incremental": {"bids": args.bids, "solve_s": round(resolve_s, 3), "rounds": mm.rounds,
+                        "deferred": len(mm.deferred)}
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
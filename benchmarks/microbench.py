@@ -0,0 +1,314 @@
+"""
+Microbenchmark Suite
+
+SRS Reference: NFR 3.0 (Performance & Observability)
+Spec: specs/technical.md, Agent Task Schema; skills/*/README.md
+
+Times every hot function in isolation: schema validation, planning, each
+skill's execute_skill, telemetry.emit and worker.run. Each benchmark is
+warmed up, calibrated so one sample lasts at least `min_sample_time`, then
+sampled repeatedly. A run can be saved as a baseline; later runs are compared
+against it with a Mann-Whitney U test, so a function only counts as regressed
+when its median slowed by more than the threshold AND the slowdown is
+statistically significant.
+
+Usage:
+    python -m benchmarks.microbench --save-baseline benchmarks/microbench_baseline.json
+    python -m benchmarks.microbench --baseline benchmarks/microbench_baseline.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Callable, Optional, Tuple, Union
+
+SCHEMA_VERSION = 1
+
+# A factory returns the function to time, or (function, cleanup) when the
+# benchmark changes shared state that must be restored afterwards
+Factory = Callable[[], Union[Callable[[], Any], Tuple[Callable[[], Any], Callable[[], None]]]]
+
+
+def _campaign_manifest() -> Dict[str, Any]:
+    from benchmarks.campaign_simulation import generate_manifests
+    return generate_manifests(1)[0]
+
+
+def _planned_tasks() -> List[Dict[str, Any]]:
+    from src.planner.engine import CampaignPlanner
+    return CampaignPlanner().plan_campaign(_campaign_manifest())
+
+
+def _bench_validate_task_manifest():
+    from src.schemas.agent_task import validate_task_manifest
+    task = _planned_tasks()[1]
+    return lambda: validate_task_manifest(task)
+
+
+def _bench_validate_task_result():
+    from src.schemas.agent_task import validate_task_result
+    result = {
+        "task_id": "task-1", "worker_soul_id": "chimera:agent:bench", "status": "SUCCESS",
+        "completed_at": datetime.now(timezone.utc).isoformat(), "confidence": 0.9,
+        "output": {"content": "hello"}, "proof": {"prompt_hash": "sha256:mock"}
+    }
+    return lambda: validate_task_result(result)
+
+
+def _bench_plan_campaign():
+    from src.planner.engine import CampaignPlanner
+    planner = CampaignPlanner()
+    manifest = _campaign_manifest()
+    return lambda: planner.plan_campaign(manifest)
+
+
+def _bench_fetch_trends():
+    from skills.skill_fetch_trends.skill import execute_skill
+    data = {"platform": "twitter", "category": "tech", "region": "US", "limit": 10}
+    return lambda: execute_skill(data)
+
+
+def _bench_generate_content():
+    from skills.skill_generate_content.skill import execute_skill
+    data = {"soul_id": "chimera:agent:bench", "content_type": "post",
+            "prompt": "Create a post about AI trends", "context_ids": ["citation:1"]}
+    return lambda: execute_skill(data)
+
+
+def _bench_publish_post():
+    from skills.skill_publish_post.skill import execute_skill
+    data = {"platform": "twitter", "content": "Test post",
+            "provenance": {"soul_id": "chimera:agent:bench", "confidence": 0.9}}
+    return lambda: execute_skill(data)
+
+
+def _bench_check_wallet_balance():
+    from skills.skill_check_wallet_balance.skill import execute_skill
+    data = {"soul_id": "chimera:agent:bench", "include_pending": True}
+    return lambda: execute_skill(data)
+
+
+def _bench_validate_image():
+    from PIL import Image
+    from skills.skill_validate_image import skill
+    from skills.skill_validate_image.pipeline import ImageValidationPipeline
+
+    tmpdir = tempfile.mkdtemp(prefix="chimera-bench-")
+    path = os.path.join(tmpdir, "creative.png")
+    Image.new("RGB", (256, 256), (255, 87, 51)).save(path)
+    previous = skill._pipeline
+    pipeline = ImageValidationPipeline(workers=0)
+    skill.set_pipeline(pipeline)
+    data = {"image_url": f"file://{path}", "brand_guidelines": {"allowed_colors": ["#FF5733"]}}
+
+    def cleanup():
+        skill.set_pipeline(previous)
+        pipeline.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return (lambda: skill.execute_skill(data)), cleanup
+
+
+def _bench_telemetry_emit():
+    from task1 import telemetry
+    payload = {"task_id": "task-1", "duration_ms": 3}
+    return lambda: telemetry.emit("task1.completed", payload)
+
+
+def _bench_worker_run():
+    from task1.worker import run
+    request = {"id": "task-1", "payload": {"content": "hello", "confidence": 0.9}}
+    return lambda: run(request)
+
+
+BENCHMARKS: Dict[str, Factory] = {
+    "schemas.validate_task_manifest": _bench_validate_task_manifest,
+    "schemas.validate_task_result": _bench_validate_task_result,
+    "planner.plan_campaign": _bench_plan_campaign,
+    "skill.fetch_trends": _bench_fetch_trends,
+    "skill.generate_content": _bench_generate_content,
+    "skill.publish_post": _bench_publish_post,
+    "skill.check_wallet_balance": _bench_check_wallet_balance,
+    "skill.validate_image": _bench_validate_image,
+    "telemetry.emit": _bench_telemetry_emit,
+    "worker.run": _bench_worker_run,
+}
+
+
+def measure(fn: Callable[[], Any], samples: int = 15, min_sample_time: float = 0.02,
+            warmup_time: float = 0.05) -> Dict[str, Any]:
+    """
+    Time `fn` and return per-call statistics in microseconds.
+
+    The loop count per sample is calibrated so each sample runs for at least
+    `min_sample_time`, which keeps timer resolution out of the result.
+    """
+    from task1 import telemetry
+
+    deadline = time.perf_counter() + warmup_time
+    while time.perf_counter() < deadline:
+        fn()
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_sample_time:
+            break
+        loops *= 2
+
+    per_call: List[float] = []
+    for _ in range(samples):
+        # The telemetry shim keeps every event; empty it outside the timed region
+        telemetry.clear()
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops * 1e6)
+    telemetry.clear()
+
+    return {
+        "loops": loops,
+        "samples_us": [round(v, 4) for v in per_call],
+        "median_us": round(statistics.median(per_call), 4),
+        "min_us": round(min(per_call), 4),
+        "stdev_us": round(statistics.stdev(per_call), 4) if len(per_call) > 1 else 0.0
+    }
+
+
+def mann_whitney_p(a: List[float], b: List[float]) -> float:
+    """
+    One-sided p-value that samples `b` tend to be larger than samples `a`.
+
+    Mann-Whitney U with the normal approximation and tie correction; adequate
+    for the 10+ samples per side this suite collects.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 1.0
+
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+
+    rank_sum_b = sum(r for r, (_, side) in zip(ranks, combined) if side == 1)
+    u_b = rank_sum_b - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_b - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def run_suite(names: Optional[List[str]] = None, samples: int = 15,
+              min_sample_time: float = 0.02) -> Dict[str, Any]:
+    """Run the selected benchmarks (all by default) and return a report."""
+    results = {}
+    for name in names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark: {name}")
+        bench = BENCHMARKS[name]()
+        fn, cleanup = bench if isinstance(bench, tuple) else (bench, None)
+        try:
+            results[name] = measure(fn, samples=samples, min_sample_time=min_sample_time)
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "machine": platform.machine()},
+        "benchmarks": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = 0.5, alpha: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    Return the benchmarks that regressed against `baseline`.
+
+    A benchmark regresses when its median grew by more than `threshold`
+    (a fraction) and the Mann-Whitney p-value is below `alpha`.
+    """
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        ratio = result["median_us"] / base["median_us"] if base["median_us"] else 1.0
+        p_value = mann_whitney_p(base["samples_us"], result["samples_us"])
+        if ratio > 1 + threshold and p_value < alpha:
+            regressions.append({
+                "name": name,
+                "baseline_us": base["median_us"],
+                "current_us": result["median_us"],
+                "ratio": round(ratio, 3),
+                "p_value": p_value
+            })
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--min-sample-time", type=float, default=0.02)
+    parser.add_argument("--baseline", help="Compare against this report; exit 1 on regression")
+    parser.add_argument("--save-baseline", help="Write this run's report here")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--alpha", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.names, samples=args.samples, min_sample_time=args.min_sample_time)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'benchmark':<34} {'median us':>12} {'stdev us':>10} {'baseline us':>12}")
+    for name, result in report["benchmarks"].items():
+        base = baseline["benchmarks"].get(name, {}).get("median_us", "-") if baseline else "-"
+        print(f"{name:<34} {result['median_us']:>12} {result['stdev_us']:>10} {base:>12}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        if baseline is None:
+            # A missing baseline must not pass the gate silently
+            print(f"ERROR: no baseline at {args.baseline}; run `make bench-baseline` first", file=sys.stderr)
+            return 2
+        regressions = compare(report, baseline, args.threshold, args.alpha)
+        for r in regressions:
+            print(f"REGRESSION: {r['name']} {r['baseline_us']}us -> {r['current_us']}us "
+                  f"(x{r['ratio']}, p={r['p_value']:.2g})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""
+Reconciliation Benchmark
+
+SRS Reference: §4.5 Commerce (FR5.1, FR5.2), NFR 3.0
+Spec: notebook/analysis_eda.ipynb, §3 Joining the Datasets
+
+Writes synthetic finance_payments and delivery_events CSVs with N orders.
+A share of orders are undelivered, unpaid or delivered late, and some
+deliveries have extra in-transit events. The files are then reconciled with
+src.reconciliation.engine.reconcile, and the benchmark reports the
+throughput and the summary.
+
+Usage:
+    python -m benchmarks.reconciliation --orders 5000000 --partitions 64
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from src.reconciliation.engine import ReconciliationRules, reconcile
+
+START = np.datetime64("2026-01-01T00:00:00")
+
+
+def write_inputs(directory: str, orders: int, chunk: int = 1_000_000, seed: int = 0) -> tuple:
+    """Write payments.csv and deliveries.csv under `directory`. Returns their paths."""
+    rng = np.random.default_rng(seed)
+    payments_path = os.path.join(directory, "payments.csv")
+    deliveries_path = os.path.join(directory, "deliveries.csv")
+    for start in range(0, orders, chunk):
+        n = min(chunk, orders - start)
+        ids = np.arange(start, start + n)
+        order_id = np.char.add("O", ids.astype(str))
+        package_id = np.char.add("P", ids.astype(str))
+        paid_at = START + rng.integers(0, 90 * 86400, n).astype("timedelta64[s]")
+        lag = rng.choice([0, 0, 0, 0, 1, 2, 5, 9], n).astype("timedelta64[D]")
+        delivered_at = paid_at + lag + rng.integers(0, 8 * 3600, n).astype("timedelta64[s]")
+        # Payments carry local business time; delivery events are logged in UTC
+        delivered_at = delivered_at - np.timedelta64(3, "h")
+
+        paid = rng.random(n) > 0.01
+        delivered = rng.random(n) > 0.02
+        pd.DataFrame({"order_id": order_id[paid], "package_id": package_id[paid],
+                      "payment_date": paid_at[paid], "amount": rng.integers(100, 2000, n)[paid],
+                      "currency": "ETB", "payment_status": "PAID"}).to_csv(
+            payments_path, mode="a", header=start == 0, index=False)
+        transit = delivered & (rng.random(n) < 0.2)
+        events = pd.concat([
+            pd.DataFrame({"order_id": order_id[delivered], "package_id": package_id[delivered],
+                          "event_time": delivered_at[delivered], "status": "DELIVERED"}),
+            pd.DataFrame({"order_id": order_id[transit], "package_id": package_id[transit],
+                          "event_time": paid_at[transit], "status": "IN_TRANSIT"})])
+        events.to_csv(deliveries_path, mode="a", header=start == 0, index=False)
+    return payments_path, deliveries_path
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=64)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="reconcile-bench-") as directory:
+        start = time.perf_counter()
+        payments, deliveries = write_inputs(directory, args.orders, seed=args.seed)
+        generate_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        # The synthetic delivery feed logs naive UTC times
+        summary = reconcile(payments, deliveries, os.path.join(directory, "reports"),
+                            ReconciliationRules(source_timezone="UTC"), partitions=args.partitions,
+                            chunksize=args.chunksize, workers=args.workers)
+        reconcile_s = time.perf_counter() - start
+
+    summary.pop("reports")
+    rows = summary["payments"] + summary["deliveries"]
+    print(json.dumps({"orders": args.orders, "generate_s": round(generate_s, 2),
+                      "reconcile_s": round(reconcile_s, 2), "rows_per_s": int(rows / reconcile_s),
+                      "summary": summary}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Worker Runtime Scaling Benchmark
+
+SRS Reference: §3.1 FastRender Swarm (Worker), NFR 3.0
+Spec: skills/README.md
+
+Runs a synthetic mixed workload through src.worker.runtime.WorkerRuntime at
+increasing core counts. The workload combines IO-bound tasks (a fixed sleep)
+with CPU-bound tasks (a SHA-256 chain). For each core count, the benchmark
+reports throughput and scaling efficiency relative to one core. Efficiency
+near 1.0 means linear scaling. Core counts above os.cpu_count() cannot scale
+the CPU share, so expect efficiency to fall past the host's core count.
+
+Usage:
+    python -m benchmarks.runtime_scaling --cores 1 2 4 8 16 --tasks 2000 --output scaling.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List
+
+from src.worker.runtime import WorkerRuntime
+
+SCHEMA_VERSION = 1
+
+
+def cpu_task(payload: Dict[str, Any]) -> str:
+    digest = b""
+    for _ in range(payload["rounds"]):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()
+
+
+def io_task(payload: Dict[str, Any]) -> None:
+    time.sleep(payload["sleep"])
+
+
+def workload(tasks: int, cpu_fraction: float, rounds: int, sleep: float) -> List[Dict[str, Any]]:
+    """Interleave CPU and IO requests so every `1 / cpu_fraction`-th one is CPU-bound."""
+    every = max(1, round(1 / cpu_fraction)) if cpu_fraction else 0
+    return [
+        {"id": f"task-{i}", "skill": "cpu", "payload": {"rounds": rounds}}
+        if every and i % every == 0 else
+        {"id": f"task-{i}", "skill": "io", "payload": {"sleep": sleep}}
+        for i in range(tasks)
+    ]
+
+
+def run_point(cores: int, requests: List[Dict[str, Any]], max_in_flight: int) -> Dict[str, Any]:
+    with WorkerRuntime(cores=cores, io_threads=cores * max_in_flight, max_in_flight=max_in_flight) as runtime:
+        runtime.register("cpu", cpu_task, cpu_bound=True)
+        runtime.register("io", io_task)
+        # Warm the process pool so worker start-up is not timed
+        runtime.run_batch([r for r in requests if r["skill"] == "cpu"][:cores])
+
+        start = time.perf_counter()
+        results = runtime.run_batch(requests)
+        elapsed = time.perf_counter() - start
+        stolen = sum(s["stolen"] for s in runtime.stats())
+
+    errors = sum(1 for r in results if r["status"] != "ok")
+    return {"cores": cores, "elapsed_s": round(elapsed, 4), "tasks_per_s": round(len(requests) / elapsed, 2),
+            "stolen": stolen, "errors": errors}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cores", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--cpu-fraction", type=float, default=0.25)
+    parser.add_argument("--rounds", type=int, default=2000, help="SHA-256 rounds per CPU task")
+    parser.add_argument("--sleep", type=float, default=0.005, help="Seconds per IO task")
+    parser.add_argument("--max-in-flight", type=int, default=32)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    requests = workload(args.tasks, args.cpu_fraction, args.rounds, args.sleep)
+    points = [run_point(cores, requests, args.max_in_flight) for cores in args.cores]
+    base = points[0]["tasks_per_s"] / points[0]["cores"]
+    for point in points:
+        point["efficiency"] = round(point["tasks_per_s"] / (base * point["cores"]), 3)
+
+    report = {
+        "schema_version": SCHEMA_VERSION,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "cpu_count": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "points": points
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"{'cores':>6} {'tasks/s':>10} {'efficiency':>11} {'stolen':>8}")
+    for point in points:
+        print(f"{point['cores']:>6} {point['tasks_per_s']:>10} {point['efficiency']:>11} {point['stolen']:>8}")
+    return 1 if any(p["errors"] for p in points) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
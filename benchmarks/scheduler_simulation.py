@@ -0,0 +1,144 @@
+"""
+Scheduler Simulation
+
+SRS Reference: §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/technical.md, Agent Task Schema (campaign_id, priority, timeout_seconds)
+
+Discrete-event simulation of a worker pool under skewed load. One large
+campaign submits HIGH tasks at close to the pool's full capacity, while
+several small campaigns submit NORMAL and LOW tasks. Together they slightly
+overload the pool. The same arrivals are run against the strict-tier
+LeaseStore and against src.orchestrator.scheduler.FairLeaseStore, and the
+report gives p50/p99 queue wait and deadline misses per campaign.
+
+Usage:
+    python -m benchmarks.scheduler_simulation --workers 16 --duration 3600
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+from typing import Dict, Any, List, Tuple
+
+from src.orchestrator.lifecycle import LeaseStore
+from src.orchestrator.scheduler import FairLeaseStore, FairQueue
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+def generate_arrivals(workers: int, duration: float, small_campaigns: int = 8, big_load: float = 0.95,
+                      small_load: float = 0.15, service_s: float = 1.0, timeout_seconds: int = 600,
+                      seed: int = 0) -> List[Tuple[float, Dict[str, Any]]]:
+    """
+    Poisson arrivals as (time, task) pairs sorted by time.
+
+    `big_load` and `small_load` are fractions of the pool's capacity
+    (workers / service_s tasks per second).
+    """
+    rng = random.Random(seed)
+    capacity = workers / service_s
+    streams = [("campaign-big", big_load * capacity, ["HIGH"])]
+    streams += [(f"campaign-small-{i}", small_load * capacity / small_campaigns, ["NORMAL", "LOW"])
+                for i in range(small_campaigns)]
+    arrivals = []
+    for campaign_id, rate, priorities in streams:
+        t = rng.expovariate(rate)
+        n = 0
+        while t < duration:
+            arrivals.append((t, {"task_id": f"{campaign_id}:{n}", "campaign_id": campaign_id,
+                                 "priority": rng.choice(priorities), "timeout_seconds": timeout_seconds}))
+            n += 1
+            t += rng.expovariate(rate)
+    arrivals.sort(key=lambda a: a[0])
+    return arrivals
+
+
+def simulate(store: LeaseStore, arrivals: List[Tuple[float, Dict[str, Any]]], workers: int,
+             service_s: float = 1.0, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Run arrivals through `store` with `workers` exponential-service workers.
+
+    Returns:
+        campaign_id -> {"served", "queued", "p50_wait_s", "p99_wait_s", "deadline_misses"}.
+        Tasks still queued at the end count with their wait so far.
+    """
+    rng = random.Random(seed)
+    fair = isinstance(store, FairLeaseStore)
+    tasks = {task["task_id"]: (t, task) for t, task in arrivals}
+    waits: Dict[str, List[float]] = {}
+    misses: Dict[str, int] = {}
+    completions: List[Tuple[float, str, str]] = []
+    idle = [f"worker-{i}" for i in range(workers)]
+    now = 0.0
+
+    def dispatch():
+        while idle:
+            task_id = store.claim(idle[-1], now, lease_ttl=float("inf"))
+            if task_id is None:
+                return
+            soul_id = idle.pop()
+            arrival, task = tasks.pop(task_id)
+            campaign_id = task["campaign_id"]
+            waits.setdefault(campaign_id, []).append(now - arrival)
+            if now - arrival > task["timeout_seconds"]:
+                misses[campaign_id] = misses.get(campaign_id, 0) + 1
+            heapq.heappush(completions, (now + rng.expovariate(1.0 / service_s), soul_id, task_id))
+
+    for arrival, task in arrivals:
+        while completions and completions[0][0] <= arrival:
+            now, soul_id, task_id = heapq.heappop(completions)
+            store.release([task_id])
+            idle.append(soul_id)
+            dispatch()
+        now = arrival
+        if fair:
+            store.enqueue_task(task, now=now)
+        else:
+            store.enqueue(task["task_id"], task["priority"])
+        dispatch()
+
+    report = {}
+    for campaign_id in sorted({task["campaign_id"] for _, task in arrivals}):
+        left = [now - t for t, task in tasks.values() if task["campaign_id"] == campaign_id]
+        all_waits = waits.get(campaign_id, []) + left
+        report[campaign_id] = {
+            "served": len(waits.get(campaign_id, [])),
+            "queued": len(left),
+            "p50_wait_s": round(_percentile(all_waits, 50), 2),
+            "p99_wait_s": round(_percentile(all_waits, 99), 2),
+            "deadline_misses": misses.get(campaign_id, 0) + sum(
+                1 for t, task in tasks.values() if task["campaign_id"] == campaign_id
+                and now - t > task["timeout_seconds"])
+        }
+    return report
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=3600.0, help="Simulated seconds of arrivals")
+    parser.add_argument("--small-campaigns", type=int, default=8)
+    parser.add_argument("--big-load", type=float, default=0.95)
+    parser.add_argument("--small-load", type=float, default=0.15)
+    parser.add_argument("--aging", type=float, default=60.0, help="FairQueue aging_seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    arrivals = generate_arrivals(args.workers, args.duration, args.small_campaigns, args.big_load,
+                                 args.small_load, seed=args.seed)
+    results = {
+        "strict_tiers": simulate(LeaseStore(), arrivals, args.workers, seed=args.seed),
+        "fair": simulate(FairLeaseStore(FairQueue(aging_seconds=args.aging)), arrivals, args.workers,
+                         seed=args.seed)
+    }
+    print(json.dumps({"workers": args.workers, "tasks": len(arrivals), "policies": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
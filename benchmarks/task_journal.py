@@ -0,0 +1,101 @@
+"""
+Task Journal Benchmark
+
+SRS Reference: §4.6 Orchestration (FR6.1, FR6.2), NFR 3.0
+Spec: specs/planner_service.md, Task DAG
+
+Journals N in-flight tasks as planner-shaped campaigns (fetch -> generate ->
+publish). It claims and completes a share of them, takes a snapshot and
+appends a tail of further records. It then abandons the journal without
+closing it, as a crash would, and times recovery from the snapshot plus the
+tail. It also reports submit throughput with group commit and the fsyncs
+that took.
+
+Usage:
+    python -m benchmarks.task_journal --tasks 1000000 --tail 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List
+
+from src.orchestrator.journal import TaskJournal
+
+
+def campaign(i: int) -> List[Dict[str, Any]]:
+    """One planner-shaped three-task DAG."""
+    campaign_id = f"camp-{i:08d}"
+    ids = [f"{campaign_id}-{step}" for step in ("fetch", "gen", "pub")]
+    base = {"campaign_id": campaign_id, "created_at": "2026-01-01T00:00:00.000Z",
+            "planner_soul_id": "planner-001", "timeout_seconds": 300}
+    return [
+        dict(base, task_id=ids[0], task_type="analytics_fetch", priority="HIGH", dependencies=[],
+             payload={"platform": "twitter", "category": "Fashion", "region": "US"}),
+        dict(base, task_id=ids[1], task_type="content_generation", priority="NORMAL", dependencies=[ids[0]],
+             payload={"prompt": f"Create content for campaign {i}", "content_type": "post", "context_ids": [ids[0]]}),
+        dict(base, task_id=ids[2], task_type="social_publish", priority="NORMAL", dependencies=[ids[1]],
+             payload={"platform": "twitter", "provenance": {"campaign_id": campaign_id, "generator_task_id": ids[1]}}),
+    ]
+
+
+def _result(task_id: str) -> Dict[str, Any]:
+    return {"task_id": task_id, "worker_soul_id": "worker-1", "status": "SUCCESS",
+            "completed_at": "2026-01-01T00:00:01.000Z", "confidence": 0.9, "output": {"ok": True}}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--tail", type=int, default=50_000, help="Records appended after the snapshot")
+    parser.add_argument("--batch", type=int, default=1000, help="Campaigns per submit (one commit)")
+    parser.add_argument("--finished", type=float, default=0.2, help="Share of fetch tasks completed")
+    args = parser.parse_args(argv)
+
+    campaigns = args.tasks // 3
+    with tempfile.TemporaryDirectory(prefix="journal-bench-") as directory:
+        journal = TaskJournal(directory, snapshot_every=0)
+        start = time.perf_counter()
+        for first in range(0, campaigns, args.batch):
+            journal.submit([t for i in range(first, min(campaigns, first + args.batch)) for t in campaign(i)])
+        submit_s = time.perf_counter() - start
+
+        for _ in range(int(campaigns * args.finished)):
+            task = journal.claim("worker-1")
+            journal.complete(_result(task["task_id"]))
+        for _ in range(int(campaigns * args.finished)):
+            journal.claim("worker-2")
+
+        start = time.perf_counter()
+        journal.snapshot()
+        snapshot_s = time.perf_counter() - start
+        snapshot_mb = os.path.getsize(os.path.join(directory, "snapshot.bin")) / 1e6
+
+        # Tail: half new campaigns, half claims
+        for i in range(campaigns, campaigns + args.tail // 6):
+            journal.submit(campaign(i))
+        for _ in range(args.tail // 2):
+            journal.claim("worker-3")
+        syncs = journal.syncs
+        # Crash: the journal is dropped without close()
+
+        start = time.perf_counter()
+        recovered = TaskJournal(directory, snapshot_every=0)
+        recover_s = time.perf_counter() - start
+        counts = recovered.counts()
+        recovered.close()
+        journal.close()
+
+    print(json.dumps({"tasks": len(recovered), "submit_s": round(submit_s, 2),
+                      "submit_tasks_per_s": int(campaigns * 3 / submit_s), "fsyncs": syncs,
+                      "snapshot_s": round(snapshot_s, 2), "snapshot_mb": round(snapshot_mb, 1),
+                      "recover_s": round(recover_s, 2), "recovery": recovered.recovery, "counts": counts},
+                     indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
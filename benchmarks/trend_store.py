@@ -0,0 +1,101 @@
+"""
+Trend Store Benchmark
+
+SRS Reference: §4.2 Perception (FR2.2), NFR 3.0
+Spec: skills/skill_fetch_trends/README.md, Output Schema
+
+Backfills a TrendStore with synthetic fetch_trends history: every platform
+and region is polled every `--interval` minutes for `--days` days, and each
+poll returns `--limit` topics drawn from a Zipf-like vocabulary. It then
+times the month-scale momentum queries (rising topics, volume deltas,
+sentiment EMA) for one (platform, region), and the flush and reload of
+the column files.
+
+Usage:
+    python -m benchmarks.trend_store --days 90 --interval 5 --limit 50
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from src.trends.store import TrendStore
+
+PLATFORMS = ("twitter", "instagram", "tiktok", "reddit")
+REGIONS = ("US", "EU", "ASIA", "GLOBAL")
+START = np.datetime64("2026-01-01T00:00:00", "ms")
+
+
+def backfill(store: TrendStore, days: int, interval_min: int, limit: int, vocabulary: int, seed: int = 0) -> int:
+    """Append the synthetic history one day per (platform, region) at a time. Returns rows written."""
+    rng = np.random.default_rng(seed)
+    topics = np.array([f"#topic{i}" for i in range(vocabulary)], dtype=object)
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+    polls = 24 * 60 // interval_min
+    rows = 0
+    for platform in PLATFORMS:
+        for region in REGIONS:
+            for day in range(days):
+                n = polls * limit
+                ts = START + np.timedelta64(day, "D") + np.repeat(
+                    np.arange(polls) * interval_min * 60_000, limit).astype("timedelta64[ms]")
+                picked = rng.choice(vocabulary, n, p=weights)
+                rows += store.append(platform, region, topics[picked], rng.integers(100, 100_000, n),
+                                     rng.uniform(-1, 1, n), ts)
+    return rows
+
+
+def _time(fn, repeat: int = 20) -> float:
+    """Best of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--interval", type=int, default=5, help="Minutes between polls")
+    parser.add_argument("--limit", type=int, default=50, help="Topics per poll")
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="trend-bench-") as directory:
+        store = TrendStore(directory)
+        start = time.perf_counter()
+        rows = backfill(store, args.days, args.interval, args.limit, args.vocabulary)
+        ingest_s = time.perf_counter() - start
+
+        month = store.scan("tiktok", "US", store.last_day("tiktok", "US"), np.datetime64(
+            store.last_day("tiktok", "US")) + 1)
+        query_ms = {
+            "rising_topics_30d": _time(lambda: store.rising_topics("tiktok", "US", days=30, recent_days=7)),
+            "volume_deltas_7d": _time(lambda: store.volume_deltas("tiktok", "US", days=7)),
+            "sentiment_ema_30d": _time(lambda: store.sentiment_ema("tiktok", "US", days=30)),
+        }
+
+        start = time.perf_counter()
+        store.flush()
+        flush_s = time.perf_counter() - start
+        start = time.perf_counter()
+        reloaded = TrendStore(directory)
+        reload_s = time.perf_counter() - start
+
+    print(json.dumps({"rows": rows, "rows_per_partition": len(month["topic"]), "partitions": len(store.partitions()),
+                      "ingest_rows_per_s": int(rows / ingest_s), "query_ms": query_ms,
+                      "flush_s": round(flush_s, 2), "reload_s": round(reload_s, 2), "reloaded_rows": reloaded.rows},
+                     indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
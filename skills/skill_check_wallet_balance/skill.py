@@ -7,8 +7,12 @@ Spec: research/tooling_strategy.md, Skill 4
 Status: Implementation
 """
 
-from typing import Dict, Any
-import jsonschema
+import os
+from typing import Dict, Any, Optional
+from skills import validation
+
+from src.ledger.engine import Ledger
+from src.ratelimit.controller import get_controller
 
 # Input Schema from tooling_strategy.md
 INPUT_SCHEMA = {
@@ -20,16 +24,43 @@ INPUT_SCHEMA = {
     }
 }
 
+validate_input = validation.register("check_wallet_balance", INPUT_SCHEMA)
+
+# Routing hint for src/worker/runtime.py: IO-bound, kept off the process pool
+CPU_BOUND = False
+
+# Shared ledger; CHIMERA_LEDGER_PATH points it at a persistent SQLite file
+_ledger: Optional[Ledger] = None
+
+
+def get_ledger() -> Ledger:
+    """Return the ledger backing this skill, opening it on first use."""
+    global _ledger
+    if _ledger is None:
+        _ledger = Ledger(os.environ.get("CHIMERA_LEDGER_PATH", ":memory:"))
+    return _ledger
+
+
+def set_ledger(ledger: Optional[Ledger]) -> None:
+    """Point the skill at a specific ledger (None resets to the default)."""
+    global _ledger
+    _ledger = ledger
+
+
 def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Execute check_wallet_balance skill."""
-    try:
-        jsonschema.validate(instance=input_data, schema=INPUT_SCHEMA)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Invalid input: {e.message}")
+    input_data = validate_input(input_data)
+    # Ledger reads go to the shared database; admitted by the shared rate-limit controller
+    return get_controller().call("check_wallet_balance:ledger", _read_balance, input_data)
+
+
+def _read_balance(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    ledger = get_ledger()
+    soul_id = input_data["soul_id"]
 
     return {
-        "balance": 100.00,
+        "balance": ledger.get_balance(soul_id),
         "currency": "USD",
-        "pending_balance": 0.00,
-        "recent_transactions": []
+        "pending_balance": ledger.get_pending_balance(soul_id) if input_data.get("include_pending") else 0.00,
+        "recent_transactions": ledger.recent_transactions(soul_id)
     }
@@ -8,10 +8,14 @@ Status: Implementation
 """
 
 import json
+import logging
 import os
-from datetime import datetime, timezone
 from typing import Dict, Any, List
-import jsonschema
+from skills import validation
+from src.ids.clock import now_iso
+from src.ratelimit.controller import get_controller
+from src.resilience.breaker import get_resilience
+from src.trends.store import get_trend_store
 
 # Input Schema from README
 INPUT_SCHEMA = {
@@ -40,6 +44,13 @@ INPUT_SCHEMA = {
     }
 }
 
+validate_input = validation.register("fetch_trends", INPUT_SCHEMA)
+
+logger = logging.getLogger(__name__)
+
+# Routing hint for src/worker/runtime.py: IO-bound, kept off the process pool
+CPU_BOUND = False
+
 def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute the fetch_trends skill.
@@ -50,17 +61,29 @@ def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict containing trends list and metadata.
     """
-    # 1. Validate Input
+    # 1. Validate Input (defaults applied)
+    input_data = validate_input(input_data)
+
+    # 2. Outbound call, admitted per platform by the shared rate-limit controller,
+    # then its own breaker and bulkhead, which time and judge only the platform call
+    endpoint = f"fetch_trends:{input_data['platform']}"
+    result = get_controller().call(endpoint, get_resilience().call, endpoint, _fetch, input_data)
+
+    # 3. Queue the observations for momentum queries (src/trends/store.py); the
+    # store decodes them in batches, and a store failure must not lose the result
     try:
-        jsonschema.validate(instance=input_data, schema=INPUT_SCHEMA)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Invalid input: {e.message}")
+        get_trend_store().enqueue(result, region=input_data["region"])
+    except Exception:
+        logger.exception("Trend store rejected fetch_trends result")
+    return result
+
 
-    # 2. Mock Logic (Real implementation would call MCP Gateway)
+def _fetch(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    # Mock Logic (Real implementation would call MCP Gateway)
     # For TDD verification, we return a compliant structure
     
     platform = input_data["platform"]
-    limit = input_data.get("limit", 10)
+    limit = input_data["limit"]
     
     return {
         "trends": [
@@ -68,7 +91,7 @@ def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
                 "topic": f"#{platform}Trend{i}",
                 "volume": 1000 * (10 - i),
                 "sentiment": 0.5,
-                "retrieved_at": datetime.now(timezone.utc).isoformat()
+                "retrieved_at": now_iso()
             }
             for i in range(limit)
         ],
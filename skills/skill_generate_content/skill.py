@@ -8,8 +8,9 @@ Status: Implementation
 """
 
 from typing import Dict, Any, List
-import jsonschema
-from datetime import datetime, timezone
+from skills import validation
+from src.ids.clock import now_iso
+from src.ratelimit.controller import get_controller
 
 # Input Schema from tooling_strategy.md
 INPUT_SCHEMA = {
@@ -27,13 +28,12 @@ INPUT_SCHEMA = {
     }
 }
 
-def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute generate_content skill."""
-    try:
-        jsonschema.validate(instance=input_data, schema=INPUT_SCHEMA)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Invalid input: {e.message}")
+validate_input = validation.register("generate_content", INPUT_SCHEMA)
 
+# Routing hint for src/worker/runtime.py: IO-bound, kept off the process pool
+CPU_BOUND = False
+
+def _generate(input_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "content": f"Generated content for prompt: {input_data['prompt']}",
         "confidence": 0.85,
@@ -42,5 +42,12 @@ def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
             "model_name": "gpt-4-turbo",
             "prompt_hash": "sha256:mock"
         },
-        "generated_at": datetime.now(timezone.utc).isoformat()
+        "generated_at": now_iso()
     }
+
+
+def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute generate_content skill."""
+    input_data = validate_input(input_data)
+    # Outbound LLM call: admitted by the shared rate-limit controller
+    return get_controller().call("generate_content", _generate, input_data)
@@ -8,9 +8,10 @@ Status: Implementation
 """
 
 from typing import Dict, Any
-import jsonschema
-from datetime import datetime, timezone
-import uuid
+from skills import validation
+from src.ids.clock import new_id, now_iso
+from src.ratelimit.controller import get_controller
+from src.resilience.breaker import get_resilience
 
 # Input Schema from tooling_strategy.md
 INPUT_SCHEMA = {
@@ -25,17 +26,25 @@ INPUT_SCHEMA = {
     }
 }
 
-def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute publish_post skill."""
-    try:
-        jsonschema.validate(instance=input_data, schema=INPUT_SCHEMA)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Invalid input: {e.message}")
+validate_input = validation.register("publish_post", INPUT_SCHEMA)
 
+# Routing hint for src/worker/runtime.py: IO-bound, kept off the process pool
+CPU_BOUND = False
+
+def _publish(input_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "post_id": f"{input_data['platform']}:{uuid.uuid4()}",
+        "post_id": f"{input_data['platform']}:{new_id()}",
         "post_url": f"https://{input_data['platform']}.com/post/123",
-        "published_at": datetime.now(timezone.utc).isoformat(),
-        "receipt_id": f"receipt:{uuid.uuid4()}",
+        "published_at": now_iso(),
+        "receipt_id": f"receipt:{new_id()}",
         "status": "SUCCESS"
     }
+
+
+def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute publish_post skill."""
+    input_data = validate_input(input_data)
+    # Outbound platform call: admitted per platform by the shared rate-limit controller,
+    # then its own breaker and bulkhead, which time and judge only the platform call
+    endpoint = f"publish_post:{input_data['platform']}"
+    return get_controller().call(endpoint, get_resilience().call, endpoint, _publish, input_data)
@@ -0,0 +1,348 @@
+"""
+Skill: Validate Image Pipeline
+
+SRS Reference: §4.3 Creative Engine (FR3.2)
+Spec: research/tooling_strategy.md, Skill 5
+
+Download -> thumbnail decode -> perceptual hash -> guideline checks.
+
+Images are streamed to a temporary file in fixed-size chunks, so a large
+creative is never held in memory whole. Decoding and hashing run in a process
+pool and only ever produce a small thumbnail (JPEGs use PIL's draft mode to
+decode at reduced scale). Content verdicts are cached by (perceptual hash,
+brand guidelines hash), and near-duplicate hashes within `max_distance` bits
+reuse the cached verdict instead of being validated again. The perceptual
+hash is taken from a grayscale thumbnail and ignores both size and colour, so
+the size and palette checks run on every image, cached or not.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.ratelimit.controller import HardRateLimit, get_controller
+
+# Shared rate-limit controller endpoint that admits asset downloads
+DOWNLOAD_ENDPOINT = "validate_image:download"
+
+_HASH_SIZE = 8
+_DCT_SIZE = 32
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+def perceptual_hash(gray: np.ndarray) -> int:
+    """
+    64-bit DCT perceptual hash of a 32x32 grayscale array.
+
+    Keeps the 8x8 lowest-frequency DCT coefficients and sets one bit per
+    coefficient above their median.
+    """
+    low = (_DCT @ gray @ _DCT.T)[:_HASH_SIZE, :_HASH_SIZE].flatten()
+    bits = low > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _analyze(path: str, thumbnail_size: int) -> Dict[str, Any]:
+    """Decode to a thumbnail and hash it. Runs in a worker process."""
+    with Image.open(path) as img:
+        width, height = img.size
+        img.draft("RGB", (thumbnail_size * 2, thumbnail_size * 2))
+        thumb = img.convert("RGB")
+    thumb.thumbnail((thumbnail_size, thumbnail_size))
+    gray = np.asarray(thumb.convert("L").resize((_DCT_SIZE, _DCT_SIZE), Image.BILINEAR), dtype=np.float64)
+    return {
+        "phash": perceptual_hash(gray),
+        "width": width,
+        "height": height,
+        "pixels": np.asarray(thumb, dtype=np.uint8).reshape(-1, 3)
+    }
+
+
+def _guidelines_hash(brand_guidelines: Dict[str, Any]) -> str:
+    canonical = json.dumps(brand_guidelines, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    value = color.lstrip("#")
+    if len(value) != 6:
+        raise ValueError(f"Invalid hex color: {color}")
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class VerdictCache:
+    """
+    Verdicts keyed by (phash, guidelines hash) with Hamming-radius lookup.
+
+    Uses multi-index hashing: the 64-bit hash is split into max_distance + 1
+    slices, and by pigeonhole any hash within max_distance bits shares at
+    least one slice exactly with a stored hash. Only those candidates are
+    compared bit by bit. Safe to share between threads.
+    """
+
+    def __init__(self, max_distance: int = 4, max_entries: int = 100_000):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        slices = max_distance + 1
+        bounds = [round(i * 64 / slices) for i in range(slices + 1)]
+        self._slices = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self._verdicts: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[str, int], set]] = [{} for _ in self._slices]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def _parts(self, phash: int) -> List[int]:
+        return [(phash >> lo) & mask for lo, mask in self._slices]
+
+    def get(self, phash: int, guidelines_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._get(phash, guidelines_hash)
+
+    def _get(self, phash: int, guidelines_hash: str) -> Optional[Dict[str, Any]]:
+        exact = self._verdicts.get((phash, guidelines_hash))
+        if exact is not None:
+            return exact
+
+        for bucket, part in zip(self._buckets, self._parts(phash)):
+            for candidate in bucket.get((guidelines_hash, part), ()):
+                if bin(candidate ^ phash).count("1") <= self.max_distance:
+                    return self._verdicts[(candidate, guidelines_hash)]
+        return None
+
+    def put(self, phash: int, guidelines_hash: str, verdict: Dict[str, Any]) -> None:
+        with self._lock:
+            self._put(phash, guidelines_hash, verdict)
+
+    def _put(self, phash: int, guidelines_hash: str, verdict: Dict[str, Any]) -> None:
+        key = (phash, guidelines_hash)
+        if key not in self._verdicts:
+            for bucket, part in zip(self._buckets, self._parts(phash)):
+                bucket.setdefault((guidelines_hash, part), set()).add(phash)
+        self._verdicts[key] = verdict
+
+        if len(self._verdicts) > self.max_entries:
+            (old_hash, old_gh), _ = self._verdicts.popitem(last=False)
+            for bucket, part in zip(self._buckets, self._parts(old_hash)):
+                members = bucket.get((old_gh, part))
+                if members is not None:
+                    members.discard(old_hash)
+                    if not members:
+                        del bucket[(old_gh, part)]
+
+
+class ImageValidationPipeline:
+    """
+    Batch image validator.
+
+    Args:
+        workers: Decode/hash processes; 0 runs them inline in this process.
+        io_workers: Concurrent downloads.
+        chunk_size: Bytes read per download chunk.
+        max_bytes: Downloads larger than this are rejected mid-stream.
+        timeout: Per-request network timeout in seconds.
+        thumbnail_size: Longest side of the decoded thumbnail.
+        max_distance: Hamming radius for reusing a near-duplicate verdict.
+    """
+
+    def __init__(self, workers: Optional[int] = None, io_workers: int = 8, chunk_size: int = 64 * 1024,
+                 max_bytes: int = 20 * 1024 * 1024, timeout: float = 10.0, thumbnail_size: int = 64,
+                 max_distance: int = 4, spool_dir: Optional[str] = None):
+        self.workers = os.cpu_count() if workers is None else workers
+        self.io_workers = io_workers
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.thumbnail_size = thumbnail_size
+        self.spool_dir = spool_dir
+        self.cache = VerdictCache(max_distance=max_distance)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _download(self, url: str) -> str:
+        """
+        Stream `url` to a temporary file and return its path.
+
+        The download holds a permit from the shared rate-limit controller
+        while it runs; an HTTP 429 is reported to it as HardRateLimit.
+        """
+        fd, path = tempfile.mkstemp(prefix="chimera-img-", dir=self.spool_dir)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                get_controller().call(DOWNLOAD_ENDPOINT, self._stream, url, out)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path
+
+    def _stream(self, url: str, out) -> None:
+        try:
+            resp = urllib.request.urlopen(url, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                retry_after = e.headers.get("Retry-After")
+                raise HardRateLimit(f"429 Too Many Requests: {url}",
+                                    float(retry_after) if retry_after and retry_after.isdigit() else None) from e
+            raise
+        with resp:
+            total = 0
+            while True:
+                chunk = resp.read(self.chunk_size)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > self.max_bytes:
+                    raise ValueError(f"Image exceeds {self.max_bytes} bytes")
+                out.write(chunk)
+
+    @staticmethod
+    def _size_violations(analysis: Dict[str, Any], guidelines: Dict[str, Any]) -> List[Dict[str, str]]:
+        min_width = guidelines.get("min_width")
+        min_height = guidelines.get("min_height")
+        if (min_width and analysis["width"] < min_width) or (min_height and analysis["height"] < min_height):
+            return [{
+                "code": "IMAGE_TOO_SMALL",
+                "message": f"Image is {analysis['width']}x{analysis['height']}"
+            }]
+        return []
+
+    @staticmethod
+    def _palette_violations(analysis: Dict[str, Any], guidelines: Dict[str, Any]) -> List[Dict[str, str]]:
+        allowed_colors = guidelines.get("allowed_colors")
+        if not allowed_colors:
+            return []
+        palette = np.asarray([_hex_to_rgb(c) for c in allowed_colors], dtype=np.float32)
+        pixels = analysis["pixels"].astype(np.float32)
+        distances = np.linalg.norm(pixels[:, None, :] - palette[None, :, :], axis=2).min(axis=1)
+        coverage = float(np.mean(distances <= guidelines.get("color_tolerance", 64)))
+        if coverage < guidelines.get("min_palette_coverage", 0.25):
+            return [{
+                "code": "OFF_PALETTE_COLORS",
+                "message": f"Only {coverage:.0%} of pixels match allowed_colors"
+            }]
+        return []
+
+    def _evaluate(self, analysis: Dict[str, Any], guidelines: Dict[str, Any]) -> Dict[str, Any]:
+        """Content checks that depend only on the image's structure (cacheable by phash)."""
+        # prohibited_content needs a vision model; flag for Judge review instead of guessing
+        confidence = 0.75 if guidelines.get("prohibited_content") else 0.95
+        return {"confidence": confidence, "violations": []}
+
+    @staticmethod
+    def _failure(code: str, error: BaseException) -> Dict[str, Any]:
+        return {
+            "is_valid": False,
+            "confidence": 1.0,
+            "violations": [{"code": code, "message": str(error)}],
+            "phash": None,
+            "cache_hit": False
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """The decode pool, started on the first batch with more than one image to decode."""
+        if self.workers and self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def validate_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate many validate_image inputs.
+
+        Args:
+            requests: Dicts with `image_url` and `brand_guidelines`.
+
+        Returns:
+            One result per request with is_valid, confidence, violations,
+            plus `phash` (hex) and `cache_hit`.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        paths: List[Optional[str]] = [None] * len(requests)
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as io:
+            downloads = [io.submit(self._download, r["image_url"]) for r in requests]
+            for i, future in enumerate(downloads):
+                try:
+                    paths[i] = future.result()
+                except Exception as e:
+                    results[i] = self._failure("IMAGE_UNREACHABLE", e)
+
+        try:
+            # A single image decodes inline; starting a pool would cost more than it saves
+            pool = self._get_pool() if sum(p is not None for p in paths) > 1 else None
+            futures = {}
+            if pool is not None:
+                futures = {i: pool.submit(_analyze, path, self.thumbnail_size)
+                           for i, path in enumerate(paths) if path is not None}
+
+            for i, path in enumerate(paths):
+                if path is None:
+                    continue
+                try:
+                    analysis = futures[i].result() if pool else _analyze(path, self.thumbnail_size)
+                except Exception as e:
+                    results[i] = self._failure("IMAGE_UNREADABLE", e)
+                    continue
+
+                guidelines = requests[i]["brand_guidelines"]
+                guidelines_hash = _guidelines_hash(guidelines)
+                phash = analysis["phash"]
+
+                cached = self.cache.get(phash, guidelines_hash)
+                if cached is None:
+                    verdict = self._evaluate(analysis, guidelines)
+                    self.cache.put(phash, guidelines_hash, verdict)
+                else:
+                    verdict = cached
+                violations = (self._size_violations(analysis, guidelines)
+                              + self._palette_violations(analysis, guidelines) + verdict["violations"])
+                results[i] = {
+                    "is_valid": not violations,
+                    "confidence": verdict["confidence"],
+                    "violations": violations,
+                    "phash": f"{phash:016x}",
+                    "cache_hit": cached is not None
+                }
+        finally:
+            for path in paths:
+                if path is not None:
+                    os.unlink(path)
+
+        return results
+
+    def validate(self, image_url: str, brand_guidelines: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a single image. See validate_batch for the result format."""
+        return self.validate_batch([{"image_url": image_url, "brand_guidelines": brand_guidelines}])[0]
+
+    def close(self) -> None:
+        """Shut down the process pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
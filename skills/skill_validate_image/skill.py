@@ -7,8 +7,12 @@ Spec: research/tooling_strategy.md, Skill 5
 Status: Implementation
 """
 
-from typing import Dict, Any
-import jsonschema
+import multiprocessing
+import os
+from typing import Dict, Any, Optional
+from skills import validation
+
+from skills.skill_validate_image.pipeline import ImageValidationPipeline
 
 # Input Schema from tooling_strategy.md
 INPUT_SCHEMA = {
@@ -20,15 +24,48 @@ INPUT_SCHEMA = {
     }
 }
 
+validate_input = validation.register("validate_image", INPUT_SCHEMA)
+
+# Routing hint for src/worker/runtime.py: decoding and hashing are CPU-bound
+CPU_BOUND = True
+
+# Shared pipeline so the verdict cache and process pool outlive single calls
+_pipeline: Optional[ImageValidationPipeline] = None
+# Process that owns _pipeline; a forked child must not reuse the parent's pool
+_pipeline_pid: Optional[int] = None
+
+
+def get_pipeline() -> ImageValidationPipeline:
+    """
+    Return the pipeline backing this skill, creating it on first use.
+
+    Inside a worker process (e.g. the runtime's CPU pool) the pipeline decodes
+    in-process; a nested process pool per child would multiply the process
+    count and keep the parent pool from shutting down.
+    """
+    global _pipeline, _pipeline_pid
+    if _pipeline is None or _pipeline_pid != os.getpid():
+        in_child = multiprocessing.parent_process() is not None
+        _pipeline = ImageValidationPipeline(workers=0 if in_child else None)
+        _pipeline_pid = os.getpid()
+    return _pipeline
+
+
+def set_pipeline(pipeline: Optional[ImageValidationPipeline]) -> None:
+    """Point the skill at a specific pipeline (None resets to the default)."""
+    global _pipeline, _pipeline_pid
+    _pipeline = pipeline
+    _pipeline_pid = os.getpid()
+
+
 def execute_skill(input_data: Dict[str, Any]) -> Dict[str, Any]:
     """Execute validate_image skill."""
-    try:
-        jsonschema.validate(instance=input_data, schema=INPUT_SCHEMA)
-    except jsonschema.ValidationError as e:
-        raise ValueError(f"Invalid input: {e.message}")
+    input_data = validate_input(input_data)
+
+    result = get_pipeline().validate(input_data["image_url"], input_data["brand_guidelines"])
 
     return {
-        "is_valid": True,
-        "confidence": 0.95,
-        "violations": []
+        "is_valid": result["is_valid"],
+        "confidence": result["confidence"],
+        "violations": result["violations"]
     }
@@ -0,0 +1,174 @@
+"""
+Skill Input Validation
+
+SRS Reference: §3.2 MCP Primitives (input sanitization)
+Spec: skills/README.md, Skill Development Guidelines §1 (Input Validation)
+
+Every skill validates its input against INPUT_SCHEMA. Calling
+`jsonschema.validate` on each request re-checks the schema and builds a new
+validator every time. Instead, each skill registers its schema here once at
+import time. The schema is compiled into a chain of plain Python checks
+covering the keywords skills actually use. Anything outside that subset falls
+back to a prebuilt jsonschema validator. Schema defaults are applied to a copy
+of the input, so skills receive pre-normalized data.
+
+Error messages match jsonschema's wording and are raised as
+`ValueError("Invalid input: <message>")`, the format skills have always used.
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import jsonschema
+
+# Returns None when the instance is valid, otherwise (path, message) where
+# path is the tuple of keys/indices leading to the failing value
+Error = Tuple[tuple, str]
+Check = Callable[[Any], Optional[Error]]
+
+# Keywords that never affect validity
+_ANNOTATIONS = {"$schema", "title", "description", "default", "examples", "format", "$comment"}
+_SUPPORTED = _ANNOTATIONS | {"type", "enum", "minimum", "maximum", "required", "properties", "items"}
+
+_TYPE_TESTS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _relevance(error: Error) -> tuple:
+    # Same preference as jsonschema.exceptions.relevance: shallowest path
+    # first, then the greatest sibling path.
+    return (-len(error[0]), error[0])
+
+
+def _compile_fallback(schema: Dict[str, Any]) -> Check:
+    validator = jsonschema.validators.validator_for(schema)(schema)
+
+    def check(instance):
+        error = jsonschema.exceptions.best_match(validator.iter_errors(instance))
+        return None if error is None else (tuple(error.path), error.message)
+    return check
+
+
+def _compile(schema: Dict[str, Any]) -> Check:
+    """Compile a schema into one check function."""
+    if not isinstance(schema, dict) or set(schema) - _SUPPORTED:
+        return _compile_fallback(schema)
+
+    # Errors on the value itself (type, enum, bounds, required) outrank errors
+    # on its children, so children are only examined once those pass.
+    checks: List[Callable[[Any], Optional[str]]] = []
+    required: List[str] = []
+    properties: List[tuple] = []
+    item_check: Optional[Check] = None
+
+    for keyword, value in schema.items():
+        if keyword == "type":
+            types = value if isinstance(value, list) else [value]
+            tests = [_TYPE_TESTS[t] for t in types]
+            expected = ", ".join(repr(t) for t in types)
+            checks.append(lambda v, tests=tests, expected=expected:
+                          None if any(t(v) for t in tests) else f"{v!r} is not of type {expected}")
+        elif keyword == "enum":
+            checks.append(lambda v, enum=value: None if v in enum else f"{v!r} is not one of {enum!r}")
+        elif keyword == "minimum":
+            checks.append(lambda v, m=value: f"{v!r} is less than the minimum of {m!r}"
+                          if _is_number(v) and v < m else None)
+        elif keyword == "maximum":
+            checks.append(lambda v, m=value: f"{v!r} is greater than the maximum of {m!r}"
+                          if _is_number(v) and v > m else None)
+        elif keyword == "required":
+            required = list(value)
+        elif keyword == "properties":
+            properties = [(name, _compile(sub)) for name, sub in value.items()]
+        elif keyword == "items":
+            item_check = _compile(value)
+
+    def check(instance):
+        for c in checks:
+            message = c(instance)
+            if message is not None:
+                return (), message
+
+        children = None
+        if isinstance(instance, dict):
+            for name in required:
+                if name not in instance:
+                    return (), f"{name!r} is a required property"
+            if properties:
+                children = ((name, c, instance[name]) for name, c in properties if name in instance)
+        elif item_check is not None and isinstance(instance, list):
+            children = ((i, item_check, item) for i, item in enumerate(instance))
+
+        if children is None:
+            return None
+        best = None
+        for key, c, child in children:
+            error = c(child)
+            if error is not None:
+                error = ((key,) + error[0], error[1])
+                if best is None or _relevance(error) > _relevance(best):
+                    best = error
+        return best
+    return check
+
+
+class InputValidator:
+    """
+    A skill's compiled INPUT_SCHEMA.
+
+    Calling it validates the input and returns it ready for the skill: a
+    shallow copy with top-level defaults filled in when the schema declares
+    any, otherwise the input itself.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self._check = _compile(schema)
+        self._defaults = [
+            (name, sub["default"])
+            for name, sub in schema.get("properties", {}).items()
+            if isinstance(sub, dict) and "default" in sub
+        ]
+
+    def __call__(self, input_data: Any) -> Dict[str, Any]:
+        error = self._check(input_data)
+        if error is not None:
+            raise ValueError(f"Invalid input: {error[1]}")
+
+        if not self._defaults:
+            return input_data
+        normalized = dict(input_data)
+        for name, default in self._defaults:
+            if name not in normalized:
+                normalized[name] = default
+        return normalized
+
+
+# Dispatch table: skill name -> compiled validator
+VALIDATORS: Dict[str, InputValidator] = {}
+
+
+def register(skill_name: str, schema: Dict[str, Any]) -> InputValidator:
+    """Compile and register a skill's INPUT_SCHEMA. Called once at import time."""
+    validator = InputValidator(schema)
+    VALIDATORS[skill_name] = validator
+    return validator
+
+
+def validate(skill_name: str, input_data: Any) -> Dict[str, Any]:
+    """Validate input for a registered skill and return the normalized input."""
+    validator = VALIDATORS.get(skill_name)
+    if validator is None:
+        raise ValueError(f"Unknown skill: {skill_name}")
+    return validator(input_data)
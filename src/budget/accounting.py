@@ -0,0 +1,308 @@
+"""
+Budget Accounting Service
+
+SRS Reference: §4.5 Commerce (FR5.3)
+Spec: specs/planner_service.md, Validation Rule 2 (Budget Check)
+Spec: specs/technical.md, MCPCapability.billing_config.cost_per_call
+
+This module tracks campaign spend across concurrently running tasks. Spend is
+reserved before a skill call, then committed (or released) once the call
+finishes. Caps are hierarchical: campaign -> agent -> capability. Every level
+of one campaign lives on the same lock stripe, so admission checks all three
+caps atomically in O(1) without summing the ledger.
+
+A call that turns out to cost more than a cap still has room for is charged
+in full, so committed spend always matches the provider's bill. The cap is
+then over its limit and admits nothing further; the overrun is logged and
+kept in `overruns`.
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+# Amounts are tracked as integer micro-dollars so repeated small charges
+# (e.g. cost_per_call=0.0025) never accumulate float error.
+_MICROS = 1_000_000
+
+Key = Tuple[str, ...]
+
+logger = logging.getLogger(__name__)
+
+
+def _to_micros(amount_usd: float) -> int:
+    return int(round(amount_usd * _MICROS))
+
+
+class _Counter:
+    """Limit, reserved and committed spend for one node of the cap hierarchy."""
+
+    __slots__ = ("limit", "reserved", "committed")
+
+    def __init__(self, limit: Optional[int] = None, committed: int = 0):
+        self.limit = limit
+        self.reserved = 0
+        self.committed = committed
+
+    def admits(self, amount: int) -> bool:
+        return self.limit is None or self.committed + self.reserved + amount <= self.limit
+
+
+class BudgetAccountant:
+    """
+    Reserve/commit/release spend with hierarchical caps.
+
+    Usage:
+        accountant.open_campaign(campaign_manifest)
+        rid = accountant.reserve(campaign_id, soul_id, capability_id)
+        if rid is None: ...  # over budget, do not call the skill
+        accountant.commit(rid)
+    """
+
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counters: List[Dict[Key, _Counter]] = [{} for _ in range(stripes)]
+        self._reservations: Dict[str, Tuple[Key, Key, Key, int]] = {}
+        self._cost_per_call: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Commits that pushed a cap over its limit, oldest first
+        self.overruns: List[Dict[str, Any]] = []
+
+    def _stripe(self, campaign_id: str) -> int:
+        return hash(campaign_id) % len(self._locks)
+
+    @staticmethod
+    def _keys(campaign_id: str, soul_id: str, capability_id: str) -> Tuple[Key, Key, Key]:
+        return (campaign_id,), (campaign_id, soul_id), (campaign_id, soul_id, capability_id)
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+
+    def register_capability(self, capability: Dict[str, Any]) -> None:
+        """Record an MCPCapability's cost_per_call as the default reservation amount."""
+        capability_id = capability.get("capability_id")
+        if not capability_id:
+            raise ValueError("Capability ID is required")
+        cost = capability.get("billing_config", {}).get("cost_per_call")
+        if cost is None:
+            raise ValueError("billing_config.cost_per_call is required")
+        self._cost_per_call[capability_id] = _to_micros(cost)
+
+    def set_cap(self, campaign_id: str, limit_usd: Optional[float],
+                soul_id: Optional[str] = None, capability_id: Optional[str] = None) -> None:
+        """
+        Set a spend cap at one level of the hierarchy.
+
+        Omit soul_id for a campaign cap; pass soul_id and capability_id for a
+        per-capability cap. A limit of None removes the cap.
+        """
+        if capability_id is not None and soul_id is None:
+            raise ValueError("A capability cap needs a soul_id")
+        key: Key = tuple(k for k in (campaign_id, soul_id, capability_id) if k is not None)
+        limit = None if limit_usd is None else _to_micros(limit_usd)
+
+        stripe = self._stripe(campaign_id)
+        with self._locks[stripe]:
+            counter = self._counters[stripe].get(key)
+            if counter is None:
+                self._counters[stripe][key] = _Counter(limit)
+            else:
+                counter.limit = limit
+
+    def open_campaign(self, manifest: Dict[str, Any]) -> None:
+        """Cap a campaign at its CampaignManifest.budget_limit_usd."""
+        campaign_id = manifest.get("campaign_id")
+        if not campaign_id:
+            raise ValueError("Campaign ID is required")
+        self.set_cap(campaign_id, manifest.get("budget_limit_usd"))
+
+    # ------------------------------------------------------------------
+    # Hot path
+    # ------------------------------------------------------------------
+
+    def reserve(self, campaign_id: str, soul_id: str, capability_id: str,
+                amount_usd: Optional[float] = None) -> Optional[str]:
+        """
+        Admit a skill call if every cap in its hierarchy has room.
+
+        Args:
+            amount_usd: Spend to hold; defaults to the capability's cost_per_call.
+
+        Returns:
+            A reservation id, or None if any cap would be exceeded.
+        """
+        if amount_usd is None:
+            if capability_id not in self._cost_per_call:
+                raise ValueError(f"Unknown capability: {capability_id}")
+            amount = self._cost_per_call[capability_id]
+        else:
+            amount = _to_micros(amount_usd)
+
+        keys = self._keys(campaign_id, soul_id, capability_id)
+        stripe = self._stripe(campaign_id)
+
+        with self._locks[stripe]:
+            counters = self._counters[stripe]
+            nodes = []
+            for key in keys:
+                node = counters.get(key)
+                if node is None:
+                    node = counters[key] = _Counter()
+                if not node.admits(amount):
+                    return None
+                nodes.append(node)
+            for node in nodes:
+                node.reserved += amount
+            reservation_id = f"rsv:{next(self._ids)}"
+            self._reservations[reservation_id] = keys + (amount,)
+        return reservation_id
+
+    def _settle(self, reservation_id: str, actual_usd: Optional[float]) -> List[Dict[str, Any]]:
+        record = self._reservations.get(reservation_id)
+        if record is None:
+            raise ValueError(f"Unknown reservation: {reservation_id}")
+        *keys, amount = record
+        actual = amount if actual_usd is None else _to_micros(actual_usd)
+
+        stripe = self._stripe(keys[0][0])
+        overruns = []
+        with self._locks[stripe]:
+            counters = self._counters[stripe]
+            # Popped under the stripe lock so a concurrent restore() cannot
+            # drop the reservation between lookup and settlement
+            if self._reservations.pop(reservation_id, None) is None:
+                raise ValueError(f"Unknown reservation: {reservation_id}")
+            for key in keys:
+                node = counters[key]
+                node.reserved -= amount
+                node.committed += actual
+                if node.limit is not None and node.committed > node.limit and actual > 0:
+                    overruns.append({
+                        "reservation_id": reservation_id,
+                        "key": list(key),
+                        "reserved_usd": amount / _MICROS,
+                        "actual_usd": actual / _MICROS,
+                        "limit_usd": node.limit / _MICROS,
+                        "committed_usd": node.committed / _MICROS
+                    })
+            self.overruns.extend(overruns)
+
+        for overrun in overruns:
+            logger.warning("Spend cap overrun on %s: %s committed against a %s limit (%s)",
+                           "/".join(overrun["key"]), overrun["committed_usd"], overrun["limit_usd"],
+                           reservation_id)
+        return overruns
+
+    def commit(self, reservation_id: str, actual_usd: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Turn a reservation into spend, optionally at a different actual cost.
+
+        The actual cost is always recorded in full. If it exceeds the
+        reservation and pushes a cap over its limit, the overrun is logged,
+        appended to `overruns` and returned; the cap then admits no further
+        reservations until it is raised.
+
+        Returns:
+            One entry per cap pushed over its limit (empty if none).
+
+        Raises:
+            ValueError: The reservation is unknown.
+        """
+        return self._settle(reservation_id, actual_usd)
+
+    def release(self, reservation_id: str) -> None:
+        """Drop a reservation without spending (call failed or was cancelled)."""
+        self._settle(reservation_id, 0.0)
+
+    # ------------------------------------------------------------------
+    # Reporting and checkpoints
+    # ------------------------------------------------------------------
+
+    def usage(self, campaign_id: str, soul_id: Optional[str] = None,
+              capability_id: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """Return limit_usd, reserved_usd, committed_usd and overrun_usd for one node."""
+        key: Key = tuple(k for k in (campaign_id, soul_id, capability_id) if k is not None)
+        stripe = self._stripe(campaign_id)
+        with self._locks[stripe]:
+            node = self._counters[stripe].get(key) or _Counter()
+            return {
+                "limit_usd": None if node.limit is None else node.limit / _MICROS,
+                "reserved_usd": node.reserved / _MICROS,
+                "committed_usd": node.committed / _MICROS,
+                "overrun_usd": 0.0 if node.limit is None else max(0, node.committed - node.limit) / _MICROS
+            }
+
+    def checkpoint(self, path: str) -> None:
+        """
+        Write limits and committed spend to `path` atomically.
+
+        Open reservations are not persisted; after a restart they lapse and the
+        in-flight calls must re-reserve.
+        """
+        entries = []
+        for stripe, lock in enumerate(self._locks):
+            with lock:
+                entries.extend(
+                    {"key": list(key), "limit": node.limit, "committed": node.committed}
+                    for key, node in self._counters[stripe].items()
+                )
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "counters": entries}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> None:
+        """Load a checkpoint written by `checkpoint`, replacing current counters."""
+        with open(path) as f:
+            data = json.load(f)
+
+        counters: List[Dict[Key, _Counter]] = [{} for _ in self._locks]
+        for entry in data["counters"]:
+            key = tuple(entry["key"])
+            counters[self._stripe(key[0])][key] = _Counter(entry["limit"], entry["committed"])
+
+        # Hold every stripe so no reservation is settled against the old counters
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            self._counters = counters
+            self._reservations.clear()
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def start_checkpointing(self, path: str, interval_seconds: float = 30.0) -> None:
+        """Checkpoint to `path` every `interval_seconds` on a daemon thread."""
+        if self._checkpoint_thread is not None:
+            raise ValueError("Checkpointing already started")
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.checkpoint(path)
+                except Exception:
+                    logger.exception("Budget checkpoint to %s failed", path)
+
+        self._checkpoint_thread = threading.Thread(target=loop, name="budget-checkpoint", daemon=True)
+        self._checkpoint_thread.start()
+
+    def stop_checkpointing(self, path: Optional[str] = None) -> None:
+        """Stop the checkpoint thread, writing one final checkpoint if `path` is given."""
+        if self._checkpoint_thread is not None:
+            self._stop.set()
+            self._checkpoint_thread.join()
+            self._checkpoint_thread = None
+        if path is not None:
+            self.checkpoint(path)
@@ -0,0 +1,335 @@
+"""
+Signing Service
+
+SRS Reference: §4.5 Commerce (FR5.x receipts), OpenClaw Integration, NFR 3.0
+Spec: specs/openclaw_integration.md, §2.1 Advertisement, §3.4 Provenance, §3.5 Receipts, §3.6 Feedback
+
+ed25519 signing and verification for advertisements, provenance metadata
+bundles, receipts and feedback messages, built on `cryptography`.
+
+* A message is signed over its canonical JSON: every field except
+  "signature", with sorted keys, compact separators and UTF-8. `Canonical`
+  serializes and hashes a payload once. Signing, verifying and cache lookups
+  all reuse those bytes.
+* Signatures and public keys are base64 text, as in the SOUL manifest.
+* `KeyRing` caches parsed public keys by soul_id (LRU). Keys it does not
+  hold come from an optional loader, for example a SOUL manifest fetch.
+* Verified signatures are cached under sha256(canonical payload), together
+  with the signature and the signer's key. An envelope seen again is
+  accepted without another curve operation. Only successes are cached.
+* `sign_batch` and `verify_batch` split large batches across a process
+  pool. Small batches run inline, where pickling would cost more than the
+  signatures themselves.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple, Union
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+SIGNATURE_FIELD = "signature"
+
+_RAW = (serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+
+def canonical_json(payload: Dict[str, Any]) -> bytes:
+    """Canonical bytes of a message: sorted keys, compact, without its signature."""
+    unsigned = {k: v for k, v in payload.items() if k != SIGNATURE_FIELD}
+    return json.dumps(unsigned, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                      default=str).encode("utf-8")
+
+
+class Canonical:
+    """
+    A message with its canonical bytes and sha256 digest, computed once.
+
+    Pass a Canonical instead of a dict wherever the same message is signed,
+    verified or looked up more than once.
+    """
+
+    __slots__ = ("payload", "data", "digest")
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload
+        self.data = canonical_json(payload)
+        self.digest = hashlib.sha256(self.data).digest()
+
+    @property
+    def signature(self) -> Optional[str]:
+        return self.payload.get(SIGNATURE_FIELD)
+
+
+Message = Union[Dict[str, Any], Canonical]
+
+
+def _canonical(message: Message) -> Canonical:
+    return message if isinstance(message, Canonical) else Canonical(message)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text, validate=True)
+
+
+def generate_key() -> Ed25519PrivateKey:
+    return Ed25519PrivateKey.generate()
+
+
+def public_key_b64(private_key: Ed25519PrivateKey) -> str:
+    """Base64 raw public key, the SOUL manifest `public_key` format."""
+    return _b64(private_key.public_key().public_bytes(*_RAW))
+
+
+# ----------------------------------------------------------------------
+# Process pool workers
+# ----------------------------------------------------------------------
+
+_worker_key: Optional[Ed25519PrivateKey] = None
+
+
+def _init_worker(private_raw: Optional[bytes]) -> None:
+    global _worker_key
+    _worker_key = Ed25519PrivateKey.from_private_bytes(private_raw) if private_raw else None
+
+
+def _sign_chunk(datas: List[bytes]) -> List[bytes]:
+    return [_worker_key.sign(data) for data in datas]
+
+
+def _verify_chunk(items: List[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+    results = []
+    for public_raw, data, signature in items:
+        try:
+            Ed25519PublicKey.from_public_bytes(public_raw).verify(signature, data)
+            results.append(True)
+        except (InvalidSignature, ValueError):
+            results.append(False)
+    return results
+
+
+class KeyRing:
+    """
+    Public keys by soul_id, parsed once and kept in an LRU.
+
+    Args:
+        loader: Called with a soul_id the ring does not hold; returns its
+            base64 public key, or None if unknown.
+        max_size: Keys kept before the least recently used is dropped.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], Optional[str]]] = None, max_size: int = 100_000):
+        self.loader = loader
+        self.max_size = max_size
+        self._keys: "OrderedDict[str, Tuple[Ed25519PublicKey, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, soul_id: str, public_key: str) -> None:
+        """Register a base64 raw ed25519 public key. Raises ValueError if malformed."""
+        raw = _unb64(public_key)
+        key = Ed25519PublicKey.from_public_bytes(raw)
+        with self._lock:
+            self._keys[soul_id] = (key, raw)
+            self._keys.move_to_end(soul_id)
+            if len(self._keys) > self.max_size:
+                self._keys.popitem(last=False)
+
+    def get(self, soul_id: str) -> Optional[Tuple[Ed25519PublicKey, bytes]]:
+        """(key, raw bytes) for a soul_id, loading it on a miss; None if unknown."""
+        with self._lock:
+            entry = self._keys.get(soul_id)
+            if entry is not None:
+                self._keys.move_to_end(soul_id)
+                return entry
+        public_key = self.loader(soul_id) if self.loader else None
+        if public_key is None:
+            return None
+        self.add(soul_id, public_key)
+        return self._keys.get(soul_id)
+
+
+class SigningService:
+    """
+    Signs messages with one private key and verifies anyone's.
+
+    Args:
+        private_key: This service's signing key; None for a verify-only service.
+        keyring: Public keys used for verification.
+        processes: Worker processes for batches; 0 keeps everything inline.
+        parallel_min: Smallest batch sent to the process pool.
+        cache_size: Verified signatures remembered (LRU).
+    """
+
+    def __init__(self, private_key: Optional[Ed25519PrivateKey] = None, keyring: Optional[KeyRing] = None,
+                 processes: int = 0, parallel_min: int = 256, cache_size: int = 100_000):
+        self.private_key = private_key
+        self.keyring = keyring or KeyRing()
+        self.processes = processes
+        self.parallel_min = parallel_min
+        self.cache_size = cache_size
+        self._verified: "OrderedDict[bytes, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.cache_hits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            private_raw = None
+            if self.private_key is not None:
+                private_raw = self.private_key.private_bytes(
+                    serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption()
+                )
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                             initargs=(private_raw,))
+        return self._pool
+
+    def _parallel(self, fn: Callable[[list], list], items: list) -> list:
+        """Run fn over items inline, or in pool chunks for a large batch."""
+        if self.processes < 1 or len(items) < self.parallel_min:
+            return fn(items)
+        size = -(-len(items) // self.processes)
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        return [r for chunk in self._get_pool().map(fn, chunks) for r in chunk]
+
+    # ------------------------------------------------------------------
+    # Signing
+    # ------------------------------------------------------------------
+
+    def _require_key(self) -> Ed25519PrivateKey:
+        if self.private_key is None:
+            raise ValueError("This signing service has no private key")
+        return self.private_key
+
+    def sign(self, message: Message) -> str:
+        """Base64 signature over the message's canonical JSON."""
+        return _b64(self._require_key().sign(_canonical(message).data))
+
+    def signed(self, message: Message) -> Dict[str, Any]:
+        """A copy of the message with its "signature" field set."""
+        canonical = _canonical(message)
+        return {**canonical.payload, SIGNATURE_FIELD: self.sign(canonical)}
+
+    def sign_batch(self, messages: Iterable[Message]) -> List[str]:
+        """Signatures for many messages, in input order."""
+        key = self._require_key()
+        datas = [_canonical(m).data for m in messages]
+        if self.processes < 1 or len(datas) < self.parallel_min:
+            return [_b64(key.sign(data)) for data in datas]
+        return [_b64(sig) for sig in self._parallel(_sign_chunk, datas)]
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def signer_of(payload: Dict[str, Any]) -> Optional[str]:
+        """The soul_id a message is signed by: from_soul_id (feedback), else soul_id."""
+        return payload.get("from_soul_id") or payload.get("soul_id")
+
+    def _prepare(self, message: Message, signer: Optional[str]) -> Tuple[Optional[bytes], Optional[tuple]]:
+        """
+        Returns (cache key, (public key entry, data, signature)). The cache key is None
+        when the message cannot verify at all; the item is None on a cache hit.
+        """
+        canonical = _canonical(message)
+        signature = canonical.signature
+        signer = signer or self.signer_of(canonical.payload)
+        entry = self.keyring.get(signer) if signer else None
+        if not signature or entry is None:
+            return None, None
+        try:
+            sig = _unb64(signature)
+        except ValueError:
+            return None, None
+        cache_key = hashlib.sha256(canonical.digest + entry[1] + sig).digest()
+        with self._lock:
+            if cache_key in self._verified:
+                self._verified.move_to_end(cache_key)
+                self.cache_hits += 1
+                return cache_key, None
+        return cache_key, (entry, canonical.data, sig)
+
+    def _remember(self, cache_keys: Iterable[bytes]) -> None:
+        with self._lock:
+            for cache_key in cache_keys:
+                self._verified[cache_key] = None
+                self._verified.move_to_end(cache_key)
+            while len(self._verified) > self.cache_size:
+                self._verified.popitem(last=False)
+
+    @staticmethod
+    def _verify_one(key: Ed25519PublicKey, data: bytes, signature: bytes) -> bool:
+        try:
+            key.verify(signature, data)
+            return True
+        except InvalidSignature:
+            return False
+
+    def verify(self, message: Message, signer: Optional[str] = None) -> bool:
+        """
+        Check a message's "signature" field against its signer's public key.
+
+        Args:
+            message: A signed message, or its Canonical.
+            signer: soul_id whose key to use; defaults to `signer_of(message)`.
+
+        Returns:
+            True if the signature is valid. False for a bad or missing
+            signature or an unknown signer.
+        """
+        return self.verify_batch([message], signers=[signer])[0]
+
+    def verify_batch(self, messages: Iterable[Message],
+                     signers: Optional[Iterable[Optional[str]]] = None) -> List[bool]:
+        """Verify many messages; results in input order. Cache hits skip the pool."""
+        messages = list(messages)
+        signers = list(signers) if signers is not None else [None] * len(messages)
+        if len(signers) != len(messages):
+            raise ValueError("signers must match messages one to one")
+
+        results = [False] * len(messages)
+        pending: List[int] = []
+        items: List[tuple] = []
+        keys: List[bytes] = []
+        for i, (message, signer) in enumerate(zip(messages, signers)):
+            cache_key, item = self._prepare(message, signer)
+            if cache_key is None:
+                continue
+            if item is None:
+                results[i] = True
+                continue
+            pending.append(i)
+            items.append(item)
+            keys.append(cache_key)
+
+        if self.processes < 1 or len(items) < self.parallel_min:
+            valid = [self._verify_one(entry[0], data, sig) for entry, data, sig in items]
+        else:
+            valid = self._parallel(_verify_chunk, [(entry[1], data, sig) for entry, data, sig in items])
+        for i, ok in zip(pending, valid):
+            results[i] = ok
+        self._remember(key for key, ok in zip(keys, valid) if ok)
+        return results
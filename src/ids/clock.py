@@ -0,0 +1,143 @@
+"""
+ID and Clock Service
+
+SRS Reference: §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/technical.md, Agent Task Schema (task_id, created_at)
+
+Shared source of IDs and timestamps for the planner, skills, ledger and
+telemetry.
+
+* IDs are UUIDv7 (RFC 9562): 48 bits of Unix milliseconds, then a 12-bit
+  counter, then 62 random bits. They sort by creation time, so appends to
+  the task_queue sorted sets and to SQL primary-key indexes land at the end
+  instead of at random pages. Within one millisecond the counter keeps IDs
+  strictly increasing.
+* `isoformat()` returns a UTC ISO-8601 timestamp with millisecond precision.
+  The string is rebuilt at most once per millisecond; other calls reuse the
+  cached value.
+* `IdClock(seed=...)` is deterministic for replays. Time comes from a
+  virtual clock that moves only when `advance()` is called, and the random
+  bits come from a seeded PRNG, so a replay produces the same IDs and
+  timestamps.
+
+The random bits make IDs unique, not secret. Do not use these IDs as
+tokens.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+# 2026-01-01T00:00:00Z, the default start of the virtual clock in deterministic mode
+DEFAULT_EPOCH_MS = 1_767_225_600_000
+
+_COUNTER_MAX = 0xFFF
+_RAND_B_BITS = 62
+
+
+class IdClock:
+    """
+    UUIDv7 generator and cached ISO timestamp source.
+
+    Args:
+        seed: Enables deterministic mode with this PRNG seed.
+        start_ms: Virtual clock start (Unix ms) in deterministic mode.
+    """
+
+    def __init__(self, seed: Optional[int] = None, start_ms: int = DEFAULT_EPOCH_MS):
+        self.deterministic = seed is not None
+        self._rng = random.Random(seed if self.deterministic else os.urandom(16))
+        self._virtual_ms = start_ms
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._counter = 0
+        # (ms, iso string, second, "YYYY-MM-DDTHH:MM:SS" prefix), replaced as
+        # one immutable tuple so readers never see a mix of two updates
+        self._iso_cache = (-1, "", -1, "")
+
+    def now_ms(self) -> int:
+        """Current Unix time in milliseconds (virtual in deterministic mode)."""
+        if self.deterministic:
+            return self._virtual_ms
+        return time.time_ns() // 1_000_000
+
+    def advance(self, ms: int) -> None:
+        """Move the virtual clock forward. Only valid in deterministic mode."""
+        if not self.deterministic:
+            raise ValueError("advance() requires deterministic mode")
+        if ms < 0:
+            raise ValueError("Cannot move the clock backwards")
+        with self._lock:
+            self._virtual_ms += ms
+
+    def uuid7_int(self) -> int:
+        """Next UUIDv7 as a 128-bit integer."""
+        ms = self.now_ms()
+        with self._lock:
+            if ms > self._last_ms:
+                self._last_ms = ms
+                # Random start leaves headroom while keeping IDs hard to guess in sequence
+                self._counter = self._rng.getrandbits(11)
+            else:
+                # Same millisecond, or the wall clock stepped back: stay monotonic
+                self._counter += 1
+                if self._counter > _COUNTER_MAX:
+                    self._last_ms += 1
+                    self._counter = 0
+            ms, counter = self._last_ms, self._counter
+            rand_b = self._rng.getrandbits(_RAND_B_BITS)
+
+        return (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+
+    def uuid7(self) -> str:
+        """Next UUIDv7 in canonical 8-4-4-4-12 form."""
+        h = "%032x" % self.uuid7_int()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def isoformat(self) -> str:
+        """UTC time as ISO-8601 with milliseconds, e.g. 2026-01-01T00:00:00.000+00:00."""
+        ms = self.now_ms()
+        cached_ms, cached_iso, cached_second, prefix = self._iso_cache
+        if ms == cached_ms:
+            return cached_iso
+
+        second, millis = divmod(ms, 1000)
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        iso = f"{prefix}.{millis:03d}+00:00"
+        # One reference store: a racing thread may overwrite it with another
+        # consistent entry, never with a mix of two
+        self._iso_cache = (ms, iso, second, prefix)
+        return iso
+
+
+def timestamp_ms(uuid7: str) -> int:
+    """Unix milliseconds embedded in a UUIDv7 string."""
+    return int(uuid7.replace("-", "")[:12], 16)
+
+
+# Process-wide clock shared by planner, skills and telemetry
+_clock = IdClock()
+
+
+def get_clock() -> IdClock:
+    return _clock
+
+
+def set_clock(clock: Optional[IdClock]) -> None:
+    """Replace the shared clock, e.g. with IdClock(seed=...) for a replay. None restores a live clock."""
+    global _clock
+    _clock = clock or IdClock()
+
+
+def new_id() -> str:
+    """Next UUIDv7 from the shared clock."""
+    return _clock.uuid7()
+
+
+def now_iso() -> str:
+    """Current UTC ISO-8601 timestamp from the shared clock."""
+    return _clock.isoformat()
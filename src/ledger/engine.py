@@ -0,0 +1,370 @@
+"""
+Ledger Engine
+
+SRS Reference: §4.5 Commerce (FR5.1, FR5.2)
+Spec: specs/technical.md, `ledger` and `receipts` tables
+Spec: specs/openclaw_integration.md, §3.5 Transaction & Receipt Ledger Protocol
+
+This module implements the append-only transaction ledger. SQLite in WAL mode
+stands in for PostgreSQL locally. Transactions are written with group commit
+(one SQL transaction per batch), and running balances per soul_id are
+materialized in a `balances` table and mirrored in memory so balance lookups
+never sum ledger history.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import deque
+from typing import Dict, Any, List, Deque, Set, Tuple
+
+from src.ids.clock import new_id, now_iso
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tx_id TEXT NOT NULL UNIQUE,
+    from_soul_id TEXT,
+    to_soul_id TEXT,
+    amount_cents INTEGER NOT NULL,
+    currency TEXT NOT NULL DEFAULT 'USD',
+    purpose TEXT,
+    campaign_id TEXT,
+    receipt_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ledger_from ON ledger(from_soul_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_to ON ledger(to_soul_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_campaign ON ledger(campaign_id);
+
+-- Append-only: no UPDATE or DELETE allowed (enforced by triggers)
+CREATE TRIGGER IF NOT EXISTS ledger_no_update BEFORE UPDATE ON ledger
+BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS ledger_no_delete BEFORE DELETE ON ledger
+BEGIN SELECT RAISE(ABORT, 'ledger is append-only'); END;
+
+CREATE TABLE IF NOT EXISTS receipts (
+    receipt_id TEXT PRIMARY KEY,
+    tx_id TEXT NOT NULL REFERENCES ledger(tx_id),
+    receipt_hash TEXT NOT NULL,
+    s3_uri TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_receipts_tx ON receipts(tx_id);
+
+-- Materialized running balances, updated in the same commit as the ledger
+CREATE TABLE IF NOT EXISTS balances (
+    soul_id TEXT PRIMARY KEY,
+    balance_cents INTEGER NOT NULL
+);
+"""
+
+
+class LedgerRejected(ValueError):
+    """
+    Transactions the ledger refused, such as a tx_id that is already recorded.
+
+    Attributes:
+        records: The refused transaction records, for the caller to fix and resubmit.
+        tx_ids: Their tx_ids.
+        reasons: tx_id -> why it was refused.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], reasons: Dict[str, str]):
+        self.records = records
+        self.tx_ids = [r["tx_id"] for r in records]
+        self.reasons = reasons
+        super().__init__("Ledger rejected " + ", ".join(f"{tx_id} ({reasons[tx_id]})" for tx_id in self.tx_ids))
+
+
+def _to_cents(amount: Any) -> int:
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise ValueError(f"Transaction amount must be a number, got {amount!r}")
+    if amount <= 0:
+        raise ValueError(f"Transaction amount must be positive, got {amount}")
+    return int(round(amount * 100))
+
+
+def _receipt_hash(tx: Dict[str, Any]) -> str:
+    canonical = json.dumps(tx, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Ledger:
+    """
+    Append-only ledger with group commit and O(1) balance lookups.
+
+    Transactions enter through `submit` (buffered, visible as pending until
+    flushed) or `append_batch` (committed immediately as one batch). Both end
+    in a single SQL transaction per batch, which is what makes WAL mode cheap.
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 256, recent_limit: int = 10):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.recent_limit = recent_limit
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        # In-memory mirrors of the materialized state
+        self._balances: Dict[str, int] = dict(
+            self._conn.execute("SELECT soul_id, balance_cents FROM balances")
+        )
+        self._recent: Dict[str, Deque[Dict[str, Any]]] = {}
+
+        # Pending index: submitted but not yet committed
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffered_ids: Set[str] = set()
+        self._pending_by_soul: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _normalize(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        from_soul = tx.get("from_soul_id")
+        to_soul = tx.get("to_soul_id")
+        if not from_soul and not to_soul:
+            raise ValueError("Transaction needs from_soul_id or to_soul_id")
+
+        record = {
+            "tx_id": tx.get("tx_id") or new_id(),
+            "from_soul_id": from_soul,
+            "to_soul_id": to_soul,
+            "amount_cents": _to_cents(tx.get("amount")),
+            "currency": tx.get("currency", "USD"),
+            "purpose": tx.get("purpose"),
+            "campaign_id": tx.get("campaign_id"),
+            "created_at": tx.get("timestamp") or now_iso(),
+            "metadata": json.dumps(tx["metadata"]) if tx.get("metadata") is not None else None,
+            "receipt": tx.get("receipt")
+        }
+        receipt = record["receipt"]
+        if receipt and not (receipt.get("s3_uri") and receipt.get("signature")):
+            raise ValueError(f"Receipt for {record['tx_id']} needs s3_uri and signature")
+        record["receipt_hash"] = tx.get("receipt_hash") or _receipt_hash(
+            {k: v for k, v in record.items() if k != "receipt"}
+        )
+        return record
+
+    def _apply_pending(self, record: Dict[str, Any], sign: int) -> None:
+        delta = record["amount_cents"] * sign
+        for soul_id, direction in ((record["from_soul_id"], -1), (record["to_soul_id"], 1)):
+            if soul_id:
+                self._pending_by_soul[soul_id] = self._pending_by_soul.get(soul_id, 0) + direction * delta
+                if self._pending_by_soul[soul_id] == 0:
+                    del self._pending_by_soul[soul_id]
+
+    def submit(self, tx: Dict[str, Any]) -> str:
+        """
+        Buffer a transaction for the next group commit.
+
+        The transaction counts towards `pending_balance` until it is flushed.
+        The buffer is flushed automatically once it reaches `batch_size`.
+
+        Returns:
+            The transaction's tx_id.
+
+        Raises:
+            LedgerRejected: The tx_id is already buffered or recorded, or the
+                automatic flush refused buffered transactions (see `flush`).
+        """
+        record = self._normalize(tx)
+        with self._lock:
+            tx_id = record["tx_id"]
+            if tx_id in self._buffered_ids or self._conn.execute(
+                    "SELECT 1 FROM ledger WHERE tx_id = ?", (tx_id,)).fetchone():
+                raise LedgerRejected([record], {tx_id: "duplicate tx_id"})
+            self._buffer.append(record)
+            self._buffered_ids.add(tx_id)
+            self._apply_pending(record, 1)
+            if len(self._buffer) >= self.batch_size:
+                self._commit(self._buffer)
+        return record["tx_id"]
+
+    def flush(self) -> int:
+        """
+        Commit every buffered transaction. Returns the number committed.
+
+        A transaction the database refuses (e.g. a receipt_id that already
+        exists) is dropped from the buffer without holding back the rest of
+        the batch, which still commits.
+
+        Raises:
+            LedgerRejected: After committing the rest, for the refused
+                transactions.
+        """
+        with self._lock:
+            return self._commit(self._buffer) if self._buffer else 0
+
+    def append_batch(self, transactions: List[Dict[str, Any]]) -> List[str]:
+        """
+        Commit a batch of transaction_execute results in one SQL transaction.
+
+        The batch is atomic: if any transaction is refused, none is recorded.
+
+        Args:
+            transactions: Transaction messages (specs/openclaw_integration.md §3.5).
+
+        Returns:
+            tx_ids in input order.
+
+        Raises:
+            LedgerRejected: For the transactions that were refused.
+        """
+        records = [self._normalize(tx) for tx in transactions]
+        with self._lock:
+            self._commit(records, pending=False)
+        return [r["tx_id"] for r in records]
+
+    def _insert(self, records: List[Dict[str, Any]]) -> None:
+        receipts = [
+            (r["receipt"].get("receipt_id") or new_id(), r["tx_id"],
+             r["receipt"].get("receipt_hash", r["receipt_hash"]), r["receipt"]["s3_uri"],
+             r["receipt"]["signature"], r["receipt"].get("created_at", r["created_at"]))
+            for r in records if r["receipt"]
+        ]
+        self._conn.executemany(
+            "INSERT INTO ledger (tx_id, from_soul_id, to_soul_id, amount_cents, currency, "
+            "purpose, campaign_id, receipt_hash, created_at, metadata) "
+            "VALUES (:tx_id, :from_soul_id, :to_soul_id, :amount_cents, :currency, "
+            ":purpose, :campaign_id, :receipt_hash, :created_at, :metadata)",
+            records
+        )
+        if receipts:
+            self._conn.executemany(
+                "INSERT INTO receipts (receipt_id, tx_id, receipt_hash, s3_uri, signature, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                receipts
+            )
+
+    def _insert_each(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """Insert records one savepoint at a time; returns (inserted, tx_id -> refusal reason)."""
+        inserted, reasons = [], {}
+        for r in records:
+            self._conn.execute("SAVEPOINT tx")
+            try:
+                self._insert([r])
+            except sqlite3.IntegrityError as e:
+                self._conn.execute("ROLLBACK TO tx")
+                reasons[r["tx_id"]] = str(e)
+            else:
+                inserted.append(r)
+            self._conn.execute("RELEASE tx")
+        return inserted, reasons
+
+    def _commit(self, records: List[Dict[str, Any]], pending: bool = True) -> int:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            try:
+                self._insert(records)
+                committed, reasons = records, {}
+            except sqlite3.IntegrityError:
+                # Find the offending records: redo the batch one savepoint each
+                conn.execute("ROLLBACK")
+                conn.execute("BEGIN IMMEDIATE")
+                committed, reasons = self._insert_each(records)
+                if not pending:
+                    raise LedgerRejected([r for r in records if r["tx_id"] in reasons], reasons)
+
+            deltas: Dict[str, int] = {}
+            for r in committed:
+                if r["from_soul_id"]:
+                    deltas[r["from_soul_id"]] = deltas.get(r["from_soul_id"], 0) - r["amount_cents"]
+                if r["to_soul_id"]:
+                    deltas[r["to_soul_id"]] = deltas.get(r["to_soul_id"], 0) + r["amount_cents"]
+            conn.executemany(
+                "INSERT INTO balances (soul_id, balance_cents) VALUES (?, ?) "
+                "ON CONFLICT(soul_id) DO UPDATE SET balance_cents = balance_cents + excluded.balance_cents",
+                deltas.items()
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            # Nothing was recorded; a buffered batch stays buffered for the next flush
+            conn.execute("ROLLBACK")
+            raise
+
+        # Mirror the committed state in memory only after the commit succeeds
+        for soul_id, delta in deltas.items():
+            self._balances[soul_id] = self._balances.get(soul_id, 0) + delta
+        for r in committed:
+            for soul_id, sign in ((r["from_soul_id"], -1), (r["to_soul_id"], 1)):
+                if sign > 0 and soul_id == r["from_soul_id"]:
+                    # A transfer to oneself is listed once, as the query does
+                    continue
+                if soul_id and soul_id in self._recent:
+                    self._recent[soul_id].appendleft(self._summary(r, sign))
+
+        if pending:
+            for r in records:
+                self._apply_pending(r, -1)
+            self._buffer = []
+            self._buffered_ids = set()
+        if reasons:
+            raise LedgerRejected([r for r in records if r["tx_id"] in reasons], reasons)
+        return len(committed)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _summary(record: Dict[str, Any], sign: int) -> Dict[str, Any]:
+        return {
+            "tx_id": record["tx_id"],
+            "amount": sign * record["amount_cents"] / 100,
+            "purpose": record["purpose"],
+            "created_at": record["created_at"]
+        }
+
+    def get_balance(self, soul_id: str) -> float:
+        """Committed balance for a soul_id (O(1), no history scan)."""
+        return self._balances.get(soul_id, 0) / 100
+
+    def get_pending_balance(self, soul_id: str) -> float:
+        """Net amount of submitted-but-uncommitted transactions for a soul_id."""
+        return self._pending_by_soul.get(soul_id, 0) / 100
+
+    def recent_transactions(self, soul_id: str) -> List[Dict[str, Any]]:
+        """
+        Most recent committed transactions for a soul_id, newest first.
+
+        Loaded once from the ledger indexes, then kept current on each commit.
+        """
+        with self._lock:
+            recent = self._recent.get(soul_id)
+            if recent is None:
+                rows = self._conn.execute(
+                    "SELECT tx_id, from_soul_id, amount_cents, purpose, created_at FROM ledger "
+                    "WHERE from_soul_id = ? OR to_soul_id = ? ORDER BY seq DESC LIMIT ?",
+                    (soul_id, soul_id, self.recent_limit)
+                ).fetchall()
+                recent = deque(
+                    ({"tx_id": tx_id,
+                      "amount": (-1 if from_soul == soul_id else 1) * cents / 100,
+                      "purpose": purpose,
+                      "created_at": created_at}
+                     for tx_id, from_soul, cents, purpose, created_at in rows),
+                    maxlen=self.recent_limit
+                )
+                self._recent[soul_id] = recent
+            return list(recent)
+
+    def close(self) -> None:
+        """Flush buffered transactions and close the database."""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._conn.close()
@@ -0,0 +1,377 @@
+"""
+OpenClaw Discovery Index
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §2.1 Agent Availability Advertisement
+Spec: specs/openclaw_integration.md, §2.2 Discovery Query
+
+Answers `GET /discovery/query` (skills, max_price, min_reputation,
+availability) from in-memory indexes, without scanning every advertisement:
+
+* Every advertisement gets an integer slot. Slots of removed agents are
+  reused.
+* Inverted indexes map each skill, and each availability status, to a
+  bitmap of slots packed into uint64 words. A multi-skill query ANDs the
+  bitmaps, least popular skill first.
+* `base_rate_per_hour` and `reputation.score` each live in a sorted column,
+  so a range filter is a binary search.
+
+A query starts from whichever side is more selective. If one range filter
+matches fewer agents than the smallest bitmap, the query walks that range
+and tests the bitmaps bit by bit. Otherwise it walks the ANDed bitmap block
+by block, checks the ranges against the columns, and stops early once
+`limit` results have been found.
+
+Advertisements refresh every 15 minutes, so updates are incremental. A
+changed slot goes into a small delta set that queries also search. The
+delta is merged into the sorted column once it grows past
+`merge_threshold`, or once per `upsert_batch`.
+"""
+
+import math
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+_BIT = np.array([1 << i for i in range(64)], dtype=np.uint64)
+# Queries walk bitmaps and ranges in chunks of slots that start small and
+# double, so a query with a limit touches little more than it returns
+_FIRST_CHUNK = 1024
+_MAX_CHUNK = 128 * 1024
+
+
+def _chunks(start: int, stop: int, first: int = _FIRST_CHUNK, largest: int = _MAX_CHUNK) -> Iterable[Tuple[int, int]]:
+    size = first
+    while start < stop:
+        yield start, min(stop, start + size)
+        start += size
+        size = min(size * 2, largest)
+
+
+def _slots_of(words: np.ndarray, base: int = 0) -> np.ndarray:
+    """Slot numbers of the set bits in a block of uint64 words, ascending."""
+    nz = np.flatnonzero(words)
+    if not len(nz):
+        return np.empty(0, dtype=np.int64)
+    bits = np.unpackbits(words[nz].view(np.uint8), bitorder="little").reshape(-1, 64)
+    rows, cols = np.nonzero(bits)
+    return (nz[rows] + base) * 64 + cols
+
+
+def _test_bits(words: np.ndarray, slots: np.ndarray) -> np.ndarray:
+    return (words[slots >> 6] & _BIT[slots & 63]) != 0
+
+
+class _SortedColumn:
+    """
+    A numeric attribute per slot, plus a sorted (value, slot) index.
+
+    Slots changed since the last merge are "dirty": their entries in the
+    sorted index are ignored and they are checked directly from `values`.
+    """
+
+    def __init__(self, capacity: int):
+        self.values = np.full(capacity, np.nan)
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.keys = np.empty(0)
+        self.slots = np.empty(0, dtype=np.int64)
+        self._delta: set = set()
+        self._delta_array: Optional[np.ndarray] = None
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - len(self.values)
+        self.values = np.concatenate([self.values, np.full(extra, np.nan)])
+        self.dirty = np.concatenate([self.dirty, np.zeros(extra, dtype=bool)])
+
+    def set(self, slot: int, value: float) -> None:
+        self.values[slot] = value
+        if not self.dirty[slot]:
+            self.dirty[slot] = True
+            self._delta.add(slot)
+            self._delta_array = None
+
+    def pending(self) -> int:
+        return len(self._delta)
+
+    def _delta_slots(self) -> np.ndarray:
+        if self._delta_array is None:
+            self._delta_array = np.fromiter(self._delta, dtype=np.int64, count=len(self._delta))
+        return self._delta_array
+
+    def merge(self) -> None:
+        if not self._delta:
+            return
+        keep = ~self.dirty[self.slots]
+        keys, slots = self.keys[keep], self.slots[keep]
+
+        delta = self._delta_slots()
+        values = self.values[delta]
+        present = ~np.isnan(values)
+        delta, values = delta[present], values[present]
+        order = np.argsort(values, kind="stable")
+        delta, values = delta[order], values[order]
+
+        positions = np.searchsorted(keys, values, side="right")
+        self.keys = np.insert(keys, positions, values)
+        self.slots = np.insert(slots, positions, delta)
+        self.dirty[self._delta_slots()] = False
+        self._delta.clear()
+        self._delta_array = None
+
+    def count(self, lo: float, hi: float) -> int:
+        """Upper bound on the slots in [lo, hi]."""
+        return int(np.searchsorted(self.keys, hi, side="right") - np.searchsorted(self.keys, lo, side="left")) \
+            + len(self._delta)
+
+    def range_chunks(self, lo: float, hi: float) -> Iterable[np.ndarray]:
+        """
+        Slots whose value is in [lo, hi], in growing chunks.
+
+        Merged slots come first, in value order. Slots changed since the last
+        merge follow them.
+        """
+        i0 = int(np.searchsorted(self.keys, lo, side="left"))
+        i1 = int(np.searchsorted(self.keys, hi, side="right"))
+        for start, stop in _chunks(i0, i1):
+            slots = self.slots[start:stop]
+            yield slots[~self.dirty[slots]] if self._delta else slots
+        if self._delta:
+            delta = self._delta_slots()
+            yield delta[self.test(delta, lo, hi)]
+
+    def test(self, slots: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        values = self.values[slots]
+        return (values >= lo) & (values <= hi)
+
+
+class DiscoveryIndex:
+    """
+    In-memory index of OpenClaw advertisements keyed by soul_id.
+
+    Args:
+        capacity: Initial slot capacity; doubles as needed.
+        merge_threshold: Changed slots buffered before a sorted column is merged.
+    """
+
+    def __init__(self, capacity: int = 1024, merge_threshold: int = 4096):
+        self.merge_threshold = merge_threshold
+        self._capacity = max(64, capacity)
+        self._slot: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._ads: List[Optional[Dict[str, Any]]] = []
+        self._terms: List[Tuple[Tuple[str, ...], Optional[str]]] = []
+        self._free: List[int] = []
+        self._updated = np.zeros(self._capacity)
+
+        self._words = self._capacity // 64
+        self._alive = np.zeros(self._words, dtype=np.uint64)
+        self._skills: Dict[str, np.ndarray] = {}
+        self._skill_counts: Dict[str, int] = {}
+        self._statuses: Dict[str, np.ndarray] = {}
+        self._status_counts: Dict[str, int] = {}
+        self._price = _SortedColumn(self._capacity)
+        self._reputation = _SortedColumn(self._capacity)
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, soul_id: str) -> bool:
+        return soul_id in self._slot
+
+    def get(self, soul_id: str) -> Optional[Dict[str, Any]]:
+        slot = self._slot.get(soul_id)
+        return None if slot is None else self._ads[slot]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        words = self._capacity // 64
+        extra = words - self._words
+        self._words = words
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=np.uint64)])
+        for index in (self._skills, self._statuses):
+            for term, bits in index.items():
+                index[term] = np.concatenate([bits, np.zeros(extra, dtype=np.uint64)])
+        self._price.grow(self._capacity)
+        self._reputation.grow(self._capacity)
+        self._updated = np.concatenate([self._updated, np.zeros(self._capacity - len(self._updated))])
+
+    def _set_bit(self, index: Dict[str, np.ndarray], counts: Dict[str, int], term: str, slot: int) -> None:
+        bits = index.get(term)
+        if bits is None:
+            bits = index[term] = np.zeros(self._words, dtype=np.uint64)
+        bits[slot >> 6] |= _BIT[slot & 63]
+        counts[term] = counts.get(term, 0) + 1
+
+    def _clear_bit(self, index: Dict[str, np.ndarray], counts: Dict[str, int], term: str, slot: int) -> None:
+        index[term][slot >> 6] &= ~_BIT[slot & 63]
+        counts[term] -= 1
+        if not counts[term]:
+            del index[term], counts[term]
+
+    def _unindex(self, slot: int) -> None:
+        skills, status = self._terms[slot]
+        for skill in skills:
+            self._clear_bit(self._skills, self._skill_counts, skill, slot)
+        if status is not None:
+            self._clear_bit(self._statuses, self._status_counts, status, slot)
+
+    def _upsert(self, ad: Dict[str, Any], now: float) -> None:
+        soul_id = ad.get("soul_id")
+        if not soul_id:
+            raise ValueError("Advertisement soul_id is required")
+        skills = tuple(dict.fromkeys(ad.get("skills") or ()))
+        status = (ad.get("availability") or {}).get("status")
+        price = (ad.get("pricing") or {}).get("base_rate_per_hour")
+        reputation = (ad.get("reputation") or {}).get("score")
+
+        slot = self._slot.get(soul_id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self._ids)
+                if slot >= self._capacity:
+                    self._grow()
+                self._ids.append(None)
+                self._ads.append(None)
+                self._terms.append(((), None))
+            self._slot[soul_id] = slot
+            self._ids[slot] = soul_id
+            self._alive[slot >> 6] |= _BIT[slot & 63]
+        else:
+            self._unindex(slot)
+
+        for skill in skills:
+            self._set_bit(self._skills, self._skill_counts, skill, slot)
+        if status is not None:
+            self._set_bit(self._statuses, self._status_counts, status, slot)
+        self._terms[slot] = (skills, status)
+        self._ads[slot] = ad
+        self._updated[slot] = now
+        self._price.set(slot, np.nan if price is None else float(price))
+        self._reputation.set(slot, np.nan if reputation is None else float(reputation))
+
+    def _maybe_merge(self, force: bool = False) -> None:
+        for column in (self._price, self._reputation):
+            if force or column.pending() > self.merge_threshold:
+                column.merge()
+
+    def upsert(self, ad: Dict[str, Any], now: float = 0.0) -> None:
+        """Add or refresh one advertisement (§2.1 schema). `now` is used by expire()."""
+        self._upsert(ad, now)
+        self._maybe_merge()
+
+    def upsert_batch(self, ads: Iterable[Dict[str, Any]], now: float = 0.0) -> None:
+        """Add or refresh many advertisements, merging the sorted columns once."""
+        for ad in ads:
+            self._upsert(ad, now)
+        self._maybe_merge(force=True)
+
+    def remove(self, soul_id: str) -> bool:
+        slot = self._slot.pop(soul_id, None)
+        if slot is None:
+            return False
+        self._unindex(slot)
+        self._terms[slot] = ((), None)
+        self._ids[slot] = None
+        self._ads[slot] = None
+        self._alive[slot >> 6] &= ~_BIT[slot & 63]
+        self._price.set(slot, np.nan)
+        self._reputation.set(slot, np.nan)
+        self._free.append(slot)
+        self._maybe_merge()
+        return True
+
+    def expire(self, older_than: float) -> List[str]:
+        """Remove advertisements not refreshed since `older_than` (missed heartbeats)."""
+        live = _slots_of(self._alive)
+        stale = live[self._updated[live] < older_than]
+        removed = [self._ids[slot] for slot in stale]
+        for soul_id in removed:
+            self.remove(soul_id)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(self, skills: Optional[List[str]] = None, max_price: Optional[float] = None,
+              min_reputation: Optional[float] = None, availability: Optional[str] = None,
+              limit: Optional[int] = None) -> List[str]:
+        """
+        Soul ids matching every given filter (§2.2 query parameters).
+
+        Args:
+            skills: Agent must advertise all of these.
+            max_price: Upper bound on pricing.base_rate_per_hour.
+            min_reputation: Lower bound on reputation.score.
+            availability: Required availability.status.
+            limit: Stop after this many matches.
+
+        Returns:
+            Matching soul ids. When a price or reputation range drives the
+            query, matches come back in that column's order (cheapest or
+            lowest-rated first), with advertisements changed since the last
+            merge at the end. Otherwise they come back in slot order.
+        """
+        if limit is not None and limit <= 0:
+            return []
+
+        bitmaps: List[Tuple[int, np.ndarray]] = []
+        for skill in skills or ():
+            bits = self._skills.get(skill)
+            if bits is None:
+                return []
+            bitmaps.append((self._skill_counts[skill], bits))
+        if availability is not None:
+            bits = self._statuses.get(availability)
+            if bits is None:
+                return []
+            bitmaps.append((self._status_counts[availability], bits))
+        bitmaps.sort(key=lambda b: b[0])
+
+        ranges: List[Tuple[_SortedColumn, float, float]] = []
+        if max_price is not None:
+            ranges.append((self._price, -math.inf, float(max_price)))
+        if min_reputation is not None:
+            ranges.append((self._reputation, float(min_reputation), math.inf))
+
+        estimate = bitmaps[0][0] if bitmaps else len(self._slot)
+        driver = min(ranges, key=lambda r: r[0].count(r[1], r[2])) if ranges else None
+
+        if driver is not None and driver[0].count(driver[1], driver[2]) < estimate:
+            chunks = driver[0].range_chunks(driver[1], driver[2])
+            ranges = [r for r in ranges if r[0] is not driver[0]]
+        else:
+            words = [bits for _, bits in bitmaps] or [self._alive]
+            chunks = self._bitmap_chunks(words)
+            bitmaps = []
+
+        found: List[str] = []
+        for slots in chunks:
+            for column, lo, hi in ranges:
+                slots = slots[column.test(slots, lo, hi)]
+            for _, bits in bitmaps:
+                slots = slots[_test_bits(bits, slots)]
+            if limit is not None:
+                slots = slots[:limit - len(found)]
+            found.extend(self._ids[s] for s in slots.tolist())
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def _bitmap_chunks(self, words: List[np.ndarray]) -> Iterable[np.ndarray]:
+        """Slots set in every bitmap of `words`, in growing chunks."""
+        for start, stop in _chunks(0, self._words, _FIRST_CHUNK // 64, _MAX_CHUNK // 64):
+            block = words[0][start:stop]
+            for bits in words[1:]:
+                block = block & bits[start:stop]
+            yield _slots_of(block, start)
+
+    def query_ads(self, **filters) -> List[Dict[str, Any]]:
+        """Like query(), but returns the advertisements (with signatures) themselves."""
+        return [self._ads[self._slot[soul_id]] for soul_id in self.query(**filters)]
@@ -0,0 +1,242 @@
+"""
+OpenClaw Reputation Aggregator
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §3.6 Reputation & Feedback Mesh
+Spec: specs/openclaw_integration.md, §5.2 Threat Model (Reputation Gaming)
+
+Folds feedback messages into a fixed-size aggregate per `to_soul_id`, so
+that reading a reputation never replays the feedback history:
+
+* Each agent keeps a decayed rating sum, a decayed weight and their
+  reference time (the newest feedback timestamp). A new rating decays the
+  aggregate to its own timestamp and adds itself. A rating older than the
+  reference time is decayed to the reference time instead, so ingest order
+  does not matter.
+* `base_score` is the decayed sum over the decayed weight: a rating average
+  in which recent campaigns count more.
+* The §3.6 decay `base_score * exp(-decay_rate * days_since_last_campaign)`
+  is applied lazily, when a score is read.
+
+Every score decays by the same factor between two reads. The ranking key
+`log(base_score) + decay_rate * last_campaign_day` therefore does not depend
+on the read time. Agents sit in two heaps on that key: a max-heap for
+`top_k` and a min-heap for `throttle_decisions`. Both are walked
+best-first, so reading k agents costs O(k log k) whatever the population.
+A heap entry goes stale when its agent receives new feedback, and the heaps
+are rebuilt once stale entries outnumber live ones.
+"""
+
+import heapq
+import math
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+SECONDS_PER_DAY = 86400.0
+
+ALLOW = "ALLOW"
+PROBATION = "PROBATION"
+THROTTLE = "THROTTLE"
+
+
+def _epoch_seconds(timestamp: Any) -> float:
+    """Unix seconds from an ISO-8601 string or a number."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+
+class _Aggregate:
+    __slots__ = ("total", "weight", "ref_day", "count", "key")
+
+    def __init__(self, day: float):
+        self.total = 0.0
+        self.weight = 0.0
+        self.ref_day = day
+        self.count = 0
+        self.key = 0.0
+
+
+class ReputationAggregator:
+    """
+    Running reputation aggregates keyed by to_soul_id.
+
+    Args:
+        decay_rate: Decay per day, for both the §3.6 score decay and the
+            weighting of older feedback within base_score.
+        throttle_below: Agents scoring below this are throttled.
+        probation_feedback: Agents with fewer feedback messages are on probation.
+    """
+
+    def __init__(self, decay_rate: float = 0.01, throttle_below: float = 2.5, probation_feedback: int = 3):
+        if decay_rate < 0:
+            raise ValueError("decay_rate must not be negative")
+        self.decay_rate = decay_rate
+        self.throttle_below = throttle_below
+        self.probation_feedback = probation_feedback
+        self._agents: Dict[str, _Aggregate] = {}
+        self._top: List[Tuple[float, str]] = []
+        self._bottom: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def __contains__(self, soul_id: str) -> bool:
+        return soul_id in self._agents
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse(feedback: Dict[str, Any]) -> Tuple[str, float, float]:
+        to_soul_id = feedback.get("to_soul_id")
+        if not to_soul_id:
+            raise ValueError("Feedback to_soul_id is required")
+        if feedback.get("from_soul_id") == to_soul_id:
+            raise ValueError(f"Self-feedback is not accepted: {to_soul_id}")
+        rating = feedback.get("rating")
+        if not isinstance(rating, (int, float)) or not 1 <= rating <= 5:
+            raise ValueError(f"Feedback rating must be between 1 and 5, got {rating!r}")
+        if "timestamp" not in feedback:
+            raise ValueError("Feedback timestamp is required")
+        return to_soul_id, float(rating), _epoch_seconds(feedback["timestamp"]) / SECONDS_PER_DAY
+
+    def _add(self, soul_id: str, rating: float, day: float) -> None:
+        agg = self._agents.get(soul_id)
+        if agg is None:
+            agg = self._agents[soul_id] = _Aggregate(day)
+        if day >= agg.ref_day:
+            factor = math.exp(-self.decay_rate * (day - agg.ref_day))
+            agg.total = agg.total * factor + rating
+            agg.weight = agg.weight * factor + 1.0
+            agg.ref_day = day
+        else:
+            factor = math.exp(-self.decay_rate * (agg.ref_day - day))
+            agg.total += rating * factor
+            agg.weight += factor
+        agg.count += 1
+
+    def _reindex(self, soul_ids: Iterable[str]) -> None:
+        for soul_id in soul_ids:
+            agg = self._agents[soul_id]
+            agg.key = math.log(agg.total / agg.weight) + self.decay_rate * agg.ref_day
+            heapq.heappush(self._top, (-agg.key, soul_id))
+            heapq.heappush(self._bottom, (agg.key, soul_id))
+        if len(self._top) > 2 * len(self._agents) + 64:
+            self._top = [(-agg.key, soul_id) for soul_id, agg in self._agents.items()]
+            self._bottom = [(agg.key, soul_id) for soul_id, agg in self._agents.items()]
+            heapq.heapify(self._top)
+            heapq.heapify(self._bottom)
+
+    def ingest(self, feedback: Dict[str, Any]) -> None:
+        """Fold one §3.6 feedback message into its agent's aggregate."""
+        self.ingest_batch([feedback])
+
+    def ingest_batch(self, feedback: Iterable[Dict[str, Any]]) -> int:
+        """
+        Fold many feedback messages in. The batch is validated before any of
+        it is applied, and each touched agent is re-ranked once.
+
+        Signatures are not checked here; pass only verified messages.
+
+        Returns:
+            Number of messages ingested.
+
+        Raises:
+            ValueError: A message is missing fields or has an invalid rating.
+        """
+        parsed = [self._parse(item) for item in feedback]
+        for soul_id, rating, day in parsed:
+            self._add(soul_id, rating, day)
+        self._reindex({soul_id for soul_id, _, _ in parsed})
+        return len(parsed)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def base_score(self, soul_id: str) -> Optional[float]:
+        """Decay-weighted average rating, before the §3.6 inactivity decay."""
+        agg = self._agents.get(soul_id)
+        return None if agg is None else agg.total / agg.weight
+
+    def score(self, soul_id: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        §3.6 reputation_score at `now` (Unix seconds, default the current time).
+
+        Returns:
+            The score, or None if the agent has no feedback.
+        """
+        agg = self._agents.get(soul_id)
+        if agg is None:
+            return None
+        return self._score(agg, self._day(now))
+
+    def _day(self, now: Optional[float]) -> float:
+        return (time.time() if now is None else now) / SECONDS_PER_DAY
+
+    def _score(self, agg: _Aggregate, day: float) -> float:
+        # Not clamped at zero days: a read dated before the newest feedback
+        # stays consistent with the heap order instead of jumping
+        return agg.total / agg.weight * math.exp(-self.decay_rate * (day - agg.ref_day))
+
+    def _walk(self, heap: List[Tuple[float, str]], sign: float) -> Iterator[Tuple[str, _Aggregate]]:
+        """Live agents in heap order, without popping the heap."""
+        frontier = [(heap[0], 0)] if heap else []
+        seen = set()
+        while frontier:
+            (key, soul_id), i = heapq.heappop(frontier)
+            agg = self._agents.get(soul_id)
+            if agg is not None and agg.key == sign * key and soul_id not in seen:
+                seen.add(soul_id)
+                yield soul_id, agg
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def top_k(self, k: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """The k highest-scoring agents, best first."""
+        day = self._day(now)
+        ranked = []
+        for soul_id, agg in self._walk(self._top, -1.0):
+            if len(ranked) >= k:
+                break
+            ranked.append({"soul_id": soul_id, "score": self._score(agg, day), "feedback_count": agg.count})
+        return ranked
+
+    def decision(self, soul_id: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Throttling decision for one agent.
+
+        THROTTLE if the score is below `throttle_below`; otherwise PROBATION
+        while the agent has fewer than `probation_feedback` messages
+        (including agents with none); otherwise ALLOW.
+        """
+        agg = self._agents.get(soul_id)
+        if agg is None:
+            return {"soul_id": soul_id, "action": PROBATION, "score": None, "feedback_count": 0}
+        score = self._score(agg, self._day(now))
+        if score < self.throttle_below:
+            action = THROTTLE
+        elif agg.count < self.probation_feedback:
+            action = PROBATION
+        else:
+            action = ALLOW
+        return {"soul_id": soul_id, "action": action, "score": score, "feedback_count": agg.count}
+
+    def throttle_decisions(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        THROTTLE decisions for every agent scoring below `throttle_below`,
+        lowest score first. Walks the min-heap and stops at the first agent at
+        or above the threshold, so the cost tracks the number throttled.
+        """
+        day = self._day(now)
+        decisions = []
+        for soul_id, agg in self._walk(self._bottom, 1.0):
+            score = self._score(agg, day)
+            if score >= self.throttle_below:
+                break
+            decisions.append({"soul_id": soul_id, "action": THROTTLE, "score": score, "feedback_count": agg.count})
+        return decisions
@@ -0,0 +1,769 @@
+"""
+Durable Task Journal
+
+SRS Reference: §4.6 Orchestration (FR6.1, FR6.2), NFR 3.0
+Spec: specs/planner_service.md, Task DAG
+Spec: specs/technical.md, Agent Task Schema, Agent Task Result Schema
+
+Write-ahead journal for planner output and task state. Every manifest the
+planner creates, every claim, result, requeue and cancellation is appended
+to the log before the call returns. After a crash, the queue and the
+campaign DAGs are rebuilt from the journal.
+
+* Records are binary frames: a `<IQBI` header (CRC-32, log sequence number,
+  record type, body length), then the body fields joined by NUL bytes.
+  Manifests and results travel as compact JSON and are not parsed again on
+  recovery.
+* Group commit: callers append under a lock and then wait until their record
+  is durable. The first waiter writes and fsyncs everything buffered so far,
+  and the other waiters return on that same fsync. The number of syncs
+  grows with the number of commit rounds, not with the number of records.
+* The log is split into segments named `wal-<first lsn>.log`. `snapshot()`
+  starts a new segment and writes the state table in columnar form: ids
+  joined by newlines, manifests and results as one buffer plus a length
+  column, dependency edges in CSR order, and numeric columns as NumPy
+  arrays. It then deletes the segments the snapshot covers. A snapshot is
+  taken automatically every `snapshot_every` records.
+* Recovery loads the snapshot with a few bulk splits and `frombuffer` calls.
+  Manifests stay in the loaded buffer and edges stay in the CSR arrays
+  until they are used. Only the records after the snapshot are replayed. A torn frame at the end of the
+  last segment (crash mid-write) is truncated away. Tasks that were claimed
+  but never finished go back to the queue at their original position,
+  since their workers died with the process.
+
+Task states: WAITING (dependencies not yet successful), READY (queued),
+CLAIMED, then SUCCESS / FAILED / ESCALATED or CANCELLED. Within each
+priority tier, READY tasks are served in creation order (FR6.2).
+Cancelling a task also cancels its unfinished dependents.
+"""
+
+import heapq
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+import numpy as np
+
+from src.orchestrator.lifecycle import PRIORITIES
+
+SNAPSHOT_MAGIC = b"CHMJNL\x00\x01"
+SNAPSHOT_FILE = "snapshot.bin"
+
+CREATE = 1
+CLAIM = 2
+RESULT = 3
+REQUEUE = 4
+CANCEL = 5
+CANCEL_CAMPAIGN = 6
+PURGE = 7
+
+# Status codes; PURGED marks a slot freed by purge_campaign
+PURGED = 0
+WAITING = 1
+READY = 2
+CLAIMED = 3
+SUCCESS = 4
+FAILED = 5
+ESCALATED = 6
+CANCELLED = 7
+
+STATUS_NAMES = {WAITING: "WAITING", READY: "READY", CLAIMED: "CLAIMED", SUCCESS: "SUCCESS",
+                FAILED: "FAILED", ESCALATED: "ESCALATED", CANCELLED: "CANCELLED"}
+RESULT_STATUSES = {"SUCCESS": SUCCESS, "FAILED": FAILED, "ESCALATED": ESCALATED}
+TERMINAL = frozenset({SUCCESS, FAILED, ESCALATED, CANCELLED, PURGED})
+
+_HEADER = struct.Struct("<IQBI")
+_SNAPSHOT_HEADER = struct.Struct("<QQ")
+_SECTION = struct.Struct("<QI")
+_SNAPSHOT_SECTIONS = 13
+_PRIORITY_CODES = {p: i for i, p in enumerate(PRIORITIES)}
+# Separators used by the record and snapshot encodings
+_RESERVED = re.compile("[\0\n,]")
+
+
+def _segment_name(lsn: int) -> str:
+    return f"wal-{lsn:020d}.log"
+
+
+def _fsync_dir(directory: str) -> None:
+    """Make renames and new files in `directory` durable (no-op where unsupported)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _encode(*fields: Any) -> bytes:
+    return b"\0".join(f if isinstance(f, bytes) else str(f).encode("utf-8") for f in fields)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class TaskJournal:
+    """
+    Durable task queue and DAG state backed by a write-ahead log.
+
+    Args:
+        directory: Holds the snapshot and the log segments; created if missing.
+            Existing contents are recovered on open.
+        fsync: Make every mutation durable before it returns, by group
+            commit. Off means the log is written through the OS cache, and
+            a power loss can drop the last records.
+        snapshot_every: Records between automatic snapshots; 0 disables them.
+            This bounds both the replay on recovery and the log's size on disk.
+
+    Attributes:
+        recovery: Stats from opening the journal: snapshot_lsn, replayed,
+            truncated_bytes, requeued, tasks and seconds.
+        syncs: fsync calls made by group commit, for verifying batching.
+    """
+
+    def __init__(self, directory: str, fsync: bool = True, snapshot_every: int = 100_000):
+        if snapshot_every < 0:
+            raise ValueError("snapshot_every must be >= 0")
+        self.directory = directory
+        self.fsync = fsync
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._snapshot_lock = threading.Lock()
+        self._reset()
+
+        self._lsn = 0
+        self._durable = 0
+        self._since_snapshot = 0
+        self._buffer: List[bytes] = []
+        self._syncing = False
+        self._fd: Optional[int] = None
+        self.syncs = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.recovery = self._recover()
+        self._open_segment()
+
+    def _reset(self) -> None:
+        # Columnar state, indexed by creation order; the index is also the FIFO position
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._campaigns: List[str] = []
+        self._owners: List[str] = []
+        self._status = bytearray()
+        self._priority = bytearray()
+        self._waiting: List[int] = []
+        # Manifests of the first _base_n tasks (loaded from the snapshot) are
+        # slices of one buffer; later ones are kept per task in _manifests
+        self._base_n = 0
+        self._base_manifests = b""
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._manifests: List[bytes] = []
+        self._results: Dict[int, bytes] = {}
+        # Unresolved dependency edges: parent index -> dependent indices. Edges
+        # loaded from the snapshot stay in CSR arrays until their parent resolves.
+        self._dependents: Dict[int, List[int]] = {}
+        self._edge_start = np.zeros(1, dtype=np.int64)
+        self._edge_children = np.zeros(0, dtype=np.int32)
+        self._ready: List[List[int]] = [[] for _ in PRIORITIES]
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def submit(self, tasks: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Journal a batch of task manifests, e.g. the output of plan_campaign.
+
+        Dependencies must name known tasks or tasks earlier in the batch, so
+        the planner's topological order is accepted as is. The whole batch
+        is made durable in one commit.
+
+        Returns:
+            Task ids that are READY immediately.
+
+        Raises:
+            ValueError: Missing fields, a duplicate task_id, an unknown
+                priority or dependency.
+        """
+        records = []
+        for task in tasks:
+            task_id = task.get("task_id")
+            campaign_id = task.get("campaign_id")
+            if not task_id or not campaign_id:
+                raise ValueError("task_id and campaign_id are required")
+            if _RESERVED.search(task_id) or _RESERVED.search(campaign_id):
+                raise ValueError(f"Invalid task_id or campaign_id: {task_id!r}, {campaign_id!r}")
+            priority = task.get("priority", "NORMAL")
+            if priority not in _PRIORITY_CODES:
+                raise ValueError(f"Unknown priority: {priority}")
+            records.append((task_id, campaign_id, _PRIORITY_CODES[priority],
+                            list(task.get("dependencies", [])), _dumps(task)))
+
+        ready = []
+        with self._lock:
+            batch = set()
+            for task_id, _, _, deps, _ in records:
+                if task_id in self._index or task_id in batch:
+                    raise ValueError(f"Task already journaled: {task_id}")
+                for dep in deps:
+                    if dep not in self._index and dep not in batch:
+                        raise ValueError(f"Unknown dependency {dep} for task {task_id}")
+                batch.add(task_id)
+            for task_id, campaign_id, priority, deps, manifest in records:
+                self._append(CREATE, task_id, campaign_id, priority, ",".join(deps), manifest)
+                if self._apply_create(task_id, campaign_id, priority, deps, manifest):
+                    ready.append(task_id)
+            lsn = self._lsn
+        self._commit(lsn)
+        return ready
+
+    def claim(self, soul_id: str, priorities: Iterable[str] = PRIORITIES) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest READY task of the highest non-empty tier.
+
+        Returns:
+            The task manifest, or None if nothing is ready.
+        """
+        if not soul_id or _RESERVED.search(soul_id):
+            raise ValueError(f"Invalid soul_id: {soul_id!r}")
+        with self._lock:
+            idx = None
+            for priority in priorities:
+                heap = self._ready[_PRIORITY_CODES[priority]]
+                while heap:
+                    candidate = heapq.heappop(heap)
+                    if self._status[candidate] == READY:
+                        idx = candidate
+                        break
+                if idx is not None:
+                    break
+            if idx is None:
+                return None
+            self._append(CLAIM, self._ids[idx], soul_id)
+            self._apply_claim(idx, soul_id)
+            manifest = self._manifest(idx)
+            lsn = self._lsn
+        self._commit(lsn)
+        return json.loads(manifest)
+
+    def complete(self, result: Dict[str, Any]) -> List[str]:
+        """
+        Journal a task result (TASK_RESULT_SCHEMA) and release its dependents.
+
+        A late result for a task that is already finished or cancelled is
+        ignored.
+
+        Returns:
+            Dependent task ids that became READY.
+
+        Raises:
+            ValueError: Unknown task or result status.
+        """
+        status = RESULT_STATUSES.get(result.get("status"))
+        if status is None:
+            raise ValueError(f"Unknown result status: {result.get('status')}")
+        data = _dumps(result)
+        with self._lock:
+            idx = self._lookup(result.get("task_id"))
+            if self._status[idx] in TERMINAL:
+                return []
+            self._append(RESULT, self._ids[idx], status, data)
+            released = self._apply_result(idx, status, data)
+            lsn = self._lsn
+        self._commit(lsn)
+        return [self._ids[i] for i in released]
+
+    def requeue(self, task_ids: Iterable[str]) -> List[str]:
+        """Return claimed tasks to the queue at their original position (e.g. a lost lease)."""
+        requeued = []
+        with self._lock:
+            for task_id in task_ids:
+                idx = self._lookup(task_id)
+                if self._status[idx] == CLAIMED:
+                    self._append(REQUEUE, task_id)
+                    self._apply_requeue(idx)
+                    requeued.append(task_id)
+            lsn = self._lsn
+        self._commit(lsn)
+        return requeued
+
+    def cancel(self, task_id: str, reason: str = "cancelled") -> List[str]:
+        """
+        Cancel a task and every unfinished task that depends on it.
+
+        Returns:
+            The cancelled task ids.
+        """
+        with self._lock:
+            idx = self._lookup(task_id)
+            if self._status[idx] in TERMINAL:
+                return []
+            self._append(CANCEL, task_id, reason)
+            cancelled = self._apply_cancel([idx])
+            lsn = self._lsn
+        self._commit(lsn)
+        return [self._ids[i] for i in cancelled]
+
+    def cancel_campaign(self, campaign_id: str, reason: str = "cancelled") -> List[str]:
+        """Cancel every unfinished task of a campaign. Returns the cancelled task ids."""
+        with self._lock:
+            self._append(CANCEL_CAMPAIGN, campaign_id, reason)
+            cancelled = self._apply_cancel(self._campaign_indices(campaign_id))
+            lsn = self._lsn
+        self._commit(lsn)
+        return [self._ids[i] for i in cancelled]
+
+    def purge_campaign(self, campaign_id: str) -> int:
+        """
+        Forget a finished campaign: its manifests, results and task ids.
+
+        Returns:
+            The number of tasks purged.
+
+        Raises:
+            ValueError: The campaign still has unfinished tasks.
+        """
+        with self._lock:
+            indices = self._campaign_indices(campaign_id)
+            if any(self._status[i] not in TERMINAL for i in indices):
+                raise ValueError(f"Campaign {campaign_id} has unfinished tasks")
+            if not indices:
+                return 0
+            self._append(PURGE, campaign_id)
+            self._apply_purge(indices)
+            lsn = self._lsn
+        self._commit(lsn)
+        return len(indices)
+
+    # ------------------------------------------------------------------
+    # State transitions, shared by live calls and recovery
+    # ------------------------------------------------------------------
+
+    def _apply_create(self, task_id: str, campaign_id: str, priority: int, deps: List[str],
+                      manifest: bytes) -> bool:
+        idx = len(self._ids)
+        self._ids.append(task_id)
+        self._index[task_id] = idx
+        self._campaigns.append(campaign_id)
+        self._owners.append("")
+        self._priority.append(priority)
+        self._manifests.append(manifest)
+
+        waiting = 0
+        for dep in deps:
+            parent = self._index[dep]
+            if self._status[parent] != SUCCESS:
+                self._dependents.setdefault(parent, []).append(idx)
+                waiting += 1
+        self._waiting.append(waiting)
+        if waiting:
+            self._status.append(WAITING)
+            return False
+        self._status.append(READY)
+        heapq.heappush(self._ready[priority], idx)
+        return True
+
+    def _apply_claim(self, idx: int, soul_id: str) -> None:
+        self._status[idx] = CLAIMED
+        self._owners[idx] = soul_id
+
+    def _apply_result(self, idx: int, status: int, data: bytes) -> List[int]:
+        self._status[idx] = status
+        self._results[idx] = data
+        released = []
+        if status != SUCCESS:
+            # Dependents of a failed or escalated task wait for a replan or a cancel
+            return released
+        for child in self._take_dependents(idx):
+            self._waiting[child] -= 1
+            if self._waiting[child] == 0 and self._status[child] == WAITING:
+                self._status[child] = READY
+                heapq.heappush(self._ready[self._priority[child]], child)
+                released.append(child)
+        return released
+
+    def _apply_requeue(self, idx: int) -> None:
+        self._status[idx] = READY
+        self._owners[idx] = ""
+        heapq.heappush(self._ready[self._priority[idx]], idx)
+
+    def _apply_cancel(self, roots: List[int]) -> List[int]:
+        cancelled = []
+        stack = list(roots)
+        while stack:
+            idx = stack.pop()
+            if self._status[idx] in TERMINAL:
+                continue
+            self._status[idx] = CANCELLED
+            cancelled.append(idx)
+            stack.extend(self._take_dependents(idx))
+        cancelled.sort()
+        return cancelled
+
+    def _apply_purge(self, indices: List[int]) -> None:
+        for idx in indices:
+            self._status[idx] = PURGED
+            del self._index[self._ids[idx]]
+            if idx >= self._base_n:
+                self._manifests[idx - self._base_n] = b""
+            self._results.pop(idx, None)
+            self._take_dependents(idx)
+
+    def _apply_record(self, record_type: int, fields: List[bytes]) -> None:
+        """Replay one log record against the in-memory state."""
+        if record_type == CREATE:
+            deps = fields[3].decode("utf-8")
+            self._apply_create(fields[0].decode("utf-8"), fields[1].decode("utf-8"), int(fields[2]),
+                               deps.split(",") if deps else [], fields[4])
+        elif record_type == CLAIM:
+            self._apply_claim(self._index[fields[0].decode("utf-8")], fields[1].decode("utf-8"))
+        elif record_type == RESULT:
+            self._apply_result(self._index[fields[0].decode("utf-8")], int(fields[1]), fields[2])
+        elif record_type == REQUEUE:
+            self._apply_requeue(self._index[fields[0].decode("utf-8")])
+        elif record_type == CANCEL:
+            self._apply_cancel([self._index[fields[0].decode("utf-8")]])
+        elif record_type == CANCEL_CAMPAIGN:
+            self._apply_cancel(self._campaign_indices(fields[0].decode("utf-8")))
+        elif record_type == PURGE:
+            self._apply_purge(self._campaign_indices(fields[0].decode("utf-8")))
+        else:
+            raise ValueError(f"Unknown journal record type: {record_type}")
+
+    def _take_dependents(self, idx: int) -> List[int]:
+        """Remove and return a task's unresolved dependents; called once, as the task resolves."""
+        children = self._dependents.pop(idx, [])
+        if idx < self._base_n:
+            lo, hi = self._edge_start[idx], self._edge_start[idx + 1]
+            if hi > lo:
+                children = self._edge_children[lo:hi].tolist() + children
+        return children
+
+    def _manifest(self, idx: int) -> bytes:
+        if idx < self._base_n:
+            return self._base_manifests[self._base_offsets[idx]:self._base_offsets[idx + 1]]
+        return self._manifests[idx - self._base_n]
+
+    def _lookup(self, task_id: Optional[str]) -> int:
+        idx = self._index.get(task_id)
+        if idx is None:
+            raise ValueError(f"Unknown task: {task_id}")
+        return idx
+
+    def _campaign_indices(self, campaign_id: str) -> List[int]:
+        return [i for i, c in enumerate(self._campaigns) if c == campaign_id and self._status[i] != PURGED]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def status(self, task_id: str) -> Optional[str]:
+        idx = self._index.get(task_id)
+        return STATUS_NAMES[self._status[idx]] if idx is not None else None
+
+    def owner(self, task_id: str) -> Optional[str]:
+        idx = self._index.get(task_id)
+        return (self._owners[idx] or None) if idx is not None else None
+
+    def manifest(self, task_id: str) -> Optional[Dict[str, Any]]:
+        idx = self._index.get(task_id)
+        return json.loads(self._manifest(idx)) if idx is not None else None
+
+    def result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        idx = self._index.get(task_id)
+        data = self._results.get(idx) if idx is not None else None
+        return json.loads(data) if data else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each state."""
+        with self._lock:
+            bins = np.bincount(np.frombuffer(bytes(self._status), dtype=np.uint8), minlength=CANCELLED + 1)
+        return {name: int(bins[code]) for code, name in STATUS_NAMES.items()}
+
+    # ------------------------------------------------------------------
+    # Log writing and group commit
+    # ------------------------------------------------------------------
+
+    def _append(self, record_type: int, *fields: Any) -> None:
+        """Frame a record into the commit buffer. Caller holds the lock."""
+        self._lsn += 1
+        self._since_snapshot += 1
+        body = _encode(*fields)
+        frame = _HEADER.pack(0, self._lsn, record_type, len(body))[4:] + body
+        self._buffer.append(struct.pack("<I", zlib.crc32(frame)) + frame)
+
+    def _commit(self, lsn: int) -> None:
+        """Return once every record up to `lsn` is written (and fsynced if enabled)."""
+        with self._cond:
+            while self._durable < lsn:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                # Lead this round: take everything buffered so far, then write it outside the lock
+                self._syncing = True
+                data = b"".join(self._buffer)
+                self._buffer.clear()
+                target = self._lsn
+                self._cond.release()
+                try:
+                    os.write(self._fd, data)
+                    if self.fsync:
+                        os.fsync(self._fd)
+                except BaseException:
+                    self._cond.acquire()
+                    # Put the round back so the next leader retries it
+                    self._buffer.insert(0, data)
+                    self._syncing = False
+                    self._cond.notify_all()
+                    raise
+                self._cond.acquire()
+                self._syncing = False
+                self._cond.notify_all()
+                if self.fsync:
+                    self.syncs += 1
+                self._durable = target
+            due = self.snapshot_every and self._since_snapshot >= self.snapshot_every
+        if due and self._snapshot_lock.acquire(blocking=False):
+            try:
+                self._snapshot()
+            finally:
+                self._snapshot_lock.release()
+
+    def _drain(self) -> None:
+        """Write and fsync the commit buffer. Caller holds the lock and no round is in progress."""
+        while self._syncing:
+            self._cond.wait()
+        if self._buffer:
+            os.write(self._fd, b"".join(self._buffer))
+            self._buffer.clear()
+        os.fsync(self._fd)
+        self._durable = self._lsn
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self.directory, _segment_name(self._lsn + 1))
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+        _fsync_dir(self.directory)
+
+    def sync(self) -> None:
+        """Flush and fsync everything appended so far."""
+        with self._cond:
+            self._drain()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._fd is None:
+                return
+            self._drain()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "TaskJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> int:
+        """
+        Write a snapshot and delete the log segments it covers.
+
+        Returns:
+            The log sequence number the snapshot includes.
+        """
+        with self._snapshot_lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> int:
+        with self._cond:
+            # Seal the current segment so every record in older segments is covered
+            self._drain()
+            os.close(self._fd)
+            lsn = self._lsn
+            self._open_segment()
+            self._since_snapshot = 0
+            state = (list(self._ids), list(self._campaigns), list(self._owners), bytes(self._status),
+                     bytes(self._priority), list(self._waiting), list(self._manifests), dict(self._results),
+                     {parent: list(children) for parent, children in self._dependents.items()})
+
+        self._write_snapshot(lsn, *state)
+        for name in os.listdir(self.directory):
+            if name.startswith("wal-") and name < _segment_name(lsn + 1):
+                os.remove(os.path.join(self.directory, name))
+        return lsn
+
+    def _write_snapshot(self, lsn: int, ids, campaigns, owners, status, priority, waiting,
+                        manifests, results, dependents) -> None:
+        # Drop purged slots and renumber the rest, keeping creation order
+        codes = np.frombuffer(status, dtype=np.uint8)
+        live = np.flatnonzero(codes != PURGED)
+        remap = np.full(len(codes), -1, dtype=np.int64)
+        remap[live] = np.arange(len(live))
+        keep = live.tolist()
+        base_n = self._base_n
+
+        # Snapshot edges whose parent has not resolved yet, plus the ones added since
+        base_parents = np.repeat(np.arange(base_n), np.diff(self._edge_start))
+        pending = ~np.isin(codes[base_parents], (SUCCESS, CANCELLED, PURGED))
+        parents = remap[np.concatenate([base_parents[pending], np.fromiter(
+            (p for p, cs in dependents.items() for _ in cs), dtype=np.int64)]).astype(np.int64)]
+        children = remap[np.concatenate([self._edge_children[pending], np.fromiter(
+            (c for cs in dependents.values() for c in cs), dtype=np.int64)]).astype(np.int64)]
+        edges = (parents >= 0) & (children >= 0)
+        order = np.lexsort((children[edges], parents[edges]))
+
+        offsets = self._base_offsets
+        lengths = np.concatenate([np.diff(offsets), [len(m) for m in manifests]]).astype(np.int64)[live]
+        if len(live) >= base_n and (base_n == 0 or live[base_n - 1] == base_n - 1):
+            base_blob = self._base_manifests[offsets[0]:offsets[-1]]
+        else:
+            base_blob = b"".join(self._base_manifests[offsets[i]:offsets[i + 1]] for i in keep if i < base_n)
+        finished = sorted(results)
+
+        sections = [
+            "\n".join(ids[i] for i in keep).encode("utf-8"),
+            "\n".join(campaigns[i] for i in keep).encode("utf-8"),
+            "\n".join(owners[i] for i in keep).encode("utf-8"),
+            codes[live].tobytes(),
+            np.frombuffer(priority, dtype=np.uint8)[live].tobytes(),
+            np.asarray(waiting, dtype=np.int32)[live].tobytes(),
+            parents[edges][order].astype(np.int32).tobytes(),
+            children[edges][order].astype(np.int32).tobytes(),
+            lengths.tobytes(),
+            bytes(base_blob) + b"".join(manifests[i - base_n] for i in keep if i >= base_n),
+            remap[finished].astype(np.int32).tobytes(),
+            np.array([len(results[i]) for i in finished], dtype=np.int64).tobytes(),
+            b"".join(results[i] for i in finished),
+        ]
+
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + _SNAPSHOT_HEADER.pack(lsn, len(keep)))
+            for data in sections:
+                f.write(_SECTION.pack(len(data), zlib.crc32(data)))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(self.directory)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _load_snapshot(self, path: str) -> int:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a task journal snapshot: {path}")
+        lsn, n = _SNAPSHOT_HEADER.unpack_from(data, len(SNAPSHOT_MAGIC))
+        pos = len(SNAPSHOT_MAGIC) + _SNAPSHOT_HEADER.size
+        view = memoryview(data)
+        sections, starts = [], []
+        for _ in range(_SNAPSHOT_SECTIONS):
+            length, crc = _SECTION.unpack_from(data, pos)
+            pos += _SECTION.size
+            section = view[pos:pos + length]
+            if len(section) != length or zlib.crc32(section) != crc:
+                raise ValueError(f"Corrupt task journal snapshot: {path}")
+            sections.append(section)
+            starts.append(pos)
+            pos += length
+
+        def strings(section):
+            return str(section, "utf-8").split("\n") if n else []
+
+        ids = strings(sections[0])
+        self._ids = ids
+        self._index = dict(zip(ids, range(n)))
+        self._campaigns = strings(sections[1])
+        self._owners = strings(sections[2])
+        self._status = bytearray(sections[3])
+        self._priority = bytearray(sections[4])
+        self._waiting = np.frombuffer(sections[5], dtype=np.int32).tolist()
+
+        # Edges are sorted by parent: a task's dependents are one CSR row
+        self._base_n = n
+        parents = np.frombuffer(sections[6], dtype=np.int32)
+        self._edge_start = np.concatenate([[0], np.cumsum(np.bincount(parents, minlength=n))]).astype(np.int64)
+        self._edge_children = np.frombuffer(sections[7], dtype=np.int32)
+
+        # Manifests stay in the file buffer until someone reads them
+        self._base_manifests = data
+        lengths = np.frombuffer(sections[8], dtype=np.int64)
+        self._base_offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64) + starts[9]
+
+        ends = np.cumsum(np.frombuffer(sections[11], dtype=np.int64)).tolist()
+        blob = bytes(sections[12])
+        self._results = {i: blob[a:b] for i, a, b in
+                         zip(np.frombuffer(sections[10], dtype=np.int32).tolist(), [0] + ends[:-1], ends)}
+
+        codes = np.frombuffer(self._status, dtype=np.uint8)
+        prios = np.frombuffer(self._priority, dtype=np.uint8)
+        # Indices come out ascending, which is already a valid heap
+        self._ready = [np.flatnonzero((codes == READY) & (prios == p)).tolist() for p in range(len(PRIORITIES))]
+        return lsn
+
+    def _replay_segment(self, path: str, after: int, last: bool) -> Tuple[int, int, int]:
+        """Apply the records after `after`. Returns (replayed, last lsn, truncated bytes)."""
+        with open(path, "rb") as f:
+            data = f.read()
+        pos = replayed = 0
+        lsn = after
+        while pos + _HEADER.size <= len(data):
+            crc, record_lsn, record_type, length = _HEADER.unpack_from(data, pos)
+            end = pos + _HEADER.size + length
+            if end > len(data) or zlib.crc32(data[pos + 4:end]) != crc:
+                break
+            if record_lsn > after:
+                self._apply_record(record_type, data[pos + _HEADER.size:end].split(b"\0"))
+                lsn = record_lsn
+                replayed += 1
+            pos = end
+
+        truncated = len(data) - pos
+        if truncated:
+            if not last:
+                raise ValueError(f"Corrupt task journal segment: {path}")
+            os.truncate(path, pos)
+        return replayed, lsn, truncated
+
+    def _recover(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        lsn = self._load_snapshot(snapshot_path) if os.path.exists(snapshot_path) else 0
+        snapshot_lsn = lsn
+
+        segments = sorted(name for name in os.listdir(self.directory) if name.startswith("wal-"))
+        replayed = truncated = 0
+        for i, name in enumerate(segments):
+            count, lsn, cut = self._replay_segment(os.path.join(self.directory, name), lsn,
+                                                   last=i == len(segments) - 1)
+            replayed += count
+            truncated += cut
+
+        # Claims died with the process that held them
+        claimed = np.flatnonzero(np.frombuffer(bytes(self._status), dtype=np.uint8) == CLAIMED).tolist()
+        for idx in claimed:
+            self._apply_requeue(idx)
+
+        self._lsn = self._durable = lsn
+        self._since_snapshot = replayed
+        return {"snapshot_lsn": snapshot_lsn, "replayed": replayed, "truncated_bytes": truncated,
+                "requeued": len(claimed), "tasks": len(self._index),
+                "seconds": time.perf_counter() - start}
@@ -0,0 +1,382 @@
+"""
+Worker Lifecycle: Heartbeats, Leases and Failure Detection
+
+SRS Reference: §4.6 Orchestration (FR6.2), §3.1 FastRender Swarm
+Spec: specs/technical.md, Redis Key Patterns (task_lease, worker heartbeat)
+
+Workers claim tasks under a 5-minute lease and report liveness through
+`worker:<soul_id>` heartbeats that expire after 60 seconds. A heartbeat does
+not become one backend write per in-flight task. Heartbeats are coalesced,
+and `flush()` sends them in a single batched write. For every worker that
+beat since the last flush, that write refreshes the worker key and renews
+every lease the worker holds, so long tasks keep their lease for as long as
+the worker is alive.
+
+A phi-accrual failure detector learns each worker's heartbeat rhythm. With a
+hard timeout as a backstop, it decides when a worker is dead. `reap()` then
+requeues the dead worker's leases, plus any lease that simply expired, in
+one bulk call. Each requeued task goes back into its priority tier at its
+original position, which preserves FIFO order (FR6.2).
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+PRIORITIES = ("HIGH", "NORMAL", "LOW")
+
+DEFAULT_LEASE_TTL = 300.0
+DEFAULT_HEARTBEAT_TTL = 60.0
+
+
+class LeaseStore:
+    """
+    In-process stand-in for the Redis task_queue / task_lease / worker keys.
+
+    Every public method corresponds to one round trip (a MULTI/EXEC pipeline
+    against Redis). `round_trips` counts them so callers can verify batching.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: Dict[str, List[Tuple[float, str]]] = {p: [] for p in PRIORITIES}
+        # task_id -> [soul_id, expires_at, priority, score]
+        self.leases: Dict[str, List[Any]] = {}
+        # soul_id -> {"status", "last_heartbeat", "expires_at"}
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self._seq = itertools.count()
+        self.round_trips = 0
+
+    def enqueue(self, task_id: str, priority: str = "NORMAL", score: Optional[float] = None) -> None:
+        """ZADD task_queue:<priority>. Score defaults to arrival order."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        with self._lock:
+            self.round_trips += 1
+            self._push(task_id, priority, next(self._seq) if score is None else score)
+
+    def _push(self, task_id: str, priority: str, score: Any) -> None:
+        """Queue a task; `score` is what _pop returned for it when it is requeued."""
+        heapq.heappush(self._queues[priority], (score, task_id))
+
+    def _pop(self, now: float) -> Optional[Tuple[str, str, Any]]:
+        """Remove the next task to claim. Returns (task_id, priority, score) or None."""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            if queue:
+                score, task_id = heapq.heappop(queue)
+                return task_id, priority, score
+        return None
+
+    def claim(self, soul_id: str, now: float, lease_ttl: float) -> Optional[str]:
+        """Pop the oldest task of the highest non-empty tier and lease it to soul_id."""
+        with self._lock:
+            self.round_trips += 1
+            popped = self._pop(now)
+            if popped is None:
+                return None
+            task_id, priority, score = popped
+            self.leases[task_id] = [soul_id, now + lease_ttl, priority, score]
+            return task_id
+
+    def heartbeat_batch(self, beats: Iterable[Tuple[str, Iterable[str]]], now: float,
+                        worker_ttl: float, lease_ttl: float) -> Dict[str, List[str]]:
+        """
+        Refresh many workers and renew their leases in one round trip.
+
+        Args:
+            beats: (soul_id, task_ids the worker believes it holds) pairs.
+
+        Returns:
+            soul_id -> task_ids the worker no longer holds (lease expired and
+            was requeued, or claimed by someone else). Workers should abandon these.
+        """
+        lost: Dict[str, List[str]] = {}
+        with self._lock:
+            self.round_trips += 1
+            for soul_id, task_ids in beats:
+                self.workers[soul_id] = {"status": "ACTIVE", "last_heartbeat": now, "expires_at": now + worker_ttl}
+                for task_id in task_ids:
+                    lease = self.leases.get(task_id)
+                    if lease is None or lease[0] != soul_id:
+                        lost.setdefault(soul_id, []).append(task_id)
+                    else:
+                        lease[1] = now + lease_ttl
+        return lost
+
+    def release(self, task_ids: Iterable[str]) -> None:
+        """Drop leases for finished tasks."""
+        with self._lock:
+            self.round_trips += 1
+            for task_id in task_ids:
+                self.leases.pop(task_id, None)
+
+    def requeue(self, task_ids: Iterable[str], soul_ids: Iterable[str] = ()) -> List[str]:
+        """
+        Move leased tasks back to their queues and delete dead worker keys.
+
+        Returns:
+            The task ids that were actually requeued.
+        """
+        requeued = []
+        with self._lock:
+            self.round_trips += 1
+            for task_id in task_ids:
+                lease = self.leases.pop(task_id, None)
+                if lease is not None:
+                    self._push(task_id, lease[2], lease[3])
+                    requeued.append(task_id)
+            for soul_id in soul_ids:
+                self.workers.pop(soul_id, None)
+        return requeued
+
+    def scan_leases(self, now: float, soul_ids: Iterable[str] = ()) -> List[str]:
+        """Task ids whose lease expired by `now` or is held by one of soul_ids."""
+        dead = set(soul_ids)
+        with self._lock:
+            self.round_trips += 1
+            return [task_id for task_id, (owner, expires_at, _, _) in self.leases.items()
+                    if expires_at <= now or owner in dead]
+
+    def queue_length(self, priority: Optional[str] = None) -> int:
+        with self._lock:
+            if priority is not None:
+                return len(self._queues[priority])
+            return sum(len(q) for q in self._queues.values())
+
+
+class PhiAccrualDetector:
+    """
+    Phi-accrual failure detector (Hayashibara et al.) over heartbeat arrivals.
+
+    phi is -log10 of the probability that a heartbeat arrives even later than
+    the current silence, given the mean and deviation of recent intervals. A
+    worker is suspected when phi exceeds `threshold`, or unconditionally once
+    it has been silent for `timeout` seconds.
+
+    Args:
+        threshold: phi above which a worker is considered dead (8 ~ 1e-8 odds).
+        window: Number of recent intervals kept per worker.
+        min_std: Floor on the interval deviation, so very regular workers are
+            not declared dead over a little jitter.
+        first_interval: Assumed interval before a worker has a history.
+        timeout: Silence after which a worker is dead regardless of phi.
+
+    Only periodic heartbeats are sampled into the interval statistics. Other
+    signs of life, such as a claim, reset the silence through `touch` but
+    would otherwise skew the mean towards their own, burstier rhythm.
+    """
+
+    def __init__(self, threshold: float = 8.0, window: int = 100, min_std: float = 0.5,
+                 first_interval: float = 10.0, timeout: float = DEFAULT_HEARTBEAT_TTL):
+        self.threshold = threshold
+        self.window = window
+        self.min_std = min_std
+        self.first_interval = first_interval
+        self.timeout = timeout
+        # soul_id -> [last_heartbeat, intervals, sum, sum_of_squares, last_seen]
+        self._history: Dict[str, List[Any]] = {}
+
+    def __contains__(self, soul_id: str) -> bool:
+        return soul_id in self._history
+
+    def _entry(self, soul_id: str, now: float) -> Optional[List[Any]]:
+        """The worker's history, or None after creating it for a first arrival."""
+        entry = self._history.get(soul_id)
+        if entry is None:
+            # Seed with the expected interval so phi is meaningful from the start
+            i = self.first_interval
+            self._history[soul_id] = [now, deque([i]), i, i * i, now]
+        return entry
+
+    def touch(self, soul_id: str, now: float) -> None:
+        """Record a sign of life that is not a periodic heartbeat."""
+        entry = self._entry(soul_id, now)
+        if entry is not None:
+            entry[4] = max(entry[4], now)
+
+    def heartbeat(self, soul_id: str, now: float) -> None:
+        entry = self._entry(soul_id, now)
+        if entry is None:
+            return
+
+        interval = now - entry[0]
+        entry[0] = now
+        entry[4] = max(entry[4], now)
+        intervals = entry[1]
+        if len(intervals) == self.window:
+            old = intervals.popleft()
+            entry[2] -= old
+            entry[3] -= old * old
+        intervals.append(interval)
+        entry[2] += interval
+        entry[3] += interval * interval
+
+    def phi(self, soul_id: str, now: float) -> float:
+        entry = self._history.get(soul_id)
+        if entry is None:
+            return 0.0
+        _, intervals, total, squares, last = entry
+        n = len(intervals)
+        mean = total / n
+        std = max(self.min_std, math.sqrt(max(0.0, squares / n - mean * mean)))
+
+        # Logistic approximation of the normal tail, as used by Akka/Cassandra
+        y = (now - last - mean) / std
+        e = math.exp(-y * (1.5976 + 0.070566 * y * y))
+        p_later = e / (1.0 + e) if now - last > mean else 1.0 - 1.0 / (1.0 + e)
+        return -math.log10(max(p_later, 1e-300))
+
+    def is_alive(self, soul_id: str, now: float) -> bool:
+        entry = self._history.get(soul_id)
+        if entry is None:
+            return False
+        return now - entry[4] < self.timeout and self.phi(soul_id, now) <= self.threshold
+
+    def suspects(self, now: float) -> List[str]:
+        return [soul_id for soul_id in self._history if not self.is_alive(soul_id, now)]
+
+    def remove(self, soul_id: str) -> None:
+        self._history.pop(soul_id, None)
+
+
+class LeaseManager:
+    """
+    Worker-facing lease and heartbeat API.
+
+    Usage:
+        task_id = manager.claim(soul_id)
+        manager.heartbeat(soul_id)        # cheap; coalesced until flush()
+        manager.complete(soul_id, task_id)
+
+    A background thread (start/stop) calls flush() and reap() every
+    `heartbeat_interval` seconds. Tests can call them directly with `now`.
+    """
+
+    def __init__(self, store: Optional[LeaseStore] = None, lease_ttl: float = DEFAULT_LEASE_TTL,
+                 heartbeat_ttl: float = DEFAULT_HEARTBEAT_TTL, heartbeat_interval: float = 10.0,
+                 detector: Optional[PhiAccrualDetector] = None, agents=None, clock=time.monotonic):
+        if heartbeat_interval >= heartbeat_ttl:
+            raise ValueError("heartbeat_interval must be shorter than heartbeat_ttl")
+        self.store = store or LeaseStore()
+        self.lease_ttl = lease_ttl
+        self.heartbeat_ttl = heartbeat_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.detector = detector or PhiAccrualDetector(first_interval=heartbeat_interval, timeout=heartbeat_ttl)
+        # Optional AgentStateStore; claims are refused for agents that are not ACTIVE (FR6.1)
+        self.agents = agents
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, set] = {}
+        self._pending: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def claim(self, soul_id: str, now: Optional[float] = None) -> Optional[str]:
+        """
+        Lease the next task to soul_id; also counts as a heartbeat.
+
+        Returns:
+            The task id, or None if the queue is empty or the agent may not claim.
+        """
+        now = self.clock() if now is None else now
+        if self.agents is not None and not self.agents.can_claim(soul_id):
+            return None
+        task_id = self.store.claim(soul_id, now, self.lease_ttl)
+        with self._lock:
+            if task_id is not None:
+                self._in_flight.setdefault(soul_id, set()).add(task_id)
+            self._beat(soul_id, now, sample=False)
+        return task_id
+
+    def complete(self, soul_id: str, task_id: str) -> None:
+        """Release a finished task's lease."""
+        with self._lock:
+            self._in_flight.get(soul_id, set()).discard(task_id)
+        self.store.release([task_id])
+
+    def heartbeat(self, soul_id: str, now: Optional[float] = None) -> None:
+        """Record that soul_id is alive. The write happens at the next flush()."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._beat(soul_id, now)
+
+    def _beat(self, soul_id: str, now: float, sample: bool = True) -> None:
+        if sample:
+            self.detector.heartbeat(soul_id, now)
+        else:
+            self.detector.touch(soul_id, now)
+        self._pending[soul_id] = now
+
+    def in_flight(self, soul_id: str) -> List[str]:
+        with self._lock:
+            return sorted(self._in_flight.get(soul_id, ()))
+
+    def flush(self, now: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Write all pending heartbeats and renew their leases in one round trip.
+
+        Returns:
+            soul_id -> task ids that worker has lost and must abandon.
+        """
+        now = self.clock() if now is None else now
+        with self._lock:
+            if not self._pending:
+                return {}
+            beats = [(soul_id, list(self._in_flight.get(soul_id, ()))) for soul_id in self._pending]
+            self._pending.clear()
+
+        lost = self.store.heartbeat_batch(beats, now, self.heartbeat_ttl, self.lease_ttl)
+        if lost:
+            with self._lock:
+                for soul_id, task_ids in lost.items():
+                    self._in_flight.get(soul_id, set()).difference_update(task_ids)
+        return lost
+
+    def reap(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Requeue the leases of dead workers and any expired lease in bulk.
+
+        Returns:
+            {"dead_workers": [...], "requeued": [...]}
+        """
+        now = self.clock() if now is None else now
+        with self._lock:
+            dead = self.detector.suspects(now)
+            for soul_id in dead:
+                self.detector.remove(soul_id)
+                self._in_flight.pop(soul_id, None)
+                self._pending.pop(soul_id, None)
+
+        stale = self.store.scan_leases(now, dead)
+        requeued = self.store.requeue(stale, dead) if stale or dead else []
+        if requeued:
+            with self._lock:
+                for tasks in self._in_flight.values():
+                    tasks.difference_update(requeued)
+        return {"dead_workers": dead, "requeued": requeued}
+
+    def start(self) -> None:
+        """Flush and reap every heartbeat_interval on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(self.heartbeat_interval):
+                self.flush()
+                self.reap()
+
+        self._thread = threading.Thread(target=loop, name="lease-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
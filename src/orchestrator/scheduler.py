@@ -0,0 +1,264 @@
+"""
+Fair Scheduling Across Campaigns
+
+SRS Reference: §4.6 Orchestration (FR6.2), §3.1 FastRender Swarm
+Spec: specs/technical.md, Agent Task Schema (campaign_id, priority, timeout_seconds)
+
+Strict FIFO within HIGH/NORMAL/LOW tiers (FR6.2) lets a sustained HIGH load
+starve LOW tasks, and lets one large campaign take every worker.
+FairLeaseStore keeps LeaseStore's lease and heartbeat behaviour but claims
+tasks from a FairQueue:
+
+* Across campaigns: start-time fair queuing, a weighted fair queuing
+  variant. Each campaign carries a virtual finish tag. Serving one of its
+  tasks advances the tag by cost / weight, where a HIGH task costs a quarter
+  of a LOW one. The campaign with the smallest tag goes next, so every
+  backlogged campaign gets its weighted share and priority still buys more
+  of it.
+* Within a campaign: tasks are ordered by arrival time plus an offset per
+  tier (HIGH 0, NORMAL `aging_seconds`, LOW twice that). In effect a task
+  rises one tier for every `aging_seconds` it waits, so a LOW task overtakes
+  fresh HIGH work after 2 * aging_seconds. The key is capped at the task's
+  deadline, arrival + timeout_seconds.
+* A task within `urgent_seconds` of its deadline is served first, from any
+  campaign (earliest deadline first). Its campaign is still charged for it.
+
+A claim is a few heap operations, O(log n) in queued tasks. Entries that
+leave a heap by another route are dropped lazily when they reach the top.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from src.orchestrator.lifecycle import LeaseStore, PRIORITIES
+
+# Virtual time a task costs its campaign, by priority
+TIER_COST = {"HIGH": 0.25, "NORMAL": 0.5, "LOW": 1.0}
+# Aging steps a task must wait before it ranks with fresh HIGH work
+TIER_AGE = {"HIGH": 0, "NORMAL": 1, "LOW": 2}
+
+DEFAULT_TIMEOUT = 3600
+
+
+class _Campaign:
+    __slots__ = ("campaign_id", "finish", "tasks", "queued", "entry")
+
+    def __init__(self, campaign_id: str, finish: float):
+        self.campaign_id = campaign_id
+        self.finish = finish
+        # [key, seq, task_id, live] entries ordered by aged key
+        self.tasks: List[List[Any]] = []
+        self.queued = 0
+        # Current entry in FairQueue._active; older ones are stale
+        self.entry: Optional[List[Any]] = None
+
+
+class FairQueue:
+    """
+    Weighted fair queue across campaigns with priority aging and deadlines.
+
+    Not thread-safe; FairLeaseStore calls it under its lock.
+
+    Args:
+        aging_seconds: Wait that lifts a task by one priority tier.
+        urgent_seconds: Lead before its deadline at which a task jumps the
+            fair order. 0 disables deadline rescue.
+        default_timeout: Deadline for tasks queued without timeout_seconds.
+    """
+
+    def __init__(self, aging_seconds: float = 60.0, urgent_seconds: float = 5.0,
+                 default_timeout: float = DEFAULT_TIMEOUT):
+        if aging_seconds <= 0:
+            raise ValueError("aging_seconds must be positive")
+        self.aging_seconds = aging_seconds
+        self.urgent_seconds = urgent_seconds
+        self.default_timeout = default_timeout
+        self._campaigns: Dict[str, _Campaign] = {}
+        self._weights: Dict[str, float] = {}
+        # task_id -> (entry, campaign_id, priority, arrival, timeout_seconds)
+        self._tasks: Dict[str, Tuple[List[Any], str, str, float, float]] = {}
+        self._counts = {p: 0 for p in PRIORITIES}
+        # [tag, seq, campaign] for backlogged campaigns
+        self._active: List[List[Any]] = []
+        # (deadline, seq, entry) for deadline rescue
+        self._deadlines: List[Tuple[float, int, List[Any]]] = []
+        # (finish, campaign_id) of emptied campaigns, forgotten once virtual time passes them
+        self._idle: List[Tuple[float, str]] = []
+        self._virtual = 0.0
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    def length(self, priority: Optional[str] = None, campaign_id: Optional[str] = None) -> int:
+        """Queued tasks, optionally of one priority or one campaign."""
+        if campaign_id is not None:
+            campaign = self._campaigns.get(campaign_id)
+            return campaign.queued if campaign is not None else 0
+        if priority is not None:
+            return self._counts[priority]
+        return len(self._tasks)
+
+    def set_weight(self, campaign_id: str, weight: float) -> None:
+        """Give a campaign `weight` times the default share of workers."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[campaign_id] = weight
+
+    def push(self, task_id: str, campaign_id: str, priority: str = "NORMAL", arrival: float = 0.0,
+             timeout_seconds: Optional[float] = None, seq: Optional[int] = None) -> None:
+        """
+        Queue a task. Requeueing with the arrival and seq that pop returned
+        restores its position within the campaign.
+
+        Raises:
+            ValueError: Unknown priority, or the task is already queued.
+        """
+        if priority not in TIER_COST:
+            raise ValueError(f"Unknown priority: {priority}")
+        if task_id in self._tasks:
+            raise ValueError(f"Task already queued: {task_id}")
+        timeout = self.default_timeout if timeout_seconds is None else timeout_seconds
+        deadline = arrival + timeout
+        entry = [min(arrival + TIER_AGE[priority] * self.aging_seconds, deadline),
+                 next(self._seq) if seq is None else seq, task_id, True]
+        self._tasks[task_id] = (entry, campaign_id, priority, arrival, timeout)
+        self._counts[priority] += 1
+
+        campaign = self._campaigns.get(campaign_id)
+        if campaign is None:
+            campaign = self._campaigns[campaign_id] = _Campaign(campaign_id, self._virtual)
+        heapq.heappush(campaign.tasks, entry)
+        campaign.queued += 1
+        if campaign.queued == 1:
+            self._activate(campaign, max(self._virtual, campaign.finish))
+        if self.urgent_seconds > 0:
+            heapq.heappush(self._deadlines, (deadline, next(self._seq), entry))
+
+    def pop(self, now: float) -> Optional[Tuple[str, str, Tuple[str, float, float, int]]]:
+        """
+        Remove the next task to serve at `now`.
+
+        Returns:
+            (task_id, priority, (campaign_id, arrival, timeout_seconds, seq)),
+            or None if nothing is queued.
+        """
+        if not self._tasks:
+            return None
+        entry = self._urgent(now)
+        if entry is None:
+            while True:
+                tag, seq, campaign = heapq.heappop(self._active)
+                if campaign.entry is not None and campaign.entry[1] == seq:
+                    break
+            self._virtual = tag
+            entry = self._head(campaign)
+        task_id = entry[2]
+        _, campaign_id, priority, arrival, timeout = self._tasks.pop(task_id)
+        self._counts[priority] -= 1
+        entry[3] = False
+        self._charge(self._campaigns[campaign_id], priority)
+        if self._tasks:
+            self._forget_idle()
+        else:
+            # An idle system restarts every campaign at the current virtual time
+            self._campaigns.clear()
+            self._active.clear()
+            self._idle.clear()
+            self._deadlines.clear()
+        return task_id, priority, (campaign_id, arrival, timeout, entry[1])
+
+    def _activate(self, campaign: _Campaign, tag: float) -> None:
+        campaign.entry = [tag, next(self._seq), campaign]
+        heapq.heappush(self._active, campaign.entry)
+
+    def _head(self, campaign: _Campaign) -> List[Any]:
+        while True:
+            entry = heapq.heappop(campaign.tasks)
+            if entry[3]:
+                return entry
+
+    def _urgent(self, now: float) -> Optional[List[Any]]:
+        deadlines = self._deadlines
+        while deadlines and not deadlines[0][2][3]:
+            heapq.heappop(deadlines)
+        if len(deadlines) > 2 * len(self._tasks) + 64:
+            self._deadlines = deadlines = [d for d in deadlines if d[2][3]]
+            heapq.heapify(deadlines)
+        if deadlines and deadlines[0][0] - now <= self.urgent_seconds:
+            return heapq.heappop(deadlines)[2]
+        return None
+
+    def _charge(self, campaign: _Campaign, priority: str) -> None:
+        start = max(self._virtual, campaign.finish)
+        campaign.finish = start + TIER_COST[priority] / self._weights.get(campaign.campaign_id, 1.0)
+        campaign.queued -= 1
+        if campaign.queued:
+            # Re-keying also invalidates the old entry after a deadline rescue
+            self._activate(campaign, campaign.finish)
+        else:
+            campaign.entry = None
+            campaign.tasks.clear()
+            heapq.heappush(self._idle, (campaign.finish, campaign.campaign_id))
+
+    def _forget_idle(self) -> None:
+        # Past the virtual time, an idle campaign's tag no longer matters: it would restart at V
+        while self._idle and self._idle[0][0] <= self._virtual:
+            _, campaign_id = heapq.heappop(self._idle)
+            campaign = self._campaigns.get(campaign_id)
+            if campaign is not None and campaign.queued == 0:
+                del self._campaigns[campaign_id]
+
+
+class FairLeaseStore(LeaseStore):
+    """
+    LeaseStore whose claims follow a FairQueue instead of strict tiers.
+
+    Usage:
+        store = FairLeaseStore()
+        for task in planner.plan_campaign(manifest):
+            store.enqueue_task(task)
+        manager = LeaseManager(store)
+
+    Args:
+        queue: Scheduling policy; defaults to FairQueue().
+        clock: Time source for arrivals, in the same units as the `now`
+            passed to claim (LeaseManager's clock).
+    """
+
+    def __init__(self, queue: Optional[FairQueue] = None, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.queue = queue or FairQueue()
+        self.clock = clock
+
+    def enqueue(self, task_id: str, priority: str = "NORMAL", score: Optional[float] = None,
+                campaign_id: str = "", timeout_seconds: Optional[float] = None,
+                now: Optional[float] = None) -> None:
+        """Queue a task for its campaign. `score` is ignored: order comes from the queue policy."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        now = self.clock() if now is None else now
+        with self._lock:
+            self.round_trips += 1
+            self._push(task_id, priority, (campaign_id, now, timeout_seconds, None))
+
+    def enqueue_task(self, task: Dict[str, Any], now: Optional[float] = None) -> None:
+        """Queue a planner task manifest by its campaign_id, priority and timeout_seconds."""
+        self.enqueue(task["task_id"], task.get("priority", "NORMAL"), campaign_id=task["campaign_id"],
+                     timeout_seconds=task.get("timeout_seconds"), now=now)
+
+    def _push(self, task_id: str, priority: str, score: Any) -> None:
+        campaign_id, arrival, timeout, seq = score
+        self.queue.push(task_id, campaign_id, priority, arrival, timeout, seq)
+
+    def _pop(self, now: float) -> Optional[Tuple[str, str, Any]]:
+        return self.queue.pop(now)
+
+    def queue_length(self, priority: Optional[str] = None) -> int:
+        with self._lock:
+            return self.queue.length(priority)
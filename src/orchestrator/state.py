@@ -0,0 +1,245 @@
+"""
+Agent Lifecycle State Store
+
+SRS Reference: §4.6 Orchestration (FR6.1), §1.4 Single Orchestrator
+Spec: specs/functional.md, FR6.1 Centralized Lifecycle Management
+Spec: specs/technical.md, agents.status
+
+Holds the CREATED / ACTIVE / SUSPENDED / TERMINATED state of every agent in
+memory, keyed by soul_id, together with the set of agents allowed to claim
+work. A queue claim only has to do a set-membership check. Suspended agents
+drop out of that set but keep their in-flight leases, as FR6.1 requires.
+
+Every transition is appended to an audit file as one JSON line, carrying
+operator_id and reason. A snapshot records the audit sequence number it
+covers and the audit file's length at that point. At startup, `restore()`
+loads the snapshot, seeks past that offset and parses only the audit records
+written after it, so restore time follows the tail, not the full history.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+from src.ids.clock import now_iso
+
+CREATED = "CREATED"
+ACTIVE = "ACTIVE"
+SUSPENDED = "SUSPENDED"
+TERMINATED = "TERMINATED"
+
+TRANSITIONS = {
+    CREATED: {ACTIVE, TERMINATED},
+    ACTIVE: {SUSPENDED, TERMINATED},
+    SUSPENDED: {ACTIVE, TERMINATED},
+    TERMINATED: set()
+}
+
+# Only ACTIVE agents may claim new tasks
+CLAIM_ELIGIBLE = {ACTIVE}
+
+
+class AgentStateStore:
+    """
+    In-memory agent state table with an append-only audit trail.
+
+    Args:
+        audit_path: JSON-lines audit file; None keeps the trail in memory only.
+        fsync: fsync after every audit record. Off by default: a crash can
+            lose the last few transitions, which the snapshot + tail restore
+            tolerates, in exchange for not paying a disk sync per transition.
+    """
+
+    def __init__(self, audit_path: Optional[str] = None, fsync: bool = False):
+        self.audit_path = audit_path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        self._eligible: set = set()
+        self._seq = 0
+        self._audit = open(audit_path, "a", encoding="utf-8") if audit_path else None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def can_claim(self, soul_id: str) -> bool:
+        """O(1) check used on every queue claim."""
+        return soul_id in self._eligible
+
+    def status(self, soul_id: str) -> Optional[str]:
+        agent = self._agents.get(soul_id)
+        return agent["status"] if agent else None
+
+    def get(self, soul_id: str) -> Optional[Dict[str, Any]]:
+        agent = self._agents.get(soul_id)
+        return dict(agent) if agent else None
+
+    def eligible(self) -> List[str]:
+        return sorted(self._eligible)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    # ------------------------------------------------------------------
+    # Transitions
+    # ------------------------------------------------------------------
+
+    def create(self, soul_id: str, operator_id: str, reason: str = "created") -> Dict[str, Any]:
+        """Register a new agent in the CREATED state."""
+        return self._apply(soul_id, CREATED, operator_id, reason, create=True)
+
+    def activate(self, soul_id: str, operator_id: str, reason: str) -> Dict[str, Any]:
+        return self.transition(soul_id, ACTIVE, operator_id, reason)
+
+    def suspend(self, soul_id: str, operator_id: str, reason: str) -> Dict[str, Any]:
+        return self.transition(soul_id, SUSPENDED, operator_id, reason)
+
+    def terminate(self, soul_id: str, operator_id: str, reason: str) -> Dict[str, Any]:
+        return self.transition(soul_id, TERMINATED, operator_id, reason)
+
+    def transition(self, soul_id: str, to_status: str, operator_id: str, reason: str) -> Dict[str, Any]:
+        """
+        Move an agent to `to_status` and audit the change.
+
+        Returns:
+            The audit record.
+
+        Raises:
+            ValueError: Unknown agent, or a transition FR6.1 does not allow.
+        """
+        if to_status not in TRANSITIONS:
+            raise ValueError(f"Unknown agent status: {to_status}")
+        return self._apply(soul_id, to_status, operator_id, reason)
+
+    def _apply(self, soul_id: str, to_status: str, operator_id: str, reason: str,
+               create: bool = False) -> Dict[str, Any]:
+        if not operator_id:
+            raise ValueError("operator_id is required")
+
+        with self._lock:
+            agent = self._agents.get(soul_id)
+            if create:
+                if agent is not None:
+                    raise ValueError(f"Agent already exists: {soul_id}")
+                from_status = None
+            else:
+                if agent is None:
+                    raise ValueError(f"Unknown agent: {soul_id}")
+                from_status = agent["status"]
+                if to_status not in TRANSITIONS[from_status]:
+                    raise ValueError(f"Invalid transition {from_status} -> {to_status} for {soul_id}")
+
+            self._seq += 1
+            record = {
+                "seq": self._seq,
+                "soul_id": soul_id,
+                "from": from_status,
+                "to": to_status,
+                "operator_id": operator_id,
+                "reason": reason,
+                "at": now_iso()
+            }
+            self._write_audit(record)
+            self._set(soul_id, to_status, record["at"], record["seq"])
+        return record
+
+    def _set(self, soul_id: str, status: str, updated_at: str, seq: int) -> None:
+        self._agents[soul_id] = {"soul_id": soul_id, "status": status, "updated_at": updated_at, "seq": seq}
+        if status in CLAIM_ELIGIBLE:
+            self._eligible.add(soul_id)
+        else:
+            self._eligible.discard(soul_id)
+
+    def _write_audit(self, record: Dict[str, Any]) -> None:
+        if self._audit is None:
+            return
+        self._audit.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._audit.flush()
+        if self.fsync:
+            os.fsync(self._audit.fileno())
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def snapshot(self, path: str) -> None:
+        """
+        Write the state table atomically, tagged with the last audit seq it
+        includes and the audit byte offset right after that record.
+        """
+        with self._lock:
+            data = {"version": 1, "seq": self._seq, "agents": list(self._agents.values())}
+            if self._audit is not None:
+                self._audit.flush()
+                os.fsync(self._audit.fileno())
+                data["audit_offset"] = os.fstat(self._audit.fileno()).st_size
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def restore(self, snapshot_path: Optional[str] = None) -> int:
+        """
+        Rebuild state from a snapshot plus the audit records written after it.
+
+        Either part may be missing: no snapshot replays the whole audit file,
+        no audit file restores the snapshot alone. The audit file is read from
+        the snapshot's `audit_offset`; a snapshot without one, or an audit
+        file shorter than it, is replayed from the start, skipping records the
+        snapshot already covers. A torn final audit line (crash mid-write) is
+        truncated away.
+
+        Returns:
+            The number of audit records replayed.
+        """
+        agents: Dict[str, Dict[str, Any]] = {}
+        seq = 0
+        offset = 0
+        if snapshot_path and os.path.exists(snapshot_path):
+            with open(snapshot_path) as f:
+                data = json.load(f)
+            seq = data["seq"]
+            offset = data.get("audit_offset", 0)
+            agents = {a["soul_id"]: a for a in data["agents"]}
+
+        replayed = 0
+        if self.audit_path and os.path.exists(self.audit_path):
+            if offset > os.path.getsize(self.audit_path):
+                offset = 0
+            good_bytes = offset
+            with open(self.audit_path, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    good_bytes += len(line)
+                    record = json.loads(line)
+                    if record["seq"] <= seq:
+                        continue
+                    agents[record["soul_id"]] = {
+                        "soul_id": record["soul_id"], "status": record["to"],
+                        "updated_at": record["at"], "seq": record["seq"]
+                    }
+                    seq = record["seq"]
+                    replayed += 1
+            # Drop a torn tail so the next record starts on a fresh line
+            if good_bytes < os.path.getsize(self.audit_path):
+                os.truncate(self.audit_path, good_bytes)
+
+        with self._lock:
+            self._agents.clear()
+            self._eligible.clear()
+            for agent in agents.values():
+                self._set(agent["soul_id"], agent["status"], agent["updated_at"], agent["seq"])
+            self._seq = seq
+        return replayed
+
+    def close(self) -> None:
+        if self._audit is not None:
+            self._audit.close()
+            self._audit = None
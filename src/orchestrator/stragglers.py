@@ -0,0 +1,369 @@
+"""
+Straggler Handling: Hard Timeouts and Speculative Re-execution
+
+SRS Reference: §4.6 Orchestration (FR6.2), §3.1 FastRender Swarm, NFR 3.0
+Spec: specs/technical.md, Agent Task Schema (timeout_seconds), Agent Task Result Schema
+
+Every task manifest carries `timeout_seconds` (1-3600). StragglerManager
+enforces it, so one hung publish_post or slow generate_content cannot hold
+up a campaign DAG:
+
+* Hard timeout. At started + timeout_seconds the task fails with a
+  TIMEOUT error result, and its lease is released through
+  LeaseManager.complete rather than left to expire. For an idempotent
+  task that happens at once. A non-idempotent attempt that is already
+  running cannot be stopped and may still post or pay, so its lease is
+  kept until that attempt finishes and the task cannot be claimed and
+  run a second time meanwhile. The elapsed time goes into the latency
+  window as a censored sample: a lower bound of the real latency, so
+  timeouts pull the speculation threshold up instead of dropping out.
+* Speculation. The manager keeps a window of recent latencies per
+  task_type. When an idempotent task runs past the chosen percentile of
+  its type, a duplicate attempt is launched. The first successful attempt
+  wins and the others are cancelled. A failed attempt only fails the task
+  once no other attempt is still running. Non-idempotent types
+  (social_publish, transaction_execute) are never duplicated.
+
+A single watchdog thread holds both kinds of deadline in a heap.
+Cancellation uses Future.cancel: an attempt that is still queued never
+runs, while one already running finishes in the background and its result
+is discarded.
+
+Usage:
+    with StragglerManager(runtime_submitter(runtime), leases=manager) as stragglers:
+        result = stragglers.run(task, soul_id).result()
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+from src.ids.clock import now_iso
+
+# Task types whose duplicate execution has no external side effect
+IDEMPOTENT_TASK_TYPES = frozenset({"analytics_fetch", "content_generation", "content_review"})
+
+# task_type -> skill that executes it on a WorkerRuntime
+TASK_SKILLS = {
+    "analytics_fetch": "fetch_trends",
+    "content_generation": "generate_content",
+    "content_review": "validate_image",
+    "social_publish": "publish_post",
+    "transaction_execute": "check_wallet_balance",
+}
+
+
+def runtime_submitter(runtime, skills: Optional[Dict[str, str]] = None) -> Callable[[Dict[str, Any]], Future]:
+    """
+    Adapt a started src.worker.runtime.WorkerRuntime to StragglerManager.
+
+    The returned callable submits a task's payload to the skill for its
+    task_type. Its Future resolves to the skill output, or raises
+    RuntimeError with the runtime's error message.
+    """
+    skills = TASK_SKILLS if skills is None else skills
+
+    def submit(task: Dict[str, Any]) -> Future:
+        outer: Future = Future()
+        inner = runtime.submit({"id": task["task_id"], "skill": skills[task["task_type"]],
+                                "payload": task.get("payload", {})})
+
+        def unwrap(done: Future) -> None:
+            if not outer.set_running_or_notify_cancel():
+                return
+            result = done.result()
+            if result["status"] == "ok":
+                outer.set_result(result["output"])
+            else:
+                outer.set_exception(RuntimeError(result["error"]))
+
+        inner.add_done_callback(unwrap)
+        return outer
+
+    return submit
+
+
+class _Tracked:
+    __slots__ = ("task", "soul_id", "started", "future", "attempts", "pending", "speculated", "done")
+
+    def __init__(self, task: Dict[str, Any], soul_id: Optional[str], started: float):
+        self.task = task
+        self.soul_id = soul_id
+        self.started = started
+        self.future: Future = Future()
+        # (attempt future, started_at)
+        self.attempts: List[tuple] = []
+        self.pending = 0
+        self.speculated = False
+        self.done = False
+
+
+class StragglerManager:
+    """
+    Enforces timeout_seconds and speculatively re-executes slow idempotent tasks.
+
+    Args:
+        submit: Starts one attempt of a task manifest and returns a Future of
+            its output, e.g. runtime_submitter(runtime).
+        leases: Optional LeaseManager; a task's lease is released once its
+            outcome is known and no non-idempotent attempt is still running.
+        percentile: Latency percentile of the task_type past which a
+            duplicate is launched.
+        min_samples: Latencies a task_type needs before it is speculated on.
+        window: Recent latencies kept per task_type.
+        speculation_budget: Most speculative attempts running at once, as a
+            fraction of tracked tasks (at least one).
+        idempotent: Task types that may be duplicated.
+        clock: Monotonic time source.
+    """
+
+    def __init__(self, submit: Callable[[Dict[str, Any]], Future], leases=None, percentile: float = 95.0,
+                 min_samples: int = 20, window: int = 500, speculation_budget: float = 0.1,
+                 idempotent: Iterable[str] = IDEMPOTENT_TASK_TYPES, clock: Callable[[], float] = time.monotonic):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        self.submit = submit
+        self.leases = leases
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.speculation_budget = speculation_budget
+        self.idempotent = frozenset(idempotent)
+        self.clock = clock
+        self._latencies: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._tracked: Dict[str, _Tracked] = {}
+        self._speculating = 0
+        # (when, seq, kind, tracked) for the watchdog
+        self._deadlines: List[tuple] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def run(self, task: Dict[str, Any], soul_id: Optional[str] = None) -> Future:
+        """
+        Start a task and track it until it succeeds, fails or times out.
+
+        Args:
+            task: Task manifest with task_id, task_type and timeout_seconds.
+            soul_id: Worker holding the task's lease, if leases are managed.
+
+        Returns:
+            A Future resolving to an Agent Task Result dict with status
+            SUCCESS or FAILED. It never raises.
+        """
+        now = self.clock()
+        tracked = _Tracked(task, soul_id, now)
+        with self._cond:
+            if self._closed:
+                raise ValueError("StragglerManager is closed")
+            if task["task_id"] in self._tracked:
+                raise ValueError(f"Task already running: {task['task_id']}")
+            self._tracked[task["task_id"]] = tracked
+            self._count(task["task_type"], "started")
+            self._schedule(now + task["timeout_seconds"], "timeout", tracked)
+            threshold = self._threshold(task["task_type"])
+            if threshold is not None:
+                self._schedule(now + threshold, "speculate", tracked)
+            self._ensure_watchdog()
+        self._attempt(tracked, now)
+        return tracked.future
+
+    def _attempt(self, tracked: _Tracked, now: float) -> None:
+        with self._cond:
+            if tracked.done:
+                return
+            tracked.pending += 1
+        try:
+            attempt = self.submit(tracked.task)
+        except Exception as e:
+            attempt = Future()
+            attempt.set_exception(e)
+        with self._cond:
+            tracked.attempts.append((attempt, now))
+        attempt.add_done_callback(lambda f: self._on_attempt_done(tracked, f, now))
+
+    def _on_attempt_done(self, tracked: _Tracked, attempt: Future, started: float) -> None:
+        if attempt.cancelled():
+            return
+        error = attempt.exception()
+        task_type = tracked.task["task_type"]
+        with self._cond:
+            if tracked.done:
+                return
+            tracked.pending -= 1
+            if error is not None and tracked.pending > 0:
+                return  # another attempt may still succeed
+            if error is None:
+                self._sample(task_type, self.clock() - started)
+                if tracked.speculated and attempt is not tracked.attempts[0][0]:
+                    self._count(task_type, "speculative_wins")
+            self._count(task_type, "succeeded" if error is None else "failed")
+        if error is None:
+            self._finish(tracked, "SUCCESS", output=attempt.result())
+        else:
+            self._finish(tracked, "FAILED", error={"code": type(error).__name__, "message": str(error)})
+
+    def _finish(self, tracked: _Tracked, status: str, output: Optional[Dict[str, Any]] = None,
+                error: Optional[Dict[str, Any]] = None) -> None:
+        with self._cond:
+            if tracked.done:
+                return
+            tracked.done = True
+            self._tracked.pop(tracked.task["task_id"], None)
+            if tracked.speculated:
+                self._speculating -= 1
+            attempts = list(tracked.attempts)
+        running = [attempt for attempt, _ in attempts if not attempt.cancel() and not attempt.done()]
+        if self.leases is not None and tracked.soul_id is not None:
+            if running and tracked.task["task_type"] not in self.idempotent:
+                self._complete_after(tracked, running)
+            else:
+                self.leases.complete(tracked.soul_id, tracked.task["task_id"])
+
+        result = {
+            "task_id": tracked.task["task_id"],
+            "worker_soul_id": tracked.soul_id or "",
+            "status": status,
+            "completed_at": now_iso(),
+            "confidence": 1.0 if status == "SUCCESS" else 0.0,
+            "output": output if isinstance(output, dict) else {"value": output} if output is not None else {}
+        }
+        if error is not None:
+            result["error"] = error
+        tracked.future.set_result(result)
+
+    def _complete_after(self, tracked: _Tracked, running: List[Future]) -> None:
+        """Release the task's lease once every attempt in `running` has finished."""
+        lock = threading.Lock()
+        left = [len(running)]
+
+        def finished(_: Future) -> None:
+            with lock:
+                left[0] -= 1
+                if left[0]:
+                    return
+            self.leases.complete(tracked.soul_id, tracked.task["task_id"])
+
+        for attempt in running:
+            attempt.add_done_callback(finished)
+
+    # ------------------------------------------------------------------
+    # Latency model
+    # ------------------------------------------------------------------
+
+    def _sample(self, task_type: str, seconds: float, censored: bool = False) -> None:
+        """Add a latency; a censored one is a lower bound (the task timed out)."""
+        samples = self._latencies.get(task_type)
+        if samples is None:
+            samples = self._latencies[task_type] = deque(maxlen=self.window)
+        samples.append((seconds, censored))
+
+    def _threshold(self, task_type: str) -> Optional[float]:
+        """Latency past which a task of this type is speculated on, or None."""
+        if task_type not in self.idempotent:
+            return None
+        samples = self._latencies.get(task_type)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(seconds for seconds, _ in samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))]
+
+    def _count(self, task_type: str, key: str) -> None:
+        stats = self._stats.setdefault(task_type, {"started": 0, "succeeded": 0, "failed": 0, "timed_out": 0,
+                                                   "speculated": 0, "speculative_wins": 0})
+        stats[key] += 1
+
+    # ------------------------------------------------------------------
+    # Watchdog
+    # ------------------------------------------------------------------
+
+    def _schedule(self, when: float, kind: str, tracked: _Tracked) -> None:
+        heapq.heappush(self._deadlines, (when, next(self._seq), kind, tracked))
+        self._cond.notify()
+
+    def _ensure_watchdog(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="straggler-watchdog", daemon=True)
+            self._thread.start()
+
+    def _watch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    while self._deadlines and self._deadlines[0][3].done:
+                        heapq.heappop(self._deadlines)
+                    if self._deadlines:
+                        wait = self._deadlines[0][0] - self.clock()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                _, _, kind, tracked = heapq.heappop(self._deadlines)
+                task_type = tracked.task["task_type"]
+                if kind == "speculate":
+                    budget = max(1, int(self.speculation_budget * len(self._tracked)))
+                    if tracked.speculated or self._speculating >= budget:
+                        continue
+                    tracked.speculated = True
+                    self._speculating += 1
+                    self._count(task_type, "speculated")
+                else:
+                    self._count(task_type, "timed_out")
+                    self._sample(task_type, self.clock() - tracked.started, censored=True)
+            if kind == "speculate":
+                self._attempt(tracked, self.clock())
+            else:
+                self._finish(tracked, "FAILED", error={
+                    "code": "TIMEOUT",
+                    "message": f"Task exceeded timeout_seconds={tracked.task['timeout_seconds']}"
+                })
+
+    def close(self) -> None:
+        """Stop the watchdog. Tasks still running are no longer timed out."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per task_type counters, plus p50, the speculation threshold in seconds
+        and how many latencies in the window are censored.
+        """
+        with self._cond:
+            report = {}
+            for task_type, stats in self._stats.items():
+                window = self._latencies.get(task_type, ())
+                samples = sorted(seconds for seconds, _ in window)
+                report[task_type] = {
+                    **stats,
+                    "p50_s": round(samples[len(samples) // 2], 4) if samples else None,
+                    "censored": sum(censored for _, censored in window),
+                    "speculate_after_s": self._threshold(task_type)
+                }
+            return report
@@ -7,22 +7,30 @@ Spec: specs/planner_service.md
 This module implements the core planning logic to decompose campaigns into tasks.
 """
 
-import uuid
-import uuid
 from typing import Dict, Any, List
-from datetime import datetime, timezone
 import logging
 
+from src.ids.clock import new_id, now_iso
+
 # We will need the schema validation, assuming it exists
 # from src.schemas.agent_task import validate_task_manifest
 
 class CampaignPlanner:
     """
     Decomposes high-level campaigns into executable Agent Tasks.
+
+    Args:
+        planner_soul_id: SOUL ID stamped on every task this planner creates.
+        journal: Optional TaskJournal; each plan is journaled before it is
+            returned, so the DAG survives a crash.
+        trends: Optional TrendStore; when it has history for the campaign's
+            platform and region, the generation task carries the rising topics.
     """
     
-    def __init__(self, planner_soul_id: str = "planner-001"):
+    def __init__(self, planner_soul_id: str = "planner-001", journal=None, trends=None):
         self.planner_soul_id = planner_soul_id
+        self.journal = journal
+        self.trends = trends
         
     def plan_campaign(self, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -39,6 +47,7 @@ class CampaignPlanner:
             raise ValueError("Campaign ID is required")
             
         tasks = []
+        created_at = now_iso()
         
         # ---------------------------------------------------------
         # Decomposition Pattern: Trend-Jacked Content (Hardcoded for MVP)
@@ -46,12 +55,12 @@ class CampaignPlanner:
         # See specs/planner_service.md for logic
         
         # 1. Analytics Fetch Task
-        fetch_task_id = str(uuid.uuid4())
+        fetch_task_id = new_id()
         fetch_task = {
             "task_id": fetch_task_id,
             "campaign_id": campaign_id,
             "task_type": "analytics_fetch",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "planner_soul_id": self.planner_soul_id,
             "priority": "HIGH", # Trends need fresh data
             "timeout_seconds": 300,
@@ -65,12 +74,12 @@ class CampaignPlanner:
         tasks.append(fetch_task)
         
         # 2. Content Generation Task
-        gen_task_id = str(uuid.uuid4())
+        gen_task_id = new_id()
         gen_task = {
             "task_id": gen_task_id,
             "campaign_id": campaign_id,
             "task_type": "content_generation",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "planner_soul_id": self.planner_soul_id,
             "priority": "NORMAL",
             "timeout_seconds": 600,
@@ -81,6 +90,11 @@ class CampaignPlanner:
                 "context_ids": [fetch_task_id] # Use output of fetch task
             }
         }
+        if self.trends is not None:
+            rising = self.trends.rising_topics(fetch_task["payload"]["platform"], fetch_task["payload"]["region"],
+                                               limit=5)
+            if rising:
+                gen_task["payload"]["trending_topics"] = [row["topic"] for row in rising]
         tasks.append(gen_task)
         
         # 3. Content Review Task (Skipped for simple MVP test validation flow, 
@@ -89,12 +103,12 @@ class CampaignPlanner:
         # Test expects 'social_publish', so let's add it.
         # In real graph: Gen -> Review -> Publish
         
-        publish_task_id = str(uuid.uuid4())
+        publish_task_id = new_id()
         publish_task = {
             "task_id": publish_task_id,
             "campaign_id": campaign_id,
             "task_type": "social_publish",
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "planner_soul_id": self.planner_soul_id,
             "priority": "NORMAL",
             "timeout_seconds": 300,
@@ -108,5 +122,7 @@ class CampaignPlanner:
             }
         }
         tasks.append(publish_task)
-        
+
+        if self.journal is not None:
+            self.journal.submit(tasks)
         return tasks
@@ -0,0 +1,316 @@
+"""
+Adaptive Concurrency Controller
+
+SRS Reference: §4.4 Action System (FR4.2), OpenClaw Integration, NFR 3.0
+Spec: specs/openclaw_integration.md, §3.7 Rate-Limit & Backoff Negotiation
+
+Client-side admission control for outbound skill calls. Each call holds a
+permit for its endpoint (e.g. "publish_post:twitter") while it runs.
+
+* Permits per endpoint follow AIMD. A clean response adds 1/permits, so the
+  limit grows by about one permit per round of calls. A SOFT_RATE_LIMIT
+  signal multiplies it by `decrease`. At most one decrease applies per round:
+  responses to calls started before the last decrease do not cut again.
+* A signal's `recommended_backoff_seconds` holds back new calls for that
+  long. If `current_usage` has reached `limit`, the hold lasts until
+  `reset_at`. Otherwise the remaining quota is spread evenly over the time
+  left until `reset_at`.
+* Jitter stretches every backoff and pacing gap by a random fraction, so
+  callers that were held together do not all resume at the same instant.
+  A paced call is never pushed past `reset_at` by it.
+* A hard 429 (`HardRateLimit`) should not happen if signals are followed.
+  When one does, the endpoint drops to `min_permits` and waits out
+  `retry_after`.
+
+A gateway attaches the §3.7 signal to a response under "rate_limit", or the
+caller passes it to `Permit.release` itself.
+
+Usage:
+    controller = get_controller()
+    result = controller.call("publish_post:twitter", gateway.publish, request)
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable
+
+SOFT_RATE_LIMIT = "SOFT_RATE_LIMIT"
+
+
+class HardRateLimit(Exception):
+    """429 Too Many Requests from the gateway."""
+
+    def __init__(self, message: str = "429 Too Many Requests", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def signal_of(result: Any) -> Optional[Dict[str, Any]]:
+    """The SOFT_RATE_LIMIT signal attached to a gateway response, if any."""
+    if isinstance(result, dict):
+        signal = result.get("rate_limit")
+        if isinstance(signal, dict) and signal.get("signal_type") == SOFT_RATE_LIMIT:
+            return signal
+    return None
+
+
+def _epoch_seconds(timestamp: Any) -> float:
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+
+
+class _Endpoint:
+    __slots__ = ("name", "permits", "in_flight", "round", "held_until", "pace", "pace_until",
+                 "next_start", "cond", "calls", "signals", "hard_limits")
+
+    def __init__(self, name: str, permits: float):
+        self.name = name
+        self.permits = permits
+        self.in_flight = 0
+        self.round = 0
+        self.held_until = 0.0
+        self.pace = 0.0
+        self.pace_until = 0.0
+        self.next_start = 0.0
+        self.cond = threading.Condition()
+        self.calls = 0
+        self.signals = 0
+        self.hard_limits = 0
+
+
+class Permit:
+    """One admitted call. Release it exactly once, or use it as a context manager."""
+
+    __slots__ = ("_controller", "_endpoint", "_round", "_released")
+
+    def __init__(self, controller: "AdaptiveConcurrency", endpoint: _Endpoint, round_: int):
+        self._controller = controller
+        self._endpoint = endpoint
+        self._round = round_
+        self._released = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._released:
+            if isinstance(exc, HardRateLimit):
+                self.release(hard_limit=exc)
+            else:
+                self.release(success=exc is None)
+
+    def release(self, signal: Optional[Dict[str, Any]] = None, success: bool = True,
+                hard_limit: Optional[HardRateLimit] = None) -> None:
+        """
+        Return the permit and report how the call went.
+
+        Args:
+            signal: §3.7 SOFT_RATE_LIMIT signal received with the response.
+            success: False for failures unrelated to rate limits; they neither
+                grow nor shrink the limit.
+            hard_limit: The 429 the call raised, if any.
+        """
+        if self._released:
+            raise ValueError("Permit already released")
+        self._released = True
+        self._controller._release(self._endpoint, self._round, signal, success, hard_limit)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limits and backoff per outbound endpoint.
+
+    Args:
+        initial_permits: Starting concurrency for a new endpoint.
+        min_permits: Floor the limit never drops below.
+        max_permits: Ceiling for additive increase.
+        decrease: Multiplier applied on a soft rate-limit signal.
+        jitter: Fraction by which backoffs and pacing gaps are randomly stretched.
+        on_permits: Called with (endpoint, permits) whenever an endpoint's
+            whole permit count changes, e.g. to emit a telemetry gauge.
+        wall_clock: Unix time source for interpreting `reset_at`.
+        max_endpoints: Most distinct endpoints tracked; callers build endpoint
+            names from validated input, so going past it is a bug.
+    """
+
+    def __init__(self, initial_permits: int = 4, min_permits: int = 1, max_permits: int = 256,
+                 decrease: float = 0.5, jitter: float = 0.2,
+                 on_permits: Optional[Callable[[str, int], Any]] = None,
+                 wall_clock: Callable[[], float] = time.time, seed: Optional[int] = None,
+                 max_endpoints: int = 1024):
+        if not 1 <= min_permits <= initial_permits <= max_permits:
+            raise ValueError("Need 1 <= min_permits <= initial_permits <= max_permits")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.initial_permits = initial_permits
+        self.min_permits = min_permits
+        self.max_permits = max_permits
+        self.decrease = decrease
+        self.jitter = jitter
+        self.on_permits = on_permits
+        self.wall_clock = wall_clock
+        self.max_endpoints = max_endpoints
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name: str) -> _Endpoint:
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            with self._lock:
+                endpoint = self._endpoints.get(name)
+                if endpoint is None:
+                    if len(self._endpoints) >= self.max_endpoints:
+                        raise ValueError(f"Too many endpoints ({self.max_endpoints}); refusing {name!r}")
+                    endpoint = self._endpoints[name] = _Endpoint(name, float(self.initial_permits))
+        return endpoint
+
+    def _stretch(self, seconds: float) -> float:
+        # Endpoints release under their own conditions, so the shared RNG needs its own lock
+        with self._rng_lock:
+            return seconds * (1.0 + self._rng.uniform(0.0, self.jitter))
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None) -> Permit:
+        """
+        Block until a call to `endpoint` may start.
+
+        Raises:
+            TimeoutError: No permit within `timeout` seconds.
+        """
+        ep = self._endpoint(endpoint)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with ep.cond:
+            while True:
+                now = time.monotonic()
+                start_at = ep.held_until
+                if now < ep.pace_until:
+                    start_at = max(start_at, ep.next_start)
+                if ep.in_flight < int(ep.permits) and now >= start_at:
+                    break
+                wait = start_at - now if now < start_at else None
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutError(f"No permit for {endpoint} within {timeout}s")
+                    wait = min(wait, deadline - now) if wait is not None else deadline - now
+                ep.cond.wait(wait)
+            ep.in_flight += 1
+            ep.calls += 1
+            if now < ep.pace_until:
+                ep.next_start = min(ep.pace_until, max(now, ep.next_start) + self._stretch(ep.pace))
+            return Permit(self, ep, ep.round)
+
+    def call(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` under a permit for `endpoint`, feeding any
+        signal attached to its result back into the controller.
+        HardRateLimit and other errors propagate to the caller.
+        """
+        permit = self.acquire(endpoint)
+        try:
+            result = fn(*args, **kwargs)
+        except HardRateLimit as e:
+            permit.release(hard_limit=e)
+            raise
+        except Exception:
+            permit.release(success=False)
+            raise
+        permit.release(signal=signal_of(result))
+        return result
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def _release(self, ep: _Endpoint, round_: int, signal: Optional[Dict[str, Any]], success: bool,
+                 hard_limit: Optional[HardRateLimit]) -> None:
+        with ep.cond:
+            before = int(ep.permits)
+            ep.in_flight -= 1
+            now = time.monotonic()
+            if hard_limit is not None:
+                ep.hard_limits += 1
+                ep.permits = float(self.min_permits)
+                ep.round += 1
+                if hard_limit.retry_after:
+                    ep.held_until = max(ep.held_until, now + self._stretch(hard_limit.retry_after))
+            elif signal is not None:
+                ep.signals += 1
+                if round_ == ep.round:
+                    ep.permits = max(float(self.min_permits), ep.permits * self.decrease)
+                    ep.round += 1
+                self._follow(ep, signal, now)
+            elif success:
+                ep.permits = min(float(self.max_permits), ep.permits + 1.0 / ep.permits)
+            ep.cond.notify_all()
+            after = int(ep.permits)
+        if after != before and self.on_permits is not None:
+            self.on_permits(ep.name, after)
+
+    def _follow(self, ep: _Endpoint, signal: Dict[str, Any], now: float) -> None:
+        backoff = float(signal.get("recommended_backoff_seconds") or 0.0)
+        reset_in = None
+        if signal.get("reset_at") is not None:
+            reset_in = _epoch_seconds(signal["reset_at"]) - self.wall_clock()
+        remaining = None
+        if signal.get("limit") is not None and signal.get("current_usage") is not None:
+            remaining = signal["limit"] - signal["current_usage"]
+
+        if reset_in is not None and reset_in > 0:
+            if remaining is not None and remaining <= 0:
+                backoff = max(backoff, reset_in)
+            elif remaining is not None and reset_in > backoff:
+                # Spread what is left of the quota over the rest of the window
+                ep.pace = (reset_in - backoff) / remaining
+                ep.pace_until = now + reset_in
+                ep.next_start = max(ep.next_start, now + backoff)
+        if backoff > 0:
+            ep.held_until = max(ep.held_until, now + self._stretch(backoff))
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def permits(self, endpoint: str) -> int:
+        """Current concurrency limit for an endpoint."""
+        return int(self._endpoint(endpoint).permits)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint permits, in-flight calls, hold time left and counters."""
+        now = time.monotonic()
+        return {
+            name: {
+                "permits": int(ep.permits),
+                "in_flight": ep.in_flight,
+                "held_for_seconds": round(max(0.0, ep.held_until - now), 3),
+                "paced": now < ep.pace_until,
+                "calls": ep.calls,
+                "soft_signals": ep.signals,
+                "hard_limits": ep.hard_limits
+            }
+            for name, ep in list(self._endpoints.items())
+        }
+
+
+# Process-wide controller shared by the outbound skills
+_controller: Optional[AdaptiveConcurrency] = None
+
+
+def get_controller() -> AdaptiveConcurrency:
+    global _controller
+    if _controller is None:
+        _controller = AdaptiveConcurrency()
+    return _controller
+
+
+def set_controller(controller: Optional[AdaptiveConcurrency]) -> None:
+    """Replace the shared controller (e.g. with tuned limits). None resets to defaults."""
+    global _controller
+    _controller = controller
@@ -0,0 +1,407 @@
+"""
+Payment / Delivery Reconciliation
+
+SRS Reference: §4.5 Commerce (FR5.1, FR5.2), NFR 3.0
+Spec: notebook/analysis_eda.ipynb, §3 Joining the Datasets, §4 Discrepancy Detection
+
+The EDA notebook reconciles finance_payments against delivery_events. It
+loads both files fully, runs an in-memory pd.merge on (order_id,
+package_id), and then computes days_diff. That works for a handful of
+orders, but not for hundreds of millions of rows. This module does the
+same reconciliation with bounded memory:
+
+1. Partition. Both inputs are read in chunks (CSV, Parquet or Excel).
+   Each row goes to one of `partitions` on-disk partitions by a hash of
+   its join keys, so every row of a given order lands in the same
+   partition. At most one chunk is held in memory.
+2. Join. Partitions are reconciled independently, in parallel across
+   `workers` processes. Each one loads only its own rows and runs the
+   vectorized reconcile_frames: an outer hash join, business dates under
+   the timezone and cut-off rules, then day-lag classification.
+3. Report. Per-partition results are streamed into unmatched_payments.csv,
+   unmatched_deliveries.csv and lagged.csv, and a summary of counts and
+   amounts is returned. The report columns are fixed once from the input
+   columns (report_columns), so every partition writes the same columns in
+   the same order, including partitions with no rows on one side.
+
+reconcile_frames also works directly on in-memory DataFrames, as in the
+notebook.
+
+Usage:
+    python -m src.reconciliation.engine finance_payments.xlsx delivery_events.xlsx --out reports/
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Iterator, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input needs pyarrow
+    pq = None
+
+try:
+    import openpyxl
+except ImportError:  # Excel input needs openpyxl
+    openpyxl = None
+
+KEYS = ("order_id", "package_id")
+
+LAG_CLASSES = ("DELIVERED_BEFORE_PAYMENT", "ON_TIME", "LAG_1D", "LAG_2_3D", "LAG_4_7D", "LAG_GT_7D")
+
+REPORTS = ("unmatched_payments", "unmatched_deliveries", "lagged")
+
+# Columns each input must provide; the minimal schema of an empty input
+INPUT_COLUMNS = {"payments": KEYS + ("payment_date", "amount"), "deliveries": KEYS + ("event_time", "status")}
+
+
+class ReconciliationRules:
+    """
+    How payment and delivery timestamps become comparable business dates.
+
+    Args:
+        timezone: Business timezone in which dates are compared.
+        source_timezone: Timezone of delivery event_time values that carry
+            none. Defaults to `timezone`, like payment_timezone, so naive
+            payment and delivery times are read the same way. Set it (e.g.
+            "UTC") for a delivery feed that records naive UTC times.
+        payment_timezone: Timezone of payment_date values that carry none.
+            Defaults to `timezone`: payment_date is usually already a
+            local business date.
+        payment_cutoff_hour: Payments at or after this local hour count
+            toward the next business day. None disables the cut-off.
+        delivery_cutoff_hour: The same cut-off for delivery events.
+        tolerance_days: Absolute days_diff still classified ON_TIME.
+        delivery_statuses: Delivery statuses that count as delivered. When
+            several events match for one key, the earliest is used. None
+            keeps every event.
+    """
+
+    def __init__(self, timezone: str = "Africa/Addis_Ababa", source_timezone: Optional[str] = None,
+                 payment_timezone: Optional[str] = None, payment_cutoff_hour: Optional[int] = None, delivery_cutoff_hour: Optional[int] = None,
+                 tolerance_days: int = 0, delivery_statuses: Optional[Sequence[str]] = ("DELIVERED",)):
+        for hour in (payment_cutoff_hour, delivery_cutoff_hour):
+            if hour is not None and not 0 <= hour <= 23:
+                raise ValueError("Cut-off hours must be between 0 and 23")
+        if tolerance_days < 0:
+            raise ValueError("tolerance_days must not be negative")
+        self.timezone = timezone
+        self.source_timezone = source_timezone or timezone
+        self.payment_timezone = payment_timezone or timezone
+        self.payment_cutoff_hour = payment_cutoff_hour
+        self.delivery_cutoff_hour = delivery_cutoff_hour
+        self.tolerance_days = tolerance_days
+        self.delivery_statuses = None if delivery_statuses is None else tuple(delivery_statuses)
+
+
+# ----------------------------------------------------------------------
+# Vectorized reconciliation of one in-memory partition
+# ----------------------------------------------------------------------
+
+def business_dates(values: pd.Series, timezone: str, source_timezone: str,
+                   cutoff_hour: Optional[int] = None) -> pd.Series:
+    """
+    Naive midnight datetimes of the business day in `timezone` each timestamp belongs to.
+
+    Naive timestamps are taken to be in `source_timezone`. Values at or
+    after `cutoff_hour` local time roll to the next day.
+    """
+    stamps = pd.to_datetime(values, utc=False)
+    if stamps.dt.tz is None:
+        stamps = stamps.dt.tz_localize(source_timezone)
+    local = stamps.dt.tz_convert(timezone).dt.tz_localize(None)
+    if cutoff_hour is not None:
+        local = local + pd.Timedelta(hours=24 - cutoff_hour)
+    return local.dt.normalize()
+
+
+def classify_lag(days_diff: np.ndarray, tolerance_days: int = 0) -> np.ndarray:
+    """LAG_CLASSES label for each delivery-minus-payment day difference."""
+    return np.select(
+        [days_diff < -tolerance_days, np.abs(days_diff) <= tolerance_days,
+         days_diff <= 1, days_diff <= 3, days_diff <= 7],
+        LAG_CLASSES[:5], default=LAG_CLASSES[5])
+
+
+def _with_keys(df: pd.DataFrame) -> pd.DataFrame:
+    missing = [k for k in KEYS if k not in df.columns]
+    if missing:
+        raise ValueError(f"Missing join key columns: {missing}")
+    return df.astype({k: str for k in KEYS})
+
+
+def reconcile_frames(payments: pd.DataFrame, deliveries: pd.DataFrame,
+                     rules: Optional[ReconciliationRules] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Join payments to deliveries on (order_id, package_id) and classify the lag.
+
+    Args:
+        payments: Rows with order_id, package_id, payment_date and amount.
+        deliveries: Rows with order_id, package_id, event_time and status.
+
+    Returns:
+        {"matched": payments joined to their delivery, with payment_business_date,
+         delivery_business_date, days_diff and lag_class;
+         "unmatched_payments": payments without a delivery;
+         "unmatched_deliveries": deliveries without a payment}
+    """
+    rules = rules or ReconciliationRules()
+    payments = _with_keys(payments)
+    deliveries = _with_keys(deliveries)
+    if rules.delivery_statuses is not None and "status" in deliveries.columns:
+        deliveries = deliveries[deliveries["status"].isin(rules.delivery_statuses)]
+
+    payments = payments.assign(payment_business_date=business_dates(
+        payments["payment_date"], rules.timezone, rules.payment_timezone, rules.payment_cutoff_hour))
+    deliveries = deliveries.assign(delivery_business_date=business_dates(
+        deliveries["event_time"], rules.timezone, rules.source_timezone, rules.delivery_cutoff_hour))
+    # One delivery per key: the earliest qualifying event
+    deliveries = (deliveries.sort_values(["delivery_business_date", "event_time"], kind="stable")
+                  .drop_duplicates(list(KEYS), keep="first"))
+
+    joined = payments.merge(deliveries, on=list(KEYS), how="outer", suffixes=("_pay", "_del"), indicator=True)
+    side = joined.pop("_merge")
+    matched = joined[side == "both"].copy()
+    days = (matched["delivery_business_date"] - matched["payment_business_date"]).dt.days.to_numpy()
+    matched["days_diff"] = days
+    matched["lag_class"] = classify_lag(days, rules.tolerance_days)
+
+    payment_columns = [c for c in joined.columns if c in payments.columns or c.endswith("_pay")]
+    delivery_columns = list(KEYS) + [c for c in joined.columns
+                                     if c not in KEYS and (c in deliveries.columns or c.endswith("_del"))]
+    return {
+        "matched": matched.sort_values(list(KEYS), kind="stable").reset_index(drop=True),
+        "unmatched_payments": joined.loc[side == "left_only", payment_columns].reset_index(drop=True),
+        "unmatched_deliveries": joined.loc[side == "right_only", delivery_columns].reset_index(drop=True)
+    }
+
+
+def report_columns(payment_columns: Sequence[str], delivery_columns: Sequence[str],
+                   rules: Optional[ReconciliationRules] = None) -> Dict[str, List[str]]:
+    """
+    Columns of each report for inputs with these columns.
+
+    The merge suffixes ("_pay", "_del") depend on which columns both inputs
+    share, so the schema is taken from reconciling empty frames with the
+    full input columns, not from whichever rows a partition happens to hold.
+    """
+    frames = reconcile_frames(pd.DataFrame({c: pd.Series(dtype=object) for c in payment_columns}),
+                              pd.DataFrame({c: pd.Series(dtype=object) for c in delivery_columns}), rules)
+    return {
+        "unmatched_payments": list(frames["unmatched_payments"].columns),
+        "unmatched_deliveries": list(frames["unmatched_deliveries"].columns),
+        "lagged": list(frames["matched"].columns)
+    }
+
+
+# ----------------------------------------------------------------------
+# Chunked input and on-disk partitions
+# ----------------------------------------------------------------------
+
+def read_chunks(path: str, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV, Parquet or Excel file as DataFrames of up to `chunksize` rows.
+
+    Raises:
+        ValueError: Unsupported file extension.
+        ImportError: Parquet without pyarrow, or Excel without openpyxl.
+    """
+    ext = os.path.splitext(path[:-3] if path.endswith(".gz") else path)[1].lower()
+    if ext in (".csv", ".txt"):
+        yield from pd.read_csv(path, chunksize=chunksize, dtype={k: str for k in KEYS})
+    elif ext in (".parquet", ".pq"):
+        if pq is None:
+            raise ImportError("Reading Parquet needs pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif ext in (".xlsx", ".xlsm"):
+        if openpyxl is None:
+            raise ImportError("Reading Excel needs openpyxl")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(h) for h in next(rows)]
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == chunksize:
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=header)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported input format: {path}")
+
+
+def partition_of(df: pd.DataFrame, partitions: int) -> np.ndarray:
+    """Partition index of every row, from a hash of its join keys."""
+    hashes = pd.util.hash_pandas_object(_with_keys(df)[list(KEYS)], index=False).to_numpy()
+    return (hashes % np.uint64(partitions)).astype(np.int64)
+
+
+def _spill(path: str, side: str, work_dir: str, partitions: int, chunksize: int) -> Tuple[int, List[str]]:
+    """Split one input into per-partition pickle files. Returns the row count and the input's columns."""
+    rows = 0
+    columns = list(INPUT_COLUMNS[side])
+    for n, chunk in enumerate(read_chunks(path, chunksize)):
+        if n == 0:
+            columns = list(chunk.columns)
+        rows += len(chunk)
+        ids = partition_of(chunk, partitions)
+        for pid, part in chunk.groupby(ids, sort=False):
+            part.to_pickle(os.path.join(work_dir, f"p{pid:05d}", f"{side}-{n:06d}.pkl"))
+    return rows, columns
+
+
+def _load(part_dir: str, side: str, columns: Sequence[str]) -> pd.DataFrame:
+    files = sorted(f for f in os.listdir(part_dir) if f.startswith(side + "-"))
+    if not files:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in columns})
+    frame = pd.concat([pd.read_pickle(os.path.join(part_dir, f)) for f in files], ignore_index=True)
+    return frame.reindex(columns=list(columns))
+
+
+def _reconcile_partition(part_dir: str, out_dir: str, pid: int, rules: ReconciliationRules,
+                         schema: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Reconcile one partition, write its report rows (no header) and return its counts."""
+    frames = reconcile_frames(_load(part_dir, "payments", schema["payments"]),
+                              _load(part_dir, "deliveries", schema["deliveries"]), rules)
+    matched = frames["matched"]
+    reports = {
+        "unmatched_payments": frames["unmatched_payments"],
+        "unmatched_deliveries": frames["unmatched_deliveries"],
+        "lagged": matched[matched["lag_class"] != "ON_TIME"]
+    }
+    for name, frame in reports.items():
+        if len(frame):
+            frame.reindex(columns=schema[name]).to_csv(
+                os.path.join(out_dir, f".{name}-{pid:05d}.csv"), index=False, header=False)
+
+    amount = "amount" if "amount" in matched.columns else "amount_pay"
+    classes = matched["lag_class"].value_counts()
+    return {
+        "matched": len(matched),
+        "unmatched_payments": len(reports["unmatched_payments"]),
+        "unmatched_deliveries": len(reports["unmatched_deliveries"]),
+        "lagged": len(reports["lagged"]),
+        "classes": {c: int(classes.get(c, 0)) for c in LAG_CLASSES},
+        "amount_matched": float(matched[amount].sum()) if amount in matched.columns else 0.0,
+        "amount_unmatched": float(reports["unmatched_payments"][amount].sum())
+        if amount in reports["unmatched_payments"].columns else 0.0
+    }
+
+
+def _concat_reports(out_dir: str, partitions: int, schema: Dict[str, List[str]]) -> Dict[str, str]:
+    """Stream per-partition report files into one CSV per report, under the schema's header."""
+    paths = {}
+    for name in REPORTS:
+        path = paths[name] = os.path.join(out_dir, f"{name}.csv")
+        with open(path, "w", newline="") as out:
+            pd.DataFrame(columns=schema[name]).to_csv(out, index=False)
+            for pid in range(partitions):
+                part = os.path.join(out_dir, f".{name}-{pid:05d}.csv")
+                if not os.path.exists(part):
+                    continue
+                with open(part, newline="") as f:
+                    shutil.copyfileobj(f, out)
+                os.remove(part)
+    return paths
+
+
+def reconcile(payments_path: str, deliveries_path: str, out_dir: str,
+              rules: Optional[ReconciliationRules] = None, partitions: int = 64,
+              chunksize: int = 1_000_000, workers: Optional[int] = None,
+              work_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reconcile two files of any size into reports under `out_dir`.
+
+    Args:
+        partitions: On-disk hash partitions. Choose it so that total rows /
+            partitions fits comfortably in one worker's memory.
+        chunksize: Rows read from an input at a time.
+        workers: Processes joining partitions; defaults to the CPU count.
+            0 joins them in this process.
+        work_dir: Where partitions are spilled; a temporary directory by default.
+
+    Returns:
+        Row counts, lag classes, amounts and the report paths.
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be at least 1")
+    rules = rules or ReconciliationRules()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    os.makedirs(out_dir, exist_ok=True)
+    spill = tempfile.mkdtemp(prefix="reconcile-", dir=work_dir)
+    try:
+        part_dirs = [os.path.join(spill, f"p{pid:05d}") for pid in range(partitions)]
+        for part_dir in part_dirs:
+            os.mkdir(part_dir)
+        counts, schema = {}, {}
+        for side, path in (("payments", payments_path), ("deliveries", deliveries_path)):
+            counts[side], schema[side] = _spill(path, side, spill, partitions, chunksize)
+        schema.update(report_columns(schema["payments"], schema["deliveries"], rules))
+
+        if workers:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_reconcile_partition, part_dirs, [out_dir] * partitions,
+                                        range(partitions), [rules] * partitions, [schema] * partitions))
+        else:
+            results = [_reconcile_partition(part_dir, out_dir, pid, rules, schema)
+                       for pid, part_dir in enumerate(part_dirs)]
+    finally:
+        shutil.rmtree(spill, ignore_errors=True)
+
+    summary: Dict[str, Any] = {**counts, "classes": {c: 0 for c in LAG_CLASSES}}
+    for result in results:
+        for key, value in result.items():
+            if key == "classes":
+                for c, n in value.items():
+                    summary["classes"][c] += n
+            else:
+                summary[key] = summary.get(key, 0) + value
+    summary["amount_matched"] = round(summary.get("amount_matched", 0.0), 2)
+    summary["amount_unmatched"] = round(summary.get("amount_unmatched", 0.0), 2)
+    summary["reports"] = _concat_reports(out_dir, partitions, schema)
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("payments", help="finance_payments file (CSV, Parquet or Excel)")
+    parser.add_argument("deliveries", help="delivery_events file (CSV, Parquet or Excel)")
+    parser.add_argument("--out", required=True, help="Directory for the report CSVs")
+    parser.add_argument("--partitions", type=int, default=64)
+    parser.add_argument("--chunksize", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timezone", default="Africa/Addis_Ababa")
+    parser.add_argument("--source-timezone", default=None,
+                        help="Timezone of naive delivery event_time values (default: --timezone)")
+    parser.add_argument("--payment-timezone", default=None, help="Timezone of naive payment_date values")
+    parser.add_argument("--payment-cutoff-hour", type=int, default=None)
+    parser.add_argument("--delivery-cutoff-hour", type=int, default=None)
+    parser.add_argument("--tolerance-days", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rules = ReconciliationRules(timezone=args.timezone, source_timezone=args.source_timezone,
+                                payment_timezone=args.payment_timezone,
+                                payment_cutoff_hour=args.payment_cutoff_hour,
+                                delivery_cutoff_hour=args.delivery_cutoff_hour,
+                                tolerance_days=args.tolerance_days)
+    summary = reconcile(args.payments, args.deliveries, args.out, rules, partitions=args.partitions,
+                        chunksize=args.chunksize, workers=args.workers)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Campaign Recording Log
+
+SRS Reference: NFR 3.0 (Performance & Observability)
+Spec: specs/planner_service.md, Pattern A (Trend-Jacked Content)
+
+Compact binary log of one campaign run: every planner input and its task
+manifests, and every skill call with its input, output or error, start
+offset and duration.
+
+File layout: the 8-byte MAGIC, then a single zlib stream of frames. Each
+frame is a struct header `<BdI` (record type, start offset in seconds,
+payload length) followed by a compact JSON payload. The writer sync-flushes
+the zlib stream on `flush()`, so a log cut off by a crash is still readable
+up to its last flush.
+"""
+
+import json
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+MAGIC = b"CHMREC\x00\x01"
+
+META = 1
+PLAN = 2
+SKILL = 3
+
+_HEADER = struct.Struct("<BdI")
+_READ_CHUNK = 64 * 1024
+
+
+class LogWriter:
+    """
+    Append-only, thread-safe writer of recording frames.
+
+    Args:
+        path: Output file; truncated if it exists.
+        flush_every: Sync-flush the zlib stream after this many frames.
+    """
+
+    def __init__(self, path: str, flush_every: int = 256):
+        self.path = path
+        self.flush_every = flush_every
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._zip = zlib.compressobj(6)
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._unflushed = 0
+        self.frames = 0
+
+    def offset(self) -> float:
+        """Seconds since the log was opened; the clock used for frame offsets."""
+        return time.perf_counter() - self._start
+
+    def write(self, record_type: int, payload: Dict[str, Any], t: Optional[float] = None) -> None:
+        data = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        frame = _HEADER.pack(record_type, self.offset() if t is None else t, len(data)) + data
+        with self._lock:
+            self._file.write(self._zip.compress(frame))
+            self.frames += 1
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.write(self._zip.flush(zlib.Z_SYNC_FLUSH))
+        self._file.flush()
+        self._unflushed = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(self._zip.flush())
+            self._file.close()
+
+
+def read_log(path: str) -> Iterator[Tuple[int, float, Dict[str, Any]]]:
+    """
+    Yield (record_type, start_offset, payload) for every complete frame.
+
+    Raises:
+        ValueError: The file is not a recording log.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a campaign recording: {path}")
+        unzip = zlib.decompressobj()
+        buffer = b""
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if chunk:
+                buffer += unzip.decompress(chunk)
+            pos = 0
+            while len(buffer) - pos >= _HEADER.size:
+                record_type, t, length = _HEADER.unpack_from(buffer, pos)
+                end = pos + _HEADER.size + length
+                if end > len(buffer):
+                    break
+                yield record_type, t, json.loads(buffer[pos + _HEADER.size:end])
+                pos = end
+            buffer = buffer[pos:]
+            if not chunk:
+                return
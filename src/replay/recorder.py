@@ -0,0 +1,407 @@
+"""
+Campaign Recorder and Replayer
+
+SRS Reference: NFR 3.0 (Performance & Observability), §4.6 Orchestration
+Spec: specs/planner_service.md, Pattern A (Trend-Jacked Content)
+
+`Recorder` captures a campaign run into a src.replay.log file.
+`Replayer` runs that workload again offline:
+
+* The recording keeps the live clock: a recorded production run gets real
+  IDs and timestamps. While recording, the shared clock is a pass-through
+  tap that notes, per thread, every ID and timestamp handed out during a
+  recorded call, and the call's record stores them. During a replay, each
+  call is served its recorded IDs and timestamps in order, so its outputs
+  reproduce even under concurrency. Values a call asks for beyond its
+  recording come from a seeded src.ids.clock.IdClock moved to the call's
+  recorded offset.
+* Planner inputs are re-planned with the current CampaignPlanner code. The
+  replayer checks the task types each re-plan produces against the
+  recording. Task ids are not compared, since concurrent recordings
+  interleave them.
+* Skills listed in `external` have side effects or read state outside the
+  process: platform APIs, LLMs, image downloads, the ledger. By default
+  that is every repo skill. They are not run. The replayer serves their
+  recorded output or error, sleeping the recorded duration first when
+  pacing is "recorded".
+* Every other skill runs its current code with the recorded input. The
+  call matches when its output equals the recorded output, or when both
+  raised the same exception type.
+* pacing="full" replays as fast as possible. pacing="recorded" starts each
+  call at its recorded offset, divided by `speed`.
+
+A replay can be wrapped in cProfile, or in any start/stop hook pair such as a
+sampling profiler, so the real workload can be profiled offline.
+
+Usage:
+    python -m src.replay.recorder run.chrec --pacing recorded --profile replay.prof
+"""
+
+import argparse
+import cProfile
+import importlib
+import itertools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+from src.ids.clock import IdClock, get_clock, set_clock
+from src.planner.engine import CampaignPlanner
+from src.replay.log import LogWriter, read_log, META, PLAN, SKILL
+from src.worker.runtime import SKILL_MODULES
+
+# Skills with side effects or outside state, served from the recording by default
+EXTERNAL_SKILLS = frozenset({"publish_post", "fetch_trends", "generate_content", "validate_image",
+                             "check_wallet_balance"})
+
+
+class RecordedError(Exception):
+    """An error a served skill raised in the recording."""
+
+    def __init__(self, error: Dict[str, str]):
+        super().__init__(f"{error['type']}: {error['message']}")
+        self.error = error
+
+
+class _ClockTap(IdClock):
+    """
+    Shared-clock stand-in for a recording.
+
+    Hands out the wrapped live clock's IDs and timestamps unchanged, and
+    appends each one to the tape of the recorded call running on this thread.
+    """
+
+    def __init__(self, clock: IdClock):
+        self.clock = clock
+        self.deterministic = clock.deterministic
+        self._local = threading.local()
+
+    def start(self) -> Optional[Dict[str, List[str]]]:
+        """Begin a tape for this thread; returns the enclosing call's tape to restore."""
+        previous = getattr(self._local, "tape", None)
+        self._local.tape = {"ids": [], "times": []}
+        return previous
+
+    def stop(self, previous: Optional[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        tape = self._local.tape
+        self._local.tape = previous
+        return tape
+
+    def _note(self, kind: str, value: str) -> str:
+        tape = getattr(self._local, "tape", None)
+        if tape is not None:
+            tape[kind].append(value)
+        return value
+
+    def now_ms(self) -> int:
+        return self.clock.now_ms()
+
+    def advance(self, ms: int) -> None:
+        self.clock.advance(ms)
+
+    def uuid7_int(self) -> int:
+        return self.clock.uuid7_int()
+
+    def uuid7(self) -> str:
+        return self._note("ids", self.clock.uuid7())
+
+    def isoformat(self) -> str:
+        return self._note("times", self.clock.isoformat())
+
+
+class _ClockTape(IdClock):
+    """
+    Shared clock for a replay.
+
+    Serves the IDs and timestamps recorded for the call replaying on this
+    thread, in order. Past the end of the tape it falls back to a seeded
+    clock.
+    """
+
+    def __init__(self, fallback: IdClock):
+        self.fallback = fallback
+        self.deterministic = True
+        self._local = threading.local()
+
+    def load(self, tape: Dict[str, List[str]]) -> None:
+        self._local.ids = iter(tape.get("ids", ()))
+        self._local.times = iter(tape.get("times", ()))
+
+    def now_ms(self) -> int:
+        return self.fallback.now_ms()
+
+    def advance(self, ms: int) -> None:
+        self.fallback.advance(ms)
+
+    def uuid7_int(self) -> int:
+        return self.fallback.uuid7_int()
+
+    def uuid7(self) -> str:
+        value = next(getattr(self._local, "ids", iter(())), None)
+        return value if value is not None else self.fallback.uuid7()
+
+    def isoformat(self) -> str:
+        value = next(getattr(self._local, "times", iter(())), None)
+        return value if value is not None else self.fallback.isoformat()
+
+
+def _sync_clock(clock: IdClock, start_ms: int, t: float) -> None:
+    """Move a deterministic clock forward to the recorded offset `t` (never backwards)."""
+    delta = start_ms + int(t * 1000) - clock.now_ms()
+    if delta > 0:
+        clock.advance(delta)
+
+
+def _normalized(value: Any) -> Any:
+    """`value` as it reads back from the log, for comparing outputs."""
+    return json.loads(json.dumps(value, separators=(",", ":"), default=str))
+
+
+class Recorder:
+    """
+    Records planner and skill calls made through it.
+
+    Usage:
+        with Recorder("run.chrec") as rec:
+            tasks = rec.plan(planner, manifest)
+            output = rec.call("publish_post", execute_skill, input_data)
+
+    The live clock keeps producing real IDs and timestamps while recording;
+    the ones each call received are stored with its record.
+    """
+
+    def __init__(self, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.log = LogWriter(path)
+        self._tap = _ClockTap(get_clock())
+        set_clock(self._tap)
+        self.log.write(META, {"version": 2, "clock_start_ms": self._tap.now_ms(), **(meta or {})}, t=0.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def plan(self, planner: CampaignPlanner, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run planner.plan_campaign and record the manifest and resulting tasks."""
+        t = self.log.offset()
+        previous = self._tap.start()
+        try:
+            tasks = planner.plan_campaign(manifest)
+        finally:
+            tape = self._tap.stop(previous)
+        self.log.write(PLAN, {"manifest": manifest, "tasks": tasks, "duration": self.log.offset() - t,
+                              "clock": tape}, t=t)
+        return tasks
+
+    def call(self, skill: str, fn: Callable[[Dict[str, Any]], Any], input_data: Dict[str, Any]) -> Any:
+        """Call a skill and record input, output or error, and timing. Errors propagate."""
+        t = self.log.offset()
+        record = {"skill": skill, "input": input_data}
+        previous = self._tap.start()
+        try:
+            record["output"] = fn(input_data)
+            return record["output"]
+        except Exception as e:
+            record["error"] = {"type": type(e).__name__, "message": str(e)}
+            raise
+        finally:
+            record["clock"] = self._tap.stop(previous)
+            record["duration"] = self.log.offset() - t
+            self.log.write(SKILL, record, t=t)
+
+    def wrap(self, skill: str, fn: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        """Return `fn` wrapped so every call is recorded under `skill`."""
+        return lambda input_data: self.call(skill, fn, input_data)
+
+    def close(self) -> None:
+        self.log.close()
+        if get_clock() is self._tap:
+            set_clock(self._tap.clock)
+
+
+class Replayer:
+    """
+    Re-run a recording against the current planner and skill code.
+
+    Args:
+        path: Recording written by Recorder.
+        external: Skill names served from the recording instead of executed.
+        skills: Skill name -> callable; defaults to the repo skills.
+        pacing: "full" or "recorded".
+        speed: Pacing multiplier for "recorded" (2.0 = twice as fast).
+        concurrency: Threads replaying calls; recorded runs are often concurrent.
+    """
+
+    def __init__(self, path: str, external: Iterable[str] = EXTERNAL_SKILLS,
+                 skills: Optional[Dict[str, Callable]] = None, pacing: str = "full",
+                 speed: float = 1.0, concurrency: int = 1):
+        if pacing not in ("full", "recorded"):
+            raise ValueError(f"Unknown pacing: {pacing}")
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.path = path
+        self.external = frozenset(external)
+        self.skills = dict(skills or {})
+        self.pacing = pacing
+        self.speed = speed
+        self.concurrency = concurrency
+        self.planner = CampaignPlanner()
+        self.meta: Dict[str, Any] = {}
+        self._clock: Optional[_ClockTape] = None
+
+    def _skill(self, name: str) -> Callable:
+        fn = self.skills.get(name)
+        if fn is None:
+            fn = importlib.import_module(SKILL_MODULES[name]).execute_skill
+            self.skills[name] = fn
+        return fn
+
+    def serve(self, payload: Dict[str, Any]) -> Any:
+        """
+        The recorded outcome of an external skill call.
+
+        Raises:
+            RecordedError: The call raised in the recording.
+        """
+        if self.pacing == "recorded":
+            time.sleep(payload["duration"] / self.speed)
+        if "error" in payload:
+            raise RecordedError(payload["error"])
+        return payload["output"]
+
+    def _replay_one(self, record_type: int, t: float, payload: Dict[str, Any]) -> Tuple[str, float, float, bool]:
+        """Replay one record. Returns (stage, recorded_s, replayed_s, matched)."""
+        if self._clock is not None:
+            self._clock.load(payload.get("clock", {}))
+            _sync_clock(self._clock.fallback, self.meta["clock_start_ms"], t)
+        start = time.perf_counter()
+        if record_type == PLAN:
+            tasks = self.planner.plan_campaign(payload["manifest"])
+            matched = [t["task_type"] for t in tasks] == [t["task_type"] for t in payload["tasks"]]
+            return "planner.plan_campaign", payload["duration"], time.perf_counter() - start, matched
+
+        name = payload["skill"]
+        if name in self.external:
+            try:
+                self.serve(payload)
+            except RecordedError:
+                pass
+            matched = True
+        else:
+            try:
+                output = self._skill(name)(payload["input"])
+                matched = "error" not in payload and _normalized(output) == payload["output"]
+            except Exception as e:
+                matched = "error" in payload and payload["error"]["type"] == type(e).__name__
+        return f"skill.{name}", payload["duration"], time.perf_counter() - start, matched
+
+    def records(self) -> Iterable[Tuple[int, float, Dict[str, Any]]]:
+        for record_type, t, payload in read_log(self.path):
+            if record_type == META:
+                self.meta = payload
+                continue
+            yield record_type, t, payload
+
+    def run(self, profile: Optional[str] = None,
+            hooks: Optional[Tuple[Callable[[], Any], Callable[[], Any]]] = None) -> Dict[str, Any]:
+        """
+        Replay the whole recording.
+
+        Args:
+            profile: Write cProfile stats here (view with pstats or snakeviz).
+                cProfile only sees the calling thread, so profile with concurrency=1.
+            hooks: (start, stop) callables run around the replay, e.g. a
+                sampling profiler's start/stop.
+
+        Returns:
+            Summary with per-stage recorded vs replayed seconds and the number
+            of calls whose outcome diverged from the recording.
+        """
+        profiler = cProfile.Profile() if profile else None
+        stages: Dict[str, Dict[str, float]] = {}
+        divergent = 0
+
+        def collect(outcome):
+            nonlocal divergent
+            stage, recorded, replayed, matched = outcome
+            entry = stages.setdefault(stage, {"calls": 0, "recorded_s": 0.0, "replayed_s": 0.0})
+            entry["calls"] += 1
+            entry["recorded_s"] += recorded
+            entry["replayed_s"] += replayed
+            divergent += not matched
+
+        records = self.records()
+        first = next(records, None)
+        previous_clock = get_clock()
+        if "clock_start_ms" in self.meta:
+            # Version 1 recordings ran on a seeded clock and carry no tapes
+            seed = self.meta.get("clock_seed", 0)
+            self._clock = _ClockTape(IdClock(seed=seed, start_ms=self.meta["clock_start_ms"]))
+            set_clock(self._clock)
+
+        if hooks:
+            hooks[0]()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = []
+                for record_type, t, payload in itertools.chain([first] if first else [], records):
+                    if self.pacing == "recorded":
+                        delay = start + t / self.speed - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    if self.concurrency == 1:
+                        collect(self._replay_one(record_type, t, payload))
+                    else:
+                        futures.append(pool.submit(self._replay_one, record_type, t, payload))
+                for future in futures:
+                    collect(future.result())
+        finally:
+            elapsed = time.perf_counter() - start
+            if self._clock is not None:
+                set_clock(previous_clock)
+                self._clock = None
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(profile)
+            if hooks:
+                hooks[1]()
+
+        for entry in stages.values():
+            entry["recorded_s"] = round(entry["recorded_s"], 6)
+            entry["replayed_s"] = round(entry["replayed_s"], 6)
+        return {
+            "meta": self.meta,
+            "pacing": self.pacing,
+            "elapsed_s": round(elapsed, 6),
+            "calls": sum(int(e["calls"]) for e in stages.values()),
+            "divergent": divergent,
+            "stages": dict(sorted(stages.items()))
+        }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="Recording written by Recorder")
+    parser.add_argument("--pacing", choices=["full", "recorded"], default="full")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--execute", action="append", default=[],
+                        help="Run this external skill's code instead of serving its recorded output (repeatable)")
+    parser.add_argument("--profile", help="Write cProfile stats to this path")
+    args = parser.parse_args(argv)
+
+    replayer = Replayer(args.log, external=EXTERNAL_SKILLS - set(args.execute), pacing=args.pacing,
+                        speed=args.speed, concurrency=args.concurrency)
+    print(json.dumps(replayer.run(profile=args.profile), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
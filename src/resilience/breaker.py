@@ -0,0 +1,384 @@
+"""
+Circuit Breakers and Bulkheads per Capability
+
+SRS Reference: §4.4 Action System (FR4.2), OpenClaw Integration, NFR 3.0
+Spec: specs/technical.md, MCP Capability Definition (capability_id); specs/openclaw_integration.md
+
+Isolates outbound capabilities from each other. A capability is a
+capability_id, or an endpoint key such as "publish_post:tiktok". Without
+isolation, a degraded platform API ties up worker threads, and calls to
+every healthy platform queue behind it.
+
+* Bulkhead. Each capability has its own concurrency limit. A call waits at
+  most `max_wait` seconds for a slot and then fails with BulkheadFull, so a
+  slow capability can hold only its own slots.
+* Circuit breaker. Calls, errors and slow calls are counted in a rolling
+  window of time buckets. Once the window holds `min_calls` calls and
+  either the error rate or the slow-call rate reaches its threshold, the
+  breaker goes CLOSED -> OPEN, and calls then fail at once with
+  CircuitOpen. After `open_seconds` it becomes HALF_OPEN and admits
+  `half_open_calls` probes. If every probe succeeds it closes again; one
+  failure reopens it.
+
+Errors in `ignored` propagate without being judged: the call counts
+neither as a failure nor as a success, and a HALF_OPEN probe that raised
+one is handed back. By default these are ValueError (bad input, not a
+degraded endpoint) and HardRateLimit, which the rate-limit controller
+answers on its own. Callers that also go through the controller put it
+outside the breaker, so permit waits are not timed as call latency and do
+not hold bulkhead slots:
+
+    controller.call(endpoint, get_resilience().call, endpoint, gateway.publish, request)
+ Each state
+change is reported to `on_state`. The shared instance from
+get_resilience() emits it as a "resilience.state" telemetry event.
+
+Usage:
+    result = get_resilience().call("publish_post:tiktok", gateway.publish, request)
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple, Type
+
+from src.ratelimit.controller import HardRateLimit
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpen(Exception):
+    """The capability's breaker is open; the call was not attempted."""
+
+    def __init__(self, capability: str, retry_in: float):
+        super().__init__(f"Circuit open for {capability}; retry in {retry_in:.1f}s")
+        self.capability = capability
+        self.retry_in = retry_in
+
+
+class BulkheadFull(Exception):
+    """Every concurrency slot of the capability stayed busy for max_wait seconds."""
+
+    def __init__(self, capability: str):
+        super().__init__(f"Bulkhead full for {capability}")
+        self.capability = capability
+
+
+DEFAULTS = {
+    "max_concurrent": 32,
+    "max_wait": 0.5,
+    "window_seconds": 30.0,
+    "buckets": 10,
+    "min_calls": 20,
+    "error_rate": 0.5,
+    "slow_call_seconds": 5.0,
+    "slow_rate": 0.8,
+    "open_seconds": 10.0,
+    "half_open_calls": 3,
+}
+
+
+class CircuitBreaker:
+    """
+    Rolling-window breaker for one capability. Thread-safe.
+
+    Args:
+        name: Capability the breaker guards.
+        window_seconds: Span of the rolling window.
+        buckets: Time buckets the window is divided into.
+        min_calls: Calls the window must hold before rates are judged.
+        error_rate: Failed fraction of calls that opens the breaker.
+        slow_call_seconds: Duration from which a call counts as slow.
+        slow_rate: Slow fraction of calls that opens the breaker.
+        open_seconds: Time spent OPEN before probing.
+        half_open_calls: Successful probes needed to close again.
+        on_state: Called with (name, old_state, new_state, stats) on every change.
+        clock: Monotonic time source.
+    """
+
+    def __init__(self, name: str, window_seconds: float = 30.0, buckets: int = 10, min_calls: int = 20,
+                 error_rate: float = 0.5, slow_call_seconds: float = 5.0, slow_rate: float = 0.8,
+                 open_seconds: float = 10.0, half_open_calls: int = 3,
+                 on_state: Optional[Callable[[str, str, str, Dict[str, Any]], Any]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 0 < error_rate <= 1 or not 0 < slow_rate <= 1:
+            raise ValueError("error_rate and slow_rate must be in (0, 1]")
+        if buckets < 1 or half_open_calls < 1:
+            raise ValueError("buckets and half_open_calls must be at least 1")
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.on_state = on_state
+        self.clock = clock
+        self._width = window_seconds / buckets
+        # Per bucket: [bucket index, calls, errors, slow]
+        self._buckets = [[-1, 0, 0, 0] for _ in range(buckets)]
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Admit a call or raise.
+
+        Returns:
+            True if the call is a HALF_OPEN probe; pass it back to record().
+
+        Raises:
+            CircuitOpen: The breaker is open, or HALF_OPEN with all probes out.
+        """
+        change = None
+        with self._lock:
+            now = self.clock()
+            if self.state == OPEN:
+                retry_in = self._opened_at + self.open_seconds - now
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, retry_in)
+                change = self._transition(HALF_OPEN, now)
+            probe = self.state == HALF_OPEN
+            if probe:
+                if self._probes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, 0.0)
+                self._probes += 1
+        self._notify(change)
+        return probe
+
+    def cancel(self, probe: bool) -> None:
+        """Return an admitted call that never ran, without judging the capability."""
+        if probe:
+            with self._lock:
+                if self.state == HALF_OPEN and self._probes > 0:
+                    self._probes -= 1
+
+    def record(self, success: bool, seconds: float, probe: bool = False) -> None:
+        """Count a finished call admitted by allow()."""
+        change = None
+        with self._lock:
+            now = self.clock()
+            slow = seconds >= self.slow_call_seconds
+            bucket = self._bucket(now)
+            bucket[1] += 1
+            bucket[2] += not success
+            bucket[3] += slow
+            if probe and self.state == HALF_OPEN:
+                if success and not slow:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        change = self._transition(CLOSED, now)
+                else:
+                    change = self._transition(OPEN, now)
+            elif self.state == CLOSED:
+                calls, errors, slow_calls = self._totals(now)
+                if calls >= self.min_calls and (errors >= self.error_rate * calls
+                                                or slow_calls >= self.slow_rate * calls):
+                    change = self._transition(OPEN, now)
+        self._notify(change)
+
+    def _bucket(self, now: float):
+        index = int(now // self._width)
+        bucket = self._buckets[index % len(self._buckets)]
+        if bucket[0] != index:
+            bucket[:] = [index, 0, 0, 0]
+        return bucket
+
+    def _totals(self, now: float) -> Tuple[int, int, int]:
+        oldest = int(now // self._width) - len(self._buckets)
+        calls = errors = slow = 0
+        for index, c, e, s in self._buckets:
+            if index > oldest:
+                calls += c
+                errors += e
+                slow += s
+        return calls, errors, slow
+
+    def _transition(self, state: str, now: float):
+        old, self.state = self.state, state
+        self._probes = self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = now
+            self.opened += 1
+        elif state == CLOSED:
+            for bucket in self._buckets:
+                bucket[:] = [-1, 0, 0, 0]
+        return old, state, self._stats(now)
+
+    def _notify(self, change) -> None:
+        if change is not None and self.on_state is not None:
+            self.on_state(self.name, *change)
+
+    def _stats(self, now: float) -> Dict[str, Any]:
+        calls, errors, slow = self._totals(now)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "error_rate": round(errors / calls, 3) if calls else 0.0,
+            "slow_rate": round(slow / calls, 3) if calls else 0.0,
+            "opened": self.opened,
+            "rejected": self.rejected
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._stats(self.clock())
+
+
+class Bulkhead:
+    """Concurrency limit for one capability."""
+
+    def __init__(self, name: str, max_concurrent: int = 32, max_wait: float = 0.5):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def acquire(self) -> None:
+        """
+        Raises:
+            BulkheadFull: No slot freed up within max_wait seconds.
+        """
+        if not self._slots.acquire(timeout=self.max_wait):
+            with self._lock:
+                self.rejected += 1
+            raise BulkheadFull(self.name)
+        with self._lock:
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+
+class Resilience:
+    """
+    Breaker and bulkhead registry keyed by capability.
+
+    Args:
+        on_state: Called with (capability, old_state, new_state, stats) when a breaker changes state.
+        ignored: Exception types that propagate without judging the capability.
+        clock: Monotonic time source shared by every breaker.
+        **defaults: Overrides of DEFAULTS for every capability.
+    """
+
+    def __init__(self, on_state: Optional[Callable[[str, str, str, Dict[str, Any]], Any]] = None,
+                 ignored: Tuple[Type[BaseException], ...] = (ValueError, HardRateLimit),
+                 clock: Callable[[], float] = time.monotonic, **defaults):
+        unknown = set(defaults) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings: {sorted(unknown)}")
+        self.defaults = {**DEFAULTS, **defaults}
+        self.on_state = on_state
+        self.ignored = ignored
+        self.clock = clock
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        self._guards: Dict[str, Tuple[CircuitBreaker, Bulkhead]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, capability: str, **settings) -> None:
+        """Override settings for one capability; takes effect for a capability not yet used."""
+        unknown = set(settings) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown settings: {sorted(unknown)}")
+        with self._lock:
+            self._settings[capability] = settings
+            self._guards.pop(capability, None)
+
+    def _guard(self, capability: str) -> Tuple[CircuitBreaker, Bulkhead]:
+        guard = self._guards.get(capability)
+        if guard is None:
+            with self._lock:
+                guard = self._guards.get(capability)
+                if guard is None:
+                    s = {**self.defaults, **self._settings.get(capability, {})}
+                    breaker = CircuitBreaker(
+                        capability, window_seconds=s["window_seconds"], buckets=s["buckets"],
+                        min_calls=s["min_calls"], error_rate=s["error_rate"],
+                        slow_call_seconds=s["slow_call_seconds"], slow_rate=s["slow_rate"],
+                        open_seconds=s["open_seconds"], half_open_calls=s["half_open_calls"],
+                        on_state=self.on_state, clock=self.clock)
+                    guard = self._guards[capability] = (
+                        breaker, Bulkhead(capability, s["max_concurrent"], s["max_wait"]))
+        return guard
+
+    def call(self, capability: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` behind the capability's breaker and bulkhead.
+
+        Raises:
+            CircuitOpen: Failing fast; fn was not called.
+            BulkheadFull: No concurrency slot; fn was not called.
+        """
+        breaker, bulkhead = self._guard(capability)
+        probe = breaker.allow()
+        try:
+            bulkhead.acquire()
+        except BulkheadFull:
+            breaker.cancel(probe)
+            raise
+        start = self.clock()
+        success = True
+        try:
+            return fn(*args, **kwargs)
+        except self.ignored:
+            success = None
+            raise
+        except Exception:
+            success = False
+            raise
+        finally:
+            bulkhead.release()
+            if success is None:
+                breaker.cancel(probe)
+            else:
+                breaker.record(success, self.clock() - start, probe)
+
+    def state(self, capability: str) -> str:
+        return self._guard(capability)[0].state
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-capability breaker state, rolling rates, in-flight calls and rejections."""
+        report = {}
+        for capability, (breaker, bulkhead) in list(self._guards.items()):
+            stats = breaker.stats()
+            report[capability] = {**stats, "in_flight": bulkhead.in_flight,
+                                  "max_concurrent": bulkhead.max_concurrent,
+                                  "bulkhead_rejected": bulkhead.rejected}
+        return report
+
+
+def _emit_state(capability: str, old: str, new: str, stats: Dict[str, Any]) -> None:
+    from task1 import telemetry
+    telemetry.emit("resilience.state", {"capability": capability, "from": old, "to": new, **stats})
+
+
+# Process-wide registry shared by the outbound skills
+_resilience: Optional[Resilience] = None
+
+
+def get_resilience() -> Resilience:
+    global _resilience
+    if _resilience is None:
+        _resilience = Resilience(on_state=_emit_state)
+    return _resilience
+
+
+def set_resilience(resilience: Optional[Resilience]) -> None:
+    """Replace the shared registry (e.g. with tuned thresholds). None resets to defaults."""
+    global _resilience
+    _resilience = resilience
@@ -0,0 +1,337 @@
+"""
+Task Result Store
+
+SRS Reference: §3.1 FastRender Swarm (Judge review), §4.6 Orchestration
+Spec: specs/technical.md, Agent Task Schema (AgentTaskResult)
+
+Stores AgentTaskResults for Judge review and audit, with content-addressed
+deduplication. The `output`, `proof` and `error` objects are serialized to
+canonical JSON and stored once per SHA-256 digest. Each task keeps only a
+compact metadata row that points at those digests, so a trend list or draft
+that repeats across retries and campaigns is written once. Small blobs are
+stored inline in SQLite. Blobs above `inline_limit` go to an object store;
+`FileObjectStore` stands in for S3 locally.
+
+Object-store writes land before the SQLite commit, so a failed or rolled-back
+`put` can leave objects no row points at, and a retry that replaces a result
+can leave blobs nothing references. `gc()` removes both; opening a store
+sweeps the object store once.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+
+from src.schemas.agent_task import validate_task_result
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    data BLOB
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    task_id TEXT PRIMARY KEY,
+    worker_soul_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    completed_at TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    output_digest TEXT NOT NULL REFERENCES blobs(digest),
+    proof_digest TEXT REFERENCES blobs(digest),
+    error_digest TEXT REFERENCES blobs(digest),
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_worker ON results(worker_soul_id);
+"""
+
+# Result fields stored as content-addressed blobs
+BLOB_FIELDS = ("output", "proof", "error")
+META_FIELDS = ("task_id", "worker_soul_id", "status", "completed_at", "confidence")
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FileObjectStore:
+    """
+    Local filesystem stand-in for the S3 bucket holding large blobs.
+
+    Keys fan out into two levels of subdirectories (ab/cd/abcd...) so no single
+    directory grows unbounded. Writes are atomic (temp file + rename), which
+    also makes concurrent writes of the same content-addressed key harmless.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list(self) -> Iterator[Tuple[str, float]]:
+        """Yield (key, modified time) for every stored object."""
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if not name.startswith(".tmp-"):
+                    yield name, os.path.getmtime(os.path.join(directory, name))
+
+
+class ResultStore:
+    """
+    Content-addressed store for AgentTaskResults.
+
+    Args:
+        path: SQLite database for metadata and inline blobs.
+        object_store: Where blobs larger than `inline_limit` go; required
+            only if such blobs are written.
+        inline_limit: Largest serialized blob (bytes) kept inline in SQLite.
+        validate: Check each result against TASK_RESULT_SCHEMA on write.
+        sweep_on_open: Delete orphaned objects (see `gc`) when opening.
+    """
+
+    def __init__(self, path: str = ":memory:", object_store: Optional[FileObjectStore] = None,
+                 inline_limit: int = 16 * 1024, validate: bool = True, sweep_on_open: bool = True):
+        self.path = path
+        self.object_store = object_store
+        self.inline_limit = inline_limit
+        self.validate = validate
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Blob bytes committed by this instance
+        self.bytes_written = 0
+        if sweep_on_open and object_store is not None:
+            self._sweep_objects(min_age_seconds=300.0)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put(self, result: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Store one result. See put_batch."""
+        return self.put_batch([result])[0]
+
+    def put_batch(self, results: Iterable[Dict[str, Any]]) -> List[Dict[str, Optional[str]]]:
+        """
+        Store results in one transaction, writing each distinct blob once.
+
+        A result with an existing task_id (a retry) replaces the earlier one.
+
+        Returns:
+            Per result, the blob digests for output, proof and error.
+
+        Raises:
+            ValueError: A result fails TASK_RESULT_SCHEMA validation.
+        """
+        rows = []
+        blobs: Dict[str, bytes] = {}
+        digests_out = []
+        for result in results:
+            if self.validate:
+                check = validate_task_result(result)
+                if not check["valid"]:
+                    raise ValueError(f"Invalid task result {result.get('task_id')}: {check['errors']}")
+
+            digests: Dict[str, Optional[str]] = {}
+            for field in BLOB_FIELDS:
+                if result.get(field) is None:
+                    digests[field] = None
+                    continue
+                data = _canonical(result[field])
+                digest = hashlib.sha256(data).hexdigest()
+                blobs.setdefault(digest, data)
+                digests[field] = digest
+
+            extra = {k: v for k, v in result.items() if k not in BLOB_FIELDS and k not in META_FIELDS}
+            rows.append((
+                result["task_id"], result["worker_soul_id"], result["status"], result["completed_at"],
+                result["confidence"], digests["output"], digests["proof"], digests["error"],
+                _canonical(extra).decode("utf-8") if extra else None
+            ))
+            digests_out.append(digests)
+
+        with self._lock:
+            new = self._missing(list(blobs))
+            blob_rows = []
+            for digest in new:
+                data = blobs[digest]
+                if len(data) > self.inline_limit:
+                    if self.object_store is None:
+                        raise ValueError(f"Blob of {len(data)} bytes exceeds inline_limit and no object store is set")
+                    if not self.object_store.exists(digest):
+                        self.object_store.put(digest, data)
+                    blob_rows.append((digest, len(data), None))
+                else:
+                    blob_rows.append((digest, len(data), data))
+
+            # Object-store writes land first, so a committed row never points at a missing blob.
+            # If the commit fails, those objects are orphans until the next gc().
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", blob_rows)
+                self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.bytes_written += sum(size for _, size, _ in blob_rows)
+        return digests_out
+
+    def _missing(self, digests: List[str]) -> List[str]:
+        present = set()
+        for i in range(0, len(digests), _QUERY_CHUNK):
+            chunk = digests[i:i + _QUERY_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            present.update(d for (d,) in self._conn.execute(
+                f"SELECT digest FROM blobs WHERE digest IN ({marks})", chunk))
+        return [d for d in digests if d not in present]
+
+    # ------------------------------------------------------------------
+    # Garbage collection
+    # ------------------------------------------------------------------
+
+    def gc(self, min_age_seconds: float = 300.0) -> Dict[str, int]:
+        """
+        Delete blobs no result references, and objects no blob row records.
+
+        Blobs are orphaned when a retry replaces a result; objects are
+        orphaned when a `put` fails after writing to the object store.
+
+        Args:
+            min_age_seconds: Leave objects younger than this alone, since
+                another process may be about to commit a row for them.
+
+        Returns:
+            blobs (rows deleted) and objects (object-store entries deleted).
+        """
+        unreferenced = ("digest NOT IN (SELECT output_digest FROM results UNION "
+                        "SELECT proof_digest FROM results WHERE proof_digest IS NOT NULL UNION "
+                        "SELECT error_digest FROM results WHERE error_digest IS NOT NULL)")
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                spilled = [d for (d,) in self._conn.execute(
+                    f"SELECT digest FROM blobs WHERE data IS NULL AND {unreferenced}")]
+                blobs = self._conn.execute(f"DELETE FROM blobs WHERE {unreferenced}").rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            objects = 0
+            if self.object_store is not None:
+                for digest in spilled:
+                    self.object_store.delete(digest)
+                objects = len(spilled) + self._sweep_objects(min_age_seconds)
+        return {"blobs": blobs, "objects": objects}
+
+    def _sweep_objects(self, min_age_seconds: float) -> int:
+        """Delete objects older than `min_age_seconds` that have no blobs row."""
+        cutoff = time.time() - min_age_seconds
+        with self._lock:
+            candidates = [key for key, mtime in self.object_store.list() if mtime <= cutoff]
+            orphans = self._missing(candidates)
+            for key in orphans:
+                self.object_store.delete(key)
+        return len(orphans)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([task_id]).get(task_id)
+
+    def get_many(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Bulk fetch results by task_id.
+
+        Each distinct blob is read once, from SQLite or the object store,
+        however many of the requested tasks share it. Unknown task_ids are
+        omitted.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        rows = []
+        with self._lock:
+            for i in range(0, len(task_ids), _QUERY_CHUNK):
+                chunk = task_ids[i:i + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(f"SELECT * FROM results WHERE task_id IN ({marks})", chunk))
+
+            digests = list({d for row in rows for d in row[5:8] if d is not None})
+            blobs: Dict[str, Optional[bytes]] = {}
+            for i in range(0, len(digests), _QUERY_CHUNK):
+                chunk = digests[i:i + _QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for digest, data in self._conn.execute(
+                        f"SELECT digest, data FROM blobs WHERE digest IN ({marks})", chunk):
+                    blobs[digest] = data
+
+        for digest, data in blobs.items():
+            if data is None:
+                blobs[digest] = self.object_store.get(digest)
+
+        results = {}
+        for task_id, soul_id, status, completed_at, confidence, out_d, proof_d, err_d, extra in rows:
+            result = json.loads(extra) if extra else {}
+            result.update(task_id=task_id, worker_soul_id=soul_id, status=status,
+                          completed_at=completed_at, confidence=confidence)
+            for field, digest in zip(BLOB_FIELDS, (out_d, proof_d, err_d)):
+                if digest is not None:
+                    # Parse per result so callers never share mutable objects
+                    result[field] = json.loads(blobs[digest])
+            results[task_id] = result
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Result count, distinct blobs, and logical vs stored blob bytes."""
+        with self._lock:
+            results = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            blobs, stored = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            logical = self._conn.execute(
+                "SELECT COALESCE(SUM(b.size), 0) FROM results r "
+                "JOIN blobs b ON b.digest IN (r.output_digest, r.proof_digest, r.error_digest)"
+            ).fetchone()[0]
+        return {"results": results, "blobs": blobs, "stored_bytes": stored, "logical_bytes": logical}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
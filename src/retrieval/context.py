@@ -0,0 +1,148 @@
+"""
+Persona / Campaign Context Retrieval
+
+SRS Reference: §4.3 Creative Engine (FR3.1), §4.2 Perception (FR2.2)
+Spec: specs/technical.md, Weaviate Collections; Diagram "Worker->>Weaviate: query(persona_context)"
+
+Workers query persona and campaign context before every content_generation
+task. This module batches those lookups: persona vectors are cached per
+soul_id, and the context queries for many tasks run as one batched top-k
+search. The resulting ids are appended to the task's `context_ids`, which
+generate_content consumes.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, List, Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from src.retrieval.vector_index import VectorIndex, HashingEmbedder
+
+EmbedFn = Callable[[Sequence[str]], np.ndarray]
+
+
+class ContextRetriever:
+    """
+    Batched retrieval over the persona_embeddings and campaign_context indexes.
+
+    Args:
+        embed_fn: Text -> (n, dim) embedding function; defaults to HashingEmbedder.
+        persona_weight: How strongly the persona vector steers each query.
+        cache_size: Maximum number of soul_id embeddings kept in the LRU cache.
+    """
+
+    def __init__(self, embed_fn: Optional[EmbedFn] = None, dim: int = 256,
+                 persona_weight: float = 0.5, cache_size: int = 4096):
+        self.embed_fn = embed_fn or HashingEmbedder(dim)
+        self.persona_index = VectorIndex(dim)
+        self.context_index = VectorIndex(dim)
+        self.persona_weight = persona_weight
+        self.cache_size = cache_size
+        self._persona_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def add_personas(self, personas: List[Dict[str, Any]]) -> None:
+        """
+        Index PersonaEmbedding objects.
+
+        Each persona needs `soul_id`; its text is built from `voice_tone` and
+        `content_themes` unless a precomputed `vector` is supplied.
+        """
+        ids = [p["soul_id"] for p in personas]
+        self.persona_index.add(ids, self._vectors(personas, self._persona_text))
+        for soul_id in ids:
+            self._persona_cache.pop(soul_id, None)
+
+    def add_campaign_context(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Index CampaignContext objects, grouped by campaign_id.
+
+        Each entry needs `context_id` and `campaign_id`; its text comes from
+        `campaign_description` and `successful_patterns` unless a `vector` is given.
+        """
+        ids = [e["context_id"] for e in entries]
+        groups = [e["campaign_id"] for e in entries]
+        self.context_index.add(ids, self._vectors(entries, self._context_text), groups=groups)
+
+    def _vectors(self, objects: List[Dict[str, Any]], to_text: Callable[[Dict[str, Any]], str]) -> np.ndarray:
+        if not objects:
+            return np.zeros((0, self.persona_index.dim), dtype=np.float32)
+        if all("vector" in o for o in objects):
+            return np.asarray([o["vector"] for o in objects], dtype=np.float32)
+        return self.embed_fn([to_text(o) for o in objects])
+
+    @staticmethod
+    def _persona_text(persona: Dict[str, Any]) -> str:
+        return " ".join([persona.get("voice_tone", "")] + list(persona.get("content_themes", [])))
+
+    @staticmethod
+    def _context_text(entry: Dict[str, Any]) -> str:
+        return " ".join([entry.get("campaign_description", "")] + list(entry.get("successful_patterns", [])))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def persona_embedding(self, soul_id: str) -> Optional[np.ndarray]:
+        """Return a soul_id's persona vector from the LRU cache, loading it on a miss."""
+        cached = self._persona_cache.get(soul_id)
+        if cached is not None:
+            self._persona_cache.move_to_end(soul_id)
+            return cached
+
+        try:
+            vector = self.persona_index.vector(soul_id)
+        except KeyError:
+            return None
+
+        self._persona_cache[soul_id] = vector
+        if len(self._persona_cache) > self.cache_size:
+            self._persona_cache.popitem(last=False)
+        return vector
+
+    def retrieve_batch(self, tasks: List[Dict[str, Any]], soul_ids: Union[str, Sequence[str]],
+                       k: int = 5) -> Dict[str, List[str]]:
+        """
+        Retrieve campaign context for many content_generation tasks at once.
+
+        Args:
+            tasks: AgentTaskManifest dictionaries (payload.prompt is the query text).
+            soul_ids: Worker soul_id per task, or one soul_id for all tasks.
+            k: Context ids per task.
+
+        Returns:
+            Mapping of task_id -> context ids, best match first.
+        """
+        if not tasks:
+            return {}
+        if isinstance(soul_ids, str):
+            soul_ids = [soul_ids] * len(tasks)
+        if len(soul_ids) != len(tasks):
+            raise ValueError("soul_ids must have one entry per task")
+
+        queries = self.embed_fn([t.get("payload", {}).get("prompt", "") for t in tasks])
+        for row, soul_id in enumerate(soul_ids):
+            persona = self.persona_embedding(soul_id)
+            if persona is not None:
+                queries[row] = queries[row] + self.persona_weight * persona
+
+        hits = self.context_index.search(queries, k=k, groups=[t["campaign_id"] for t in tasks])
+        return {t["task_id"]: [id_ for id_, _ in hit] for t, hit in zip(tasks, hits)}
+
+    def enrich_tasks(self, tasks: List[Dict[str, Any]], soul_ids: Union[str, Sequence[str]],
+                     k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Append retrieved context ids to each task's `payload.context_ids`.
+
+        Existing ids (e.g. the upstream analytics_fetch task) are kept first.
+        Tasks are updated in place and returned for convenience.
+        """
+        retrieved = self.retrieve_batch(tasks, soul_ids, k=k)
+        for task in tasks:
+            payload = task.setdefault("payload", {})
+            existing = payload.get("context_ids", [])
+            payload["context_ids"] = existing + [c for c in retrieved[task["task_id"]] if c not in existing]
+        return tasks
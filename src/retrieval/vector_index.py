@@ -0,0 +1,214 @@
+"""
+Local Vector Index
+
+SRS Reference: §4.3 Creative Engine (FR3.1)
+Spec: specs/technical.md, Weaviate Collections (persona_embeddings, campaign_context)
+
+This module is a local stand-in for the Weaviate collections. It stores
+L2-normalized float32 vectors and answers batched cosine top-k queries with
+NumPy, either by brute force or through an optional IVF (inverted file)
+partitioning built with a few rounds of k-means.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing text embedder.
+
+    Stands in for the text2vec-openai vectorizer so the index can be exercised
+    without network access. Tokens are hashed with crc32 (stable across
+    processes) into signed buckets.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                h = zlib.crc32(token.encode("utf-8"))
+                out[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        return _normalize(out)
+
+
+class VectorIndex:
+    """
+    In-memory cosine-similarity index with optional group filtering.
+
+    Each vector may carry a group label (e.g. campaign_id). Queries can be
+    restricted to one group each, which mirrors a Weaviate `where` filter.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._ids: List[str] = []
+        self._groups: List[Optional[str]] = []
+        self._chunks: List[np.ndarray] = []
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._group_rows: Optional[Dict[Optional[str], np.ndarray]] = None
+        self._id_rows: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self.nprobe = 1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray, groups: Optional[Sequence[Optional[str]]] = None) -> None:
+        """
+        Add vectors to the index.
+
+        Adding invalidates any IVF partitioning; call `build_ivf` again
+        after bulk loads.
+        """
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(ids)}, {self.dim}), got {vectors.shape}")
+        if groups is not None and len(groups) != len(ids):
+            raise ValueError("groups must have one entry per id")
+
+        # Check the whole batch first so a rejected add leaves the index unchanged
+        seen = set()
+        for id_ in ids:
+            if id_ in self._id_rows or id_ in seen:
+                raise ValueError(f"Duplicate id: {id_}")
+            seen.add(id_)
+        for offset, id_ in enumerate(ids):
+            self._id_rows[id_] = len(self._ids) + offset
+        self._ids.extend(ids)
+        self._groups.extend(groups if groups is not None else [None] * len(ids))
+        self._chunks.append(vectors)
+        self._group_rows = None
+        self._centroids = None
+
+    def vector(self, id_: str) -> np.ndarray:
+        """Return the stored (normalized) vector for an id."""
+        row = self._id_rows.get(id_)
+        if row is None:
+            raise KeyError(id_)
+        return self._consolidate()[row]
+
+    def _consolidate(self) -> np.ndarray:
+        if self._chunks:
+            self._matrix = np.vstack([self._matrix] + self._chunks)
+            self._chunks = []
+        return self._matrix
+
+    def _rows_for_group(self, group: Optional[str]) -> Optional[np.ndarray]:
+        if self._group_rows is None:
+            buckets: Dict[Optional[str], List[int]] = {}
+            for row, g in enumerate(self._groups):
+                buckets.setdefault(g, []).append(row)
+            self._group_rows = {g: np.asarray(rows, dtype=np.int64) for g, rows in buckets.items()}
+        return self._group_rows.get(group, np.zeros(0, dtype=np.int64))
+
+    def build_ivf(self, nlist: int, nprobe: int = 4, iterations: int = 10, seed: int = 0) -> None:
+        """
+        Partition the index into `nlist` k-means cells.
+
+        Queries then score only the vectors in their `nprobe` closest cells,
+        trading a little recall for far fewer dot products on large indexes.
+        """
+        matrix = self._consolidate()
+        if nlist < 1 or nlist > len(matrix):
+            raise ValueError(f"nlist must be between 1 and the index size ({len(matrix)})")
+
+        rng = np.random.default_rng(seed)
+        centroids = matrix[rng.choice(len(matrix), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(matrix @ centroids.T, axis=1)
+            for cell in range(nlist):
+                members = matrix[assign == cell]
+                if len(members):
+                    centroids[cell] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        assign = np.argmax(matrix @ centroids.T, axis=1)
+        self._centroids = centroids
+        self._lists = [np.flatnonzero(assign == cell) for cell in range(nlist)]
+        self.nprobe = min(nprobe, nlist)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Row-wise indices of the k highest scores, best first."""
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return np.zeros((scores.shape[0], 0), dtype=np.int64)
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+        return np.take_along_axis(part, order, axis=1)
+
+    def search(self, queries: np.ndarray, k: int = 5,
+               groups: Optional[Sequence[Optional[str]]] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Batched top-k cosine search.
+
+        Args:
+            queries: (n, dim) query vectors.
+            k: Results per query.
+            groups: Optional per-query group label restricting candidates.
+
+        Returns:
+            One list of (id, score) pairs per query, best first.
+        """
+        queries = _normalize(queries)
+        matrix = self._consolidate()
+        results: List[List[Tuple[str, float]]] = [[] for _ in range(len(queries))]
+        if not len(matrix) or k < 1:
+            return results
+
+        if self._centroids is not None:
+            self._search_ivf(queries, k, groups, matrix, results)
+            return results
+
+        if groups is None:
+            batches = {None: (np.arange(len(queries)), None)}
+        else:
+            batches = {}
+            for q, g in enumerate(groups):
+                batches.setdefault(g, []).append(q)
+            batches = {g: (np.asarray(qs), self._rows_for_group(g)) for g, qs in batches.items()}
+
+        # One matrix multiply per group covers every query in that group
+        for _, (query_rows, candidate_rows) in batches.items():
+            candidates = matrix if candidate_rows is None else matrix[candidate_rows]
+            if not len(candidates):
+                continue
+            scores = queries[query_rows] @ candidates.T
+            top = self._top_k(scores, k)
+            for i, q in enumerate(query_rows):
+                rows = top[i] if candidate_rows is None else candidate_rows[top[i]]
+                results[q] = [(self._ids[r], float(s)) for r, s in zip(rows, scores[i, top[i]])]
+        return results
+
+    def _search_ivf(self, queries, k, groups, matrix, results) -> None:
+        probes = self._top_k(queries @ self._centroids.T, self.nprobe)
+        group_labels = np.asarray(self._groups, dtype=object) if groups is not None else None
+
+        for q, cells in enumerate(probes):
+            candidates = np.concatenate([self._lists[c] for c in cells])
+            if group_labels is not None:
+                candidates = candidates[group_labels[candidates] == groups[q]]
+            if not len(candidates):
+                continue
+            scores = matrix[candidates] @ queries[q]
+            top = self._top_k(scores[None, :], k)[0]
+            results[q] = [(self._ids[candidates[r]], float(scores[r])) for r in top]
@@ -0,0 +1,194 @@
+"""
+Brand Safety Review
+
+SRS Reference: §4.3 Creative Engine (FR3.2)
+Spec: specs/planner_service.md, Pattern A Task 3 (content_review)
+
+This module scans generated content against a campaign's
+`constraints.prohibited_keywords`. Each keyword list is compiled once into a
+single trie-shaped regular expression and cached by campaign_id, so a batch of
+`generate_content` outputs is checked with one pass over each text.
+"""
+
+import re
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# Sentinel key marking "a keyword ends here" inside the trie
+_END = ""
+
+
+def _normalize_keyword(keyword: str) -> str:
+    """Casefold and collapse internal whitespace so phrases match loosely."""
+    return " ".join(keyword.casefold().split())
+
+
+def _fold_with_offsets(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Casefold `text` the same way keywords are folded.
+
+    Folding can expand a character ("ß" -> "ss"), so when the length changes
+    this also returns, for each folded character, the index of the original
+    character it came from. None means offsets are unchanged.
+    """
+    folded = text.casefold()
+    if len(folded) == len(text):
+        return folded, None
+    origin = []
+    for i, ch in enumerate(text):
+        origin.extend([i] * len(ch.casefold()))
+    return folded, origin
+
+
+def _build_trie(keywords: Iterable[str]) -> Dict[str, Any]:
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[_END] = {}
+    return trie
+
+
+def _trie_to_pattern(node: Dict[str, Any]) -> str:
+    """
+    Emit a regex for a trie node.
+
+    Shared prefixes are factored out, so the regex engine walks the keyword set
+    like an automaton instead of retrying every alternative at each offset.
+    """
+    branches = []
+    for ch in sorted(k for k in node if k != _END):
+        token = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(token + _trie_to_pattern(node[ch]))
+
+    if not branches:
+        return ""
+
+    optional = _END in node
+    if len(branches) == 1 and not optional:
+        return branches[0]
+
+    pattern = "(?:" + "|".join(branches) + ")"
+    if optional:
+        pattern += "?"
+    return pattern
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for one prohibited keyword list.
+
+    Matching is case-insensitive and, by default, restricted to whole words so
+    that "cheap" does not flag "cheapest". Keywords and text go through the
+    same `str.casefold()`, so "STRASSE" and "straße" are the same keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str], whole_words: bool = True):
+        normalized = {}
+        for keyword in keywords:
+            if not isinstance(keyword, str):
+                raise ValueError(f"Prohibited keyword must be a string, got {type(keyword).__name__}")
+            key = _normalize_keyword(keyword)
+            if key:
+                normalized.setdefault(key, keyword)
+
+        self.keywords: Dict[str, str] = normalized
+        self.whole_words = whole_words
+        self._regex: Optional[re.Pattern] = None
+
+        if normalized:
+            body = _trie_to_pattern(_build_trie(normalized))
+            if whole_words:
+                body = r"(?<!\w)" + body + r"(?!\w)"
+            self._regex = re.compile(body)
+
+    def find(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Return every non-overlapping keyword hit in `text`.
+
+        Each match carries the original keyword spelling plus `start`/`end`
+        character offsets into `text`.
+        """
+        if self._regex is None or not text:
+            return []
+
+        folded, origin = _fold_with_offsets(text)
+        matches = []
+        for m in self._regex.finditer(folded):
+            start, end = m.start(), m.end()
+            if origin is not None:
+                start, end = origin[start], origin[end - 1] + 1
+            key = _normalize_keyword(m.group())
+            matches.append({
+                "keyword": self.keywords.get(key, key),
+                "start": start,
+                "end": end,
+                "text": text[start:end]
+            })
+        return matches
+
+
+class BrandSafetyScanner:
+    """
+    Caches one KeywordMatcher per campaign_id.
+
+    A matcher is rebuilt only when the campaign's keyword list changes.
+    """
+
+    def __init__(self, whole_words: bool = True):
+        self.whole_words = whole_words
+        self._cache: Dict[str, Tuple[Tuple[str, ...], KeywordMatcher]] = {}
+
+    def get_matcher(self, campaign_id: str, keywords: Iterable[str]) -> KeywordMatcher:
+        """Return the cached matcher for a campaign, compiling it on first use."""
+        fingerprint = tuple(keywords)
+        cached = self._cache.get(campaign_id)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        matcher = KeywordMatcher(fingerprint, whole_words=self.whole_words)
+        self._cache[campaign_id] = (fingerprint, matcher)
+        return matcher
+
+    def invalidate(self, campaign_id: str) -> None:
+        """Drop a campaign's compiled matcher."""
+        self._cache.pop(campaign_id, None)
+
+    def scan_batch(self, campaign_manifest: Dict[str, Any], outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scan a batch of generate_content outputs for one campaign.
+
+        Args:
+            campaign_manifest: The CampaignManifest JSON dictionary.
+            outputs: generate_content result dictionaries (must carry `content`).
+
+        Returns:
+            One review per output, in order, with keys:
+                - passed (bool): True if no prohibited keyword was found
+                - matches (List[Dict]): keyword, start, end, text for each hit
+        """
+        campaign_id = campaign_manifest.get("campaign_id")
+        if not campaign_id:
+            raise ValueError("Campaign ID is required")
+
+        keywords = campaign_manifest.get("constraints", {}).get("prohibited_keywords", [])
+        matcher = self.get_matcher(campaign_id, keywords)
+
+        reviews = []
+        for output in outputs:
+            matches = matcher.find(output.get("content", ""))
+            reviews.append({"passed": not matches, "matches": matches})
+        return reviews
+
+
+_default_scanner = BrandSafetyScanner()
+
+
+def review_content_batch(campaign_manifest: Dict[str, Any], outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Check generate_content outputs against the campaign's prohibited keywords.
+
+    Uses a process-wide scanner so compiled matchers are shared across calls.
+    See BrandSafetyScanner.scan_batch for the return format.
+    """
+    return _default_scanner.scan_batch(campaign_manifest, outputs)
@@ -0,0 +1,606 @@
+"""
+Trend History Store
+
+SRS Reference: §4.2 Perception (FR2.2), NFR 3.0
+Spec: skills/skill_fetch_trends/README.md, Output Schema (topic, volume, sentiment, retrieved_at)
+
+Keeps every fetch_trends observation so the planner can rank topics by
+momentum instead of by a single snapshot.
+
+* Columnar: each partition holds four NumPy columns: retrieved_at (epoch
+  ms), topic (int32 id), volume and sentiment. Topics are dictionary-encoded
+  once, store-wide, so queries work on integer ids and never touch the
+  strings or the raw JSON.
+* Partitioned by (platform, region, UTC day). Each partition caches a
+  per-topic rollup (observations, volume and sentiment sums) until its
+  next append, so only the current day is ever re-aggregated. A month-scale
+  query concatenates about 30 rollups and works on those (topic, day) cells
+  with `np.bincount` and one vectorized step per day. No raw rows are read.
+* Off the skill's hot path: fetch_trends hands its result to `enqueue()`,
+  which only queues it. Queued results are decoded and appended together,
+  once `batch_size` have queued up and before every read or flush, so the
+  timestamp parsing and topic encoding run once per batch. A result that
+  cannot be decoded is logged and dropped without holding up the rest.
+* Retention: partitions more than `retention_days` days older than the
+  newest day of their (platform, region) are evicted, from memory and from
+  `directory`.
+* Append-only: ingestion only appends to the newest rows of a partition,
+  into arrays that grow by doubling. With a `directory`, `flush()` appends
+  the rows written since the last flush to one raw file per column and
+  partition, and new topics to topics.txt. Reopening the directory loads
+  the columns with `np.fromfile`. Rows cut short by a crash are trimmed.
+
+Aggregates are daily means per topic. A topic's volume for a day is the
+mean of that day's observations. `volume_deltas` compares two adjacent
+windows. `sentiment_ema` runs an exponential moving average over the daily
+sentiment means. `rising_topics` ranks topics by recent volume growth
+against the days before.
+"""
+
+import itertools
+import logging
+import os
+import shutil
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Iterable, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (("retrieved_at", np.int64), ("topic", np.int32), ("volume", np.int64), ("sentiment", np.float32))
+
+TOPICS_FILE = "topics.txt"
+
+_DAY_MS = 86_400_000
+_MIN_CAPACITY = 64
+
+_TREND_FIELDS = itemgetter("topic", "volume", "sentiment", "retrieved_at")
+
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_BATCH_SIZE = 256
+
+Day = Union[str, np.datetime64, int]
+
+
+def _to_ms(values: Iterable[Any]) -> np.ndarray:
+    """Epoch milliseconds from datetime64 values or ISO-8601 strings (naive means UTC)."""
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ms]").astype(np.int64)
+    # A fetch_trends result stamps its trends with a handful of distinct times
+    parsed_ms: Dict[str, int] = {}
+    out = []
+    for value in values:
+        ms = parsed_ms.get(value)
+        if ms is None:
+            parsed = datetime.fromisoformat(value)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            ms = parsed_ms[value] = round(parsed.timestamp() * 1000)
+        out.append(ms)
+    return np.asarray(out, dtype=np.int64)
+
+
+def _day_number(day: Day) -> int:
+    """Days since the Unix epoch for a date string, datetime64 or day number."""
+    if isinstance(day, (int, np.integer)):
+        return int(day)
+    return int(np.datetime64(day, "D").astype(np.int64))
+
+
+def _day_label(day: int) -> str:
+    return str(np.datetime64(day, "D"))
+
+
+class _Partition:
+    """Growable columns of one (platform, region, day)."""
+
+    __slots__ = ("columns", "n", "flushed", "_rollup")
+
+    def __init__(self, columns: Optional[Dict[str, np.ndarray]] = None):
+        self.columns = columns or {name: np.empty(_MIN_CAPACITY, dtype=dtype) for name, dtype in COLUMNS}
+        self.n = len(next(iter(self.columns.values()))) if columns else 0
+        self.flushed = self.n
+        self._rollup: Optional[Tuple[int, ...]] = None
+
+    def append(self, rows: Dict[str, np.ndarray]) -> None:
+        count = len(rows["topic"])
+        end = self.n + count
+        for name, dtype in COLUMNS:
+            column = self.columns[name]
+            if end > len(column):
+                grown = np.empty(max(end, 2 * len(column), _MIN_CAPACITY), dtype=dtype)
+                grown[:self.n] = column[:self.n]
+                self.columns[name] = column = grown
+            column[self.n:end] = rows[name]
+        self.n = end
+
+    def rollup(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-topic (topic ids, observations, volume sum, sentiment sum) for the day.
+
+        Cached until the next append. Past days are no longer appended to, so
+        a month-scale query only recomputes the current day.
+        """
+        if self._rollup is None or self._rollup[0] != self.n:
+            topic = self.columns["topic"][:self.n]
+            ids, inverse, counts = np.unique(topic, return_inverse=True, return_counts=True)
+            self._rollup = (self.n, ids, counts,
+                            np.bincount(inverse, weights=self.columns["volume"][:self.n], minlength=len(ids)),
+                            np.bincount(inverse, weights=self.columns["sentiment"][:self.n], minlength=len(ids)))
+        return self._rollup[1:]
+
+    def view(self) -> Dict[str, np.ndarray]:
+        """Read-only slices of the filled rows; later appends do not affect them."""
+        return {name: column[:self.n] for name, column in self.columns.items()}
+
+
+class TrendStore:
+    """
+    Append-only columnar history of trend observations.
+
+    Args:
+        directory: Persist partitions under this directory and load what is
+            already there. None keeps the history in memory only.
+        retention_days: Days kept per (platform, region), counted back from
+            its newest day. None keeps everything.
+        batch_size: Queued results that trigger a drain().
+
+    Usage:
+        store.ingest(execute_skill({"platform": "tiktok", "region": "US"}), region="US")
+        store.rising_topics("tiktok", "US", days=30, recent_days=7)
+    """
+
+    def __init__(self, directory: Optional[str] = None, retention_days: Optional[int] = DEFAULT_RETENTION_DAYS,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        if retention_days is not None and retention_days < 1:
+            raise ValueError("retention_days must be >= 1")
+        self.directory = directory
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        # (output, region, platform) queued by enqueue()
+        self._queue: deque = deque()
+        self.dropped = 0
+        self._topics: List[str] = []
+        self._topic_ids: Dict[str, int] = {}
+        self._flushed_topics = 0
+        # (platform, region) -> day number -> partition
+        self._partitions: Dict[Tuple[str, str], Dict[int, _Partition]] = {}
+        self._rows = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    @property
+    def rows(self) -> int:
+        """Rows held, including queued results."""
+        self.drain()
+        return self._rows
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def ingest(self, output: Dict[str, Any], region: str = "GLOBAL", platform: Optional[str] = None) -> int:
+        """
+        Append one fetch_trends result.
+
+        Args:
+            output: The skill's return value (trends + metadata).
+            region: The region the trends were fetched for; the output does
+                not carry it.
+            platform: Defaults to output["metadata"]["platform"].
+
+        Returns:
+            Rows appended.
+        """
+        platform, rows = self._decode(output, platform)
+        if not rows:
+            return 0
+        return self.append(platform, region, *zip(*rows))
+
+    @staticmethod
+    def _decode(output: Dict[str, Any], platform: Optional[str]) -> Tuple[str, List[Tuple[Any, ...]]]:
+        """(platform, [(topic, volume, sentiment, retrieved_at), ...]) of one result."""
+        platform = platform or output.get("metadata", {}).get("platform")
+        if not platform:
+            raise ValueError("platform is required")
+        return platform, list(map(_TREND_FIELDS, output.get("trends", [])))
+
+    def enqueue(self, output: Dict[str, Any], region: str = "GLOBAL", platform: Optional[str] = None) -> None:
+        """
+        Queue one fetch_trends result for a later drain(); see ingest() for
+        the arguments. Cheap enough for the skill's hot path.
+        """
+        self._queue.append((output, region, platform))
+        if len(self._queue) >= self.batch_size:
+            self.drain()
+
+    def drain(self) -> int:
+        """
+        Append every queued result, one append() per (platform, region).
+
+        A result that fails to decode or append is logged and counted in
+        `dropped`; the others are kept.
+
+        Returns:
+            Rows appended.
+        """
+        groups: Dict[Tuple[str, str], List[List[Tuple[Any, ...]]]] = {}
+        while True:
+            try:
+                output, region, platform = self._queue.popleft()
+            except IndexError:
+                break
+            try:
+                platform, rows = self._decode(output, platform)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                self._drop(e)
+                continue
+            if rows:
+                groups.setdefault((platform, region), []).append(rows)
+
+        appended = 0
+        for (platform, region), batch in groups.items():
+            try:
+                appended += self.append(platform, region, *zip(*itertools.chain.from_iterable(batch)))
+            except (ValueError, TypeError):
+                # Isolate the bad results so the rest of the batch is kept
+                for rows in batch:
+                    try:
+                        appended += self.append(platform, region, *zip(*rows))
+                    except (ValueError, TypeError) as e:
+                        self._drop(e)
+        return appended
+
+    def _drop(self, error: Exception) -> None:
+        self.dropped += 1
+        logger.warning("Dropped a queued fetch_trends result: %s", error)
+
+    def append(self, platform: str, region: str, topics: Iterable[str], volumes: Iterable[int],
+               sentiments: Iterable[float], retrieved_at: Iterable[Any]) -> int:
+        """
+        Append observations in columnar form (bulk backfills).
+
+        Args:
+            retrieved_at: ISO-8601 strings or a datetime64 array.
+
+        Returns:
+            Rows appended.
+
+        Raises:
+            ValueError: Columns of different lengths.
+        """
+        topics = np.asarray(topics, dtype=object)
+        ts = _to_ms(retrieved_at)
+        volume = np.asarray(volumes, dtype=np.int64)
+        sentiment = np.asarray(sentiments, dtype=np.float32)
+        if not len(topics) == len(ts) == len(volume) == len(sentiment):
+            raise ValueError("topics, volumes, sentiments and retrieved_at must have the same length")
+        if not len(topics):
+            return 0
+
+        days = ts // _DAY_MS
+        with self._lock:
+            codes = np.fromiter(map(self._encode, topics), dtype=np.int32, count=len(topics))
+            partitions = self._partitions.setdefault((platform, region), {})
+            for day in np.unique(days).tolist():
+                rows = days == day
+                partition = partitions.get(day)
+                if partition is None:
+                    partition = partitions[day] = _Partition()
+                partition.append({"retrieved_at": ts[rows], "topic": codes[rows], "volume": volume[rows],
+                                  "sentiment": sentiment[rows]})
+            self._rows += len(ts)
+            self._evict(platform, region)
+        return len(ts)
+
+    def _evict(self, platform: str, region: str) -> None:
+        """Drop partitions that fell out of the retention window. Caller holds the lock."""
+        partitions = self._partitions.get((platform, region))
+        if self.retention_days is None or not partitions:
+            return
+        cutoff = max(partitions) - self.retention_days + 1
+        for day in [day for day in partitions if day < cutoff]:
+            self._rows -= partitions.pop(day).n
+            if self.directory:
+                shutil.rmtree(self._partition_dir(platform, region, day), ignore_errors=True)
+
+    def _encode(self, topic: str) -> int:
+        topic_id = self._topic_ids.get(topic)
+        if topic_id is None:
+            if "\n" in topic:
+                raise ValueError(f"Invalid topic: {topic!r}")
+            topic_id = self._topic_ids[topic] = len(self._topics)
+            self._topics.append(topic)
+        return topic_id
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def partitions(self) -> List[Tuple[str, str, str]]:
+        """(platform, region, day) of every partition, sorted."""
+        self.drain()
+        with self._lock:
+            return sorted((platform, region, _day_label(day))
+                          for (platform, region), days in self._partitions.items() for day in days)
+
+    def topic_id(self, topic: str) -> Optional[int]:
+        self.drain()
+        return self._topic_ids.get(topic)
+
+    def last_day(self, platform: str, region: str) -> Optional[str]:
+        """The latest day with observations, or None."""
+        self.drain()
+        days = self._partitions.get((platform, region))
+        return _day_label(max(days)) if days else None
+
+    def scan(self, platform: str, region: str, start: Day, end: Day) -> Dict[str, np.ndarray]:
+        """
+        Raw columns for the days in [start, end), plus a `day` column of
+        offsets from `start`.
+        """
+        first, stop = _day_number(start), _day_number(end)
+        self.drain()
+        with self._lock:
+            days = self._partitions.get((platform, region), {})
+            views = [(day - first, days[day].view()) for day in range(first, stop) if day in days]
+        if not views:
+            columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+            columns["day"] = np.empty(0, dtype=np.int64)
+            return columns
+        columns = {name: np.concatenate([view[name] for _, view in views]) for name, _ in COLUMNS}
+        columns["day"] = np.repeat([offset for offset, _ in views], [len(view["topic"]) for _, view in views])
+        return columns
+
+    def _cells(self, platform: str, region: str, first: int, stop: int) -> Dict[str, Any]:
+        """
+        One row per (topic, day) with observations in [first, stop), in day order.
+
+        Returns:
+            {"present": global ids of the window's topics, "topic": index into
+             present, "day": offset from first, "bounds": row offsets of each
+             day, "volume" / "sentiment": that day's means}.
+        """
+        self.drain()
+        with self._lock:
+            days = self._partitions.get((platform, region), {})
+            rollups = [(day - first, days[day].rollup()) for day in range(first, stop) if day in days]
+            n_topics = len(self._topics)
+        if rollups:
+            ids, counts, volume, sentiment = (np.concatenate([r[i] for _, r in rollups]) for i in range(4))
+            sizes = [len(r[0]) for _, r in rollups]
+            day = np.repeat([offset for offset, _ in rollups], sizes)
+        else:
+            ids = day = np.empty(0, dtype=np.int64)
+            counts = volume = sentiment = np.empty(0)
+            sizes = []
+
+        # Renumber the topics seen in the window densely, without sorting
+        seen = np.zeros(n_topics, dtype=bool)
+        seen[ids] = True
+        return {
+            "present": np.flatnonzero(seen),
+            "topic": (np.cumsum(seen) - 1)[ids],
+            "day": day,
+            "bounds": np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)]),
+            "volume": volume / counts,
+            "sentiment": sentiment / counts
+        }
+
+    def daily(self, platform: str, region: str, start: Day, end: Day) -> Dict[str, Any]:
+        """
+        Daily mean volume and sentiment per topic over [start, end).
+
+        Returns:
+            {"days": [...], "topics": [...], "topic_ids": int array,
+             "volume": float (topics x days), "sentiment": float (topics x days)}.
+            Days without observations for a topic are NaN.
+        """
+        first, stop = _day_number(start), _day_number(end)
+        if stop <= first:
+            raise ValueError("end must be after start")
+        n_days = stop - first
+        cells = self._cells(platform, region, first, stop)
+        present = cells["present"]
+
+        flat = cells["topic"] * n_days + cells["day"]
+        volume = np.full((len(present), n_days), np.nan)
+        sentiment = np.full((len(present), n_days), np.nan)
+        volume.flat[flat] = cells["volume"]
+        sentiment.flat[flat] = cells["sentiment"]
+        return {
+            "days": [_day_label(day) for day in range(first, stop)],
+            "topics": [self._topics[i] for i in present.tolist()],
+            "topic_ids": present,
+            "volume": volume,
+            "sentiment": sentiment
+        }
+
+    def _window(self, platform: str, region: str, end: Optional[Day], days: int) -> Tuple[int, int]:
+        if days < 1:
+            raise ValueError("days must be >= 1")
+        if end is None:
+            last = self.last_day(platform, region)
+            stop = _day_number(last) + 1 if last else 0
+        else:
+            stop = _day_number(end)
+        return stop - days, stop
+
+    def volume_deltas(self, platform: str, region: str, end: Optional[Day] = None,
+                      days: int = 7) -> Dict[str, Dict[str, float]]:
+        """
+        Mean daily volume over the `days` before `end` against the `days` before that.
+
+        `end` is exclusive and defaults to the day after the latest observation.
+
+        Returns:
+            topic -> {"volume", "previous", "delta", "pct"}. A topic absent
+            from a window counts as 0 there; pct is None without a previous volume.
+        """
+        start, stop = self._window(platform, region, end, 2 * days)
+        cells = self._cells(platform, region, start, stop)
+        previous, recent = self._split_means(cells, days)
+        delta = recent - previous
+        return {
+            self._topics[i]: {"volume": r, "previous": p, "delta": d, "pct": d / p if p > 0 else None}
+            for i, r, p, d in zip(cells["present"].tolist(), recent.tolist(), previous.tolist(), delta.tolist())
+        }
+
+    def sentiment_ema(self, platform: str, region: str, end: Optional[Day] = None, days: int = 30,
+                      span: float = 7.0) -> Dict[str, float]:
+        """
+        Exponential moving average of daily mean sentiment, alpha = 2 / (span + 1).
+
+        Days without observations leave a topic's average unchanged.
+        """
+        start, stop = self._window(platform, region, end, days)
+        cells = self._cells(platform, region, start, stop)
+        ema = self._ema(cells, span)
+        return {self._topics[i]: value for i, value in zip(cells["present"].tolist(), ema.tolist())}
+
+    def rising_topics(self, platform: str, region: str, end: Optional[Day] = None, days: int = 30,
+                      recent_days: int = 7, limit: int = 10, min_volume: float = 0.0,
+                      span: float = 7.0) -> List[Dict[str, Any]]:
+        """
+        Topics ranked by recent volume growth.
+
+        The last `recent_days` before `end` are compared with the rest of the
+        `days` window. growth is (recent - baseline) / (baseline + 1), so a
+        topic that only just appeared ranks by its recent volume.
+
+        Returns:
+            Up to `limit` rows: topic, volume, baseline, delta, growth and
+            sentiment_ema. Topics below `min_volume` recently are skipped.
+        """
+        if not 0 < recent_days < days:
+            raise ValueError("recent_days must be between 1 and days - 1")
+        start, stop = self._window(platform, region, end, days)
+        cells = self._cells(platform, region, start, stop)
+        baseline, recent = self._split_means(cells, days - recent_days)
+        growth = (recent - baseline) / (baseline + 1.0)
+
+        eligible = np.flatnonzero((recent > 0) & (recent >= min_volume))
+        # Highest growth first, then highest recent volume
+        ranked = eligible[np.lexsort((-recent[eligible], -growth[eligible]))][:limit]
+        ema = self._ema(cells, span)
+        return [{"topic": self._topics[cells["present"][i]], "volume": float(recent[i]),
+                 "baseline": float(baseline[i]), "delta": float(recent[i] - baseline[i]),
+                 "growth": float(growth[i]), "sentiment_ema": float(ema[i])} for i in ranked.tolist()]
+
+    @staticmethod
+    def _split_means(cells: Dict[str, Any], split: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-topic mean daily volume before and from day offset `split`; 0 where a topic has no days."""
+        n = len(cells["present"])
+        later = cells["day"] >= split
+        means = []
+        for side in (~later, later):
+            total = np.bincount(cells["topic"], weights=np.where(side, cells["volume"], 0.0), minlength=n)
+            count = np.bincount(cells["topic"], weights=side, minlength=n)
+            means.append(np.divide(total, count, out=np.zeros(n), where=count > 0))
+        return means[0], means[1]
+
+    @staticmethod
+    def _ema(cells: Dict[str, Any], span: float) -> np.ndarray:
+        """Per-topic EMA of daily sentiment, one vectorized update per day."""
+        alpha = 2.0 / (span + 1.0)
+        ema = np.full(len(cells["present"]), np.nan)
+        bounds = cells["bounds"].tolist()
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            topics = cells["topic"][lo:hi]
+            observed = cells["sentiment"][lo:hi]
+            previous = ema[topics]
+            ema[topics] = np.where(np.isnan(previous), observed, previous + alpha * (observed - previous))
+        return ema
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, platform: str, region: str, day: int) -> str:
+        return os.path.join(self.directory, platform, region, _day_label(day))
+
+    def flush(self) -> int:
+        """
+        Append rows written since the last flush to the column files.
+
+        Returns:
+            Rows written.
+        """
+        self.drain()
+        if not self.directory:
+            return 0
+        written = 0
+        with self._lock:
+            # Topics first, so every id in a column file has a name on reload
+            if self._flushed_topics < len(self._topics):
+                with open(os.path.join(self.directory, TOPICS_FILE), "a", encoding="utf-8") as f:
+                    f.write("".join(t + "\n" for t in self._topics[self._flushed_topics:]))
+                self._flushed_topics = len(self._topics)
+            for (platform, region), days in self._partitions.items():
+                for day, partition in days.items():
+                    if partition.flushed == partition.n:
+                        continue
+                    path = self._partition_dir(platform, region, day)
+                    os.makedirs(path, exist_ok=True)
+                    for name, _ in COLUMNS:
+                        with open(os.path.join(path, name), "ab") as f:
+                            f.write(partition.columns[name][partition.flushed:partition.n].tobytes())
+                    written += partition.n - partition.flushed
+                    partition.flushed = partition.n
+        return written
+
+    def _load(self) -> None:
+        topics_path = os.path.join(self.directory, TOPICS_FILE)
+        if os.path.exists(topics_path):
+            with open(topics_path, encoding="utf-8") as f:
+                data = f.read()
+            # A torn last line has no newline; drop it
+            self._topics = data.split("\n")[:-1]
+            self._topic_ids = {topic: i for i, topic in enumerate(self._topics)}
+            self._flushed_topics = len(self._topics)
+
+        for platform in sorted(os.listdir(self.directory)):
+            platform_dir = os.path.join(self.directory, platform)
+            if not os.path.isdir(platform_dir):
+                continue
+            for region in sorted(os.listdir(platform_dir)):
+                for label in sorted(os.listdir(os.path.join(platform_dir, region))):
+                    path = os.path.join(platform_dir, region, label)
+                    columns = {name: np.fromfile(os.path.join(path, name), dtype=dtype) for name, dtype in COLUMNS}
+                    # Trim rows a crash left incomplete, or whose topic never reached topics.txt
+                    n = min(len(column) for column in columns.values())
+                    unknown = np.flatnonzero(columns["topic"][:n] >= len(self._topics))
+                    n = int(unknown[0]) if len(unknown) else n
+                    for name, column in columns.items():
+                        if os.path.getsize(os.path.join(path, name)) > n * column.itemsize:
+                            os.truncate(os.path.join(path, name), n * column.itemsize)
+                    columns = {name: column[:n] for name, column in columns.items()}
+                    self._partitions.setdefault((platform, region), {})[_day_number(label)] = _Partition(columns)
+                    self._rows += n
+                self._evict(platform, region)
+
+
+_store: Optional[TrendStore] = None
+_store_lock = threading.Lock()
+
+
+def get_trend_store() -> TrendStore:
+    """The shared store fetch_trends writes to; in memory unless replaced."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TrendStore()
+        return _store
+
+
+def set_trend_store(store: Optional[TrendStore]) -> None:
+    """Replace the shared store (None resets to a fresh in-memory store on next use)."""
+    global _store
+    with _store_lock:
+        _store = store
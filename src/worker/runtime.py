@@ -0,0 +1,281 @@
+"""
+Work-Stealing Worker Runtime
+
+SRS Reference: §3.1 FastRender Swarm (Worker), §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/technical.md, Agent Task Schema; skills/README.md
+
+Runs skill calls for one worker host, which may have many cores.
+
+* One asyncio event loop per core. Each loop has its own local deque of
+  tasks and keeps up to `max_in_flight` of them running at once.
+* IO-bound skills (publish_post, fetch_trends, ...) run as coroutines when
+  they are async. Otherwise they go to a shared thread pool, so a blocking
+  network call never stalls its loop.
+* CPU-bound skills go to a shared process pool sized to the core count. A
+  skill declares this with a module-level `CPU_BOUND = True`.
+* When a loop's deque is empty, it steals half of another loop's deque,
+  taking from the tail, the end opposite to where the owner pops. A burst of
+  submissions that lands on one loop therefore spreads across every core.
+
+Requests use the task1.worker.run shape: {"id", "skill", "payload"}.
+Results are {"id", "status": "ok", "output"} or {"id", "status": "error", "error"}.
+"""
+
+import asyncio
+import importlib
+import itertools
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+# Skill name -> module exposing execute_skill (and optionally CPU_BOUND)
+SKILL_MODULES = {
+    "fetch_trends": "skills.skill_fetch_trends.skill",
+    "generate_content": "skills.skill_generate_content.skill",
+    "publish_post": "skills.skill_publish_post.skill",
+    "check_wallet_balance": "skills.skill_check_wallet_balance.skill",
+    "validate_image": "skills.skill_validate_image.skill",
+}
+
+
+class _Core:
+    """Per-core state: local deque, its lock, and the loop that drains it."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.queue: deque = deque()
+        self.lock = threading.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wake: Optional[asyncio.Event] = None
+        self.ready = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.executed = 0
+        self.stolen = 0
+
+
+class WorkerRuntime:
+    """
+    Multi-core skill executor with per-core event loops and work stealing.
+
+    Args:
+        cores: Event loops to run; defaults to os.cpu_count().
+        cpu_workers: Processes for CPU-bound skills; defaults to `cores`.
+            0 runs CPU-bound skills on the thread pool instead.
+        io_threads: Threads for blocking IO-bound skills.
+        max_in_flight: Concurrent tasks per event loop.
+        idle_poll: Seconds an idle loop waits before trying to steal again.
+    """
+
+    def __init__(self, cores: Optional[int] = None, cpu_workers: Optional[int] = None,
+                 io_threads: int = 64, max_in_flight: int = 64, idle_poll: float = 0.002):
+        self.cores = cores or os.cpu_count() or 1
+        self.cpu_workers = self.cores if cpu_workers is None else cpu_workers
+        self.io_threads = io_threads
+        self.max_in_flight = max_in_flight
+        self.idle_poll = idle_poll
+        self._handlers: Dict[str, tuple] = {}
+        self._cores = [_Core(i) for i in range(self.cores)]
+        self._next_core = itertools.count()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        self._stopping = False
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, name: str, fn: Callable[[Dict[str, Any]], Any], cpu_bound: bool = False) -> None:
+        """
+        Register a handler for requests whose "skill" is `name`.
+
+        CPU-bound handlers must be picklable (module-level functions), since
+        they run in the process pool.
+        """
+        self._handlers[name] = (fn, cpu_bound)
+
+    def register_skill(self, name: str, module_path: Optional[str] = None) -> None:
+        """Register a skill module's execute_skill, routed by its CPU_BOUND attribute."""
+        module = importlib.import_module(module_path or SKILL_MODULES[name])
+        self.register(name, module.execute_skill, cpu_bound=getattr(module, "CPU_BOUND", False))
+
+    def register_skills(self) -> None:
+        """Register every skill in SKILL_MODULES."""
+        for name in SKILL_MODULES:
+            self.register_skill(name)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> "WorkerRuntime":
+        if self._started:
+            raise ValueError("Runtime already started")
+        self._started = True
+        self._stopping = False
+        self._io_pool = ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix="runtime-io")
+        if self.cpu_workers:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+        for core in self._cores:
+            core.thread = threading.Thread(target=self._run_core, args=(core,),
+                                           name=f"runtime-core-{core.index}", daemon=True)
+            core.thread.start()
+        for core in self._cores:
+            core.ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Finish every queued and running task, then shut down."""
+        if not self._started:
+            return
+        self._stopping = True
+        for core in self._cores:
+            self._wake(core)
+        for core in self._cores:
+            core.thread.join()
+            core.ready.clear()
+        self._io_pool.shutdown()
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown()
+            self._cpu_pool = None
+        self._started = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit(self, request: Dict[str, Any], core: Optional[int] = None) -> Future:
+        """
+        Queue a request on one core's local deque (round-robin by default).
+
+        Returns:
+            A Future resolving to the result dict.
+        """
+        if not self._started or self._stopping:
+            raise ValueError("Runtime is not running")
+        skill = request.get("skill")
+        if skill not in self._handlers:
+            raise ValueError(f"Unknown skill: {skill}")
+
+        future: Future = Future()
+        target = self._cores[(next(self._next_core) if core is None else core) % self.cores]
+        with target.lock:
+            target.queue.append((request, future))
+        self._wake(target)
+        return future
+
+    def run_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit every request and wait for all results, in request order."""
+        futures = [self.submit(r) for r in requests]
+        return [f.result() for f in futures]
+
+    def stats(self) -> List[Dict[str, int]]:
+        """Per-core executed and stolen task counts."""
+        return [{"core": c.index, "executed": c.executed, "stolen": c.stolen, "queued": len(c.queue)}
+                for c in self._cores]
+
+    # ------------------------------------------------------------------
+    # Core loops
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _wake(core: _Core) -> None:
+        if core.loop is not None:
+            try:
+                core.loop.call_soon_threadsafe(core.wake.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _run_core(self, core: _Core) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._drain(core, loop))
+        finally:
+            core.loop = None
+            loop.close()
+
+    def _take(self, core: _Core):
+        with core.lock:
+            if core.queue:
+                return core.queue.popleft()
+
+        # Steal half of a victim's backlog from its tail
+        victims = self._cores[:core.index] + self._cores[core.index + 1:]
+        if not victims:
+            return None
+        start = random.randrange(len(victims))
+        for victim in victims[start:] + victims[:start]:
+            if not victim.queue:
+                continue
+            with victim.lock:
+                n = (len(victim.queue) + 1) // 2
+                loot = [victim.queue.pop() for _ in range(n)]
+            if not loot:
+                continue
+            core.stolen += len(loot)
+            first = loot.pop()
+            if loot:
+                with core.lock:
+                    core.queue.extend(reversed(loot))
+            return first
+        return None
+
+    def _idle(self) -> bool:
+        return all(not c.queue for c in self._cores)
+
+    async def _drain(self, core: _Core, loop: asyncio.AbstractEventLoop) -> None:
+        core.wake = asyncio.Event()
+        core.loop = loop
+        core.ready.set()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        running: set = set()
+
+        while True:
+            await slots.acquire()
+            core.wake.clear()
+            item = self._take(core)
+            if item is None:
+                slots.release()
+                if self._stopping and self._idle():
+                    break
+                try:
+                    await asyncio.wait_for(core.wake.wait(), self.idle_poll)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = loop.create_task(self._execute(core, loop, item, slots))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        if running:
+            await asyncio.gather(*running)
+
+    async def _execute(self, core: _Core, loop: asyncio.AbstractEventLoop, item, slots) -> None:
+        request, future = item
+        fn, cpu_bound = self._handlers[request["skill"]]
+        payload = request.get("payload", {})
+        try:
+            if cpu_bound and self._cpu_pool is not None:
+                output = await loop.run_in_executor(self._cpu_pool, fn, payload)
+            elif asyncio.iscoroutinefunction(fn):
+                output = await fn(payload)
+            else:
+                output = await loop.run_in_executor(self._io_pool, fn, payload)
+            result = {"id": request.get("id", "unknown"), "status": "ok", "output": output}
+        except Exception as e:
+            result = {"id": request.get("id", "unknown"), "status": "error", "error": str(e)}
+        finally:
+            slots.release()
+        core.executed += 1
+        future.set_result(result)
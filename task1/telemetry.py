@@ -1,8 +1,10 @@
 """Simple in-memory telemetry shim for tests."""
+from src.ids.clock import now_iso
+
 _events = []
 
 def emit(name, payload=None):
-    _events.append({"name": name, "payload": payload})
+    _events.append({"name": name, "payload": payload, "ts": now_iso()})
 
 def events():
     return list(_events)
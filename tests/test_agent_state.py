@@ -0,0 +1,136 @@
+"""
+Agent State Store Tests
+
+SRS Reference: §4.6 Orchestration (FR6.1)
+Spec: specs/functional.md, FR6.1 Centralized Lifecycle Management
+
+These tests validate lifecycle transitions, claim eligibility, the audit
+trail and snapshot + audit-tail restore.
+"""
+
+import json
+import pytest
+from src.orchestrator.lifecycle import LeaseManager, LeaseStore
+from src.orchestrator.state import AgentStateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AgentStateStore(audit_path=str(tmp_path / "audit.jsonl"))
+    yield store
+    store.close()
+
+
+class TestAgentStateStore:
+
+    def test_only_active_agents_can_claim(self, store):
+        store.create("agent-a", "op-1")
+        assert not store.can_claim("agent-a")
+
+        store.activate("agent-a", "op-1", "onboarded")
+        assert store.can_claim("agent-a")
+
+        store.suspend("agent-a", "op-2", "budget exhausted")
+        assert not store.can_claim("agent-a")
+        assert store.status("agent-a") == "SUSPENDED"
+        assert not store.can_claim("agent-unknown")
+
+    def test_rejects_invalid_transitions(self, store):
+        store.create("agent-a", "op-1")
+        store.terminate("agent-a", "op-1", "retired")
+
+        with pytest.raises(ValueError, match="Invalid transition"):
+            store.activate("agent-a", "op-1", "revive")
+        with pytest.raises(ValueError, match="Unknown agent"):
+            store.suspend("agent-b", "op-1", "n/a")
+        with pytest.raises(ValueError, match="already exists"):
+            store.create("agent-a", "op-1")
+        with pytest.raises(ValueError, match="operator_id"):
+            store.create("agent-c", "")
+
+    def test_audit_records_operator_and_reason(self, store):
+        store.create("agent-a", "op-1")
+        store.activate("agent-a", "op-2", "approved")
+
+        with open(store.audit_path) as f:
+            records = [json.loads(line) for line in f]
+
+        assert [(r["from"], r["to"], r["operator_id"]) for r in records] == [
+            (None, "CREATED", "op-1"), ("CREATED", "ACTIVE", "op-2")
+        ]
+        assert records[1]["reason"] == "approved"
+
+    def test_restore_from_snapshot_and_audit_tail(self, store, tmp_path):
+        for i in range(3):
+            store.create(f"agent-{i}", "op-1")
+            store.activate(f"agent-{i}", "op-1", "go")
+        store.snapshot(str(tmp_path / "state.json"))
+        store.suspend("agent-1", "op-1", "policy")
+        store.terminate("agent-2", "op-1", "retired")
+        store.close()
+
+        restored = AgentStateStore(audit_path=store.audit_path)
+        replayed = restored.restore(str(tmp_path / "state.json"))
+
+        assert replayed == 2
+        assert restored.eligible() == ["agent-0"]
+        assert restored.status("agent-2") == "TERMINATED"
+        restored.activate("agent-1", "op-1", "cleared")
+        assert restored.get("agent-1")["seq"] == 9
+        restored.close()
+
+    def test_restore_parses_only_the_audit_tail(self, store, tmp_path, monkeypatch):
+        for i in range(50):
+            store.create(f"agent-{i}", "op-1")
+        store.snapshot(str(tmp_path / "state.json"))
+        store.activate("agent-7", "op-1", "go")
+        store.close()
+
+        parsed = []
+        loads = json.loads
+
+        def counting_loads(data, **kwargs):
+            if isinstance(data, bytes):
+                parsed.append(data)
+            return loads(data, **kwargs)
+
+        monkeypatch.setattr(json, "loads", counting_loads)
+        restored = AgentStateStore(audit_path=store.audit_path)
+
+        assert restored.restore(str(tmp_path / "state.json")) == 1
+        assert len(parsed) == 1
+        assert len(restored) == 50
+        assert restored.eligible() == ["agent-7"]
+        restored.close()
+
+    def test_restore_drops_torn_audit_line(self, store):
+        store.create("agent-a", "op-1")
+        store.close()
+        with open(store.audit_path, "a") as f:
+            f.write('{"seq":2,"soul_id":"agent-a","fr')
+
+        restored = AgentStateStore(audit_path=store.audit_path)
+        assert restored.restore() == 1
+        restored.activate("agent-a", "op-1", "go")
+        restored.close()
+
+        again = AgentStateStore(audit_path=store.audit_path)
+        assert again.restore() == 2
+        assert again.can_claim("agent-a")
+        again.close()
+
+    def test_lease_manager_refuses_ineligible_claims(self, store):
+        leases = LeaseStore()
+        leases.enqueue("task-1")
+        leases.enqueue("task-2")
+        manager = LeaseManager(leases, agents=store, clock=lambda: 0.0)
+        store.create("agent-a", "op-1")
+        store.activate("agent-a", "op-1", "go")
+
+        assert manager.claim("agent-a") == "task-1"
+        store.suspend("agent-a", "op-1", "review")
+        assert manager.claim("agent-a") is None
+        # In-flight work keeps its lease while suspended
+        manager.heartbeat("agent-a")
+        assert manager.flush() == {}
+        assert manager.in_flight("agent-a") == ["task-1"]
@@ -0,0 +1,93 @@
+"""
+Brand Safety Review Tests
+
+SRS Reference: §4.3 Creative Engine (FR3.2)
+Spec: specs/planner_service.md, Pattern A Task 3 (content_review)
+
+These tests validate prohibited keyword scanning of generated content.
+"""
+
+import pytest
+from src.review.brand_safety import BrandSafetyScanner, KeywordMatcher
+
+
+class TestKeywordMatcher:
+
+    def test_reports_matches_with_offsets(self):
+        matcher = KeywordMatcher(["fast fashion", "cheap", "waste"])
+        text = "No Cheap tricks, no fast   fashion, zero waste."
+
+        matches = matcher.find(text)
+
+        assert [m["keyword"] for m in matches] == ["cheap", "fast fashion", "waste"]
+        for m in matches:
+            assert text[m["start"]:m["end"]] == m["text"]
+
+    def test_whole_words_only(self):
+        matcher = KeywordMatcher(["cheap"])
+        assert matcher.find("the cheapest option") == []
+
+        loose = KeywordMatcher(["cheap"], whole_words=False)
+        assert len(loose.find("the cheapest option")) == 1
+
+    def test_prefers_longest_keyword(self):
+        matcher = KeywordMatcher(["cheap", "cheap deals"])
+        matches = matcher.find("cheap deals and cheap deal")
+
+        assert [m["keyword"] for m in matches] == ["cheap deals", "cheap"]
+
+    def test_special_characters_are_literal(self):
+        matcher = KeywordMatcher(["#ad", "c++"])
+        assert [m["keyword"] for m in matcher.find("sponsored #ad for c++ devs")] == ["#ad", "c++"]
+        assert matcher.find("sponsored ad") == []
+
+    def test_casefolding_matches_keyword_index(self):
+        matcher = KeywordMatcher(["straße", "ΟΔΟΣ"])
+        text = "Die STRASSE, die Straße und η οδος."
+
+        matches = matcher.find(text)
+
+        assert [m["keyword"] for m in matches] == ["straße", "straße", "ΟΔΟΣ"]
+        assert [m["text"] for m in matches] == ["STRASSE", "Straße", "οδος"]
+        for m in matches:
+            assert text[m["start"]:m["end"]] == m["text"]
+
+    def test_empty_keyword_list_matches_nothing(self):
+        assert KeywordMatcher([]).find("anything at all") == []
+
+
+class TestBrandSafetyScanner:
+
+    @pytest.fixture
+    def campaign(self):
+        return {
+            "campaign_id": "campaign-1",
+            "constraints": {"prohibited_keywords": ["fast fashion", "cheap"]}
+        }
+
+    def test_scan_batch_flags_each_output(self, campaign):
+        scanner = BrandSafetyScanner()
+        outputs = [
+            {"content": "Sustainable summer looks"},
+            {"content": "Cheap thrills all summer"}
+        ]
+
+        reviews = scanner.scan_batch(campaign, outputs)
+
+        assert reviews[0] == {"passed": True, "matches": []}
+        assert reviews[1]["passed"] is False
+        assert reviews[1]["matches"][0]["start"] == 0
+
+    def test_matcher_is_cached_per_campaign(self, campaign):
+        scanner = BrandSafetyScanner()
+        keywords = campaign["constraints"]["prohibited_keywords"]
+
+        first = scanner.get_matcher("campaign-1", keywords)
+        assert scanner.get_matcher("campaign-1", list(keywords)) is first
+
+        # Changing the keyword list recompiles
+        assert scanner.get_matcher("campaign-1", ["waste"]) is not first
+
+    def test_requires_campaign_id(self):
+        with pytest.raises(ValueError, match="Campaign ID"):
+            BrandSafetyScanner().scan_batch({}, [])
@@ -0,0 +1,129 @@
+"""
+Budget Accounting Tests
+
+SRS Reference: §4.5 Commerce (FR5.3)
+Spec: specs/planner_service.md, Validation Rule 2 (Budget Check)
+
+These tests validate reserve/commit/release and hierarchical spend caps.
+"""
+
+import threading
+import pytest
+from src.budget.accounting import BudgetAccountant
+
+
+@pytest.fixture
+def accountant():
+    accountant = BudgetAccountant(stripes=4)
+    accountant.register_capability({
+        "capability_id": "cap-publish",
+        "billing_config": {"cost_per_call": 0.10, "currency": "USD"}
+    })
+    accountant.open_campaign({"campaign_id": "campaign-1", "budget_limit_usd": 1.00})
+    return accountant
+
+
+class TestBudgetAccountant:
+
+    def test_reserve_uses_cost_per_call(self, accountant):
+        rid = accountant.reserve("campaign-1", "agent-a", "cap-publish")
+
+        assert rid is not None
+        assert accountant.usage("campaign-1")["reserved_usd"] == 0.10
+
+        accountant.commit(rid)
+        usage = accountant.usage("campaign-1", "agent-a", "cap-publish")
+        assert usage["reserved_usd"] == 0.0
+        assert usage["committed_usd"] == 0.10
+
+    def test_campaign_cap_rejects_overspend(self, accountant):
+        rids = [accountant.reserve("campaign-1", "agent-a", "cap-publish") for _ in range(10)]
+        assert all(rids)
+
+        assert accountant.reserve("campaign-1", "agent-b", "cap-publish") is None
+
+    def test_release_frees_capacity(self, accountant):
+        rid = accountant.reserve("campaign-1", "agent-a", "cap-publish", amount_usd=1.00)
+        assert accountant.reserve("campaign-1", "agent-a", "cap-publish") is None
+
+        accountant.release(rid)
+
+        assert accountant.reserve("campaign-1", "agent-a", "cap-publish") is not None
+        assert accountant.usage("campaign-1")["committed_usd"] == 0.0
+
+    def test_agent_and_capability_caps(self, accountant):
+        accountant.set_cap("campaign-1", 0.20, soul_id="agent-a")
+        accountant.set_cap("campaign-1", 0.10, soul_id="agent-b", capability_id="cap-publish")
+
+        assert accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.20) is not None
+        assert accountant.reserve("campaign-1", "agent-a", "cap-other", 0.01) is None
+
+        assert accountant.reserve("campaign-1", "agent-b", "cap-publish") is not None
+        assert accountant.reserve("campaign-1", "agent-b", "cap-publish") is None
+        assert accountant.reserve("campaign-1", "agent-b", "cap-other", 0.50) is not None
+
+    def test_commit_actual_cost(self, accountant):
+        rid = accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.50)
+        accountant.commit(rid, actual_usd=0.30)
+
+        assert accountant.usage("campaign-1")["committed_usd"] == 0.30
+
+    def test_commit_over_reservation_records_actual_cost(self, accountant):
+        rid = accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.50)
+        overruns = accountant.commit(rid, actual_usd=1.50)
+
+        assert accountant.usage("campaign-1") == {"limit_usd": 1.00, "reserved_usd": 0.0,
+                                                  "committed_usd": 1.50, "overrun_usd": 0.50}
+        assert [o["key"] for o in overruns] == [["campaign-1"]]
+        assert overruns[0]["actual_usd"] == 1.50
+        assert accountant.overruns == overruns
+        assert accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.01) is None
+
+    def test_unknown_reservation(self, accountant):
+        with pytest.raises(ValueError, match="Unknown reservation"):
+            accountant.commit("rsv:missing")
+
+    def test_concurrent_reservations_never_exceed_cap(self, accountant):
+        granted = []
+
+        def worker():
+            for _ in range(50):
+                rid = accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.01)
+                if rid:
+                    granted.append(rid)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(granted) == 100
+
+    def test_checkpoint_round_trip(self, accountant, tmp_path):
+        accountant.commit(accountant.reserve("campaign-1", "agent-a", "cap-publish", 0.75))
+        path = str(tmp_path / "budget.json")
+        accountant.checkpoint(path)
+
+        restored = BudgetAccountant()
+        restored.restore(path)
+
+        assert restored.usage("campaign-1") == {"limit_usd": 1.00, "reserved_usd": 0.0,
+                                                "committed_usd": 0.75, "overrun_usd": 0.0}
+        assert restored.reserve("campaign-1", "agent-a", "cap-publish", 0.30) is None
+
+    def test_restore_drops_open_reservations(self, accountant, tmp_path):
+        path = str(tmp_path / "budget.json")
+        accountant.checkpoint(path)
+        rid = accountant.reserve("campaign-1", "agent-a", "cap-publish")
+        accountant.restore(path)
+
+        with pytest.raises(ValueError, match="Unknown reservation"):
+            accountant.commit(rid)
+
+    def test_checkpoint_thread_survives_errors(self, accountant, tmp_path):
+        path = str(tmp_path / "missing" / "budget.json")
+        accountant.start_checkpointing(path, interval_seconds=0.01)
+        threading.Event().wait(0.05)
+        assert accountant._checkpoint_thread.is_alive()
+        accountant.stop_checkpointing()
@@ -0,0 +1,47 @@
+"""
+Campaign Simulation Harness Tests
+
+SRS Reference: §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/planner_service.md, Pattern A (Trend-Jacked Content)
+
+These tests validate that the end-to-end benchmark harness drives campaigns
+through every stage and produces a comparable report.
+"""
+
+from benchmarks.campaign_simulation import CampaignSimulation, generate_manifests, compare
+
+
+class TestCampaignSimulation:
+
+    def test_manifests_are_deterministic(self):
+        assert generate_manifests(3, seed=7)[0]["campaign_id"] == generate_manifests(3, seed=7)[0]["campaign_id"]
+
+    def test_report_covers_every_stage(self):
+        with CampaignSimulation(latencies={"skill.publish_post": 0.001}) as sim:
+            report = sim.run(generate_manifests(4), concurrency=2)
+
+        assert report["config"]["campaigns"] == 4
+        assert report["throughput"]["tasks_per_s"] > 0
+        assert report["peak_rss_mb"] > 0
+        for stage in ("planner.plan_campaign", "schema.validate_manifest", "schema.validate_result",
+                      "skill.fetch_trends", "skill.generate_content", "skill.validate_image",
+                      "skill.check_wallet_balance", "skill.publish_post", "worker.run"):
+            assert report["stages"][stage]["count"] > 0
+        assert report["stages"]["skill.publish_post"]["p50_ms"] >= 1.0
+
+    def test_telemetry_is_drained(self):
+        import task1
+
+        with CampaignSimulation() as sim:
+            sim.run(generate_manifests(3), concurrency=1)
+
+        assert task1.telemetry.events() == []
+
+    def test_compare_flags_regressions(self):
+        baseline = {"throughput": {"tasks_per_s": 100.0}, "stages": {"worker.run": {"p99_ms": 1.0}}}
+        current = {"throughput": {"tasks_per_s": 80.0}, "stages": {"worker.run": {"p99_ms": 1.05}}}
+
+        regressions = compare(current, baseline, threshold=0.10)
+
+        assert len(regressions) == 1
+        assert "tasks_per_s" in regressions[0]
@@ -0,0 +1,108 @@
+"""
+OpenClaw Discovery Index Tests
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §2.1 Agent Availability Advertisement, §2.2 Discovery Query
+
+These tests validate indexed discovery queries against a brute-force scan,
+including incremental updates, removals and expiry.
+"""
+
+import random
+import pytest
+from src.openclaw.discovery import DiscoveryIndex
+
+SKILLS = ["content_generation", "social_media_management", "analytics_reporting", "video_editing", "translation"]
+STATUSES = ["AVAILABLE", "BUSY", "OFFLINE"]
+
+
+def _ad(rng, i):
+    return {
+        "soul_id": f"chimera:agent:{i}",
+        "skills": rng.sample(SKILLS, rng.randint(1, 3)),
+        "availability": {"status": rng.choice(STATUSES), "capacity_percent": rng.randint(0, 100)},
+        "pricing": {"currency": "USD", "base_rate_per_hour": round(rng.uniform(5, 100), 2)},
+        "reputation": {"score": round(rng.uniform(1, 5), 2)},
+        "signature": "ed25519_signature_of_payload"
+    }
+
+
+def _scan(ads, skills=None, max_price=None, min_reputation=None, availability=None):
+    return sorted(
+        ad["soul_id"] for ad in ads.values()
+        if all(s in ad["skills"] for s in skills or ())
+        and (max_price is None or ad["pricing"]["base_rate_per_hour"] <= max_price)
+        and (min_reputation is None or ad["reputation"]["score"] >= min_reputation)
+        and (availability is None or ad["availability"]["status"] == availability)
+    )
+
+
+QUERIES = [
+    {"skills": ["content_generation"]},
+    {"skills": ["content_generation", "translation"], "availability": "AVAILABLE"},
+    {"max_price": 10},
+    {"min_reputation": 4.9, "skills": ["video_editing"]},
+    {"max_price": 50, "min_reputation": 3, "availability": "BUSY"},
+    {"skills": ["analytics_reporting"], "max_price": 90},
+    {},
+]
+
+
+class TestDiscoveryIndex:
+
+    @pytest.fixture
+    def populated(self):
+        rng = random.Random(0)
+        ads = {f"chimera:agent:{i}": _ad(rng, i) for i in range(3000)}
+        index = DiscoveryIndex(capacity=64, merge_threshold=50)
+        index.upsert_batch(ads.values())
+        return rng, ads, index
+
+    @pytest.mark.parametrize("filters", QUERIES)
+    def test_matches_linear_scan(self, populated, filters):
+        _, ads, index = populated
+        assert sorted(index.query(**filters)) == _scan(ads, **filters)
+
+    def test_incremental_updates_and_removals(self, populated):
+        rng, ads, index = populated
+        for step in range(400):
+            i = rng.randrange(3500)
+            if rng.random() < 0.2 and f"chimera:agent:{i}" in ads:
+                del ads[f"chimera:agent:{i}"]
+                index.remove(f"chimera:agent:{i}")
+            else:
+                ads[f"chimera:agent:{i}"] = _ad(rng, i)
+                index.upsert(ads[f"chimera:agent:{i}"])
+            if step % 50 == 0:
+                for filters in QUERIES:
+                    assert sorted(index.query(**filters)) == _scan(ads, **filters)
+
+        assert len(index) == len(ads)
+        for filters in QUERIES:
+            assert sorted(index.query(**filters)) == _scan(ads, **filters)
+
+    def test_limit_and_unknown_terms(self, populated):
+        _, ads, index = populated
+
+        limited = index.query(skills=["content_generation"], limit=5)
+        cheapest = index.query(max_price=8, limit=3)
+
+        assert len(limited) == 5 and set(limited) <= set(_scan(ads, skills=["content_generation"]))
+        prices = [ads[s]["pricing"]["base_rate_per_hour"] for s in cheapest]
+        assert prices == sorted(prices)
+        assert index.query(skills=["unknown_skill"]) == []
+        assert index.query(availability="ON_VACATION") == []
+
+    def test_query_ads_and_expiry(self):
+        index = DiscoveryIndex()
+        rng = random.Random(1)
+        index.upsert_batch([_ad(rng, i) for i in range(10)], now=0)
+        index.upsert_batch([_ad(rng, i) for i in range(5)], now=900)
+
+        assert sorted(index.expire(older_than=900)) == [f"chimera:agent:{i}" for i in range(5, 10)]
+        assert len(index) == 5
+        assert all(ad["signature"] for ad in index.query_ads())
+
+    def test_rejects_ad_without_soul_id(self):
+        with pytest.raises(ValueError, match="soul_id"):
+            DiscoveryIndex().upsert({"skills": ["x"]})
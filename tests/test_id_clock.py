@@ -0,0 +1,111 @@
+"""
+ID and Clock Service Tests
+
+SRS Reference: §4.6 Orchestration (FR6.2)
+Spec: specs/technical.md, Agent Task Schema (task_id, created_at)
+
+These tests validate UUIDv7 layout and ordering, the cached ISO timestamp
+and deterministic replay mode.
+"""
+
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+from src.ids import clock
+from src.ids.clock import IdClock, timestamp_ms
+from src.planner.engine import CampaignPlanner
+
+
+@pytest.fixture
+def seeded_clock():
+    clock.set_clock(IdClock(seed=7))
+    yield clock.get_clock()
+    clock.set_clock(None)
+
+
+class TestIdClock:
+
+    def test_uuid7_layout(self):
+        value = uuid.UUID(IdClock().uuid7())
+
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_ids_are_strictly_increasing(self):
+        ids_clock = IdClock(seed=1)
+        ids = [ids_clock.uuid7() for _ in range(10_000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+        # 10k IDs in one virtual millisecond overflow the 12-bit counter into later ms
+        assert timestamp_ms(ids[-1]) > timestamp_ms(ids[0])
+
+    def test_unique_across_threads(self):
+        ids_clock = IdClock()
+        ids = []
+
+        def worker():
+            ids.extend(ids_clock.uuid7() for _ in range(2000))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(ids)) == 8000
+
+    def test_isoformat_is_cached_per_ms(self):
+        ids_clock = IdClock(seed=0, start_ms=1_767_225_600_123)
+
+        first = ids_clock.isoformat()
+        assert first == "2026-01-01T00:00:00.123+00:00"
+        assert ids_clock.isoformat() is first
+        ids_clock.advance(1_000)
+        assert ids_clock.isoformat() == "2026-01-01T00:00:01.123+00:00"
+        assert datetime.fromisoformat(IdClock().isoformat()).tzinfo is not None
+
+    def test_isoformat_is_consistent_across_threads(self):
+        ids_clock = IdClock(seed=0)
+        bad = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                before = ids_clock.now_ms()
+                ms = round(datetime.fromisoformat(ids_clock.isoformat()).timestamp() * 1000)
+                if not before <= ms <= ids_clock.now_ms():
+                    bad.append((before, ms))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for t in readers:
+            t.start()
+        for _ in range(20_000):
+            ids_clock.advance(999)
+        done.set()
+        for t in readers:
+            t.join()
+
+        assert bad == []
+
+    def test_advance_requires_deterministic_mode(self):
+        with pytest.raises(ValueError):
+            IdClock().advance(1)
+        with pytest.raises(ValueError):
+            IdClock(seed=0).advance(-1)
+
+    def test_seeded_replay_reproduces_plan(self, seeded_clock):
+        manifest = {
+            "campaign_id": "campaign-1",
+            "goal": "Promote summer collection",
+            "target_audience": {"regions": ["US"]},
+            "constraints": {"platforms": ["twitter"]}
+        }
+        first = CampaignPlanner().plan_campaign(manifest)
+        clock.set_clock(IdClock(seed=7))
+        second = CampaignPlanner().plan_campaign(manifest)
+
+        assert first == second
+        assert [t["task_id"] for t in first] == sorted(t["task_id"] for t in first)
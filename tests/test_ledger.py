@@ -0,0 +1,151 @@
+"""
+Ledger Engine Tests
+
+SRS Reference: §4.5 Commerce (FR5.1, FR5.2)
+Spec: specs/technical.md, `ledger` table
+
+These tests validate append-only storage, group commit and materialized
+balances behind the check_wallet_balance skill.
+"""
+
+import sqlite3
+import pytest
+from src.ledger.engine import Ledger, LedgerRejected
+
+
+class TestLedger:
+
+    @pytest.fixture
+    def ledger(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.db"), batch_size=3)
+        yield ledger
+        ledger.close()
+
+    def test_append_batch_updates_balances(self, ledger):
+        ledger.append_batch([
+            {"to_soul_id": "agent-a", "amount": 100.00, "purpose": "Funding"},
+            {"from_soul_id": "agent-a", "to_soul_id": "agent-b", "amount": 25.50, "purpose": "Payment"}
+        ])
+
+        assert ledger.get_balance("agent-a") == 74.50
+        assert ledger.get_balance("agent-b") == 25.50
+        assert ledger.get_balance("unknown") == 0.0
+
+    def test_submitted_transactions_are_pending_until_flushed(self, ledger):
+        ledger.submit({"to_soul_id": "agent-a", "amount": 10.00})
+
+        assert ledger.get_balance("agent-a") == 0.0
+        assert ledger.get_pending_balance("agent-a") == 10.00
+
+        ledger.flush()
+
+        assert ledger.get_balance("agent-a") == 10.00
+        assert ledger.get_pending_balance("agent-a") == 0.0
+
+    def test_buffer_auto_flushes_at_batch_size(self, ledger):
+        for _ in range(3):
+            ledger.submit({"to_soul_id": "agent-a", "amount": 1.00})
+
+        assert ledger.get_balance("agent-a") == 3.00
+        assert ledger.get_pending_balance("agent-a") == 0.0
+
+    def test_recent_transactions_newest_first(self, ledger):
+        ledger.append_batch([{"to_soul_id": "agent-a", "amount": 5.00, "purpose": "first"}])
+        assert [t["purpose"] for t in ledger.recent_transactions("agent-a")] == ["first"]
+
+        ledger.append_batch([{"from_soul_id": "agent-a", "amount": 2.00, "purpose": "second"}])
+        recent = ledger.recent_transactions("agent-a")
+        assert [t["purpose"] for t in recent] == ["second", "first"]
+        assert recent[0]["amount"] == -2.00
+
+    def test_ledger_is_append_only(self, ledger):
+        ledger.append_batch([{"to_soul_id": "agent-a", "amount": 5.00}])
+
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            ledger._conn.execute("UPDATE ledger SET amount_cents = 0")
+
+    def test_balances_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "reopen.db")
+        ledger = Ledger(path)
+        ledger.submit({"to_soul_id": "agent-a", "amount": 12.34})
+        ledger.close()
+
+        reopened = Ledger(path)
+        assert reopened.get_balance("agent-a") == 12.34
+        assert len(reopened.recent_transactions("agent-a")) == 1
+        reopened.close()
+
+    def test_failed_batch_is_atomic(self, ledger):
+        ledger.append_batch([{"tx_id": "tx-1", "to_soul_id": "agent-a", "amount": 5.00}])
+
+        with pytest.raises(LedgerRejected) as excinfo:
+            ledger.append_batch([
+                {"tx_id": "tx-2", "to_soul_id": "agent-a", "amount": 1.00},
+                {"tx_id": "tx-1", "to_soul_id": "agent-a", "amount": 1.00}
+            ])
+
+        assert excinfo.value.tx_ids == ["tx-1"]
+        assert ledger.get_balance("agent-a") == 5.00
+
+    def test_duplicate_is_rejected_before_buffering(self, ledger):
+        ledger.append_batch([{"tx_id": "tx-1", "to_soul_id": "agent-a", "amount": 5.00}])
+        ledger.submit({"tx_id": "tx-2", "to_soul_id": "agent-a", "amount": 1.00})
+
+        for tx_id in ("tx-1", "tx-2"):
+            with pytest.raises(LedgerRejected, match="duplicate") as excinfo:
+                ledger.submit({"tx_id": tx_id, "to_soul_id": "agent-a", "amount": 1.00})
+            assert excinfo.value.tx_ids == [tx_id]
+
+        assert ledger.get_pending_balance("agent-a") == 1.00
+        assert ledger.flush() == 1
+        assert ledger.get_balance("agent-a") == 6.00
+
+    def test_refused_record_does_not_discard_batch(self, ledger):
+        receipt = {"receipt_id": "r-1", "s3_uri": "s3://r/1", "signature": "sig"}
+        ledger.append_batch([{"tx_id": "tx-1", "to_soul_id": "agent-a", "amount": 5.00, "receipt": receipt}])
+        ledger.submit({"tx_id": "tx-2", "to_soul_id": "agent-b", "amount": 1.00})
+        ledger.submit({"tx_id": "tx-3", "to_soul_id": "agent-a", "amount": 1.00, "receipt": receipt})
+
+        # The third submit fills the batch; only the reused receipt_id is refused
+        with pytest.raises(LedgerRejected) as excinfo:
+            ledger.submit({"tx_id": "tx-4", "to_soul_id": "agent-b", "amount": 2.00})
+        assert excinfo.value.tx_ids == ["tx-3"]
+        assert excinfo.value.records[0]["receipt"] == receipt
+
+        assert ledger.get_balance("agent-a") == 5.00
+        assert ledger.get_balance("agent-b") == 3.00
+        assert ledger.get_pending_balance("agent-a") == 0.0
+        assert [t["tx_id"] for t in ledger.recent_transactions("agent-b")] == ["tx-4", "tx-2"]
+
+    def test_receipt_requires_uri_and_signature(self, ledger):
+        with pytest.raises(ValueError, match="s3_uri"):
+            ledger.submit({"to_soul_id": "agent-a", "amount": 1.00, "receipt": {"s3_uri": "s3://r"}})
+
+    def test_transfer_to_self_listed_once(self, ledger):
+        ledger.recent_transactions("agent-a")
+        ledger.append_batch([{"from_soul_id": "agent-a", "to_soul_id": "agent-a", "amount": 1.00}])
+
+        assert len(ledger.recent_transactions("agent-a")) == 1
+
+    def test_rejects_non_positive_amount(self, ledger):
+        with pytest.raises(ValueError, match="positive"):
+            ledger.submit({"to_soul_id": "agent-a", "amount": 0})
+
+
+class TestCheckWalletBalanceLedger:
+
+    def test_skill_reads_ledger(self):
+        from skills.skill_check_wallet_balance import skill
+
+        ledger = Ledger()
+        ledger.append_batch([{"to_soul_id": "agent-a", "amount": 475.50, "purpose": "Funding"}])
+        ledger.submit({"from_soul_id": "agent-a", "amount": 25.00})
+        skill.set_ledger(ledger)
+        try:
+            result = skill.execute_skill({"soul_id": "agent-a", "include_pending": True})
+        finally:
+            skill.set_ledger(None)
+
+        assert result["balance"] == 475.50
+        assert result["pending_balance"] == -25.00
+        assert result["recent_transactions"][0]["purpose"] == "Funding"
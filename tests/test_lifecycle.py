@@ -0,0 +1,130 @@
+"""
+Worker Lifecycle Tests
+
+SRS Reference: §4.6 Orchestration (FR6.2)
+Spec: specs/technical.md, Redis Key Patterns (task_lease, worker heartbeat)
+
+These tests validate batched heartbeats, lease renewal, failure detection and
+bulk requeue of expired leases.
+"""
+
+import pytest
+from src.orchestrator.lifecycle import LeaseManager, LeaseStore, PhiAccrualDetector
+
+
+@pytest.fixture
+def manager():
+    store = LeaseStore()
+    for i in range(6):
+        store.enqueue(f"task-{i}", "HIGH" if i == 5 else "NORMAL")
+    return LeaseManager(store, lease_ttl=300, heartbeat_ttl=60, heartbeat_interval=10, clock=lambda: 0.0)
+
+
+class TestLeaseManager:
+
+    def test_claim_is_fifo_within_priority(self, manager):
+        claimed = [manager.claim("agent-a", now=0) for _ in range(3)]
+
+        assert claimed == ["task-5", "task-0", "task-1"]
+        assert manager.in_flight("agent-a") == ["task-0", "task-1", "task-5"]
+
+    def test_heartbeats_are_one_write_per_flush(self, manager):
+        for soul_id in ("agent-a", "agent-b", "agent-c"):
+            manager.claim(soul_id, now=0)
+            manager.claim(soul_id, now=0)
+        before = manager.store.round_trips
+
+        for _ in range(5):
+            for soul_id in ("agent-a", "agent-b", "agent-c"):
+                manager.heartbeat(soul_id, now=5)
+        manager.flush(now=5)
+
+        assert manager.store.round_trips == before + 1
+        assert manager.store.workers["agent-b"]["expires_at"] == 65
+
+    def test_heartbeat_renews_long_running_lease(self, manager):
+        task_id = manager.claim("agent-a", now=0)
+        for now in range(10, 600, 10):
+            manager.heartbeat("agent-a", now=now)
+            manager.flush(now=now)
+            assert manager.reap(now=now)["requeued"] == []
+
+        assert manager.store.leases[task_id][1] == 590 + 300
+
+    def test_dead_worker_leases_requeued_in_bulk(self, manager):
+        for _ in range(3):
+            manager.claim("agent-a", now=0)
+        manager.claim("agent-b", now=0)
+        for now in range(10, 100, 10):
+            manager.heartbeat("agent-b", now=now)
+        manager.flush(now=90)
+        before = manager.store.round_trips
+
+        result = manager.reap(now=90)
+
+        assert result["dead_workers"] == ["agent-a"]
+        assert sorted(result["requeued"]) == ["task-0", "task-1", "task-5"]
+        assert manager.store.round_trips == before + 2
+        assert "agent-a" not in manager.store.workers
+        # Requeued tasks keep their original place in line
+        assert manager.claim("agent-b", now=90) == "task-5"
+        assert manager.claim("agent-b", now=90) == "task-0"
+
+    def test_claim_bursts_do_not_shrink_heartbeat_interval(self):
+        store = LeaseStore()
+        for i in range(51):
+            store.enqueue(f"t{i}")
+        manager = LeaseManager(store, heartbeat_interval=10, clock=lambda: 0.0)
+        for i in range(50):
+            manager.claim("w", now=i * 0.01)
+            manager.complete("w", f"t{i}")
+        manager.claim("w", now=0.5)
+
+        # Still inside the first 10s heartbeat interval after the long task's claim
+        assert manager.reap(now=9) == {"dead_workers": [], "requeued": []}
+        manager.heartbeat("w", now=10.5)
+        assert manager.reap(now=19) == {"dead_workers": [], "requeued": []}
+
+    def test_expired_lease_is_requeued(self, manager):
+        task_id = manager.claim("agent-a", now=0)
+        # agent-a is alive but its last renewal never landed, so the lease lapses
+        manager.store.leases[task_id][1] = 50
+        manager.heartbeat("agent-a", now=50)
+
+        assert manager.reap(now=50) == {"dead_workers": [], "requeued": [task_id]}
+        assert manager.in_flight("agent-a") == []
+
+    def test_flush_reports_leases_lost_elsewhere(self, manager):
+        task_id = manager.claim("agent-a", now=0)
+        # Another orchestrator replica requeued the task and agent-b claimed it
+        manager.store.requeue([task_id])
+        manager.store.claim("agent-b", 1, 300)
+
+        manager.heartbeat("agent-a", now=10)
+
+        assert manager.flush(now=10) == {"agent-a": [task_id]}
+        assert manager.in_flight("agent-a") == []
+
+    def test_rejects_interval_longer_than_ttl(self):
+        with pytest.raises(ValueError):
+            LeaseManager(heartbeat_interval=60, heartbeat_ttl=60)
+
+
+class TestPhiAccrualDetector:
+
+    def test_phi_grows_with_silence(self):
+        detector = PhiAccrualDetector(threshold=8, first_interval=1.0, min_std=0.1, timeout=60)
+        for t in range(20):
+            detector.heartbeat("agent-a", float(t))
+
+        assert detector.phi("agent-a", 19.5) < 1
+        assert detector.is_alive("agent-a", 20.2)
+        assert detector.phi("agent-a", 22.0) > 8
+        assert detector.suspects(22.0) == ["agent-a"]
+
+    def test_timeout_backstop(self):
+        detector = PhiAccrualDetector(threshold=1e9, timeout=30)
+        detector.heartbeat("agent-a", 0.0)
+
+        assert detector.is_alive("agent-a", 29.0)
+        assert not detector.is_alive("agent-a", 30.0)
@@ -0,0 +1,181 @@
+"""
+OpenClaw Matchmaking Solver Tests
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §3.3 Campaign Manifest, §3.10 POST /marketplace/bid
+
+These tests validate pair scoring, the auction against an exhaustive
+optimum, handling of infeasible campaigns, and incremental bids.
+"""
+
+import itertools
+import math
+import random
+import pytest
+from src.openclaw.matchmaking import Matchmaker, greedy_match
+
+SKILLS = ["content_generation", "social_media_management", "analytics_reporting", "video_editing"]
+
+
+def _campaign(i, rng, budget=None):
+    return {
+        "campaign_id": f"campaign-{i}",
+        "required_skills": rng.sample(SKILLS, rng.randint(1, 2)),
+        "budget_limit_usd": budget if budget is not None else rng.uniform(100, 500),
+        "estimated_hours": rng.uniform(2, 8)
+    }
+
+
+def _ad(i, rng):
+    return {
+        "soul_id": f"chimera:agent:{i}",
+        "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+        "availability": {"status": "AVAILABLE", "capacity_percent": rng.randint(0, 100)},
+        "pricing": {"base_rate_per_hour": rng.uniform(5, 60), "campaign_setup_fee": rng.uniform(0, 50)},
+        "reputation": {"score": rng.uniform(1, 5)}
+    }
+
+
+def _market(seed, campaigns, agents, **kwargs):
+    rng = random.Random(seed)
+    mm = Matchmaker(**kwargs)
+    mm.add_campaigns(_campaign(i, rng) for i in range(campaigns))
+    mm.add_agents(_ad(i, rng) for i in range(agents))
+    return mm
+
+
+def _optimum(mm):
+    """Exhaustive best total, allowing campaigns to stay unmatched."""
+    n_rows, n_cols = mm.shape
+    best = 0.0
+    options = list(range(n_cols)) + [None] * n_rows
+    for choice in itertools.permutations(options, n_rows):
+        scores = [mm.score(mm._campaign_ids[row], mm._agent_ids[col])
+                  for row, col in enumerate(choice) if col is not None]
+        if all(math.isfinite(s) for s in scores):
+            best = max(best, sum(scores))
+    return best
+
+
+class TestScoring:
+    """Pair scores follow skill fit, price, reputation and capacity"""
+
+    def test_score_components(self):
+        mm = Matchmaker()
+        mm.add_campaigns([{"campaign_id": "c", "required_skills": ["video_editing"],
+                           "budget_limit_usd": 200, "estimated_hours": 4}])
+        mm.add_agents([{"soul_id": "a", "skills": ["video_editing"], "pricing": {"base_rate_per_hour": 25},
+                        "reputation": {"score": 5.0}, "availability": {"capacity_percent": 50}}])
+        # fit 1, price 100/200, reputation 1, capacity 0.5
+        assert mm.score("c", "a") == pytest.approx(0.4 + 0.3 * 0.5 + 0.2 + 0.1 * 0.5)
+
+    def test_infeasible_pairs(self):
+        mm = Matchmaker()
+        mm.add_campaigns([{"campaign_id": "c", "required_skills": ["video_editing", "translation"],
+                           "budget_limit_usd": 100}])
+        mm.add_agents([
+            {"soul_id": "partial", "skills": ["video_editing"]},
+            {"soul_id": "expensive", "skills": ["video_editing", "translation"], "pricing": {"base_rate_per_hour": 500}},
+            {"soul_id": "full", "skills": ["video_editing", "translation"], "availability": {"capacity_percent": 0}},
+        ])
+        assert all(mm.score("c", s) == -math.inf for s in ("partial", "expensive", "full"))
+        assert mm.solve() == {}
+
+    def test_bid_replaces_advertised_quote(self):
+        mm = Matchmaker()
+        mm.add_campaigns([{"campaign_id": "c", "budget_limit_usd": 100}])
+        mm.add_agents([{"soul_id": "a", "pricing": {"base_rate_per_hour": 90}}])
+        before = mm.score("c", "a")
+        mm.add_bid({"campaign_id": "c", "soul_id": "a", "price_usd": 10})
+        assert mm.score("c", "a") > before
+        assert mm.solve()["c"]["price_usd"] == 10
+
+    def test_invalid_inputs(self):
+        mm = Matchmaker()
+        with pytest.raises(ValueError):
+            mm.add_campaigns([{"campaign_id": "c"}])
+        with pytest.raises(ValueError):
+            mm.add_agents([{"skills": []}])
+        with pytest.raises(ValueError):
+            mm.add_bid({"campaign_id": "missing", "soul_id": "a", "price_usd": 1})
+
+
+class TestAuction:
+    """Auction totals against the exhaustive optimum and greedy"""
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_matches_exhaustive_optimum(self, seed):
+        mm = _market(seed, campaigns=5, agents=6, min_skill_fit=0.5)
+        result = mm.solve()
+        assert mm.total_score() == pytest.approx(_optimum(mm), abs=5 * mm.eps + 1e-5)
+        assert len({m["soul_id"] for m in result.values()}) == len(result)
+
+    def test_not_worse_than_greedy(self):
+        mm = _market(7, campaigns=200, agents=150, min_skill_fit=0.5)
+        mm.solve()
+        greedy = greedy_match(mm)
+        greedy_total = sum(mm.score(c, s) for c, s in greedy.items())
+        assert mm.total_score() >= greedy_total - 1e-6
+
+    def test_require_bid(self):
+        mm = _market(8, campaigns=3, agents=3, require_bid=True, min_skill_fit=0.0)
+        assert mm.solve() == {}
+        mm.add_bid({"campaign_id": "campaign-1", "soul_id": "chimera:agent:2", "price_usd": 5})
+        assert mm.solve() == {"campaign-1": {"soul_id": "chimera:agent:2", "price_usd": 5,
+                                             "score": pytest.approx(mm.score("campaign-1", "chimera:agent:2"))}}
+
+
+class TestIncremental:
+    """Incremental solves stay close to a full re-solve"""
+
+    def test_bids_and_new_agents(self):
+        rng = random.Random(9)
+        mm = _market(9, campaigns=150, agents=120, min_skill_fit=0.5)
+        mm.solve()
+        for round_ in range(5):
+            bids = [{"campaign_id": f"campaign-{rng.randrange(150)}", "soul_id": f"chimera:agent:{rng.randrange(120)}",
+                     "price_usd": rng.uniform(5, 100)} for _ in range(20)]
+            mm.add_bids(bids)
+            mm.add_agents([_ad(1000 + round_, rng)])
+            result = mm.solve()
+            assert len({m["soul_id"] for m in result.values()}) == len(result)
+            incremental = mm.total_score()
+            mm.solve(full=True)
+            assert incremental == pytest.approx(mm.total_score(), rel=1e-3)
+
+    def test_bids_over_budget_are_deferred(self):
+        rng = random.Random(11)
+        mm = _market(11, campaigns=150, agents=120, min_skill_fit=0.5, incremental_rounds=1)
+        before = mm.solve()
+        bids = [{"campaign_id": f"campaign-{rng.randrange(150)}", "soul_id": f"chimera:agent:{rng.randrange(120)}",
+                 "price_usd": rng.uniform(5, 100)} for _ in range(20)]
+        mm.add_bids(bids)
+
+        result = mm.solve()
+        assert mm.rounds <= 1
+        assert mm.deferred
+        # Rolled-back campaigns keep their previous agent
+        for campaign_id in mm.deferred:
+            assert result.get(campaign_id, {}).get("soul_id") == before.get(campaign_id, {}).get("soul_id")
+        assert len({m["soul_id"] for m in result.values()}) == len(result)
+
+        mm.solve(full=True)
+        assert mm.deferred == []
+
+
+class TestTermination:
+    """Tied bidders settle and runaway auctions are cut off"""
+
+    @pytest.mark.parametrize("campaigns,agents", [(4, 2), (2, 4), (3, 3)])
+    def test_identical_bidders_settle(self, campaigns, agents):
+        mm = Matchmaker()
+        mm.add_campaigns({"campaign_id": f"c{i}", "budget_limit_usd": 100} for i in range(campaigns))
+        mm.add_agents({"soul_id": f"a{i}", "pricing": {"base_rate_per_hour": 10}} for i in range(agents))
+        result = mm.solve()
+        assert len(result) == min(campaigns, agents)
+        assert len({m["soul_id"] for m in result.values()}) == len(result)
+
+    def test_round_cap(self):
+        mm = _market(10, campaigns=50, agents=50, min_skill_fit=0.5, max_rounds=2)
+        with pytest.raises(RuntimeError):
+            mm.solve()
@@ -0,0 +1,68 @@
+"""
+Microbenchmark Suite Tests
+
+SRS Reference: NFR 3.0 (Performance & Observability)
+
+These tests validate timing, statistical comparison and regression gating
+of the microbenchmark suite.
+"""
+
+import pytest
+from benchmarks.microbench import BENCHMARKS, measure, mann_whitney_p, compare, run_suite, main
+
+
+class TestMicrobench:
+
+    def test_covers_every_hot_function(self):
+        for name in ("schemas.validate_task_manifest", "schemas.validate_task_result",
+                     "planner.plan_campaign", "skill.fetch_trends", "skill.generate_content",
+                     "skill.publish_post", "skill.check_wallet_balance", "skill.validate_image",
+                     "telemetry.emit", "worker.run"):
+            assert name in BENCHMARKS
+
+    def test_measure_reports_per_call_statistics(self):
+        result = measure(lambda: sum(range(100)), samples=5, min_sample_time=0.001, warmup_time=0.0)
+
+        assert len(result["samples_us"]) == 5
+        assert result["loops"] >= 1
+        assert 0 < result["min_us"] <= result["median_us"]
+
+    def test_mann_whitney_detects_shift(self):
+        fast = [1.0 + i * 0.01 for i in range(15)]
+        slow = [3.0 + i * 0.01 for i in range(15)]
+
+        assert mann_whitney_p(fast, slow) < 0.001
+        assert mann_whitney_p(slow, fast) > 0.99
+        assert mann_whitney_p(fast, fast) > 0.3
+
+    def test_compare_gates_on_threshold_and_significance(self):
+        baseline = {"benchmarks": {"f": {"median_us": 1.0, "samples_us": [1.0 + i * 0.01 for i in range(15)]}}}
+        tripled = {"benchmarks": {"f": {"median_us": 3.0, "samples_us": [3.0 + i * 0.01 for i in range(15)]}}}
+        noisy = {"benchmarks": {"f": {"median_us": 1.2, "samples_us": [1.2 + i * 0.01 for i in range(15)]}}}
+
+        regressions = compare(tripled, baseline, threshold=0.5)
+        assert [r["name"] for r in regressions] == ["f"]
+        assert regressions[0]["ratio"] == pytest.approx(3.0)
+        assert compare(noisy, baseline, threshold=0.5) == []
+
+    def test_run_suite_subset(self):
+        report = run_suite(["telemetry.emit", "planner.plan_campaign"], samples=3, min_sample_time=0.001)
+
+        assert set(report["benchmarks"]) == {"telemetry.emit", "planner.plan_campaign"}
+        with pytest.raises(ValueError, match="Unknown benchmark"):
+            run_suite(["missing"])
+
+    def test_validate_image_restores_skill_pipeline(self):
+        from skills.skill_validate_image import skill
+
+        before = skill._pipeline
+        run_suite(["skill.validate_image"], samples=2, min_sample_time=0.001)
+
+        assert skill._pipeline is before
+
+    def test_missing_baseline_fails_the_gate(self, tmp_path, capsys):
+        code = main(["telemetry.emit", "--samples", "2", "--min-sample-time", "0.001",
+                     "--baseline", str(tmp_path / "missing.json")])
+
+        assert code != 0
+        assert "no baseline" in capsys.readouterr().err
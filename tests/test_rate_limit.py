@@ -0,0 +1,239 @@
+"""
+Adaptive Concurrency Controller Tests
+
+SRS Reference: §4.4 Action System (FR4.2), OpenClaw Integration
+Spec: specs/openclaw_integration.md, §3.7 Rate-Limit & Backoff Negotiation
+
+These tests validate AIMD permit changes, honoring of backoff, reset_at and
+hard limits, and a run against a local stub gateway that emits
+SOFT_RATE_LIMIT signals and 429s.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.ratelimit.controller import (
+    AdaptiveConcurrency, HardRateLimit, SOFT_RATE_LIMIT, signal_of, get_controller, set_controller
+)
+
+
+def _signal(usage=45, limit=50, backoff=0.0, reset_in=None):
+    signal = {"signal_type": SOFT_RATE_LIMIT, "current_usage": usage, "limit": limit,
+              "recommended_backoff_seconds": backoff}
+    if reset_in is not None:
+        signal["reset_at"] = time.time() + reset_in
+    return signal
+
+
+class StubGateway:
+    """
+    Fixed-window rate limiter in the style of the MCP Gateway: soft signal
+    from `soft_at` calls per window, 429 beyond `limit`.
+    """
+
+    def __init__(self, limit=20, window=0.1, soft_at=10, latency=0.002):
+        self.limit, self.window, self.soft_at, self.latency = limit, window, soft_at, latency
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._count = 0
+        self.served = 0
+        self.rejected = 0
+
+    def call(self, request):
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start, self._count = now, 0
+            self._count += 1
+            usage, reset_at = self._count, self._window_start + self.window
+            if usage > self.limit:
+                self.rejected += 1
+                raise HardRateLimit(retry_after=reset_at - now)
+            self.served += 1
+        time.sleep(self.latency)
+        response = {"ok": True, "request": request}
+        if usage >= self.soft_at:
+            response["rate_limit"] = {
+                "signal_type": SOFT_RATE_LIMIT, "current_usage": usage, "limit": self.limit,
+                "reset_at": reset_at, "recommended_backoff_seconds": 0
+            }
+        return response
+
+
+class TestAimd:
+    """Additive increase, multiplicative decrease"""
+
+    def test_successes_grow_permits(self):
+        controller = AdaptiveConcurrency(initial_permits=2)
+        for _ in range(20):
+            controller.call("api", lambda: {"ok": True})
+        assert controller.permits("api") > 2
+
+    def test_signal_decreases_once_per_round(self):
+        controller = AdaptiveConcurrency(initial_permits=8)
+        permits = [controller.acquire("api") for _ in range(4)]
+        for permit in permits:
+            permit.release(signal=_signal())
+        assert controller.permits("api") == 4
+        with controller.acquire("api") as permit:
+            permit.release(signal=_signal())
+        assert controller.permits("api") == 2
+
+    def test_unrelated_failures_leave_permits(self):
+        controller = AdaptiveConcurrency(initial_permits=4)
+        with pytest.raises(RuntimeError):
+            controller.call("api", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        assert controller.permits("api") == 4
+        assert controller.metrics()["api"]["in_flight"] == 0
+
+    def test_permit_limit_blocks(self):
+        controller = AdaptiveConcurrency(initial_permits=1)
+        permit = controller.acquire("api")
+        with pytest.raises(TimeoutError):
+            controller.acquire("api", timeout=0.02)
+        permit.release()
+        controller.acquire("api", timeout=0.02).release()
+
+    def test_permit_gauge_callback(self):
+        seen = []
+        controller = AdaptiveConcurrency(initial_permits=4, on_permits=lambda name, n: seen.append((name, n)))
+        controller.call("api", lambda: {"rate_limit": _signal()})
+        assert seen == [("api", 2)]
+
+
+class TestBackoff:
+    """Recommended backoff, reset_at and hard limits"""
+
+    def test_recommended_backoff_holds_calls(self):
+        controller = AdaptiveConcurrency(jitter=0.0)
+        controller.call("api", lambda: {"rate_limit": _signal(backoff=0.1)})
+        start = time.monotonic()
+        controller.call("api", lambda: {"ok": True})
+        assert time.monotonic() - start >= 0.09
+
+    def test_exhausted_quota_waits_for_reset(self):
+        controller = AdaptiveConcurrency(jitter=0.0)
+        controller.call("api", lambda: {"rate_limit": _signal(usage=50, limit=50, reset_in=0.15)})
+        assert controller.metrics()["api"]["held_for_seconds"] > 0.1
+        start = time.monotonic()
+        controller.call("api", lambda: {"ok": True})
+        assert time.monotonic() - start >= 0.1
+
+    def test_remaining_quota_is_paced_until_reset(self):
+        controller = AdaptiveConcurrency(initial_permits=8, jitter=0.0)
+        controller.call("api", lambda: {"rate_limit": _signal(usage=45, limit=50, reset_in=0.25)})
+        start = time.monotonic()
+        for _ in range(4):
+            controller.call("api", lambda: {"ok": True})
+        # Five calls left over 0.25s: about 0.05s apart
+        assert time.monotonic() - start >= 0.14
+        assert controller.metrics()["api"]["paced"]
+
+    def test_jitter_never_paces_past_reset(self):
+        controller = AdaptiveConcurrency(initial_permits=8, jitter=10.0, seed=0)
+        controller.call("api", lambda: {"rate_limit": _signal(usage=45, limit=50, reset_in=0.25)})
+        controller.call("api", lambda: {"ok": True})
+
+        ep = controller._endpoints["api"]
+        assert ep.next_start <= ep.pace_until
+
+    def test_hard_limit_drops_to_minimum(self):
+        controller = AdaptiveConcurrency(initial_permits=8, jitter=0.0)
+
+        def rejected():
+            raise HardRateLimit(retry_after=0.05)
+
+        with pytest.raises(HardRateLimit):
+            controller.call("api", rejected)
+        metrics = controller.metrics()["api"]
+        assert metrics["permits"] == 1
+        assert metrics["hard_limits"] == 1
+        assert metrics["held_for_seconds"] > 0
+
+    def test_signal_of(self):
+        assert signal_of({"rate_limit": _signal()})["limit"] == 50
+        assert signal_of({"ok": True}) is None
+        assert signal_of("text") is None
+
+
+class TestStubGateway:
+    """End to end against a gateway that emits §3.7 signals"""
+
+    def test_no_hard_limits_under_pressure(self):
+        gateway = StubGateway(limit=20, window=0.1, soft_at=10)
+        controller = AdaptiveConcurrency(initial_permits=4, seed=1)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: controller.call("gateway", gateway.call, i), range(120)))
+        assert len(results) == 120
+        assert gateway.rejected == 0
+        assert controller.metrics()["gateway"]["soft_signals"] > 0
+
+    def test_blind_retries_trip_hard_limits(self):
+        """Baseline: without the controller the same load hits 429s"""
+        gateway = StubGateway(limit=20, window=0.1, soft_at=10)
+
+        def blind(i):
+            while True:
+                try:
+                    return gateway.call(i)
+                except HardRateLimit:
+                    pass
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(blind, range(120)))
+        assert gateway.rejected > 0
+
+
+class TestSkillsUseSharedController:
+    """Outbound skills are admitted by the shared controller"""
+
+    def test_publish_post_goes_through_controller(self):
+        from skills.skill_publish_post.skill import execute_skill
+        controller = AdaptiveConcurrency()
+        set_controller(controller)
+        try:
+            execute_skill({"platform": "twitter", "content": "hi", "provenance": {}})
+            assert get_controller() is controller
+            assert controller.metrics()["publish_post:twitter"]["calls"] == 1
+        finally:
+            set_controller(None)
+
+    def test_wallet_reads_go_through_controller(self):
+        from skills.skill_check_wallet_balance.skill import execute_skill
+        controller = AdaptiveConcurrency()
+        set_controller(controller)
+        try:
+            execute_skill({"soul_id": "agent-a"})
+            assert controller.metrics()["check_wallet_balance:ledger"]["calls"] == 1
+        finally:
+            set_controller(None)
+
+    def test_image_download_429_is_a_hard_limit(self, monkeypatch):
+        import io
+        import urllib.error
+        import urllib.request
+        from skills.skill_validate_image.pipeline import DOWNLOAD_ENDPOINT, ImageValidationPipeline
+
+        def too_many(url, timeout):
+            raise urllib.error.HTTPError(url, 429, "Too Many Requests", {"Retry-After": "0"}, io.BytesIO())
+
+        monkeypatch.setattr(urllib.request, "urlopen", too_many)
+        controller = AdaptiveConcurrency()
+        set_controller(controller)
+        try:
+            result = ImageValidationPipeline(workers=0).validate("http://cdn.example/a.png", {})
+            assert result["violations"][0]["code"] == "IMAGE_UNREACHABLE"
+            assert controller.metrics()[DOWNLOAD_ENDPOINT]["hard_limits"] == 1
+        finally:
+            set_controller(None)
+
+    def test_endpoint_count_is_bounded(self):
+        controller = AdaptiveConcurrency(max_endpoints=2)
+        controller.call("a", lambda: None)
+        controller.call("b", lambda: None)
+
+        with pytest.raises(ValueError, match="Too many endpoints"):
+            controller.call("c", lambda: None)
+        controller.call("a", lambda: None)
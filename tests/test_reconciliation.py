@@ -0,0 +1,162 @@
+"""
+Reconciliation Engine Tests
+
+SRS Reference: §4.5 Commerce (FR5.1, FR5.2)
+Spec: notebook/analysis_eda.ipynb, §3 Joining the Datasets, §4 Discrepancy Detection
+
+These tests validate the vectorized join and lag classification against the
+notebook sample, the timezone and cut-off rules, and that the partitioned
+on-disk reconciliation matches the in-memory result.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from src.reconciliation.engine import (
+    ReconciliationRules, reconcile, reconcile_frames, read_chunks, partition_of, classify_lag
+)
+
+
+def _payments():
+    return pd.DataFrame({
+        "order_id": ["O5001", "O5002", "O5003", "O5004", "O5005", "O5006"],
+        "package_id": ["P1", "P2", "P3", "P4", "P5", "P6"],
+        "customer_id": ["C1", "C2", "C3", "C4", "C5", "C6"],
+        "payment_date": ["2026-01-02", "2026-01-03", "2026-01-04", "2026-01-05", "2026-01-06", "2026-01-07"],
+        "amount": [500, 700, 450, 600, 550, 300],
+        "currency": "ETB",
+        "payment_status": "PAID"
+    })
+
+
+def _deliveries():
+    return pd.DataFrame({
+        "order_id": ["O5001", "O5002", "O5003", "O5003", "O5004", "O5005", "O5007"],
+        "package_id": ["P1", "P2", "P3", "P3", "P4", "P5", "P7"],
+        "event_time": ["2026-01-02 07:00", "2026-01-03 08:30", "2026-01-04 09:00", "2026-01-05 09:00",
+                       "2026-01-05 06:00", "2026-01-15 07:00", "2026-01-07 10:00"],
+        "status": ["DELIVERED", "DELIVERED", "IN_TRANSIT", "DELIVERED", "DELIVERED", "DELIVERED", "DELIVERED"],
+        "city": ["Addis", "Adama", "Addis", "Addis", "BahirDar", "Adama", "Addis"]
+    })
+
+
+class TestReconcileFrames:
+
+    def test_notebook_sample(self):
+        frames = reconcile_frames(_payments(), _deliveries())
+        matched = frames["matched"].set_index("order_id")
+
+        assert list(matched.index) == ["O5001", "O5002", "O5003", "O5004", "O5005"]
+        assert matched["days_diff"].to_dict() == {"O5001": 0, "O5002": 0, "O5003": 1, "O5004": 0, "O5005": 9}
+        assert matched.loc["O5003", "lag_class"] == "LAG_1D"
+        assert matched.loc["O5005", "lag_class"] == "LAG_GT_7D"
+        assert list(frames["unmatched_payments"]["order_id"]) == ["O5006"]
+        assert list(frames["unmatched_deliveries"]["order_id"]) == ["O5007"]
+        assert "amount" not in frames["unmatched_deliveries"].columns
+
+    def test_timezone_moves_late_utc_event_to_next_day(self):
+        payments = _payments().iloc[:1]
+        deliveries = _deliveries().iloc[:1].assign(event_time="2026-01-02 22:30")
+
+        addis = reconcile_frames(payments, deliveries, ReconciliationRules(source_timezone="UTC"))["matched"]
+        utc = reconcile_frames(payments, deliveries, ReconciliationRules(timezone="UTC"))["matched"]
+
+        assert addis["days_diff"].tolist() == [1]
+        assert utc["days_diff"].tolist() == [0]
+
+    def test_naive_times_default_to_the_business_timezone(self):
+        payments = _payments().iloc[:1].assign(payment_date="2026-01-02 09:00")
+        deliveries = _deliveries().iloc[:1].assign(event_time="2026-01-02 22:20")
+
+        matched = reconcile_frames(payments, deliveries)["matched"]
+
+        assert ReconciliationRules(timezone="UTC").source_timezone == "UTC"
+        assert matched["lag_class"].tolist() == ["ON_TIME"]
+
+    def test_cutoff_and_tolerance(self):
+        payments = _payments().iloc[:1].assign(payment_date="2026-01-02 19:00")
+        deliveries = _deliveries().iloc[:1].assign(event_time="2026-01-03 05:00")
+
+        plain = reconcile_frames(payments, deliveries)["matched"]
+        cutoff = reconcile_frames(payments, deliveries, ReconciliationRules(payment_cutoff_hour=18))["matched"]
+        tolerant = reconcile_frames(payments, deliveries, ReconciliationRules(tolerance_days=1))["matched"]
+
+        assert plain["lag_class"].tolist() == ["LAG_1D"]
+        assert cutoff["days_diff"].tolist() == [0]
+        assert tolerant["lag_class"].tolist() == ["ON_TIME"]
+
+    def test_classify_lag(self):
+        labels = classify_lag(pd.Series([-2, 0, 1, 3, 7, 8]).to_numpy())
+
+        assert list(labels) == ["DELIVERED_BEFORE_PAYMENT", "ON_TIME", "LAG_1D", "LAG_2_3D", "LAG_4_7D", "LAG_GT_7D"]
+
+    def test_rejects_missing_keys_and_bad_rules(self):
+        with pytest.raises(ValueError, match="package_id"):
+            reconcile_frames(_payments().drop(columns=["package_id"]), _deliveries())
+        with pytest.raises(ValueError, match="Cut-off"):
+            ReconciliationRules(delivery_cutoff_hour=24)
+
+
+class TestPartitionedReconcile:
+
+    @pytest.fixture
+    def inputs(self, tmp_path):
+        payments, deliveries = str(tmp_path / "payments.csv"), str(tmp_path / "deliveries.csv")
+        _payments().to_csv(payments, index=False)
+        _deliveries().to_csv(deliveries, index=False)
+        return payments, deliveries
+
+    def test_partitions_keep_keys_together(self):
+        ids = partition_of(_deliveries(), 4)
+
+        assert ids[2] == ids[3]
+        assert partition_of(_payments(), 4)[2] == ids[2]
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_matches_in_memory_result(self, inputs, tmp_path, workers):
+        out = str(tmp_path / "reports")
+        summary = reconcile(*inputs, out, partitions=3, chunksize=2, workers=workers)
+
+        assert summary["payments"] == 6
+        assert summary["deliveries"] == 7
+        assert summary["matched"] == 5
+        assert summary["classes"]["LAG_1D"] == 1
+        assert summary["classes"]["LAG_GT_7D"] == 1
+        assert summary["amount_matched"] == 2800
+        assert summary["amount_unmatched"] == 300
+
+        lagged = pd.read_csv(summary["reports"]["lagged"])
+        assert sorted(lagged["order_id"]) == ["O5003", "O5005"]
+        assert pd.read_csv(summary["reports"]["unmatched_payments"])["order_id"].tolist() == ["O5006"]
+        assert pd.read_csv(summary["reports"]["unmatched_deliveries"])["order_id"].tolist() == ["O5007"]
+        assert sorted(os.listdir(out)) == ["lagged.csv", "unmatched_deliveries.csv", "unmatched_payments.csv"]
+
+    def test_report_columns_do_not_depend_on_partition_contents(self, tmp_path):
+        payments, deliveries = str(tmp_path / "payments.csv"), str(tmp_path / "deliveries.csv")
+        _payments().rename(columns={"payment_status": "status"}).to_csv(payments, index=False)
+        _deliveries().to_csv(deliveries, index=False)
+
+        summary = reconcile(payments, deliveries, str(tmp_path / "reports"), partitions=16, workers=0)
+
+        unmatched = pd.read_csv(summary["reports"]["unmatched_deliveries"])
+        assert list(unmatched.columns) == ["order_id", "package_id", "event_time", "status_del", "city",
+                                           "delivery_business_date"]
+        assert unmatched["status_del"].tolist() == ["DELIVERED"]
+        lagged = pd.read_csv(summary["reports"]["lagged"])
+        assert {"status_pay", "status_del"} <= set(lagged.columns)
+        assert lagged["status_pay"].tolist() == ["PAID", "PAID"]
+
+    def test_read_chunks(self, inputs):
+        chunks = list(read_chunks(inputs[1], chunksize=3))
+
+        assert [len(c) for c in chunks] == [3, 3, 1]
+        with pytest.raises(ValueError, match="Unsupported"):
+            list(read_chunks("payments.json"))
+
+    def test_excel_input(self, tmp_path):
+        pytest.importorskip("openpyxl")
+        path = str(tmp_path / "payments.xlsx")
+        _payments().to_excel(path, index=False)
+
+        assert sum(len(c) for c in read_chunks(path, chunksize=4)) == 6
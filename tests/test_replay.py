@@ -0,0 +1,171 @@
+"""
+Campaign Recording and Replay Tests
+
+SRS Reference: NFR 3.0 (Performance & Observability)
+Spec: specs/planner_service.md, Pattern A (Trend-Jacked Content)
+
+These tests validate the binary recording log, replay at full and recorded
+pacing, served and compared outputs with the recorded IDs and timestamps,
+and the profiling hooks.
+"""
+
+import pstats
+import time
+
+import pytest
+from benchmarks.campaign_simulation import CampaignSimulation, generate_manifests
+from src.ids import clock
+from src.ids.clock import DEFAULT_EPOCH_MS, timestamp_ms
+from src.planner.engine import CampaignPlanner
+from src.replay.log import LogWriter, read_log, PLAN, SKILL
+from src.replay.recorder import Recorder, Replayer, RecordedError
+from skills.skill_fetch_trends.skill import execute_skill as fetch_trends
+
+
+def _slow_publish(input_data):
+    time.sleep(0.05)
+    return {"status": "SUCCESS"}
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = str(tmp_path / "run.chrec")
+    with Recorder(path, meta={"source": "test"}) as rec:
+        rec.plan(CampaignPlanner(), generate_manifests(1)[0])
+        rec.call("fetch_trends", fetch_trends, {"platform": "twitter", "limit": 3})
+        rec.call("publish_post", _slow_publish, {"platform": "twitter"})
+        with pytest.raises(ValueError):
+            rec.call("fetch_trends", fetch_trends, {"platform": "myspace"})
+    return path
+
+
+class TestRecordingLog:
+
+    def test_round_trip(self, recording):
+        records = list(read_log(recording))
+
+        assert [r[0] for r in records] == [1, PLAN, SKILL, SKILL, SKILL]
+        assert records[0][2]["version"] == 2
+        assert records[0][2]["source"] == "test"
+        assert records[0][2]["clock_start_ms"] > DEFAULT_EPOCH_MS
+        assert records[2][2]["input"] == {"platform": "twitter", "limit": 3}
+        assert records[3][2]["duration"] >= 0.05
+        assert records[4][2]["error"]["type"] == "ValueError"
+        assert [r[1] for r in records] == sorted(r[1] for r in records)
+
+    def test_reads_up_to_last_flush_of_unclosed_log(self, tmp_path):
+        path = str(tmp_path / "partial.chrec")
+        writer = LogWriter(path)
+        for i in range(3):
+            writer.write(SKILL, {"i": i})
+        writer.flush()
+        writer.write(SKILL, {"i": 3})
+
+        assert [p["i"] for _, _, p in read_log(path)] == [0, 1, 2]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a log")
+        with pytest.raises(ValueError, match="Not a campaign recording"):
+            list(read_log(str(path)))
+
+
+class TestReplayer:
+
+    def test_full_speed_replay(self, recording):
+        summary = Replayer(recording, external={"publish_post"}).run()
+
+        assert summary["calls"] == 4
+        assert summary["divergent"] == 0
+        assert summary["stages"]["skill.fetch_trends"]["calls"] == 2
+        assert summary["stages"]["skill.publish_post"]["replayed_s"] < 0.01
+        assert summary["meta"]["source"] == "test"
+
+    def test_recorded_pacing(self, recording):
+        summary = Replayer(recording, external={"publish_post"}, pacing="recorded").run()
+
+        assert summary["stages"]["skill.publish_post"]["replayed_s"] >= 0.05
+        assert summary["elapsed_s"] >= 0.05
+
+    def test_detects_divergence(self, recording):
+        def strict_fetch(input_data):
+            raise ValueError("new validation rule")
+
+        summary = Replayer(recording, external={"publish_post"}, skills={"fetch_trends": strict_fetch}).run()
+
+        assert summary["divergent"] == 1
+
+    def test_detects_output_divergence(self, recording):
+        def changed_fetch(input_data):
+            output = fetch_trends(input_data)
+            output["trends"] = output["trends"][:1]
+            return output
+
+        summary = Replayer(recording, external={"publish_post"}, skills={"fetch_trends": changed_fetch}).run()
+
+        assert summary["divergent"] == 1
+
+    def test_replay_restores_clock_and_reproduces_timestamps(self, recording):
+        live = clock.get_clock()
+        recorded = [p for t, _, p in read_log(recording)
+                    if t == SKILL and p["skill"] == "fetch_trends" and "output" in p]
+
+        assert recorded[0]["output"]["trends"][0]["retrieved_at"] in recorded[0]["clock"]["times"]
+        assert Replayer(recording, external={"publish_post"}).run()["divergent"] == 0
+        assert clock.get_clock() is live
+
+    def test_recording_keeps_the_live_clock(self, tmp_path):
+        live = clock.get_clock()
+        task_ids = []
+        for name in ("a.chrec", "b.chrec"):
+            with Recorder(str(tmp_path / name)) as rec:
+                before = time.time() * 1000
+                tasks = rec.plan(CampaignPlanner(), generate_manifests(1)[0])
+            task_ids.append([t["task_id"] for t in tasks])
+
+            assert timestamp_ms(tasks[0]["task_id"]) >= before - 1
+            assert clock.get_clock() is live
+
+        assert not set(task_ids[0]) & set(task_ids[1])
+
+    def test_replayed_plan_reuses_recorded_ids(self, recording):
+        recorded = next(p for t, _, p in read_log(recording) if t == PLAN)
+        replayed = []
+        replayer = Replayer(recording, external={"publish_post"})
+        replayer.planner.plan_campaign = lambda manifest: replayed.append(
+            CampaignPlanner().plan_campaign(manifest)) or replayed[-1]
+
+        assert replayer.run()["divergent"] == 0
+        assert [t["task_id"] for t in replayed[0]] == [t["task_id"] for t in recorded["tasks"]]
+        assert replayed[0][0]["created_at"] == recorded["tasks"][0]["created_at"]
+
+    def test_serves_recorded_outputs(self, recording):
+        replayer = Replayer(recording, skills={"fetch_trends": lambda _: pytest.fail("served skill was executed")})
+        skills = [p for t, _, p in replayer.records() if t == SKILL]
+
+        assert "fetch_trends" in replayer.external and "validate_image" in replayer.external
+        assert replayer.serve(skills[0]) == skills[0]["output"]
+        with pytest.raises(RecordedError, match="ValueError"):
+            replayer.serve(skills[2])
+        assert replayer.run()["divergent"] == 0
+
+    def test_profiling_hooks(self, recording, tmp_path):
+        calls = []
+        profile = str(tmp_path / "replay.prof")
+
+        Replayer(recording, external={"publish_post"}).run(
+            profile=profile, hooks=(lambda: calls.append("start"), lambda: calls.append("stop")))
+
+        assert calls == ["start", "stop"]
+        stats = pstats.Stats(profile)
+        assert any(func[2] == "plan_campaign" for func in stats.stats)
+
+    def test_records_campaign_simulation(self, tmp_path):
+        path = str(tmp_path / "sim.chrec")
+        with Recorder(path) as rec, CampaignSimulation(recorder=rec) as sim:
+            sim.run(generate_manifests(3), concurrency=2)
+
+        summary = Replayer(path, concurrency=2).run()
+        assert summary["stages"]["planner.plan_campaign"]["calls"] == 3
+        assert summary["stages"]["skill.publish_post"]["calls"] == 3
+        assert summary["divergent"] == 0
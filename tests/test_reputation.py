@@ -0,0 +1,139 @@
+"""
+OpenClaw Reputation Aggregator Tests
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §3.6 Reputation & Feedback Mesh
+
+These tests check the running aggregates against a full-history
+recomputation of the §3.6 decay, and check the top-k ranking and the
+throttling decisions.
+"""
+
+import math
+import random
+import pytest
+from src.openclaw.reputation import ReputationAggregator, ALLOW, PROBATION, THROTTLE, SECONDS_PER_DAY
+
+DECAY = 0.05
+START = 1_767_225_600.0  # 2026-01-01T00:00:00Z
+
+
+def _feedback(to_soul_id, rating, day, from_soul_id="external:agent:xyz"):
+    return {
+        "feedback_id": f"{to_soul_id}:{day}",
+        "from_soul_id": from_soul_id,
+        "to_soul_id": to_soul_id,
+        "campaign_id": "campaign-1",
+        "rating": rating,
+        "timestamp": START + day * SECONDS_PER_DAY,
+        "signature": "ed25519_signature"
+    }
+
+
+def _history(seed=0, agents=50, messages=1000):
+    rng = random.Random(seed)
+    return [_feedback(f"chimera:agent:{rng.randrange(agents)}", rng.randint(1, 5), rng.uniform(0, 90))
+            for _ in range(messages)]
+
+
+def _recompute(history, soul_id, now_day):
+    """Reference: replay the whole history for one agent."""
+    days = [(f["timestamp"] - START) / SECONDS_PER_DAY for f in history if f["to_soul_id"] == soul_id]
+    ratings = [f["rating"] for f in history if f["to_soul_id"] == soul_id]
+    last = max(days)
+    weights = [math.exp(-DECAY * (last - d)) for d in days]
+    base = sum(w * r for w, r in zip(weights, ratings)) / sum(weights)
+    return base * math.exp(-DECAY * (now_day - last))
+
+
+class TestAggregation:
+    """Aggregates match the full-history computation"""
+
+    def test_scores_match_recomputation(self):
+        history = _history()
+        rep = ReputationAggregator(decay_rate=DECAY)
+        rep.ingest_batch(history)
+        now_day = 120
+        for soul_id in {f["to_soul_id"] for f in history}:
+            assert rep.score(soul_id, now=START + now_day * SECONDS_PER_DAY) == \
+                pytest.approx(_recompute(history, soul_id, now_day))
+
+    def test_ingest_order_does_not_matter(self):
+        history = _history(seed=1)
+        in_order = ReputationAggregator(decay_rate=DECAY)
+        in_order.ingest_batch(sorted(history, key=lambda f: f["timestamp"]))
+        shuffled = ReputationAggregator(decay_rate=DECAY)
+        for item in random.Random(2).sample(history, len(history)):
+            shuffled.ingest(item)
+        now = START + 100 * SECONDS_PER_DAY
+        for soul_id in {f["to_soul_id"] for f in history}:
+            assert shuffled.score(soul_id, now) == pytest.approx(in_order.score(soul_id, now))
+
+    def test_iso_timestamps(self):
+        rep = ReputationAggregator(decay_rate=DECAY)
+        rep.ingest({"to_soul_id": "chimera:agent:a", "rating": 4, "timestamp": "2026-01-01T00:00:00Z"})
+        assert rep.score("chimera:agent:a", now=START + 10 * SECONDS_PER_DAY) == pytest.approx(4 * math.exp(-0.5))
+        assert rep.score("chimera:agent:unknown") is None
+
+    def test_invalid_batch_is_not_applied(self):
+        rep = ReputationAggregator()
+        batch = [_feedback("chimera:agent:a", 5, 0), _feedback("chimera:agent:b", 9, 0)]
+        with pytest.raises(ValueError):
+            rep.ingest_batch(batch)
+        assert len(rep) == 0
+
+    @pytest.mark.parametrize("feedback", [
+        {"rating": 4, "timestamp": START},
+        {"to_soul_id": "chimera:agent:a", "from_soul_id": "chimera:agent:a", "rating": 4, "timestamp": START},
+        {"to_soul_id": "chimera:agent:a", "rating": "5", "timestamp": START},
+        {"to_soul_id": "chimera:agent:a", "rating": 4},
+    ])
+    def test_rejects_invalid_feedback(self, feedback):
+        with pytest.raises(ValueError):
+            ReputationAggregator().ingest(feedback)
+
+
+class TestRankingAndThrottling:
+    """Top-k and throttling read the heaps instead of scanning"""
+
+    def _loaded(self):
+        history = _history(seed=3, agents=200, messages=3000)
+        rep = ReputationAggregator(decay_rate=DECAY, throttle_below=2.8)
+        # Several batches, so the heaps carry stale entries
+        for i in range(0, len(history), 250):
+            rep.ingest_batch(history[i:i + 250])
+        return rep, {f["to_soul_id"] for f in history}
+
+    def test_top_k_matches_sorted_scores(self):
+        rep, souls = self._loaded()
+        now = START + 95 * SECONDS_PER_DAY
+        expected = sorted(souls, key=lambda s: rep.score(s, now), reverse=True)[:10]
+        top = rep.top_k(10, now=now)
+        assert [entry["soul_id"] for entry in top] == expected
+        assert top[0]["score"] >= top[-1]["score"]
+
+    def test_throttle_decisions_match_scan(self):
+        rep, souls = self._loaded()
+        now = START + 95 * SECONDS_PER_DAY
+        expected = {s for s in souls if rep.score(s, now) < 2.8}
+        decisions = rep.throttle_decisions(now=now)
+        assert expected
+        assert {d["soul_id"] for d in decisions} == expected
+        assert all(d["action"] == THROTTLE for d in decisions)
+        assert [d["score"] for d in decisions] == sorted(d["score"] for d in decisions)
+
+    def test_inactivity_leads_to_throttling(self):
+        rep = ReputationAggregator(decay_rate=DECAY, throttle_below=2.5)
+        rep.ingest_batch([_feedback("chimera:agent:a", 5, day) for day in range(3)])
+        assert rep.decision("chimera:agent:a", now=START + 3 * SECONDS_PER_DAY)["action"] == ALLOW
+        assert rep.throttle_decisions(now=START + 3 * SECONDS_PER_DAY) == []
+        # 5 * exp(-0.05 * days) drops below 2.5 about 14 days after the last campaign
+        later = START + 22 * SECONDS_PER_DAY
+        assert rep.decision("chimera:agent:a", now=later)["action"] == THROTTLE
+        assert [d["soul_id"] for d in rep.throttle_decisions(now=later)] == ["chimera:agent:a"]
+
+    def test_new_agents_are_on_probation(self):
+        rep = ReputationAggregator(probation_feedback=3)
+        rep.ingest(_feedback("chimera:agent:a", 5, 0))
+        assert rep.decision("chimera:agent:a", now=START)["action"] == PROBATION
+        assert rep.decision("chimera:agent:unknown", now=START)["action"] == PROBATION
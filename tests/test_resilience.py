@@ -0,0 +1,217 @@
+"""
+Circuit Breaker and Bulkhead Tests
+
+SRS Reference: §4.4 Action System (FR4.2), NFR 3.0
+Spec: specs/technical.md, MCP Capability Definition (capability_id)
+
+These tests validate breaker transitions on error and slow-call rates,
+half-open probing, bulkhead isolation between capabilities, telemetry
+export and the outbound skills' use of the shared registry.
+"""
+
+import threading
+import time
+
+import pytest
+from src.ratelimit.controller import HardRateLimit
+from src.resilience.breaker import (
+    Resilience, CircuitBreaker, CircuitOpen, BulkheadFull, CLOSED, OPEN, HALF_OPEN,
+    get_resilience, set_resilience
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise ConnectionError("503 Service Unavailable")
+
+
+class TestCircuitBreaker:
+
+    def test_opens_on_error_rate_and_fails_fast(self):
+        clock = FakeClock()
+        res = Resilience(clock=clock, min_calls=10, error_rate=0.5)
+        for _ in range(5):
+            res.call("publish_post:tiktok", lambda: "ok")
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                res.call("publish_post:tiktok", _fail)
+        assert res.state("publish_post:tiktok") == CLOSED
+
+        with pytest.raises(ConnectionError):
+            res.call("publish_post:tiktok", _fail)
+        assert res.state("publish_post:tiktok") == OPEN
+
+        called = []
+        with pytest.raises(CircuitOpen):
+            res.call("publish_post:tiktok", called.append, 1)
+        assert called == []
+        assert res.metrics()["publish_post:tiktok"]["rejected"] == 1
+
+    def test_opens_on_slow_calls(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("fetch_trends:reddit", min_calls=5, slow_call_seconds=2.0, slow_rate=0.8,
+                                 clock=clock)
+        for _ in range(5):
+            breaker.record(success=True, seconds=3.0)
+
+        assert breaker.state == OPEN
+
+    def test_old_errors_leave_the_window(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("api", window_seconds=10, min_calls=4, error_rate=0.5, clock=clock)
+        for _ in range(3):
+            breaker.record(success=False, seconds=0.1)
+        clock.now = 11.0
+        breaker.record(success=False, seconds=0.1)
+        for _ in range(3):
+            breaker.record(success=True, seconds=0.1)
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 4
+
+    def test_half_open_probes_close_or_reopen(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker("api", min_calls=2, open_seconds=5, half_open_calls=2, clock=clock)
+        breaker.record(False, 0.1)
+        breaker.record(False, 0.1)
+        assert breaker.state == OPEN
+
+        clock.now = 5.0
+        assert breaker.allow() is True
+        assert breaker.state == HALF_OPEN
+        breaker.record(False, 0.1, probe=True)
+        assert breaker.state == OPEN
+
+        clock.now = 10.0
+        probes = [breaker.allow(), breaker.allow()]
+        with pytest.raises(CircuitOpen):
+            breaker.allow()
+        for probe in probes:
+            breaker.record(True, 0.1, probe=probe)
+        assert breaker.state == CLOSED
+        assert breaker.allow() is False
+
+    def test_ignored_errors_do_not_count(self):
+        res = Resilience(min_calls=2)
+
+        def bad_input():
+            raise ValueError("Invalid input")
+
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                res.call("api", bad_input)
+        assert res.state("api") == CLOSED
+        assert res.metrics()["api"]["error_rate"] == 0.0
+
+    def test_ignored_error_does_not_close_half_open_breaker(self):
+        clock = FakeClock()
+        res = Resilience(clock=clock, min_calls=2, open_seconds=5, half_open_calls=1)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                res.call("api", _fail)
+        clock.now = 5.0
+
+        def throttled():
+            raise HardRateLimit(retry_after=1.0)
+
+        for bad_call, error in ((throttled, HardRateLimit), (lambda: int("x"), ValueError)):
+            with pytest.raises(error):
+                res.call("api", bad_call)
+            assert res.state("api") == HALF_OPEN
+        res.call("api", lambda: "ok")
+        assert res.state("api") == CLOSED
+
+    def test_state_changes_are_reported(self):
+        changes = []
+        res = Resilience(on_state=lambda *change: changes.append(change), min_calls=2)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                res.call("api", _fail)
+
+        assert changes[0][:3] == ("api", CLOSED, OPEN)
+        assert changes[0][3]["error_rate"] == 1.0
+
+
+class TestBulkhead:
+
+    def test_slow_capability_does_not_block_others(self):
+        res = Resilience(max_concurrent=2, max_wait=0.05)
+        release = threading.Event()
+        threads = [threading.Thread(target=res.call, args=("publish_post:tiktok", release.wait))
+                   for _ in range(2)]
+        for t in threads:
+            t.start()
+        while res.metrics().get("publish_post:tiktok", {}).get("in_flight") != 2:
+            time.sleep(0.001)
+
+        with pytest.raises(BulkheadFull):
+            res.call("publish_post:tiktok", lambda: "ok")
+        assert res.call("fetch_trends:twitter", lambda: "ok") == "ok"
+
+        release.set()
+        for t in threads:
+            t.join()
+        assert res.metrics()["publish_post:tiktok"]["bulkhead_rejected"] == 1
+        assert res.metrics()["publish_post:tiktok"]["in_flight"] == 0
+
+    def test_configure_per_capability(self):
+        res = Resilience()
+        res.configure("publish_post:tiktok", max_concurrent=4)
+
+        res.call("publish_post:tiktok", lambda: None)
+        assert res.metrics()["publish_post:tiktok"]["max_concurrent"] == 4
+        with pytest.raises(ValueError, match="Unknown settings"):
+            res.configure("api", max_threads=4)
+
+
+class TestSharedRegistry:
+
+    def test_skills_call_through_shared_registry(self):
+        from task1 import telemetry
+        from skills.skill_fetch_trends.skill import execute_skill
+
+        set_resilience(None)
+        try:
+            execute_skill({"platform": "reddit", "limit": 1})
+            assert get_resilience().metrics()["fetch_trends:reddit"]["calls"] == 1
+
+            telemetry.clear()
+            breaker = get_resilience()._guard("fetch_trends:reddit")[0]
+            for _ in range(20):
+                breaker.record(False, 0.1)
+            with pytest.raises(CircuitOpen):
+                execute_skill({"platform": "reddit", "limit": 1})
+            assert telemetry.last()["name"] == "resilience.state"
+            assert telemetry.last()["payload"]["to"] == OPEN
+        finally:
+            set_resilience(None)
+            telemetry.clear()
+
+    def test_rate_limit_waits_are_not_timed_by_the_breaker(self):
+        from src.ratelimit.controller import AdaptiveConcurrency, set_controller
+        from skills.skill_publish_post.skill import execute_skill
+
+        clock = FakeClock()
+        set_resilience(Resilience(clock=clock))
+        controller = AdaptiveConcurrency()
+        acquire = controller.acquire
+
+        def slow_acquire(endpoint):
+            clock.now += 60.0
+            return acquire(endpoint)
+
+        controller.acquire = slow_acquire
+        set_controller(controller)
+        try:
+            execute_skill({"platform": "tiktok", "content": "hi", "provenance": {}})
+            assert get_resilience().metrics()["publish_post:tiktok"]["slow_rate"] == 0.0
+        finally:
+            set_controller(None)
+            set_resilience(None)
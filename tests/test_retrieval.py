@@ -0,0 +1,116 @@
+"""
+Context Retrieval Tests
+
+SRS Reference: §4.3 Creative Engine (FR3.1)
+Spec: specs/technical.md, Weaviate Collections
+
+These tests validate the local vector index and batched context retrieval
+feeding generate_content's context_ids.
+"""
+
+import numpy as np
+import pytest
+from src.retrieval.vector_index import VectorIndex, HashingEmbedder
+from src.retrieval.context import ContextRetriever
+
+
+class TestVectorIndex:
+
+    @pytest.fixture
+    def index(self):
+        rng = np.random.default_rng(1)
+        index = VectorIndex(dim=16)
+        index.add([f"v{i}" for i in range(200)], rng.normal(size=(200, 16)),
+                  groups=["a" if i % 2 else "b" for i in range(200)])
+        return index
+
+    def test_exact_match_ranks_first(self, index):
+        queries = np.stack([index.vector("v7"), index.vector("v42")])
+        results = index.search(queries, k=3)
+
+        assert results[0][0][0] == "v7"
+        assert results[1][0][0] == "v42"
+        assert results[0][0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(results[0]) == 3
+
+    def test_group_filter(self, index):
+        results = index.search(np.stack([index.vector("v7")] * 2), k=5, groups=["a", "b"])
+
+        assert all(int(id_[1:]) % 2 == 1 for id_, _ in results[0])
+        assert all(int(id_[1:]) % 2 == 0 for id_, _ in results[1])
+        assert index.search(index.vector("v7"), k=5, groups=["missing"]) == [[]]
+
+    def test_ivf_matches_brute_force_for_self_queries(self, index):
+        queries = np.stack([index.vector(f"v{i}") for i in range(0, 200, 20)])
+        index.build_ivf(nlist=8, nprobe=2)
+
+        results = index.search(queries, k=1)
+
+        assert [r[0][0] for r in results] == [f"v{i}" for i in range(0, 200, 20)]
+
+    def test_rejects_duplicate_ids(self, index):
+        with pytest.raises(ValueError, match="Duplicate"):
+            index.add(["v1"], np.ones((1, 16)))
+
+    def test_duplicate_within_batch_leaves_index_unchanged(self, index):
+        with pytest.raises(ValueError, match="Duplicate"):
+            index.add(["new-1", "new-2", "new-1"], np.ones((3, 16)))
+
+        assert len(index) == 200
+        index.add(["new-1"], np.ones((1, 16)))
+        assert index.search(index.vector("new-1"), k=1)[0][0][0] == "new-1"
+
+    def test_hashing_embedder_is_deterministic(self):
+        embed = HashingEmbedder(dim=32)
+        a, b = embed(["summer fashion", "summer fashion"])
+
+        assert np.allclose(a, b)
+        assert np.linalg.norm(a) == pytest.approx(1.0)
+
+
+class TestContextRetriever:
+
+    @pytest.fixture
+    def retriever(self):
+        retriever = ContextRetriever(dim=128)
+        retriever.add_personas([
+            {"soul_id": "agent-a", "voice_tone": "eco conscious", "content_themes": ["sustainability"]}
+        ])
+        retriever.add_campaign_context([
+            {"context_id": "ctx-beach", "campaign_id": "c1", "campaign_description": "beach summer swimwear"},
+            {"context_id": "ctx-recycle", "campaign_id": "c1", "campaign_description": "recycled sustainability fabrics"},
+            {"context_id": "ctx-other", "campaign_id": "c2", "campaign_description": "beach summer swimwear"}
+        ])
+        return retriever
+
+    def test_retrieve_batch_stays_within_campaign(self, retriever):
+        tasks = [
+            {"task_id": "t1", "campaign_id": "c1", "payload": {"prompt": "summer beach swimwear post"}},
+            {"task_id": "t2", "campaign_id": "c2", "payload": {"prompt": "summer beach swimwear post"}}
+        ]
+
+        result = retriever.retrieve_batch(tasks, "agent-a", k=1)
+
+        assert result == {"t1": ["ctx-beach"], "t2": ["ctx-other"]}
+
+    def test_persona_embedding_is_cached(self, retriever):
+        first = retriever.persona_embedding("agent-a")
+
+        assert retriever.persona_embedding("agent-a") is first
+        assert retriever.persona_embedding("unknown") is None
+
+    def test_enrich_tasks_appends_context_ids(self, retriever):
+        task = {"task_id": "t1", "campaign_id": "c1",
+                "payload": {"prompt": "sustainability fabrics", "context_ids": ["fetch-task"]}}
+
+        retriever.enrich_tasks([task], ["agent-a"], k=2)
+
+        assert task["payload"]["context_ids"][0] == "fetch-task"
+        assert task["payload"]["context_ids"][1] == "ctx-recycle"
+        assert len(task["payload"]["context_ids"]) == 3
+
+    def test_empty_loads_are_no_ops(self, retriever):
+        retriever.add_personas([])
+        retriever.add_campaign_context([])
+
+        assert len(retriever.context_index) == 3
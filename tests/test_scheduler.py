@@ -0,0 +1,134 @@
+"""
+Fair Scheduler Tests
+
+SRS Reference: §4.6 Orchestration (FR6.2)
+Spec: specs/technical.md, Agent Task Schema (campaign_id, priority, timeout_seconds)
+
+These tests validate weighted fair sharing across campaigns, priority aging,
+deadline rescue, requeue order and the skewed-load simulator.
+"""
+
+import pytest
+from benchmarks.scheduler_simulation import generate_arrivals, simulate
+from src.orchestrator.lifecycle import LeaseManager, LeaseStore
+from src.orchestrator.scheduler import FairLeaseStore, FairQueue
+
+
+def _drain(queue, now=0.0):
+    order = []
+    while len(queue):
+        order.append(queue.pop(now)[0])
+    return order
+
+
+class TestFairQueue:
+
+    def test_large_campaign_does_not_monopolize(self):
+        queue = FairQueue()
+        for i in range(100):
+            queue.push(f"big-{i}", "campaign-big", "HIGH")
+        for i in range(5):
+            queue.push(f"small-{i}", "campaign-small", "HIGH")
+
+        first = _drain(queue)[:10]
+        assert sum(task_id.startswith("small") for task_id in first) == 5
+
+    def test_weights_set_the_share(self):
+        queue = FairQueue()
+        queue.set_weight("campaign-a", 3)
+        for i in range(40):
+            queue.push(f"a-{i}", "campaign-a")
+            queue.push(f"b-{i}", "campaign-b")
+
+        first = _drain(queue)[:20]
+        assert sum(task_id.startswith("a") for task_id in first) == 15
+
+    def test_high_priority_campaign_gets_more_but_low_is_not_starved(self):
+        queue = FairQueue()
+        for i in range(100):
+            queue.push(f"high-{i}", "campaign-high", "HIGH")
+            queue.push(f"low-{i}", "campaign-low", "LOW")
+
+        first = _drain(queue)[:50]
+        assert sum(task_id.startswith("low") for task_id in first) == 10
+
+    def test_low_task_ages_past_fresh_high_work(self):
+        queue = FairQueue(aging_seconds=10)
+        queue.push("old-low", "campaign-1", "LOW", arrival=0)
+        queue.push("fresh-high", "campaign-1", "HIGH", arrival=15)
+        queue.push("late-high", "campaign-1", "HIGH", arrival=25)
+
+        assert _drain(queue, now=25) == ["fresh-high", "old-low", "late-high"]
+
+    def test_near_deadline_task_jumps_the_fair_order(self):
+        queue = FairQueue(urgent_seconds=5)
+        for i in range(10):
+            queue.push(f"task-{i}", "campaign-a", arrival=0)
+        queue.push("due", "campaign-b", "LOW", arrival=0, timeout_seconds=30)
+
+        assert queue.pop(now=0)[0] == "task-0"
+        assert queue.pop(now=26)[0] == "due"
+        assert _drain(queue, now=26) == [f"task-{i}" for i in range(1, 10)]
+
+    def test_requeue_restores_position(self):
+        store = FairLeaseStore(clock=lambda: 0.0)
+        for i in range(3):
+            store.enqueue(f"task-{i}", campaign_id="campaign-1", timeout_seconds=60)
+        claimed = store.claim("agent-a", now=1, lease_ttl=300)
+
+        assert store.requeue([claimed]) == ["task-0"]
+        assert [store.claim("agent-a", now=2, lease_ttl=300) for _ in range(3)] == ["task-0", "task-1", "task-2"]
+
+    def test_idle_campaigns_are_forgotten(self):
+        queue = FairQueue()
+        for i in range(100):
+            queue.push(f"long-{i}", "campaign-long")
+        for i in range(50):
+            queue.push(f"task-{i}", f"campaign-{i}")
+        for _ in range(120):
+            queue.pop(0)
+
+        assert len(queue._campaigns) == 1
+        _drain(queue)
+        assert queue._campaigns == {}
+
+    def test_rejects_unknown_priority_and_duplicates(self):
+        queue = FairQueue()
+        queue.push("task-1", "campaign-1")
+
+        with pytest.raises(ValueError, match="priority"):
+            queue.push("task-2", "campaign-1", "URGENT")
+        with pytest.raises(ValueError, match="already queued"):
+            queue.push("task-1", "campaign-1")
+
+
+class TestFairLeaseStore:
+
+    def test_lease_manager_claims_and_reaps(self):
+        store = FairLeaseStore(clock=lambda: 0.0)
+        for i in range(4):
+            store.enqueue_task({"task_id": f"a-{i}", "campaign_id": "campaign-a", "priority": "HIGH",
+                                "timeout_seconds": 600})
+        store.enqueue_task({"task_id": "b-0", "campaign_id": "campaign-b", "priority": "LOW",
+                            "timeout_seconds": 600})
+        manager = LeaseManager(store, lease_ttl=30, heartbeat_ttl=60, heartbeat_interval=10, clock=lambda: 0.0)
+
+        claimed = [manager.claim("agent-a", now=0) for _ in range(2)]
+        assert claimed == ["a-0", "b-0"]
+        assert store.queue_length() == 3
+        assert store.queue_length("LOW") == 0
+
+        assert sorted(manager.reap(now=100)["requeued"]) == ["a-0", "b-0"]
+        assert store.queue_length() == 5
+
+
+class TestSimulation:
+
+    def test_fair_policy_bounds_small_campaign_waits(self):
+        arrivals = generate_arrivals(workers=4, duration=600, small_campaigns=3, seed=1)
+        strict = simulate(LeaseStore(), arrivals, workers=4, seed=1)
+        fair = simulate(FairLeaseStore(), arrivals, workers=4, seed=1)
+
+        for campaign_id in ("campaign-small-0", "campaign-small-1", "campaign-small-2"):
+            assert fair[campaign_id]["p99_wait_s"] < strict[campaign_id]["p99_wait_s"] / 10
+            assert fair[campaign_id]["queued"] == 0
@@ -0,0 +1,137 @@
+"""
+Signing Service Tests
+
+SRS Reference: §4.5 Commerce, OpenClaw Integration
+Spec: specs/openclaw_integration.md, §3.4 Provenance, §3.5 Receipts, §3.6 Feedback
+
+These tests validate canonical serialization, ed25519 sign/verify round
+trips, batch processing (inline and in a process pool), the public key
+cache and the verified-signature cache.
+"""
+
+import pytest
+from src.crypto.signing import (
+    SigningService, KeyRing, Canonical, canonical_json, generate_key, public_key_b64
+)
+
+SOUL = "chimera:agent:1"
+
+
+def _envelope(i=0):
+    return {
+        "soul_id": SOUL,
+        "confidence": 0.87,
+        "human_override_flag": False,
+        "receipt_id": f"receipt-{i}",
+        "trace_id": f"trace_abc123:evt{i}",
+        "model_metadata": {"model_name": "gpt-4-turbo", "prompt_hash": "sha256_hash"},
+        "created_at": "2026-02-06T16:45:00Z"
+    }
+
+
+@pytest.fixture
+def service():
+    key = generate_key()
+    keyring = KeyRing()
+    keyring.add(SOUL, public_key_b64(key))
+    with SigningService(private_key=key, keyring=keyring) as svc:
+        yield svc
+
+
+class TestCanonicalJson:
+    """Canonical form is stable and excludes the signature"""
+
+    def test_key_order_and_signature_are_ignored(self):
+        a = {"b": 1, "a": {"y": 2, "x": "é"}}
+        b = {"a": {"x": "é", "y": 2}, "b": 1, "signature": "abc"}
+        assert canonical_json(a) == canonical_json(b) == '{"a":{"x":"é","y":2},"b":1}'.encode("utf-8")
+
+    def test_canonical_is_computed_once(self):
+        c = Canonical(_envelope())
+        assert c.data == canonical_json(_envelope())
+        assert len(c.digest) == 32
+
+
+class TestSignVerify:
+    """Round trips, tampering and unknown signers"""
+
+    def test_round_trip(self, service):
+        signed = service.signed(_envelope())
+        assert service.verify(signed)
+
+    def test_tampered_message_fails(self, service):
+        signed = service.signed(_envelope())
+        signed["confidence"] = 0.99
+        assert not service.verify(signed)
+
+    def test_missing_or_malformed_signature_fails(self, service):
+        assert not service.verify(_envelope())
+        assert not service.verify({**_envelope(), "signature": "not base64!"})
+
+    def test_unknown_signer_fails(self, service):
+        signed = service.signed({**_envelope(), "soul_id": "chimera:agent:unknown"})
+        assert not service.verify(signed)
+
+    def test_feedback_is_verified_against_sender(self, service):
+        feedback = service.signed({"from_soul_id": SOUL, "to_soul_id": "external:agent:xyz", "rating": 5})
+        assert service.verify(feedback)
+
+    def test_verify_only_service_cannot_sign(self):
+        with pytest.raises(ValueError):
+            SigningService().sign(_envelope())
+
+
+class TestCaches:
+    """Public key loading and verified-signature reuse"""
+
+    def test_keyring_loader_and_lru(self):
+        key = generate_key()
+        calls = []
+
+        def loader(soul_id):
+            calls.append(soul_id)
+            return public_key_b64(key) if soul_id != "missing" else None
+
+        ring = KeyRing(loader=loader, max_size=2)
+        assert ring.get("a") is ring.get("a")
+        assert ring.get("missing") is None
+        ring.get("b")
+        ring.get("c")
+        assert len(ring) == 2
+        assert calls == ["a", "missing", "b", "c"]
+
+    def test_verified_signature_cache(self, service):
+        signed = service.signed(_envelope())
+        assert service.verify(signed)
+        assert service.cache_hits == 0
+        assert service.verify(signed)
+        assert service.cache_hits == 1
+
+    def test_failures_are_not_cached(self, service):
+        signed = service.signed(_envelope())
+        signed["confidence"] = 0.5
+        service.verify(signed)
+        service.verify(signed)
+        assert service.cache_hits == 0
+
+
+class TestBatches:
+    """Batch results match single calls, inline and in a process pool"""
+
+    @pytest.mark.parametrize("processes", [0, 2])
+    def test_batch_round_trip(self, processes):
+        key = generate_key()
+        keyring = KeyRing()
+        keyring.add(SOUL, public_key_b64(key))
+        messages = [Canonical(_envelope(i)) for i in range(40)]
+        with SigningService(private_key=key, keyring=keyring, processes=processes, parallel_min=8) as svc:
+            signatures = svc.sign_batch(messages)
+            assert signatures == [svc.sign(m) for m in messages]
+            signed = [{**m.payload, "signature": s} for m, s in zip(messages, signatures)]
+            signed[3]["confidence"] = 0.1
+            results = svc.verify_batch(signed)
+        assert results == [i != 3 for i in range(40)]
+
+    def test_signers_must_match_messages(self, service):
+        with pytest.raises(ValueError):
+            service.verify_batch([_envelope()], signers=[])
@@ -0,0 +1,84 @@
+"""
+Skill Input Validation Tests
+
+SRS Reference: §3.2 MCP Primitives (input sanitization)
+Spec: skills/README.md, Skill Development Guidelines §1 (Input Validation)
+
+These tests validate that compiled skill validators accept and reject the
+same inputs as jsonschema, with the same error messages.
+"""
+
+import jsonschema
+import pytest
+from skills import validation
+from skills.skill_fetch_trends.skill import INPUT_SCHEMA as FETCH_TRENDS_SCHEMA
+from skills.skill_publish_post.skill import INPUT_SCHEMA as PUBLISH_POST_SCHEMA
+
+
+def _jsonschema_message(instance, schema):
+    try:
+        jsonschema.validate(instance=instance, schema=schema)
+    except jsonschema.ValidationError as e:
+        return f"Invalid input: {e.message}"
+    return None
+
+
+class TestSkillValidation:
+
+    @pytest.mark.parametrize("instance", [
+        {},
+        [],
+        {"platform": "myspace"},
+        {"platform": 3},
+        {"platform": "twitter", "limit": 0},
+        {"platform": "twitter", "limit": 51},
+        {"platform": "twitter", "limit": True},
+        {"platform": "twitter", "limit": 2.5},
+        {"platform": "twitter", "region": "MARS", "category": "cooking"},
+        {"platform": "twitter", "limit": 5.0},
+    ])
+    def test_matches_jsonschema_for_fetch_trends(self, instance):
+        validator = validation.InputValidator(FETCH_TRENDS_SCHEMA)
+        expected = _jsonschema_message(instance, FETCH_TRENDS_SCHEMA)
+
+        if expected is None:
+            validator(instance)
+        else:
+            with pytest.raises(ValueError) as exc:
+                validator(instance)
+            assert str(exc.value) == expected
+
+    def test_nullable_type_message(self):
+        instance = {"platform": "twitter", "content": "x", "provenance": {}, "schedule_at": 5}
+        validator = validation.InputValidator(PUBLISH_POST_SCHEMA)
+
+        with pytest.raises(ValueError) as exc:
+            validator(instance)
+        assert str(exc.value) == _jsonschema_message(instance, PUBLISH_POST_SCHEMA)
+
+    def test_applies_defaults_without_mutating_input(self):
+        original = {"platform": "twitter"}
+
+        normalized = validation.validate("fetch_trends", original)
+
+        assert normalized == {"platform": "twitter", "region": "GLOBAL", "limit": 10}
+        assert original == {"platform": "twitter"}
+
+    def test_every_skill_is_registered(self):
+        import skills.skill_check_wallet_balance.skill  # noqa: F401
+        import skills.skill_generate_content.skill  # noqa: F401
+        import skills.skill_validate_image.skill  # noqa: F401
+
+        assert {"fetch_trends", "generate_content", "publish_post",
+                "check_wallet_balance", "validate_image"} <= set(validation.VALIDATORS)
+        with pytest.raises(ValueError, match="Unknown skill"):
+            validation.validate("missing_skill", {})
+
+    def test_unsupported_keywords_fall_back_to_jsonschema(self):
+        schema = {"type": "object", "properties": {"tag": {"type": "string", "pattern": "^#"}}}
+        validator = validation.InputValidator(schema)
+
+        validator({"tag": "#ok"})
+        with pytest.raises(ValueError) as exc:
+            validator({"tag": "nope"})
+        assert str(exc.value) == _jsonschema_message({"tag": "nope"}, schema)
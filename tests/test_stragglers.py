@@ -0,0 +1,188 @@
+"""
+Straggler Manager Tests
+
+SRS Reference: §4.6 Orchestration (FR6.2), NFR 3.0
+Spec: specs/technical.md, Agent Task Schema (timeout_seconds), Agent Task Result Schema
+
+These tests validate hard timeouts with lease release (deferred while a
+non-idempotent attempt still runs), censored latency samples, speculative
+duplicates for idempotent task types only, first-result-wins cancellation
+and the WorkerRuntime adapter.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.orchestrator.lifecycle import LeaseManager, LeaseStore
+from src.orchestrator.stragglers import StragglerManager, runtime_submitter
+from src.schemas.agent_task import validate_task_result
+from src.worker.runtime import WorkerRuntime
+
+
+def _task(task_id, task_type="analytics_fetch", timeout_seconds=5.0, **payload):
+    return {"task_id": task_id, "task_type": task_type, "timeout_seconds": timeout_seconds, "payload": payload}
+
+
+class FakeWorkers:
+    """Runs tasks on threads; each attempt sleeps the next entry of payload['sleeps']."""
+
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(max_workers=16)
+        self.attempts = {}
+        self._lock = threading.Lock()
+
+    def submit(self, task):
+        with self._lock:
+            n = self.attempts.get(task["task_id"], 0)
+            self.attempts[task["task_id"]] = n + 1
+        sleeps = task["payload"].get("sleeps", [0.0])
+        failures = task["payload"].get("fail", [])
+        return self.pool.submit(self._work, sleeps[min(n, len(sleeps) - 1)], n in failures, n)
+
+    @staticmethod
+    def _work(sleep, fail, attempt):
+        time.sleep(sleep)
+        if fail:
+            raise ValueError(f"attempt {attempt} failed")
+        return {"attempt": attempt}
+
+
+@pytest.fixture
+def workers():
+    workers = FakeWorkers()
+    yield workers
+    workers.pool.shutdown(wait=False)
+
+
+def _warm(manager, task_type, n=20):
+    for i in range(n):
+        manager.run(_task(f"warm-{task_type}-{i}", task_type, sleeps=[0.01])).result(timeout=5)
+
+
+class TestHardTimeout:
+
+    def test_times_out_and_releases_lease(self, workers):
+        store = LeaseStore()
+        store.enqueue("task-1")
+        leases = LeaseManager(store, heartbeat_interval=10, clock=lambda: 0.0)
+        task_id = leases.claim("agent-a")
+
+        with StragglerManager(workers.submit, leases=leases) as manager:
+            start = time.monotonic()
+            result = manager.run(_task(task_id, "analytics_fetch", timeout_seconds=0.1, sleeps=[2.0]),
+                                 soul_id="agent-a").result(timeout=5)
+
+        assert time.monotonic() - start < 1.0
+        assert result["status"] == "FAILED"
+        assert result["error"]["code"] == "TIMEOUT"
+        assert validate_task_result(result)["valid"]
+        assert store.leases == {}
+        assert leases.in_flight("agent-a") == []
+        metrics = manager.metrics()["analytics_fetch"]
+        assert metrics["timed_out"] == 1
+        assert metrics["censored"] == 1
+        assert metrics["p50_s"] >= 0.1
+
+    def test_running_non_idempotent_attempt_keeps_its_lease(self, workers):
+        store = LeaseStore()
+        store.enqueue("task-1")
+        leases = LeaseManager(store, heartbeat_interval=10, clock=lambda: 0.0)
+        task_id = leases.claim("agent-a")
+        release = threading.Event()
+        attempt = workers.pool.submit(release.wait)
+
+        with StragglerManager(lambda task: attempt, leases=leases) as manager:
+            result = manager.run(_task(task_id, "social_publish", timeout_seconds=0.1),
+                                 soul_id="agent-a").result(timeout=5)
+
+            assert result["error"]["code"] == "TIMEOUT"
+            assert leases.in_flight("agent-a") == [task_id]
+            release.set()
+            deadline = time.monotonic() + 5
+            while leases.in_flight("agent-a") and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+        assert store.leases == {}
+        assert leases.in_flight("agent-a") == []
+
+    def test_success_releases_lease(self, workers):
+        store = LeaseStore()
+        store.enqueue("task-1")
+        leases = LeaseManager(store, heartbeat_interval=10, clock=lambda: 0.0)
+        task_id = leases.claim("agent-a")
+
+        with StragglerManager(workers.submit, leases=leases) as manager:
+            result = manager.run(_task(task_id, "social_publish"), soul_id="agent-a").result(timeout=5)
+
+        assert result["status"] == "SUCCESS"
+        assert result["output"] == {"attempt": 0}
+        assert validate_task_result(result)["valid"]
+        assert store.leases == {}
+
+
+class TestSpeculation:
+
+    def test_slow_idempotent_task_gets_a_duplicate(self, workers):
+        with StragglerManager(workers.submit, percentile=90, min_samples=20) as manager:
+            _warm(manager, "analytics_fetch")
+            start = time.monotonic()
+            result = manager.run(_task("slow", sleeps=[2.0, 0.01])).result(timeout=5)
+
+            assert time.monotonic() - start < 1.0
+            assert result["output"] == {"attempt": 1}
+            assert workers.attempts["slow"] == 2
+            metrics = manager.metrics()["analytics_fetch"]
+            assert metrics["speculated"] == 1
+            assert metrics["speculative_wins"] == 1
+
+    def test_non_idempotent_task_is_not_duplicated(self, workers):
+        with StragglerManager(workers.submit, min_samples=20) as manager:
+            _warm(manager, "social_publish")
+            result = manager.run(_task("publish", "social_publish", sleeps=[0.3])).result(timeout=5)
+
+        assert result["status"] == "SUCCESS"
+        assert workers.attempts["publish"] == 1
+        assert manager.metrics()["social_publish"]["speculated"] == 0
+
+    def test_failed_attempt_waits_for_the_duplicate(self, workers):
+        with StragglerManager(workers.submit, min_samples=20) as manager:
+            _warm(manager, "content_generation")
+            result = manager.run(_task("flaky", "content_generation", sleeps=[0.2, 0.3], fail=[0])).result(timeout=5)
+
+        assert result["status"] == "SUCCESS"
+        assert result["output"] == {"attempt": 1}
+
+    def test_no_speculation_without_latency_history(self, workers):
+        with StragglerManager(workers.submit, min_samples=20) as manager:
+            manager.run(_task("cold", sleeps=[0.2, 0.01])).result(timeout=5)
+
+        assert workers.attempts["cold"] == 1
+
+    def test_rejects_duplicate_task_ids(self, workers):
+        with StragglerManager(workers.submit) as manager:
+            manager.run(_task("same", sleeps=[0.2]))
+            with pytest.raises(ValueError, match="already running"):
+                manager.run(_task("same"))
+
+
+def runtime_echo(payload):
+    time.sleep(payload.get("sleep", 0.0))
+    if payload.get("fail"):
+        raise ValueError("Invalid input: boom")
+    return {"echo": payload.get("value")}
+
+
+class TestRuntimeSubmitter:
+
+    def test_runs_on_worker_runtime(self):
+        runtime = WorkerRuntime(cores=1, cpu_workers=0, io_threads=4)
+        runtime.register("fetch_trends", runtime_echo)
+        with runtime, StragglerManager(runtime_submitter(runtime)) as manager:
+            ok = manager.run(_task("ok", value=3)).result(timeout=5)
+            failed = manager.run(_task("bad", fail=True)).result(timeout=5)
+
+        assert ok["output"] == {"echo": 3}
+        assert failed["status"] == "FAILED"
+        assert "boom" in failed["error"]["message"]
@@ -0,0 +1,258 @@
+"""
+Task Journal Tests
+
+SRS Reference: §4.6 Orchestration (FR6.1, FR6.2), NFR 3.0
+Spec: specs/planner_service.md, Task DAG
+
+These tests validate DAG release and cancellation, FIFO claims per tier,
+group commit, snapshot + tail recovery, torn-tail truncation and the
+planner's journaling hook.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+from src.orchestrator.journal import TaskJournal, SNAPSHOT_FILE
+from src.planner.engine import CampaignPlanner
+
+
+def _task(task_id, campaign_id="c1", priority="NORMAL", dependencies=()):
+    return {"task_id": task_id, "campaign_id": campaign_id, "task_type": "content_generation",
+            "priority": priority, "timeout_seconds": 300, "dependencies": list(dependencies),
+            "payload": {"prompt": f"task {task_id}"}}
+
+
+def _result(task_id, status="SUCCESS", soul_id="w1"):
+    return {"task_id": task_id, "worker_soul_id": soul_id, "status": status,
+            "completed_at": "2026-01-01T00:00:00.000Z", "confidence": 0.9, "output": {"id": task_id}}
+
+
+def _chain(campaign_id="c1"):
+    return [_task(f"{campaign_id}-fetch", campaign_id, "HIGH"),
+            _task(f"{campaign_id}-gen", campaign_id, dependencies=[f"{campaign_id}-fetch"]),
+            _task(f"{campaign_id}-pub", campaign_id, dependencies=[f"{campaign_id}-gen"])]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "journal")
+
+
+class TestTaskDag:
+
+    def test_results_release_dependents(self, directory):
+        with TaskJournal(directory) as journal:
+            assert journal.submit(_chain()) == ["c1-fetch"]
+            assert journal.claim("w1")["task_id"] == "c1-fetch"
+            assert journal.claim("w2") is None
+
+            assert journal.complete(_result("c1-fetch")) == ["c1-gen"]
+            assert journal.status("c1-pub") == "WAITING"
+            assert journal.result("c1-fetch")["output"] == {"id": "c1-fetch"}
+
+    def test_claims_follow_tier_then_creation_order(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit([_task("low", priority="LOW"), _task("n1"), _task("high", priority="HIGH"),
+                            _task("n2")])
+
+            assert [journal.claim("w1")["task_id"] for _ in range(4)] == ["high", "n1", "n2", "low"]
+
+    def test_requeue_keeps_position(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit([_task("t1"), _task("t2")])
+            journal.claim("w1")
+
+            assert journal.requeue(["t1", "t2"]) == ["t1"]
+            assert journal.claim("w2")["task_id"] == "t1"
+            assert journal.owner("t1") == "w2"
+
+    def test_cancel_cascades_and_ignores_late_results(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit(_chain())
+            journal.claim("w1")
+
+            assert journal.cancel("c1-fetch", "campaign paused") == ["c1-fetch", "c1-gen", "c1-pub"]
+            assert journal.complete(_result("c1-fetch")) == []
+            assert journal.status("c1-fetch") == "CANCELLED"
+            assert journal.claim("w1") is None
+
+    def test_failed_task_blocks_dependents(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit(_chain())
+            journal.claim("w1")
+
+            assert journal.complete(_result("c1-fetch", "FAILED")) == []
+            assert journal.counts()["WAITING"] == 2
+            assert journal.cancel_campaign("c1") == ["c1-gen", "c1-pub"]
+
+    def test_purge_requires_finished_campaign(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit(_chain())
+            with pytest.raises(ValueError, match="unfinished"):
+                journal.purge_campaign("c1")
+
+            journal.cancel_campaign("c1")
+            assert journal.purge_campaign("c1") == 3
+            assert len(journal) == 0
+            assert journal.status("c1-fetch") is None
+
+    def test_rejects_invalid_submissions(self, directory):
+        with TaskJournal(directory) as journal:
+            journal.submit([_task("t1")])
+            with pytest.raises(ValueError, match="already journaled"):
+                journal.submit([_task("t1")])
+            with pytest.raises(ValueError, match="Unknown dependency"):
+                journal.submit([_task("t2", dependencies=["t3"]), _task("t3")])
+            with pytest.raises(ValueError, match="Unknown priority"):
+                journal.submit([_task("t4", priority="URGENT")])
+            with pytest.raises(ValueError, match="Invalid"):
+                journal.submit([_task("t5,t6")])
+            with pytest.raises(ValueError, match="Unknown result status"):
+                journal.complete(_result("t1", "DONE"))
+            assert len(journal) == 1
+
+
+class TestDurability:
+
+    def test_recovers_queue_and_dag_after_crash(self, directory):
+        journal = TaskJournal(directory)
+        journal.submit(_chain("c1") + _chain("c2"))
+        journal.claim("w1")
+        journal.claim("w2")
+        journal.complete(_result("c1-fetch"))
+        assert journal.claim("w1")["task_id"] == "c1-gen"
+        journal.cancel_campaign("c2")
+        # No close(): every call above was already fsynced
+
+        recovered = TaskJournal(directory)
+        assert recovered.recovery["replayed"] == 11
+        assert recovered.recovery["requeued"] == 1
+        assert recovered.status("c1-fetch") == "SUCCESS"
+        assert recovered.status("c1-gen") == "READY"
+        assert recovered.status("c2-pub") == "CANCELLED"
+        assert recovered.claim("w2")["task_id"] == "c1-gen"
+        assert recovered.complete(_result("c1-gen")) == ["c1-pub"]
+        recovered.close()
+        journal.close()
+
+    def test_snapshot_truncates_log_and_replays_only_tail(self, directory):
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            journal.submit(_chain("c1") + _chain("c2"))
+            journal.claim("w1")
+            journal.complete(_result("c1-fetch"))
+            assert journal.snapshot() == 8
+            journal.submit([_task("c3-fetch", "c3", "HIGH")])
+
+        segments = sorted(name for name in os.listdir(directory) if name.startswith("wal-"))
+        assert SNAPSHOT_FILE in os.listdir(directory)
+        assert segments == ["wal-00000000000000000009.log"]
+
+        with TaskJournal(directory) as recovered:
+            assert recovered.recovery["snapshot_lsn"] == 8
+            assert recovered.recovery["replayed"] == 1
+            assert [recovered.claim("w2")["task_id"] for _ in range(3)] == ["c2-fetch", "c3-fetch", "c1-gen"]
+            assert recovered.complete(_result("c2-fetch")) == ["c2-gen"]
+
+    def test_snapshot_survives_purge(self, directory):
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            journal.submit(_chain("c1") + _chain("c2"))
+            journal.cancel_campaign("c1")
+            journal.purge_campaign("c1")
+            journal.snapshot()
+
+        with TaskJournal(directory) as recovered:
+            assert len(recovered) == 3
+            assert recovered.claim("w1")["task_id"] == "c2-fetch"
+            assert recovered.complete(_result("c2-fetch")) == ["c2-gen"]
+
+    def test_snapshot_of_recovered_state(self, directory):
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            journal.submit(_chain("c1") + _chain("c2") + _chain("c3"))
+            journal.claim("w1")
+            journal.complete(_result("c1-fetch"))
+            journal.cancel_campaign("c3")
+            journal.snapshot()
+
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            journal.purge_campaign("c3")
+            journal.submit([_task("c4-gen", "c4", dependencies=["c2-fetch"])])
+            journal.snapshot()
+
+        with TaskJournal(directory) as recovered:
+            assert len(recovered) == 7
+            assert recovered.result("c1-fetch")["output"] == {"id": "c1-fetch"}
+            assert recovered.manifest("c2-pub")["dependencies"] == ["c2-gen"]
+            assert recovered.claim("w1")["task_id"] == "c2-fetch"
+            assert recovered.complete(_result("c2-fetch")) == ["c2-gen", "c4-gen"]
+            assert recovered.claim("w1")["task_id"] == "c1-gen"
+
+    def test_automatic_snapshots(self, directory):
+        with TaskJournal(directory, snapshot_every=4) as journal:
+            for i in range(10):
+                journal.submit([_task(f"t{i}")])
+
+        with TaskJournal(directory) as recovered:
+            assert recovered.recovery["snapshot_lsn"] == 8
+            assert recovered.recovery["replayed"] == 2
+            assert len(recovered) == 10
+
+    def test_torn_tail_is_truncated(self, directory):
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            journal.submit([_task("t1"), _task("t2")])
+        segment = os.path.join(directory, sorted(os.listdir(directory))[0])
+        size = os.path.getsize(segment)
+        os.truncate(segment, size - 5)
+
+        with TaskJournal(directory) as recovered:
+            assert recovered.recovery["replayed"] == 1
+            assert recovered.recovery["truncated_bytes"] > 0
+            assert recovered.status("t2") is None
+            recovered.submit([_task("t2")])
+
+        with TaskJournal(directory) as again:
+            assert again.recovery["truncated_bytes"] == 0
+            assert len(again) == 2
+
+    def test_group_commit_batches_fsyncs(self, directory, monkeypatch):
+        fsync = os.fsync
+
+        def slow_fsync(fd):
+            time.sleep(0.002)
+            fsync(fd)
+
+        monkeypatch.setattr(os, "fsync", slow_fsync)
+        with TaskJournal(directory, snapshot_every=0) as journal:
+            barrier = threading.Barrier(8)
+
+            def submit(worker):
+                barrier.wait()
+                for i in range(50):
+                    journal.submit([_task(f"w{worker}-{i}")])
+
+            threads = [threading.Thread(target=submit, args=(w,)) for w in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert len(journal) == 400
+            # Writers that arrive during an fsync share the next one
+            assert journal.syncs < 200
+
+        with TaskJournal(directory) as recovered:
+            assert recovered.recovery["replayed"] == 400
+
+
+class TestPlannerJournal:
+
+    def test_plan_campaign_is_journaled(self, directory):
+        manifest = {"campaign_id": "camp-1", "goal": "Launch", "constraints": {"platforms": ["twitter"]},
+                    "target_audience": {"regions": ["US"]}}
+        with TaskJournal(directory) as journal:
+            tasks = CampaignPlanner(journal=journal).plan_campaign(manifest)
+
+        with TaskJournal(directory) as recovered:
+            assert recovered.manifest(tasks[2]["task_id"]) == tasks[2]
+            assert recovered.claim("w1")["task_type"] == "analytics_fetch"
@@ -0,0 +1,227 @@
+"""
+Trend History Store Tests
+
+SRS Reference: §4.2 Perception (FR2.2), NFR 3.0
+Spec: skills/skill_fetch_trends/README.md, Output Schema
+
+These tests validate dictionary encoding and day partitioning, the daily
+aggregates (rising topics, volume deltas, sentiment EMA), append-only
+persistence with crash trimming, queued ingestion and retention, and the
+fetch_trends and planner hooks.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from src.trends.store import TrendStore, get_trend_store, set_trend_store
+
+
+def _observe(store, day, topic, volume, sentiment=0.5, platform="tiktok", region="US", hour=12):
+    return store.append(platform, region, [topic], [volume], [sentiment], [f"{day}T{hour:02d}:00:00.000+00:00"])
+
+
+def _history(store):
+    """Two weeks: #steady stays flat, #rising jumps in the second week, #new appears on the last day."""
+    for d in range(1, 15):
+        day = f"2026-03-{d:02d}"
+        _observe(store, day, "#steady", 1000, 0.2)
+        _observe(store, day, "#rising", 100 if d <= 7 else 900, 0.8)
+    _observe(store, "2026-03-14", "#new", 300, -0.4)
+
+
+class TestIngestion:
+
+    def test_fetch_trends_output_is_encoded_and_partitioned(self):
+        store = TrendStore()
+        output = {
+            "trends": [
+                {"topic": "#a", "volume": 10, "sentiment": 0.1, "retrieved_at": "2026-03-01T23:59:59.000+00:00"},
+                {"topic": "#b", "volume": 20, "sentiment": 0.2, "retrieved_at": "2026-03-02T00:00:01.000+00:00"},
+                {"topic": "#a", "volume": 30, "sentiment": 0.3, "retrieved_at": "2026-03-02T00:00:01.000Z"}
+            ],
+            "metadata": {"platform": "reddit", "total_trends": 3, "cache_hit": False}
+        }
+
+        assert store.ingest(output, region="EU") == 3
+        assert store.partitions() == [("reddit", "EU", "2026-03-01"), ("reddit", "EU", "2026-03-02")]
+        columns = store.scan("reddit", "EU", "2026-03-01", "2026-03-03")
+        assert columns["topic"].tolist() == [0, 1, 0]
+        assert columns["day"].tolist() == [0, 1, 1]
+        assert columns["volume"].dtype == np.int64
+        assert store.topic_id("#b") == 1
+
+    def test_rejects_ragged_columns(self):
+        with pytest.raises(ValueError, match="same length"):
+            TrendStore().append("tiktok", "US", ["#a", "#b"], [1], [0.1], ["2026-03-01"])
+
+    def test_partition_growth_keeps_earlier_views(self):
+        store = TrendStore()
+        _observe(store, "2026-03-01", "#a", 1)
+        before = store.scan("tiktok", "US", "2026-03-01", "2026-03-02")
+        for i in range(200):
+            _observe(store, "2026-03-01", "#a", i)
+
+        assert before["volume"].tolist() == [1]
+        assert len(store.scan("tiktok", "US", "2026-03-01", "2026-03-02")["volume"]) == 201
+
+    def test_queued_results_are_drained_and_bad_ones_dropped(self):
+        store = TrendStore(batch_size=3)
+
+        def output(topic, retrieved_at="2026-03-01T12:00:00.000+00:00"):
+            return {"trends": [{"topic": topic, "volume": 10, "sentiment": 0.1, "retrieved_at": retrieved_at}],
+                    "metadata": {"platform": "reddit"}}
+
+        store.enqueue(output("#a"), region="EU")
+        store.enqueue(output("#b", retrieved_at="yesterday"), region="EU")
+        assert len(store._queue) == 2
+        store.enqueue({"trends": [{"topic": "#c"}], "metadata": {"platform": "reddit"}}, region="EU")
+        assert len(store._queue) == 0
+
+        store.enqueue(output("#d"), region="EU")
+        assert store.rows == 2
+        assert store.dropped == 2
+        assert store.topic_id("#d") is not None
+
+    def test_retention_evicts_old_days(self, tmp_path):
+        directory = str(tmp_path / "trends")
+        store = TrendStore(directory, retention_days=7)
+        _history(store)
+        store.flush()
+
+        assert [day for _, _, day in store.partitions()] == [f"2026-03-{d:02d}" for d in range(8, 15)]
+        assert store.rows == 15
+        assert not os.path.exists(os.path.join(directory, "tiktok", "US", "2026-03-07"))
+        assert TrendStore(directory, retention_days=3).rows == 7
+
+
+class TestAggregates:
+
+    def test_daily_means_per_topic(self):
+        store = TrendStore()
+        _observe(store, "2026-03-01", "#a", 100, 0.0, hour=9)
+        _observe(store, "2026-03-01", "#a", 300, 1.0, hour=18)
+        _observe(store, "2026-03-03", "#a", 50)
+        _observe(store, "2026-03-02", "#a", 999, region="EU")
+
+        table = store.daily("tiktok", "US", "2026-03-01", "2026-03-04")
+        assert table["days"] == ["2026-03-01", "2026-03-02", "2026-03-03"]
+        assert table["topics"] == ["#a"]
+        np.testing.assert_allclose(table["volume"], [[200.0, np.nan, 50.0]])
+        np.testing.assert_allclose(table["sentiment"], [[0.5, np.nan, 0.5]])
+
+    def test_rising_topics(self):
+        store = TrendStore()
+        _history(store)
+
+        rising = store.rising_topics("tiktok", "US", days=14, recent_days=7)
+        assert [row["topic"] for row in rising] == ["#new", "#rising", "#steady"]
+        assert rising[0]["baseline"] == 0.0
+        assert rising[0]["growth"] == 300.0
+        assert rising[1]["volume"] == 900.0
+        assert rising[1]["baseline"] == 100.0
+        assert rising[1]["sentiment_ema"] == pytest.approx(0.8)
+        assert rising[2]["growth"] == 0.0
+        assert [row["topic"] for row in store.rising_topics("tiktok", "US", days=14, recent_days=7,
+                                                           min_volume=500)] == ["#rising", "#steady"]
+
+    def test_volume_deltas(self):
+        store = TrendStore()
+        _history(store)
+
+        deltas = store.volume_deltas("tiktok", "US", end="2026-03-15", days=7)
+        assert deltas["#rising"] == {"volume": 900.0, "previous": 100.0, "delta": 800.0, "pct": 8.0}
+        assert deltas["#steady"]["delta"] == 0.0
+        assert deltas["#new"]["pct"] is None
+
+    def test_sentiment_ema_skips_missing_days(self):
+        store = TrendStore()
+        _observe(store, "2026-03-01", "#a", 1, 1.0)
+        _observe(store, "2026-03-03", "#a", 1, 0.0)
+
+        ema = store.sentiment_ema("tiktok", "US", end="2026-03-04", days=3, span=3)
+        assert ema == {"#a": pytest.approx(0.5)}
+
+    def test_empty_history(self):
+        store = TrendStore()
+
+        assert store.rising_topics("tiktok", "US") == []
+        assert store.volume_deltas("tiktok", "US") == {}
+        with pytest.raises(ValueError, match="recent_days"):
+            store.rising_topics("tiktok", "US", days=7, recent_days=7)
+
+
+class TestPersistence:
+
+    def test_flush_appends_and_reload(self, tmp_path):
+        directory = str(tmp_path / "trends")
+        store = TrendStore(directory)
+        _history(store)
+        assert store.flush() == 29
+        _observe(store, "2026-03-14", "#late", 50)
+        assert store.flush() == 1
+        assert store.flush() == 0
+
+        reloaded = TrendStore(directory)
+        assert reloaded.rows == 30
+        assert reloaded.partitions() == store.partitions()
+        assert reloaded.rising_topics("tiktok", "US", days=14, recent_days=7) == \
+            store.rising_topics("tiktok", "US", days=14, recent_days=7)
+
+        _observe(reloaded, "2026-03-14", "#late", 70)
+        reloaded.flush()
+        assert TrendStore(directory).volume_deltas("tiktok", "US", days=1)["#late"]["volume"] == 60.0
+
+    def test_torn_rows_are_trimmed(self, tmp_path):
+        directory = str(tmp_path / "trends")
+        store = TrendStore(directory)
+        _observe(store, "2026-03-01", "#a", 1)
+        _observe(store, "2026-03-01", "#b", 2)
+        store.flush()
+        volume_path = os.path.join(directory, "tiktok", "US", "2026-03-01", "volume")
+        os.truncate(volume_path, os.path.getsize(volume_path) - 3)
+
+        reloaded = TrendStore(directory)
+        assert reloaded.rows == 1
+        assert os.path.getsize(volume_path) == 8
+
+
+class TestIntegration:
+
+    def test_fetch_trends_feeds_shared_store(self):
+        from skills.skill_fetch_trends.skill import execute_skill
+
+        set_trend_store(None)
+        try:
+            execute_skill({"platform": "reddit", "region": "EU", "limit": 3})
+            store = get_trend_store()
+            assert store.rows == 3
+            assert store.partitions()[0][:2] == ("reddit", "EU")
+        finally:
+            set_trend_store(None)
+
+    def test_store_failure_keeps_the_fetch_result(self):
+        from skills.skill_fetch_trends.skill import execute_skill
+
+        class BrokenStore(TrendStore):
+            def enqueue(self, *args, **kwargs):
+                raise OSError("disk full")
+
+        set_trend_store(BrokenStore())
+        try:
+            result = execute_skill({"platform": "reddit", "region": "EU", "limit": 3})
+            assert len(result["trends"]) == 3
+        finally:
+            set_trend_store(None)
+
+    def test_planner_uses_rising_topics(self):
+        from src.planner.engine import CampaignPlanner
+
+        store = TrendStore()
+        _history(store)
+        manifest = {"campaign_id": "camp-1", "goal": "Launch", "constraints": {"platforms": ["tiktok"]},
+                    "target_audience": {"regions": ["US"]}}
+
+        tasks = CampaignPlanner(trends=store).plan_campaign(manifest)
+        assert tasks[1]["payload"]["trending_topics"] == ["#new", "#rising", "#steady"]
+        assert "trending_topics" not in CampaignPlanner().plan_campaign(manifest)[1]["payload"]
@@ -0,0 +1,177 @@
+"""
+Validate Image Pipeline Tests
+
+SRS Reference: §4.3 Creative Engine (FR3.2)
+Spec: research/tooling_strategy.md, Skill 5
+
+These tests validate streaming download, perceptual hashing and the verdict
+cache. A local HTTP server stands in for remote image URLs.
+"""
+
+import functools
+import http.server
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from skills.skill_validate_image.pipeline import ImageValidationPipeline, VerdictCache
+
+
+@pytest.fixture
+def image_server(tmp_path):
+    """Serve tmp_path over HTTP and yield its base URL."""
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(tmp_path))
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield tmp_path, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _creative(path, size=(256, 256), color=(255, 87, 51), noise=0):
+    """Write a test creative: a smooth random texture shaded in `color`."""
+    rng = np.random.default_rng(0)
+    field = Image.fromarray((rng.random((6, 6)) * 255).astype(np.uint8)).resize(size, Image.BICUBIC)
+    shade = 0.5 + 0.5 * np.asarray(field) / 255
+    pixels = np.asarray(color)[None, None, :] * shade[:, :, None]
+    pixels = np.clip(pixels + rng.integers(0, noise + 1, (size[1], size[0], 3)), 0, 255)
+    Image.fromarray(pixels.astype(np.uint8)).save(path)
+
+
+class TestImageValidationPipeline:
+
+    @pytest.fixture
+    def pipeline(self):
+        pipeline = ImageValidationPipeline(workers=0, chunk_size=1024)
+        yield pipeline
+        pipeline.close()
+
+    def test_valid_image_passes_palette_check(self, pipeline, image_server):
+        root, base = image_server
+        _creative(root / "brand.png")
+
+        result = pipeline.validate(f"{base}/brand.png", {"allowed_colors": ["#FF5733"]})
+
+        assert result["is_valid"] is True
+        assert result["violations"] == []
+        assert result["cache_hit"] is False
+        assert len(result["phash"]) == 16
+
+    def test_off_palette_and_too_small(self, pipeline, image_server):
+        root, base = image_server
+        _creative(root / "blue.jpg", size=(64, 64), color=(20, 40, 220))
+
+        result = pipeline.validate(f"{base}/blue.jpg", {"allowed_colors": ["#FF5733"], "min_width": 128})
+
+        assert result["is_valid"] is False
+        assert {v["code"] for v in result["violations"]} == {"OFF_PALETTE_COLORS", "IMAGE_TOO_SMALL"}
+
+    def test_near_duplicate_reuses_verdict(self, pipeline, image_server):
+        root, base = image_server
+        _creative(root / "original.png")
+        _creative(root / "resized.jpg", size=(200, 200), noise=4)
+        guidelines = {"allowed_colors": ["#FF5733"]}
+
+        first = pipeline.validate(f"{base}/original.png", guidelines)
+        second = pipeline.validate(f"{base}/resized.jpg", guidelines)
+        other = pipeline.validate(f"{base}/original.png", {"allowed_colors": ["#000000"]})
+
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert other["cache_hit"] is False
+        assert len(pipeline.cache) == 2
+
+    def test_cached_verdict_still_checks_size(self, pipeline, image_server):
+        root, base = image_server
+        _creative(root / "large.png", size=(512, 512))
+        _creative(root / "small.png", size=(64, 64))
+        guidelines = {"allowed_colors": ["#FF5733"], "min_width": 256}
+
+        large = pipeline.validate(f"{base}/large.png", guidelines)
+        small = pipeline.validate(f"{base}/small.png", guidelines)
+
+        assert large["is_valid"] is True
+        assert small["cache_hit"] is True
+        assert small["is_valid"] is False
+        assert [v["code"] for v in small["violations"]] == ["IMAGE_TOO_SMALL"]
+
+    def test_cached_verdict_still_checks_palette(self, pipeline, image_server):
+        root, base = image_server
+        _creative(root / "approved.png")
+        _creative(root / "recolored.png", color=(20, 40, 220))
+        guidelines = {"allowed_colors": ["#FF5733"]}
+
+        approved = pipeline.validate(f"{base}/approved.png", guidelines)
+        recolored = pipeline.validate(f"{base}/recolored.png", guidelines)
+
+        assert approved["is_valid"] is True
+        assert recolored["cache_hit"] is True
+        assert recolored["is_valid"] is False
+        assert [v["code"] for v in recolored["violations"]] == ["OFF_PALETTE_COLORS"]
+
+    def test_single_image_does_not_start_pool(self, image_server):
+        root, base = image_server
+        _creative(root / "one.png")
+        pipeline = ImageValidationPipeline(workers=2)
+
+        assert pipeline.validate(f"{base}/one.png", {})["is_valid"] is True
+        assert pipeline._pool is None
+
+    def test_unreachable_and_unreadable(self, pipeline, image_server):
+        root, base = image_server
+        (root / "broken.png").write_bytes(b"not an image")
+
+        missing, broken = pipeline.validate_batch([
+            {"image_url": f"{base}/missing.png", "brand_guidelines": {}},
+            {"image_url": f"{base}/broken.png", "brand_guidelines": {}}
+        ])
+
+        assert missing["violations"][0]["code"] == "IMAGE_UNREACHABLE"
+        assert broken["violations"][0]["code"] == "IMAGE_UNREADABLE"
+
+    def test_rejects_oversized_download(self, image_server):
+        root, base = image_server
+        _creative(root / "big.png")
+        pipeline = ImageValidationPipeline(workers=0, max_bytes=512)
+
+        result = pipeline.validate(f"{base}/big.png", {})
+
+        assert result["violations"][0]["code"] == "IMAGE_UNREACHABLE"
+
+    def test_process_pool_batch(self, image_server):
+        root, base = image_server
+        for i in range(4):
+            _creative(root / f"img{i}.png", color=(255, 87, 51 + i * 40))
+        pipeline = ImageValidationPipeline(workers=2)
+        try:
+            results = pipeline.validate_batch([
+                {"image_url": f"{base}/img{i}.png", "brand_guidelines": {}} for i in range(4)
+            ])
+        finally:
+            pipeline.close()
+
+        assert all(r["is_valid"] for r in results)
+
+
+class TestVerdictCache:
+
+    def test_hamming_radius_lookup(self):
+        cache = VerdictCache(max_distance=3)
+        cache.put(0b1011, "g", {"is_valid": True})
+
+        assert cache.get(0b1011, "g") == {"is_valid": True}
+        assert cache.get(0b1011 ^ (1 << 63) ^ (1 << 40) ^ (1 << 2), "g") == {"is_valid": True}
+        assert cache.get(0b1011 ^ 0b1111 << 20, "g") is None
+        assert cache.get(0b1011, "other") is None
+
+    def test_evicts_oldest(self):
+        cache = VerdictCache(max_distance=0, max_entries=2)
+        for phash in (1, 2, 4):
+            cache.put(phash << 32, "g", {"phash": phash})
+
+        assert len(cache) == 2
+        assert cache.get(1 << 32, "g") is None
@@ -0,0 +1,123 @@
+"""
+Worker Runtime Tests
+
+SRS Reference: §3.1 FastRender Swarm (Worker), NFR 3.0
+Spec: skills/README.md
+
+These tests validate skill routing by CPU_BOUND, work stealing between
+per-core queues and error isolation.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+from src.worker.runtime import WorkerRuntime
+
+
+def cpu_task(payload):
+    digest = b""
+    for _ in range(payload.get("rounds", 1000)):
+        digest = hashlib.sha256(digest).digest()
+    return {"pid": os.getpid(), "digest": digest.hex()}
+
+
+def io_task(payload):
+    time.sleep(payload.get("sleep", 0.01))
+    return {"thread": threading.current_thread().name}
+
+
+async def async_io_task(payload):
+    await asyncio.sleep(payload.get("sleep", 0.01))
+    return {"async": True}
+
+
+def failing_task(payload):
+    raise ValueError("Invalid input: boom")
+
+
+class TestWorkerRuntime:
+
+    def test_routes_cpu_bound_to_process_pool(self):
+        with WorkerRuntime(cores=2, cpu_workers=1) as runtime:
+            runtime.register("cpu", cpu_task, cpu_bound=True)
+            runtime.register("io", io_task)
+            runtime.register("aio", async_io_task)
+
+            cpu, io, aio = runtime.run_batch([
+                {"id": "t1", "skill": "cpu", "payload": {}},
+                {"id": "t2", "skill": "io", "payload": {}},
+                {"id": "t3", "skill": "aio", "payload": {}}
+            ])
+
+        assert cpu["status"] == "ok" and cpu["output"]["pid"] != os.getpid()
+        assert io["output"]["thread"].startswith("runtime-io")
+        assert aio["output"] == {"async": True}
+
+    def test_idle_cores_steal_queued_work(self):
+        with WorkerRuntime(cores=4, cpu_workers=0, max_in_flight=2) as runtime:
+            runtime.register("io", io_task)
+            futures = [runtime.submit({"id": f"t{i}", "skill": "io", "payload": {"sleep": 0.01}}, core=0)
+                       for i in range(40)]
+            results = [f.result(timeout=10) for f in futures]
+            stats = runtime.stats()
+
+        assert [r["id"] for r in results] == [f"t{i}" for i in range(40)]
+        assert sum(s["stolen"] for s in stats) > 0
+        assert all(s["executed"] > 0 for s in stats)
+
+    def test_errors_are_isolated(self):
+        with WorkerRuntime(cores=1, cpu_workers=0) as runtime:
+            runtime.register("fail", failing_task)
+            runtime.register("io", io_task)
+
+            failed, ok = runtime.run_batch([
+                {"id": "t1", "skill": "fail", "payload": {}},
+                {"id": "t2", "skill": "io", "payload": {"sleep": 0}}
+            ])
+
+        assert failed == {"id": "t1", "status": "error", "error": "Invalid input: boom"}
+        assert ok["status"] == "ok"
+
+    def test_registers_repo_skills_by_cpu_bound(self):
+        runtime = WorkerRuntime(cores=1, cpu_workers=0)
+        runtime.register_skills()
+
+        assert runtime._handlers["validate_image"][1] is True
+        assert runtime._handlers["publish_post"][1] is False
+
+        with runtime:
+            result = runtime.run_batch([{"id": "t1", "skill": "fetch_trends", "payload": {"platform": "twitter"}}])[0]
+        assert len(result["output"]["trends"]) == 10
+
+    def test_rejects_unknown_skill_and_submit_after_stop(self):
+        runtime = WorkerRuntime(cores=1, cpu_workers=0).start()
+        with pytest.raises(ValueError, match="Unknown skill"):
+            runtime.submit({"id": "t1", "skill": "missing"})
+        runtime.stop()
+        with pytest.raises(ValueError, match="not running"):
+            runtime.submit({"id": "t1", "skill": "missing"})
+
+    def test_stops_after_cpu_bound_validate_image(self, tmp_path):
+        from PIL import Image
+
+        path = tmp_path / "creative.png"
+        Image.new("RGB", (128, 128), (255, 87, 51)).save(path)
+        runtime = WorkerRuntime(cores=1, cpu_workers=1)
+        runtime.register_skills()
+        runtime.start()
+        results = runtime.run_batch([
+            {"id": f"t{i}", "skill": "validate_image",
+             "payload": {"image_url": f"file://{path}", "brand_guidelines": {"allowed_colors": ["#FF5733"]}}}
+            for i in range(3)
+        ])
+
+        stopper = threading.Thread(target=runtime.stop, daemon=True)
+        stopper.start()
+        stopper.join(timeout=30)
+
+        assert not stopper.is_alive()
+        assert all(r["status"] == "ok" and r["output"]["is_valid"] for r in results)